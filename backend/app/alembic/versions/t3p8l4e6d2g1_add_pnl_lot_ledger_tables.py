@@ -0,0 +1,77 @@
+"""add pnl lot ledger tables
+
+Revision ID: t3p8l4e6d2g1
+Revises: s2v6w3x9y4z8
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel.sql.sqltypes
+
+
+# revision identifiers, used by Alembic.
+revision = 't3p8l4e6d2g1'
+down_revision = 's2v6w3x9y4z8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('pnl_lots',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('book', sqlmodel.sql.sqltypes.AutoString(length=10), nullable=False),
+    sa.Column('algorithm_id', sa.Uuid(), nullable=True),
+    sa.Column('coin_type', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+    sa.Column('buy_order_id', sa.Uuid(), nullable=False),
+    sa.Column('quantity', sa.DECIMAL(precision=20, scale=10), nullable=False),
+    sa.Column('remaining_quantity', sa.DECIMAL(precision=20, scale=10), nullable=False),
+    sa.Column('price', sa.DECIMAL(precision=20, scale=8), nullable=False),
+    sa.Column('opened_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_pnl_lots_user_id'), 'pnl_lots', ['user_id'], unique=False)
+    op.create_index('idx_pnl_lot_book', 'pnl_lots', ['user_id', 'book', 'algorithm_id', 'coin_type', 'opened_at'], unique=False)
+
+    op.create_table('pnl_realized_matches',
+    sa.Column('id', sa.Uuid(), nullable=False),
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('book', sqlmodel.sql.sqltypes.AutoString(length=10), nullable=False),
+    sa.Column('algorithm_id', sa.Uuid(), nullable=True),
+    sa.Column('coin_type', sqlmodel.sql.sqltypes.AutoString(length=20), nullable=False),
+    sa.Column('sell_order_id', sa.Uuid(), nullable=False),
+    sa.Column('buy_order_id', sa.Uuid(), nullable=False),
+    sa.Column('quantity', sa.DECIMAL(precision=20, scale=10), nullable=False),
+    sa.Column('buy_price', sa.DECIMAL(precision=20, scale=8), nullable=False),
+    sa.Column('sell_price', sa.DECIMAL(precision=20, scale=8), nullable=False),
+    sa.Column('realized_pnl', sa.DECIMAL(precision=30, scale=10), nullable=False),
+    sa.Column('realized_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_pnl_realized_matches_user_id'), 'pnl_realized_matches', ['user_id'], unique=False)
+    op.create_index('idx_pnl_match_book_time', 'pnl_realized_matches', ['user_id', 'book', 'algorithm_id', 'coin_type', 'realized_at'], unique=False)
+    op.create_index('idx_pnl_match_user_time', 'pnl_realized_matches', ['user_id', 'book', 'realized_at'], unique=False)
+
+    op.create_table('pnl_ledger_state',
+    sa.Column('user_id', sa.Uuid(), nullable=False),
+    sa.Column('last_filled_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('last_order_id', sa.Uuid(), nullable=True),
+    sa.Column('applied_orders', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade():
+    op.drop_table('pnl_ledger_state')
+    op.drop_index('idx_pnl_match_user_time', table_name='pnl_realized_matches')
+    op.drop_index('idx_pnl_match_book_time', table_name='pnl_realized_matches')
+    op.drop_index(op.f('ix_pnl_realized_matches_user_id'), table_name='pnl_realized_matches')
+    op.drop_table('pnl_realized_matches')
+    op.drop_index('idx_pnl_lot_book', table_name='pnl_lots')
+    op.drop_index(op.f('ix_pnl_lots_user_id'), table_name='pnl_lots')
+    op.drop_table('pnl_lots')
@@ -0,0 +1,24 @@
+"""add backtest equity curve blob
+
+Revision ID: u4q9m5f7h3j2
+Revises: t3p8l4e6d2g1
+Create Date: 2026-10-17 00:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'u4q9m5f7h3j2'
+down_revision = 't3p8l4e6d2g1'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('backtest_runs', sa.Column('equity_curve_blob', sa.LargeBinary(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('backtest_runs', 'equity_curve_blob')
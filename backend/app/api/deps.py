@@ -1,8 +1,8 @@
 from collections.abc import Generator
-from typing import Annotated
+from typing import Annotated, Any, cast
 
 import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt.exceptions import InvalidTokenError
 from pydantic import ValidationError
@@ -27,11 +27,22 @@ SessionDep = Annotated[Session, Depends(get_db)]
 TokenDep = Annotated[str, Depends(reusable_oauth2)]
 
 
-def get_current_user(session: SessionDep, token: TokenDep) -> User:
+def decode_token(request: Request, token: str) -> dict[str, Any]:
+    """
+    Decode the JWT, reusing the claims verified by RateLimitMiddleware.
+
+    The cached claims are only used when their raw token string matches
+    the one being decoded; any other token is decoded and verified here.
+    """
+    cached = getattr(request.state, "token_claims", None)
+    if cached is not None and cached[0] == token:
+        return cast(dict[str, Any], cached[1])
+    return jwt.decode(token, settings.SECRET_KEY, algorithms=[security.ALGORITHM])
+
+
+def get_current_user(request: Request, session: SessionDep, token: TokenDep) -> User:
     try:
-        payload = jwt.decode(
-            token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
-        )
+        payload = decode_token(request, token)
         token_data = TokenPayload(**payload)
     except (InvalidTokenError, ValidationError):
         raise HTTPException(
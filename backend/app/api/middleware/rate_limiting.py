@@ -4,44 +4,120 @@ Rate Limiting Middleware
 Sprint 2.11 - Track B: Rate Limiting Implementation
 
 Provides user-based rate limiting with Redis backend:
-- Per-user rate limits (60 req/min for normal users, 300 req/min for admins)
+- Per-user rate limits (per minute and per hour, higher for admins)
 - Rate limit headers in responses (X-RateLimit-*)
 - 429 Too Many Requests responses with Retry-After header
 - Bypass prevention (rate limits by user_id, not IP or token)
 
+Limits are enforced with GCRA (generic cell rate algorithm), a sliding
+window that stores a single timestamp per user and window. All windows are
+checked and updated by one Lua script, so a request costs one EVALSHA round
+trip on the async Redis client and a burst at a window boundary cannot get
+twice the limit through. The script uses the Redis clock, so every API
+process shares the same notion of time.
+
 Security Features:
 - OWASP A04:2021 – Insecure Design (abuse prevention)
 - OWASP A05:2021 – Security Misconfiguration (proper rate limiting)
 """
 
+import logging
+import math
 import time
-from typing import Any
+from typing import Any, NamedTuple
 
 import jwt
-import redis
+import redis.asyncio as redis
 from fastapi import Request, Response, status
 from fastapi.responses import JSONResponse
+from redis.exceptions import RedisError
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 
+from app.core import security
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+# Window name -> length in seconds
+WINDOWS: dict[str, int] = {"minute": 60, "hour": 3600}
+
+# KEYS: one key per window; ARGV: limit and period (ms) for each key.
+# Returns {allowed, remaining_1, reset_ms_1, retry_ms_1, remaining_2, ...}.
+# A request is only counted in any window when every window allows it.
+RATE_LIMIT_SCRIPT = """
+local time = redis.call('TIME')
+local now = time[1] * 1000 + math.floor(time[2] / 1000)
+local allowed = 1
+local result = {}
+local tats = {}
+for i, key in ipairs(KEYS) do
+    local limit = tonumber(ARGV[2 * i - 1])
+    local period = tonumber(ARGV[2 * i])
+    local interval = period / limit
+    local tat = tonumber(redis.call('GET', key) or now)
+    if tat < now then
+        tat = now
+    end
+    local new_tat = tat + interval
+    local allow_at = new_tat - period
+    if now < allow_at then
+        allowed = 0
+        result[#result + 1] = 0
+        result[#result + 1] = math.ceil(tat - now)
+        result[#result + 1] = math.ceil(allow_at - now)
+    else
+        result[#result + 1] = math.floor((now - allow_at) / interval + 1e-9)
+        result[#result + 1] = math.ceil(new_tat - now)
+        result[#result + 1] = 0
+    end
+    tats[i] = new_tat
+end
+if allowed == 1 then
+    for i, key in ipairs(KEYS) do
+        redis.call('SET', key, string.format('%.3f', tats[i]),
+            'PX', math.ceil(tats[i] - now))
+    end
+end
+table.insert(result, 1, allowed)
+return result
+"""
+
+
+class WindowState(NamedTuple):
+    """Rate limit state of one window after a request"""
+
+    limit: int
+    remaining: int
+    reset_time: int  # Unix timestamp when the window is fully replenished
+    retry_after: int  # Seconds until a request is allowed (0 if allowed)
+
 
 class RateLimitMiddleware(BaseHTTPMiddleware):
     """
     Rate limiting middleware using Redis for tracking.
 
     Implements per-user rate limits with different windows:
-    - Per-minute limits: 60 requests for normal users, 300 for admins
-    - Per-hour limits: 1000 requests for normal users, 10000 for admins
+    - Per-minute limits: RATE_LIMIT_PER_MINUTE (x RATE_LIMIT_ADMIN_MULTIPLIER for admins)
+    - Per-hour limits: RATE_LIMIT_PER_HOUR (x RATE_LIMIT_ADMIN_MULTIPLIER for admins)
 
     Rate limits are tied to user_id (not IP or token) to prevent bypass.
+    The decoded token claims are kept on request.state for the auth
+    dependencies, so the JWT is verified once per request.
     """
 
-    def __init__(self, app: Any, redis_url: str | None = None) -> None:
+    def __init__(
+        self, app: Any, redis_url: str | None = None, retry_seconds: float = 5.0
+    ) -> None:
         super().__init__(app)
         self.redis_url = redis_url or settings.REDIS_URL
-        # mypy assumes redis.from_url returns Any or untyped, we can hint it or ignore
-        self.redis_client = redis.from_url(self.redis_url, decode_responses=True)  # type: ignore[no-untyped-call]
+        self.redis_client = redis.from_url(
+            self.redis_url, decode_responses=True, socket_connect_timeout=1
+        )
+        # EVALSHA, loading the script on first use (NOSCRIPT)
+        self._script = self.redis_client.register_script(RATE_LIMIT_SCRIPT)
+        # After a Redis error, fail open without contacting Redis until then
+        self.retry_seconds = retry_seconds
+        self._retry_at = 0.0
 
         # Rate limit configuration from settings
         self.normal_user_limits: dict[str, int] = {
@@ -54,6 +130,9 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         """
         Extract user_id and is_superuser from JWT token.
 
+        Valid claims are cached on request.state.token_claims as
+        (token, payload) for app.api.deps.
+
         Returns:
             (user_id, is_superuser) tuple, or (None, False) if no valid token
         """
@@ -63,13 +142,15 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
 
         token = auth_header.replace("Bearer ", "")
         try:
-            payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
-            user_id = payload.get("sub")
-            is_superuser = payload.get("is_superuser", False)
-            return user_id, is_superuser
-        except (jwt.DecodeError, jwt.ExpiredSignatureError, KeyError):
+            payload = jwt.decode(
+                token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
+            )
+        except jwt.InvalidTokenError:
             return None, False
 
+        request.state.token_claims = (token, payload)
+        return payload.get("sub"), payload.get("is_superuser", False)
+
     def get_rate_limits(self, is_superuser: bool) -> dict[str, int]:
         """Get rate limits based on user role."""
         if is_superuser:
@@ -79,56 +160,59 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
             }
         return self.normal_user_limits
 
-    def check_rate_limit(
-        self, user_id: str, window: str, limit: int
-    ) -> tuple[bool, int, int]:
+    async def check_rate_limit(
+        self, user_id: str, limits: dict[str, int]
+    ) -> tuple[bool, dict[str, WindowState]]:
         """
-        Check if user is within rate limit for given window.
+        Check and count a request against all windows in one script call.
 
         Args:
             user_id: User identifier
-            window: Time window ("minute" or "hour")
-            limit: Maximum requests allowed in window
+            limits: Window name ("minute" or "hour") -> maximum requests
 
         Returns:
-            (allowed, remaining, reset_time) tuple
-            - allowed: True if request is allowed
-            - remaining: Requests remaining in window
-            - reset_time: Unix timestamp when limit resets
+            (allowed, states) tuple
+            - allowed: True if every window allows the request
+            - states: Window name -> WindowState
         """
-        current_time = int(time.time())
-
-        # Calculate window parameters
-        if window == "minute":
-            window_size = 60
-            window_start = current_time - (current_time % 60)
-        elif window == "hour":
-            window_size = 3600
-            window_start = current_time - (current_time % 3600)
-        else:
-            raise ValueError(f"Invalid window: {window}")
-
-        reset_time = window_start + window_size
-        key = f"rate_limit:{user_id}:{window}:{window_start}"
-
-        # Increment counter atomically
-        try:
-            count = self.redis_client.incr(key)
+        for window in limits:
+            if window not in WINDOWS:
+                raise ValueError(f"Invalid window: {window}")
 
-            # Set expiration on first request of window
-            if count == 1:
-                self.redis_client.expire(key, window_size)
+        now = time.time()
+        if now < self._retry_at:
+            return True, self._unlimited(limits, now)
 
-            # Check if limit exceeded
-            allowed = count <= limit
-            remaining = max(0, limit - count)
+        keys = [f"rate_limit:{user_id}:{window}" for window in limits]
+        args: list[int] = []
+        for window, limit in limits.items():
+            args += [limit, WINDOWS[window] * 1000]
 
-            return allowed, remaining, reset_time
+        try:
+            result = await self._script(keys=keys, args=args)
+        except RedisError as e:
+            # If Redis fails, allow requests but don't enforce limits
+            self._retry_at = now + self.retry_seconds
+            logger.warning(f"Rate limiting unavailable, allowing requests: {e}")
+            return True, self._unlimited(limits, now)
+
+        states = {}
+        for i, (window, limit) in enumerate(limits.items()):
+            remaining, reset_ms, retry_ms = result[1 + 3 * i : 4 + 3 * i]
+            states[window] = WindowState(
+                limit=limit,
+                remaining=int(remaining),
+                reset_time=int(now) + math.ceil(int(reset_ms) / 1000),
+                retry_after=math.ceil(int(retry_ms) / 1000),
+            )
+        return bool(result[0]), states
 
-        except redis.RedisError:
-            # If Redis fails, allow request but don't enforce limits
-            # Log error in production
-            return True, limit, reset_time
+    @staticmethod
+    def _unlimited(limits: dict[str, int], now: float) -> dict[str, WindowState]:
+        return {
+            window: WindowState(limit, limit, int(now) + WINDOWS[window], 0)
+            for window, limit in limits.items()
+        }
 
     async def dispatch(
         self, request: Request, call_next: RequestResponseEndpoint
@@ -146,43 +230,22 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         if not user_id:
             return await call_next(request)
 
-        # Get rate limits for user role
-        limits = self.get_rate_limits(is_superuser)
-
-        # Check both minute and hour limits
-        minute_allowed, minute_remaining, minute_reset = self.check_rate_limit(
-            user_id, "minute", limits["minute"]
+        # Check minute and hour limits for the user role
+        allowed, states = await self.check_rate_limit(
+            user_id, self.get_rate_limits(is_superuser)
         )
-        hour_allowed, hour_remaining, hour_reset = self.check_rate_limit(
-            user_id, "hour", limits["hour"]
-        )
-
-        # Use the most restrictive limit
-        if not minute_allowed:
-            # Rate limit exceeded for minute window
-            retry_after = minute_reset - int(time.time())
-            return JSONResponse(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                content={"detail": "Rate limit exceeded. Please try again later."},
-                headers={
-                    "X-RateLimit-Limit": str(limits["minute"]),
-                    "X-RateLimit-Remaining": "0",
-                    "X-RateLimit-Reset": str(minute_reset),
-                    "Retry-After": str(retry_after),
-                },
-            )
 
-        if not hour_allowed:
-            # Rate limit exceeded for hour window
-            retry_after = hour_reset - int(time.time())
+        if not allowed:
+            # Report the window that blocks the request the longest
+            blocked = max(states.values(), key=lambda state: state.retry_after)
             return JSONResponse(
                 status_code=status.HTTP_429_TOO_MANY_REQUESTS,
                 content={"detail": "Rate limit exceeded. Please try again later."},
                 headers={
-                    "X-RateLimit-Limit": str(limits["hour"]),
+                    "X-RateLimit-Limit": str(blocked.limit),
                     "X-RateLimit-Remaining": "0",
-                    "X-RateLimit-Reset": str(hour_reset),
-                    "Retry-After": str(retry_after),
+                    "X-RateLimit-Reset": str(blocked.reset_time),
+                    "Retry-After": str(max(1, blocked.retry_after)),
                 },
             )
 
@@ -190,8 +253,9 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         response = await call_next(request)
 
         # Add rate limit headers to response
-        response.headers["X-RateLimit-Limit"] = str(limits["minute"])
-        response.headers["X-RateLimit-Remaining"] = str(minute_remaining)
-        response.headers["X-RateLimit-Reset"] = str(minute_reset)
+        minute = states["minute"]
+        response.headers["X-RateLimit-Limit"] = str(minute.limit)
+        response.headers["X-RateLimit-Remaining"] = str(minute.remaining)
+        response.headers["X-RateLimit-Reset"] = str(minute.reset_time)
 
         return response
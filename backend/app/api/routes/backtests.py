@@ -1,10 +1,13 @@
 # mypy: ignore-errors
 """Backtest API endpoints."""
 
+import json
 from typing import Any
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException
+import numpy as np
+import pandas as pd
+from fastapi import APIRouter, HTTPException, Query
 from sqlmodel import desc, func, select
 
 from app.api.deps import CurrentUser, SessionDep
@@ -13,8 +16,15 @@ from app.models import (
     BacktestRunCreate,
     BacktestRunList,
     BacktestRunPublic,
+    EquityCurvePublic,
 )
 from app.services.trading.backtester import BacktestEngine
+from app.services.trading.equity_curve import (
+    EQUITY_CURVE_PREVIEW_POINTS,
+    MAX_EQUITY_CURVE_POINTS,
+    downsample_equity_curve,
+    unpack_equity_curve,
+)
 
 router = APIRouter()
 
@@ -45,12 +55,31 @@ def get_backtest(
     current_user: CurrentUser,
 ) -> Any:
     """Get a backtest by ID."""
-    backtest = session.get(BacktestRun, backtest_id)
-    if not backtest:
-        raise HTTPException(status_code=404, detail="Backtest not found")
-    if backtest.user_id != current_user.id:
-        raise HTTPException(status_code=403, detail="Not authorized")
-    return backtest
+    return _get_user_backtest(session, backtest_id, current_user)
+
+
+@router.get("/{backtest_id}/equity-curve", response_model=EquityCurvePublic)
+def get_backtest_equity_curve(
+    backtest_id: UUID,
+    session: SessionDep,
+    current_user: CurrentUser,
+    points: int = Query(EQUITY_CURVE_PREVIEW_POINTS, ge=2, le=MAX_EQUITY_CURVE_POINTS),
+) -> Any:
+    """Get a backtest's equity curve, LTTB-downsampled to at most `points`."""
+    backtest = _get_user_backtest(session, backtest_id, current_user)
+
+    if backtest.equity_curve_blob:
+        timestamps, equity = unpack_equity_curve(backtest.equity_curve_blob)
+    else:
+        # Runs stored before the packed format only have the JSON curve
+        curve = json.loads(backtest.equity_curve_json or "[]")
+        timestamps = pd.DatetimeIndex(
+            pd.to_datetime([p["timestamp"] for p in curve], utc=True, format="ISO8601")
+        ).asi8
+        equity = np.array([p["equity"] for p in curve], dtype=float)
+
+    data = downsample_equity_curve(timestamps, equity, points)
+    return EquityCurvePublic(data=data, count=len(data), total_points=len(equity))
 
 
 @router.get("", response_model=BacktestRunList)
@@ -77,3 +106,15 @@ def list_backtests(
     )
     backtests = session.exec(statement).all()
     return BacktestRunList(data=backtests, count=count)
+
+
+def _get_user_backtest(
+    session: SessionDep, backtest_id: UUID, current_user: CurrentUser
+) -> BacktestRun:
+    """Load a backtest owned by the current user or raise 404/403."""
+    backtest = session.get(BacktestRun, backtest_id)
+    if not backtest:
+        raise HTTPException(status_code=404, detail="Backtest not found")
+    if backtest.user_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return backtest
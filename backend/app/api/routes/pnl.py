@@ -273,7 +273,9 @@ def get_historical_pnl(
     """
     Get historical P&L data aggregated by time interval
 
-    Provides time-series P&L data for charting and trend analysis.
+    Provides time-series P&L data for charting and trend analysis. All buckets
+    are computed in a single pass over the user's realized trades, and
+    'month' buckets follow calendar months.
 
     Query Parameters:
     - start_date: Start date for historical data (required, ISO 8601 format)
@@ -18,6 +18,7 @@ from app.models import (
     RiskRuleUpdate,
     SystemSettingPublic,
 )
+from app.services.trading.risk_state import get_risk_state
 
 router = APIRouter()
 
@@ -53,6 +54,7 @@ def create_risk_rule(
     risk_rule = crud_risk.create_risk_rule(
         session=session, risk_rule_create=risk_rule_in
     )
+    get_risk_state().invalidate_rules()
     return risk_rule
 
 
@@ -74,6 +76,7 @@ def update_risk_rule(
     risk_rule = crud_risk.update_risk_rule(
         session=session, db_risk_rule=risk_rule, risk_rule_in=risk_rule_in
     )
+    get_risk_state().invalidate_rules()
     return risk_rule
 
 
@@ -89,6 +92,7 @@ def delete_risk_rule(
     if not risk_rule:
         raise HTTPException(status_code=404, detail="Risk rule not found")
     crud_risk.delete_risk_rule(session=session, db_risk_rule=risk_rule)
+    get_risk_state().invalidate_rules()
     return Message(message="Risk rule deleted successfully")
 
 
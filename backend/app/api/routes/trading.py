@@ -41,7 +41,7 @@ async def place_order(
 
     # Submit to queue
     try:
-        await get_order_queue().submit(order.id)
+        await get_order_queue().submit(order.id, order.user_id, order.coin_type)
     except Exception as e:
         # Update order status to failed if submission fails
         order.status = "failed"
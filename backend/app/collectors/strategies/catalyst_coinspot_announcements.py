@@ -100,14 +100,14 @@ class CatalystCoinSpotAnnouncements(ICollector):
         )
 
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {"User-Agent": HTTP_USER_AGENT}
-                async with session.get(
-                    url,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=10),
-                ) as resp:
-                    return resp.status == 200
+            session = self.http.aiohttp_session()
+            headers = {"User-Agent": HTTP_USER_AGENT}
+            async with session.get(
+                url,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=10),
+            ) as resp:
+                return resp.status == 200
         except Exception as e:
             logger.error(f"Failed to test CoinSpot connection: {e}")
             return False
@@ -125,19 +125,19 @@ class CatalystCoinSpotAnnouncements(ICollector):
         announcements = []
 
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {"User-Agent": HTTP_USER_AGENT}
-
-                async with session.get(
-                    url,
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=30),
-                ) as resp:
-                    if resp.status != 200:
-                        logger.error(f"Failed to fetch page: status {resp.status}")
-                        return []
-
-                    content = await resp.text()
+            session = self.http.aiohttp_session()
+            headers = {"User-Agent": HTTP_USER_AGENT}
+
+            async with session.get(
+                url,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=30),
+            ) as resp:
+                if resp.status != 200:
+                    logger.error(f"Failed to fetch page: status {resp.status}")
+                    return []
+
+                content = await resp.text()
 
             # Parse HTML
             soup = BeautifulSoup(content, "html.parser")
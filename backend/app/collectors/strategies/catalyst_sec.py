@@ -82,15 +82,15 @@ class CatalystSEC(ICollector):
     async def test_connection(self, config: dict[str, Any]) -> bool:
         """Test connectivity to SEC API."""
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {"User-Agent": HTTP_USER_AGENT}
-                # Test with a known CIK
-                async with session.get(
-                    "https://data.sec.gov/submissions/CIK0001679788.json",
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=10),
-                ) as resp:
-                    return resp.status == 200
+            session = self.http.aiohttp_session()
+            headers = {"User-Agent": HTTP_USER_AGENT}
+            # Test with a known CIK
+            async with session.get(
+                "https://data.sec.gov/submissions/CIK0001679788.json",
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=10),
+            ) as resp:
+                return resp.status == 200
         except Exception as e:
             logger.error(f"Failed to test SEC connection: {e}")
             return False
@@ -102,105 +102,101 @@ class CatalystSEC(ICollector):
 
         all_filings = []
 
-        async with aiohttp.ClientSession() as session:
-            headers = {"User-Agent": HTTP_USER_AGENT}
+        session = self.http.aiohttp_session()
+        headers = {"User-Agent": HTTP_USER_AGENT}
 
-            for cik in companies:
-                try:
-                    # Pad CIK to 10 digits
-                    padded_cik = cik.zfill(10)
-                    company_name = self.MONITORED_COMPANIES.get(cik, "Unknown")
-
-                    url = f"https://data.sec.gov/submissions/CIK{padded_cik}.json"
-
-                    async with session.get(
-                        url,
-                        headers=headers,
-                        timeout=aiohttp.ClientTimeout(total=30),
-                    ) as resp:
-                        if resp.status != 200:
-                            logger.warning(
-                                f"Failed to fetch {company_name}: status {resp.status}"
-                            )
-                            continue
+        for cik in companies:
+            try:
+                # Pad CIK to 10 digits
+                padded_cik = cik.zfill(10)
+                company_name = self.MONITORED_COMPANIES.get(cik, "Unknown")
 
-                        company_data = await resp.json()
+                url = f"https://data.sec.gov/submissions/CIK{padded_cik}.json"
 
-                    if not company_data or "filings" not in company_data:
-                        logger.warning(f"No filings data for {company_name}")
+                async with session.get(
+                    url,
+                    headers=headers,
+                    timeout=aiohttp.ClientTimeout(total=30),
+                ) as resp:
+                    if resp.status != 200:
+                        logger.warning(
+                            f"Failed to fetch {company_name}: status {resp.status}"
+                        )
                         continue
 
-                    # Get the recent filings
-                    filings_data = company_data["filings"]
-                    if "recent" not in filings_data:
-                        logger.warning(f"No recent filings for {company_name}")
-                        continue
+                    company_data = await resp.json()
 
-                    recent_filings = filings_data["recent"]
+                if not company_data or "filings" not in company_data:
+                    logger.warning(f"No filings data for {company_name}")
+                    continue
 
-                    # Iterate through recent filings
-                    for _i, filing in enumerate(
-                        zip(
-                            recent_filings.get("form", []),
-                            recent_filings.get("filingDate", []),
-                            recent_filings.get("accessionNumber", []),
-                            strict=False,
-                        )
-                    ):
+                # Get the recent filings
+                filings_data = company_data["filings"]
+                if "recent" not in filings_data:
+                    logger.warning(f"No recent filings for {company_name}")
+                    continue
+
+                recent_filings = filings_data["recent"]
+
+                # Iterate through recent filings
+                for _i, filing in enumerate(
+                    zip(
+                        recent_filings.get("form", []),
+                        recent_filings.get("filingDate", []),
+                        recent_filings.get("accessionNumber", []),
+                        strict=False,
+                    )
+                ):
+                    try:
+                        form_type, filing_date, accession = filing
+
+                        # Only track filing types we care about
+                        if form_type not in self.FILING_TYPES:
+                            continue
+
+                        # Parse filing date
                         try:
-                            form_type, filing_date, accession = filing
-
-                            # Only track filing types we care about
-                            if form_type not in self.FILING_TYPES:
-                                continue
-
-                            # Parse filing date
-                            try:
-                                filing_datetime = datetime.strptime(
-                                    filing_date, "%Y-%m-%d"
-                                ).replace(tzinfo=timezone.utc)
-                            except Exception:
-                                continue
-
-                            # Skip old filings (older than 30 days)
-                            if datetime.now(timezone.utc) - filing_datetime > timedelta(
-                                days=30
-                            ):
-                                continue
-
-                            filing_info = self.FILING_TYPES[form_type]
-                            currencies = self.COMPANY_CRYPTO_MAP.get(
-                                company_name, ["BTC"]
-                            )
-
-                            # Create CatalystEvents instance
-                            data_point = CatalystEvents(
-                                event_type=form_type,
-                                title=f"{company_name} {filing_info['name']} (Form {form_type})",
-                                description=f"SEC filing: {filing_date}",
-                                source="SEC EDGAR",
-                                currencies=currencies,
-                                impact_score=filing_info["impact"],
-                                detected_at=filing_datetime,
-                                url=f"https://www.sec.gov/cgi-bin/browse-edgar?action=getcompany&CIK={cik}&type={form_type}",
-                                collected_at=datetime.now(timezone.utc),
-                            )
-
-                            all_filings.append(data_point)
-                            logger.debug(
-                                f"Collected {form_type} filing for {company_name}"
-                            )
-
-                        except Exception as e:
-                            logger.debug(f"Failed to parse filing: {e}")
+                            filing_datetime = datetime.strptime(
+                                filing_date, "%Y-%m-%d"
+                            ).replace(tzinfo=timezone.utc)
+                        except Exception:
                             continue
 
-                    # Wait between requests to respect rate limits
-                    await asyncio.sleep(0.2)
+                        # Skip old filings (older than 30 days)
+                        if datetime.now(timezone.utc) - filing_datetime > timedelta(
+                            days=30
+                        ):
+                            continue
 
-                except Exception as e:
-                    logger.error(f"Failed to collect filings for {company_name}: {e}")
-                    continue
+                        filing_info = self.FILING_TYPES[form_type]
+                        currencies = self.COMPANY_CRYPTO_MAP.get(company_name, ["BTC"])
+
+                        # Create CatalystEvents instance
+                        data_point = CatalystEvents(
+                            event_type=form_type,
+                            title=f"{company_name} {filing_info['name']} (Form {form_type})",
+                            description=f"SEC filing: {filing_date}",
+                            source="SEC EDGAR",
+                            currencies=currencies,
+                            impact_score=filing_info["impact"],
+                            detected_at=filing_datetime,
+                            url=f"https://www.sec.gov/cgi-bin/browse-edgar?action=getcompany&CIK={cik}&type={form_type}",
+                            collected_at=datetime.now(timezone.utc),
+                        )
+
+                        all_filings.append(data_point)
+                        logger.debug(f"Collected {form_type} filing for {company_name}")
+
+                    except Exception as e:
+                        logger.debug(f"Failed to parse filing: {e}")
+                        continue
+
+                # Wait between requests to respect rate limits
+                await asyncio.sleep(0.2)
+
+            except Exception as e:
+                logger.error(f"Failed to collect filings for {company_name}: {e}")
+                continue
 
         logger.info(f"Collected {len(all_filings)} SEC filings")
         return all_filings
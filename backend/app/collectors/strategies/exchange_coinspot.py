@@ -4,12 +4,12 @@ from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Any
 
-import httpx
-from bs4 import BeautifulSoup
-
 from app.core.collectors.base import ICollector
+from app.core.collectors.parsing import parse_rows
 from app.core.collectors.registry import CollectorRegistry
 from app.models import PriceData5Min
+from app.services.trading.events import get_event_publisher
+from app.services.trading.price_cache import get_price_cache
 
 logger = logging.getLogger(__name__)
 
@@ -43,11 +43,10 @@ class CoinspotExchangeCollector(ICollector):
         # Test by fetching the public API which is always available
         url = "https://www.coinspot.com.au/pubapi/v2/latest"
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(url)
-                response.raise_for_status()
-                data = response.json()
-                return bool(data.get("status") == "ok")
+            response = await self.http.httpx_client().get(url, timeout=10.0)
+            response.raise_for_status()
+            data = response.json()
+            return bool(data.get("status") == "ok")
         except Exception as e:
             logger.error(f"Connection test failed: {e}")
             return False
@@ -100,59 +99,61 @@ class CoinspotExchangeCollector(ICollector):
                 logger.warning(f"Failed to parse coin data for {coin}: {e}")
                 continue
 
+        # Publish to the in-process latest-price cache used by trading and P&L
+        get_price_cache().update_many(results)
+        # ...and to other processes (hard-stop watcher)
+        await get_event_publisher().publish_prices(
+            {item.coin_type: item.last for item in results}, now
+        )
+
         logger.info(f"Collected {len(results)} price records from Coinspot.")
         return results
 
     async def _fetch_public_prices(self, timeout: float) -> dict[str, Any] | None:
         url = "https://www.coinspot.com.au/pubapi/v2/latest"
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            data = response.json()
-            if data.get("status") == "ok":
-                prices = data.get("prices", {})
-                return dict(prices) if isinstance(prices, dict) else {}
+        response = await self.http.httpx_client().get(url, timeout=timeout)
+        response.raise_for_status()
+        data = response.json()
+        if data.get("status") == "ok":
+            prices = data.get("prices", {})
+            return dict(prices) if isinstance(prices, dict) else {}
         return None
 
     async def _fetch_scraped_prices(self, timeout: float) -> dict[str, Any] | None:
         url = "https://www.coinspot.com.au/tradecoins"
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.get(url)
-            response.raise_for_status()
-            html = response.text
-
-            soup = BeautifulSoup(html, "html.parser")
-            coin_rows = soup.find_all("tr", attrs={"data-coin": True})
-
-            prices = {}
-            for row in coin_rows:
-                coin_data = row.get("data-coin", "")
-                coin_symbol = coin_data.upper() if isinstance(coin_data, str) else ""
-                if not coin_symbol or coin_symbol == "AUD":
-                    continue
-
-                try:
-                    tds = row.find_all("td")
-                    if len(tds) >= 4:
-                        # Index 2 is Buy, Index 3 is Sell
-                        buy_val = tds[2].get("data-value")
-                        sell_val = tds[3].get("data-value")
-
-                        if isinstance(buy_val, str) and isinstance(sell_val, str):
-                            buy_price = float(buy_val)
-                            sell_price = float(sell_val)
-
-                            if buy_price > 0 and sell_price > 0:
-                                last_price = (buy_price + sell_price) / 2
-                                prices[coin_symbol.lower()] = {
-                                    "bid": buy_price,
-                                    "ask": sell_price,
-                                    "last": last_price,
-                                }
-                except Exception:
-                    continue
-
-            return prices if prices else None
+        response = await self.http.httpx_client().get(url, timeout=timeout)
+        response.raise_for_status()
+
+        # Rows are <tr data-coin="btc"> with prices in the data-value of each cell
+        rows = await parse_rows(response.content, "data-coin", "data-value")
+
+        prices = {}
+        for coin_data, values in rows:
+            coin_symbol = coin_data.upper()
+            if not coin_symbol or coin_symbol == "AUD":
+                continue
+
+            try:
+                if len(values) >= 4:
+                    # Index 2 is Buy, Index 3 is Sell
+                    buy_val = values[2]
+                    sell_val = values[3]
+
+                    if buy_val is not None and sell_val is not None:
+                        buy_price = float(buy_val)
+                        sell_price = float(sell_val)
+
+                        if buy_price > 0 and sell_price > 0:
+                            last_price = (buy_price + sell_price) / 2
+                            prices[coin_symbol.lower()] = {
+                                "bid": buy_price,
+                                "ask": sell_price,
+                                "last": last_price,
+                            }
+            except Exception:
+                continue
+
+        return prices if prices else None
 
 
 CollectorRegistry.register(CoinspotExchangeCollector)
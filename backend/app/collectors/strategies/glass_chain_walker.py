@@ -89,24 +89,24 @@ class GlassChainWalker(ICollector):
                 timeout = httpx.Timeout(
                     CONNECTION_TIMEOUT_SECONDS, connect=CONNECTION_TIMEOUT_SECONDS
                 )
-                async with httpx.AsyncClient(timeout=timeout) as client:
-                    if chain == "ethereum":
-                        payload = {
-                            "jsonrpc": "2.0",
-                            "method": "eth_blockNumber",
-                            "params": [],
-                            "id": 1,
-                        }
-                    else:
-                        payload = {
-                            "jsonrpc": "2.0",
-                            "id": 1,
-                            "method": "getBlockHeight",
-                        }
-                    response = await client.post(rpc_url, json=payload)
-                    response.raise_for_status()
-                    logger.info("Connection test succeeded via %s", rpc_url)
-                    return True
+                client = self.http.httpx_client()
+                if chain == "ethereum":
+                    payload = {
+                        "jsonrpc": "2.0",
+                        "method": "eth_blockNumber",
+                        "params": [],
+                        "id": 1,
+                    }
+                else:
+                    payload = {
+                        "jsonrpc": "2.0",
+                        "id": 1,
+                        "method": "getBlockHeight",
+                    }
+                response = await client.post(rpc_url, json=payload, timeout=timeout)
+                response.raise_for_status()
+                logger.info("Connection test succeeded via %s", rpc_url)
+                return True
             except (
                 httpx.ConnectError,
                 httpx.TimeoutException,
@@ -135,23 +135,23 @@ class GlassChainWalker(ICollector):
                 timeout = httpx.Timeout(
                     CONNECTION_TIMEOUT_SECONDS, connect=CONNECTION_TIMEOUT_SECONDS
                 )
-                async with httpx.AsyncClient(timeout=timeout) as client:
-                    results: list[dict[str, Any]] = []
-                    for payload in payloads:
-                        resp = await client.post(rpc_url, json=payload)
-                        resp.raise_for_status()
-                        data = resp.json()
-                        if (
-                            not isinstance(data, dict)
-                            or "error" in data
-                            or "result" not in data
-                        ):
-                            raise ValueError(
-                                f"RPC error from {rpc_url}: {data.get('error', 'no result key') if isinstance(data, dict) else data}"
-                            )
-                        results.append(data)
-                    logger.info("RPC calls succeeded via %s for %s", rpc_url, chain)
-                    return results
+                client = self.http.httpx_client()
+                results: list[dict[str, Any]] = []
+                for payload in payloads:
+                    resp = await client.post(rpc_url, json=payload, timeout=timeout)
+                    resp.raise_for_status()
+                    data = resp.json()
+                    if (
+                        not isinstance(data, dict)
+                        or "error" in data
+                        or "result" not in data
+                    ):
+                        raise ValueError(
+                            f"RPC error from {rpc_url}: {data.get('error', 'no result key') if isinstance(data, dict) else data}"
+                        )
+                    results.append(data)
+                logger.info("RPC calls succeeded via %s for %s", rpc_url, chain)
+                return results
             except (
                 httpx.ConnectError,
                 httpx.TimeoutException,
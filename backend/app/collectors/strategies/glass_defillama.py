@@ -99,12 +99,12 @@ class GlassDefiLlama(ICollector):
     async def test_connection(self, config: dict[str, Any]) -> bool:
         """Test connectivity to DeFiLlama API."""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    "https://api.llama.fi/protocols",
-                    timeout=aiohttp.ClientTimeout(total=10),
-                ) as resp:
-                    return resp.status == 200
+            session = self.http.aiohttp_session()
+            async with session.get(
+                "https://api.llama.fi/protocols",
+                timeout=aiohttp.ClientTimeout(total=10),
+            ) as resp:
+                return resp.status == 200
         except Exception as e:
             logger.error(f"Failed to test DeFiLlama connection: {e}")
             return False
@@ -144,72 +144,72 @@ class GlassDefiLlama(ICollector):
         """Inner collection loop, separated so wait_for can wrap it."""
         base_url = "https://api.llama.fi"
 
-        async with aiohttp.ClientSession() as session:
-            for protocol_slug in protocols:
+        session = self.http.aiohttp_session()
+        for protocol_slug in protocols:
+            try:
+                await asyncio.sleep(rate_limit_delay)
+
+                # Fetch protocol TVL data
+                async with session.get(
+                    f"{base_url}/protocol/{protocol_slug}",
+                    timeout=aiohttp.ClientTimeout(total=10),
+                ) as resp:
+                    if resp.status != 200:
+                        logger.warning(
+                            f"Failed to fetch {protocol_slug}: status {resp.status}"
+                        )
+                        continue
+
+                    protocol_data = await resp.json()
+
+                # Extract current TVL
+                tvl = protocol_data.get("tvl")
+                if tvl is None or len(tvl) == 0:
+                    logger.warning(f"No TVL data for {protocol_slug}")
+                    continue
+
+                # Get the most recent TVL value
+                latest_tvl = tvl[-1] if isinstance(tvl, list) else tvl
+                current_tvl = (
+                    latest_tvl.get("totalLiquidityUSD")
+                    if isinstance(latest_tvl, dict)
+                    else latest_tvl
+                )
+
+                # Try to get fees/revenue data
+                fees_24h = None
+                revenue_24h = None
+
                 try:
                     await asyncio.sleep(rate_limit_delay)
-
-                    # Fetch protocol TVL data
                     async with session.get(
-                        f"{base_url}/protocol/{protocol_slug}",
+                        f"{base_url}/summary/fees/{protocol_slug}",
                         timeout=aiohttp.ClientTimeout(total=10),
                     ) as resp:
-                        if resp.status != 200:
-                            logger.warning(
-                                f"Failed to fetch {protocol_slug}: status {resp.status}"
-                            )
-                            continue
-
-                        protocol_data = await resp.json()
-
-                    # Extract current TVL
-                    tvl = protocol_data.get("tvl")
-                    if tvl is None or len(tvl) == 0:
-                        logger.warning(f"No TVL data for {protocol_slug}")
-                        continue
-
-                    # Get the most recent TVL value
-                    latest_tvl = tvl[-1] if isinstance(tvl, list) else tvl
-                    current_tvl = (
-                        latest_tvl.get("totalLiquidityUSD")
-                        if isinstance(latest_tvl, dict)
-                        else latest_tvl
-                    )
-
-                    # Try to get fees/revenue data
-                    fees_24h = None
-                    revenue_24h = None
-
-                    try:
-                        await asyncio.sleep(rate_limit_delay)
-                        async with session.get(
-                            f"{base_url}/summary/fees/{protocol_slug}",
-                            timeout=aiohttp.ClientTimeout(total=10),
-                        ) as resp:
-                            if resp.status == 200:
-                                fees_data = await resp.json()
-                                if fees_data and "total24h" in fees_data:
-                                    fees_24h = fees_data["total24h"]
-                                if fees_data and "totalRevenue24h" in fees_data:
-                                    revenue_24h = fees_data["totalRevenue24h"]
-                    except Exception as e:
-                        logger.debug(f"No fees data for {protocol_slug}: {e}")
-
-                    # Create ProtocolFundamentals instance
-                    data_point = ProtocolFundamentals(
-                        protocol=protocol_slug,
-                        tvl_usd=Decimal(str(current_tvl)) if current_tvl else None,
-                        fees_24h=Decimal(str(fees_24h)) if fees_24h else None,
-                        revenue_24h=Decimal(str(revenue_24h)) if revenue_24h else None,
-                        collected_at=datetime.now(timezone.utc),
-                    )
-
-                    all_data.append(data_point)
-                    logger.debug(f"Collected data for {protocol_slug}")
-
+                        if resp.status == 200:
+                            fees_data = await resp.json()
+                            if fees_data and "total24h" in fees_data:
+                                fees_24h = fees_data["total24h"]
+                            if fees_data and "totalRevenue24h" in fees_data:
+                                revenue_24h = fees_data["totalRevenue24h"]
                 except Exception as e:
-                    logger.error(f"Failed to collect data for {protocol_slug}: {e}")
-                    continue
+                    logger.debug(f"No fees data for {protocol_slug}: {e}")
+
+                # Create ProtocolFundamentals instance
+                data_point = ProtocolFundamentals(
+                    protocol=protocol_slug,
+                    tvl_usd=Decimal(str(current_tvl)) if current_tvl else None,
+                    fees_24h=Decimal(str(fees_24h)) if fees_24h else None,
+                    revenue_24h=Decimal(str(revenue_24h)) if revenue_24h else None,
+                    collected_at=datetime.now(timezone.utc),
+                )
+
+                all_data.append(data_point)
+                logger.debug(f"Collected data for {protocol_slug}")
+
+            except Exception as e:
+                logger.error(f"Failed to collect data for {protocol_slug}: {e}")
+                continue
 
 
 # Register the collector
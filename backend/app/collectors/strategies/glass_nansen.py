@@ -121,30 +121,28 @@ class GlassNansen(ICollector):
             return False
 
         try:
-            timeout = httpx.Timeout(REQUEST_TIMEOUT, connect=REQUEST_TIMEOUT)
-            async with httpx.AsyncClient(timeout=timeout) as client:
-                response = await client.post(
-                    f"{NANSEN_BASE_URL}/smart-money/netflow",
-                    headers={"apikey": api_key},
-                    json={
-                        "chains": ["ethereum"],
-                        "filters": {
-                            "include_smart_money_labels": ["Fund", "Smart Trader"],
-                            "include_stablecoins": False,
-                        },
-                        "pagination": {"page": 1, "per_page": 1},
-                        "order_by": [
-                            {"field": "net_flow_24h_usd", "direction": "DESC"}
-                        ],
+            client = self.http.httpx_client()
+            response = await client.post(
+                f"{NANSEN_BASE_URL}/smart-money/netflow",
+                headers={"apikey": api_key},
+                timeout=REQUEST_TIMEOUT,
+                json={
+                    "chains": ["ethereum"],
+                    "filters": {
+                        "include_smart_money_labels": ["Fund", "Smart Trader"],
+                        "include_stablecoins": False,
                     },
-                )
-                if response.status_code == 200:
-                    logger.info("Nansen API connection test succeeded")
-                    return True
-                logger.warning(
-                    "Nansen API connection test failed: status %d", response.status_code
-                )
-                return False
+                    "pagination": {"page": 1, "per_page": 1},
+                    "order_by": [{"field": "net_flow_24h_usd", "direction": "DESC"}],
+                },
+            )
+            if response.status_code == 200:
+                logger.info("Nansen API connection test succeeded")
+                return True
+            logger.warning(
+                "Nansen API connection test failed: status %d", response.status_code
+            )
+            return False
         except Exception as e:
             logger.error("Failed to test Nansen connection: %s", e)
             return False
@@ -200,60 +198,53 @@ class GlassNansen(ICollector):
         all_data: list[Any],
     ) -> None:
         """Inner collection loop, separated so wait_for can wrap it."""
-        timeout = httpx.Timeout(REQUEST_TIMEOUT, connect=REQUEST_TIMEOUT)
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            for chain in chains:
-                page = 1
-                while page <= MAX_PAGES:
-                    try:
-                        if page > 1:
-                            await asyncio.sleep(rate_limit_delay)
-
-                        response_data = await self._fetch_page(
-                            client, api_key, chain, page
-                        )
-                        if response_data is None:
-                            break
-
-                        items = response_data.get("data", [])
-                        collected_at = datetime.now(timezone.utc)
-
-                        for item in items:
-                            symbol = (item.get("token_symbol") or "").upper()
-                            if symbol not in tracked_tokens:
-                                continue
-
-                            net_flow = item.get("net_flow_24h_usd", 0.0)
-                            trader_count = item.get("trader_count", 0)
-
-                            flow = SmartMoneyFlow(
-                                token=symbol,
-                                net_flow_usd=Decimal(str(net_flow)),
-                                buying_wallet_count=(
-                                    trader_count if net_flow > 0 else 0
-                                ),
-                                selling_wallet_count=(
-                                    trader_count if net_flow < 0 else 0
-                                ),
-                                buying_wallets=None,
-                                selling_wallets=None,
-                                collected_at=collected_at,
-                            )
-                            all_data.append(flow)
-
-                        pagination = response_data.get("pagination", {})
-                        if pagination.get("is_last_page", True):
-                            break
-                        page += 1
-
-                    except Exception as e:
-                        logger.error(
-                            "Failed to collect Nansen data for chain=%s page=%d: %s",
-                            chain,
-                            page,
-                            e,
+        client = self.http.httpx_client()
+        for chain in chains:
+            page = 1
+            while page <= MAX_PAGES:
+                try:
+                    if page > 1:
+                        await asyncio.sleep(rate_limit_delay)
+
+                    response_data = await self._fetch_page(client, api_key, chain, page)
+                    if response_data is None:
+                        break
+
+                    items = response_data.get("data", [])
+                    collected_at = datetime.now(timezone.utc)
+
+                    for item in items:
+                        symbol = (item.get("token_symbol") or "").upper()
+                        if symbol not in tracked_tokens:
+                            continue
+
+                        net_flow = item.get("net_flow_24h_usd", 0.0)
+                        trader_count = item.get("trader_count", 0)
+
+                        flow = SmartMoneyFlow(
+                            token=symbol,
+                            net_flow_usd=Decimal(str(net_flow)),
+                            buying_wallet_count=(trader_count if net_flow > 0 else 0),
+                            selling_wallet_count=(trader_count if net_flow < 0 else 0),
+                            buying_wallets=None,
+                            selling_wallets=None,
+                            collected_at=collected_at,
                         )
+                        all_data.append(flow)
+
+                    pagination = response_data.get("pagination", {})
+                    if pagination.get("is_last_page", True):
                         break
+                    page += 1
+
+                except Exception as e:
+                    logger.error(
+                        "Failed to collect Nansen data for chain=%s page=%d: %s",
+                        chain,
+                        page,
+                        e,
+                    )
+                    break
 
     async def _fetch_page(
         self,
@@ -279,6 +270,7 @@ class GlassNansen(ICollector):
                 f"{NANSEN_BASE_URL}/smart-money/netflow",
                 headers={"apikey": api_key},
                 json=body,
+                timeout=REQUEST_TIMEOUT,
             )
 
             if response.status_code == 200:
@@ -109,19 +109,19 @@ class SnapshotGovernanceCollector(ICollector):
     async def test_connection(self, config: dict[str, Any]) -> bool:
         """Test connectivity to Snapshot GraphQL API."""
         try:
-            async with aiohttp.ClientSession() as session:
-                payload = {
-                    "query": '{ proposals(first: 1, where: { space: "uniswap" }) { id } }'
-                }
-                async with session.post(
-                    GRAPHQL_ENDPOINT,
-                    json=payload,
-                    timeout=aiohttp.ClientTimeout(total=10),
-                ) as resp:
-                    if resp.status != 200:
-                        return False
-                    data = await resp.json()
-                    return "data" in data
+            session = self.http.aiohttp_session()
+            payload = {
+                "query": '{ proposals(first: 1, where: { space: "uniswap" }) { id } }'
+            }
+            async with session.post(
+                GRAPHQL_ENDPOINT,
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=10),
+            ) as resp:
+                if resp.status != 200:
+                    return False
+                data = await resp.json()
+                return "data" in data
         except Exception as e:
             logger.error(f"Failed to test Snapshot connection: {e}")
             return False
@@ -204,39 +204,37 @@ class SnapshotGovernanceCollector(ICollector):
         all_events: list[CatalystEvents] = []
         seen_ids: set[str] = set()
 
-        async with aiohttp.ClientSession() as session:
-            # Fetch active proposals
-            try:
-                active_proposals = await self._fetch_proposals(
-                    session, spaces, state="active"
-                )
-                logger.info(f"Fetched {len(active_proposals)} active proposals")
-                for proposal in active_proposals:
-                    pid = proposal.get("id", "")
-                    if pid in seen_ids:
-                        continue
-                    seen_ids.add(pid)
-                    all_events.append(self._proposal_to_catalyst(proposal))
-            except Exception as e:
-                logger.error(f"Failed to fetch active proposals: {e}")
-
-            # Fetch recently closed proposals (last 7 days)
-            try:
-                seven_days_ago = int(time.time()) - (7 * 24 * 3600)
-                closed_proposals = await self._fetch_proposals(
-                    session, spaces, state="closed", created_gte=seven_days_ago
-                )
-                logger.info(
-                    f"Fetched {len(closed_proposals)} recently closed proposals"
-                )
-                for proposal in closed_proposals:
-                    pid = proposal.get("id", "")
-                    if pid in seen_ids:
-                        continue
-                    seen_ids.add(pid)
-                    all_events.append(self._proposal_to_catalyst(proposal))
-            except Exception as e:
-                logger.error(f"Failed to fetch closed proposals: {e}")
+        session = self.http.aiohttp_session()
+        # Fetch active proposals
+        try:
+            active_proposals = await self._fetch_proposals(
+                session, spaces, state="active"
+            )
+            logger.info(f"Fetched {len(active_proposals)} active proposals")
+            for proposal in active_proposals:
+                pid = proposal.get("id", "")
+                if pid in seen_ids:
+                    continue
+                seen_ids.add(pid)
+                all_events.append(self._proposal_to_catalyst(proposal))
+        except Exception as e:
+            logger.error(f"Failed to fetch active proposals: {e}")
+
+        # Fetch recently closed proposals (last 7 days)
+        try:
+            seven_days_ago = int(time.time()) - (7 * 24 * 3600)
+            closed_proposals = await self._fetch_proposals(
+                session, spaces, state="closed", created_gte=seven_days_ago
+            )
+            logger.info(f"Fetched {len(closed_proposals)} recently closed proposals")
+            for proposal in closed_proposals:
+                pid = proposal.get("id", "")
+                if pid in seen_ids:
+                    continue
+                seen_ids.add(pid)
+                all_events.append(self._proposal_to_catalyst(proposal))
+        except Exception as e:
+            logger.error(f"Failed to fetch closed proposals: {e}")
 
         logger.info(f"Collected {len(all_events)} Snapshot governance events")
         return all_events
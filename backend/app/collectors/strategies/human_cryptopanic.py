@@ -63,20 +63,20 @@ class CryptoPanicCollector(ICollector):
             logger.warning("CRYPTOPANIC_API_KEY not set — cannot connect")
             return False
         try:
-            async with aiohttp.ClientSession() as session:
-                params = {
-                    "auth_token": settings.CRYPTOPANIC_API_KEY,
-                    "filter": "important",
-                    "kind": "news",
-                    "public": "true",
-                    "currencies": "BTC",
-                }
-                async with session.get(
-                    self.API_BASE,
-                    params=params,
-                    timeout=aiohttp.ClientTimeout(total=10),
-                ) as resp:
-                    return resp.status == 200
+            session = self.http.aiohttp_session()
+            params = {
+                "auth_token": settings.CRYPTOPANIC_API_KEY,
+                "filter": "important",
+                "kind": "news",
+                "public": "true",
+                "currencies": "BTC",
+            }
+            async with session.get(
+                self.API_BASE,
+                params=params,
+                timeout=aiohttp.ClientTimeout(total=10),
+            ) as resp:
+                return resp.status == 200
         except Exception as e:
             logger.error(f"Failed to test CryptoPanic connection: {e}")
             return False
@@ -113,16 +113,16 @@ class CryptoPanicCollector(ICollector):
         all_items: list[SocialSentiment] = []
 
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    self.API_BASE,
-                    params=params,
-                    timeout=aiohttp.ClientTimeout(total=30),
-                ) as resp:
-                    if resp.status != 200:
-                        logger.warning(f"CryptoPanic API returned status {resp.status}")
-                        return []
-                    data = await resp.json()
+            session = self.http.aiohttp_session()
+            async with session.get(
+                self.API_BASE,
+                params=params,
+                timeout=aiohttp.ClientTimeout(total=30),
+            ) as resp:
+                if resp.status != 200:
+                    logger.warning(f"CryptoPanic API returned status {resp.status}")
+                    return []
+                data = await resp.json()
 
             results = data.get("results", [])
             logger.info(f"Fetched {len(results)} items from CryptoPanic")
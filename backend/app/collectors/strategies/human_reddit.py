@@ -141,14 +141,14 @@ class HumanReddit(ICollector):
 
     async def test_connection(self, config: dict[str, Any]) -> bool:
         try:
-            async with aiohttp.ClientSession() as session:
-                headers = {"User-Agent": HTTP_USER_AGENT}
-                async with session.get(
-                    "https://www.reddit.com/r/CryptoCurrency/hot.json",
-                    headers=headers,
-                    timeout=aiohttp.ClientTimeout(total=10),
-                ) as resp:
-                    return resp.status == 200
+            session = self.http.aiohttp_session()
+            headers = {"User-Agent": HTTP_USER_AGENT}
+            async with session.get(
+                "https://www.reddit.com/r/CryptoCurrency/hot.json",
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=10),
+            ) as resp:
+                return resp.status == 200
         except Exception as e:
             logger.error(f"Failed to test Reddit connection: {e}")
             return False
@@ -163,115 +163,115 @@ class HumanReddit(ICollector):
         all_posts: list[SocialSentiment] = []
         seen_urls: set[str] = set()
 
-        async with aiohttp.ClientSession() as session:
-            oauth_token = await self._get_oauth_token(session)
-            use_oauth = oauth_token is not None
-
-            if use_oauth:
-                base_url = "https://oauth.reddit.com"
-                headers = {
-                    "User-Agent": HTTP_USER_AGENT,
-                    "Authorization": f"Bearer {oauth_token}",
-                }
-                logger.info("Using Reddit OAuth API (1 req/sec)")
-            else:
-                base_url = "https://www.reddit.com"
-                headers = {"User-Agent": HTTP_USER_AGENT}
-                logger.info("Using Reddit public API (2s delay)")
-
-            for subreddit in subreddits:
-                try:
-                    await self._rate_limited_sleep(None, use_oauth)
-
-                    url = f"{base_url}/r/{subreddit}/hot.json"
-                    params: dict[str, int] = {"limit": limit, "raw_json": 1}
-
-                    async with session.get(
-                        url,
-                        headers=headers,
-                        params=params,
-                        timeout=aiohttp.ClientTimeout(total=30),
-                    ) as resp:
-                        if resp.status == 429:
-                            await self._rate_limited_sleep(resp, use_oauth)
-                            continue
-                        if resp.status != 200:
-                            logger.warning(
-                                f"Failed to fetch r/{subreddit}: status {resp.status}"
-                            )
-                            continue
-                        data = await resp.json()
+        session = self.http.aiohttp_session()
+        oauth_token = await self._get_oauth_token(session)
+        use_oauth = oauth_token is not None
+
+        if use_oauth:
+            base_url = "https://oauth.reddit.com"
+            headers = {
+                "User-Agent": HTTP_USER_AGENT,
+                "Authorization": f"Bearer {oauth_token}",
+            }
+            logger.info("Using Reddit OAuth API (1 req/sec)")
+        else:
+            base_url = "https://www.reddit.com"
+            headers = {"User-Agent": HTTP_USER_AGENT}
+            logger.info("Using Reddit public API (2s delay)")
+
+        for subreddit in subreddits:
+            try:
+                await self._rate_limited_sleep(None, use_oauth)
 
-                    if not data or "data" not in data or "children" not in data["data"]:
-                        logger.warning(f"No data returned for r/{subreddit}")
+                url = f"{base_url}/r/{subreddit}/hot.json"
+                params: dict[str, int] = {"limit": limit, "raw_json": 1}
+
+                async with session.get(
+                    url,
+                    headers=headers,
+                    params=params,
+                    timeout=aiohttp.ClientTimeout(total=30),
+                ) as resp:
+                    if resp.status == 429:
+                        await self._rate_limited_sleep(resp, use_oauth)
                         continue
+                    if resp.status != 200:
+                        logger.warning(
+                            f"Failed to fetch r/{subreddit}: status {resp.status}"
+                        )
+                        continue
+                    data = await resp.json()
 
-                    posts = data["data"]["children"]
-                    logger.info(f"Fetched {len(posts)} posts from r/{subreddit}")
-
-                    for post in posts:
-                        try:
-                            post_data = post.get("data", {})
-                            title = post_data.get("title", "")
-                            created_utc = post_data.get("created_utc")
-
-                            # Intra-run dedup by permalink
-                            permalink = post_data.get("permalink", "")
-                            if not permalink:
-                                continue
-                            post_url = f"https://reddit.com{permalink}"
-                            if post_url in seen_urls:
-                                continue
-                            seen_urls.add(post_url)
-
-                            # Parse publication timestamp
-                            published_at = None
-                            if created_utc:
-                                try:
-                                    published_at = datetime.fromtimestamp(
-                                        created_utc, tz=timezone.utc
-                                    )
-                                except Exception:
-                                    pass
-
-                            # Extract post body and comment count
-                            body = post_data.get("selftext") or None
-                            num_comments = post_data.get("num_comments", 0)
-
-                            # Fetch top comments for posts that have them
-                            top_comments = None
-                            if num_comments and num_comments > 0:
-                                top_comments = await self._fetch_top_comments(
-                                    session,
-                                    base_url,
-                                    headers,
-                                    permalink,
-                                    use_oauth,
-                                )
+                if not data or "data" not in data or "children" not in data["data"]:
+                    logger.warning(f"No data returned for r/{subreddit}")
+                    continue
 
-                            data_point = SocialSentiment(
-                                platform="reddit",
-                                content=title,
-                                author=post_data.get("author"),
-                                score=post_data.get("score"),
-                                sentiment=None,
-                                currencies=None,
-                                posted_at=published_at,
-                                collected_at=datetime.now(timezone.utc),
-                                body=body,
-                                comment_count=num_comments,
-                                top_comments=top_comments,
-                            )
+                posts = data["data"]["children"]
+                logger.info(f"Fetched {len(posts)} posts from r/{subreddit}")
 
-                            all_posts.append(data_point)
+                for post in posts:
+                    try:
+                        post_data = post.get("data", {})
+                        title = post_data.get("title", "")
+                        created_utc = post_data.get("created_utc")
 
-                        except Exception as e:
-                            logger.debug(f"Failed to parse Reddit post: {e}")
+                        # Intra-run dedup by permalink
+                        permalink = post_data.get("permalink", "")
+                        if not permalink:
+                            continue
+                        post_url = f"https://reddit.com{permalink}"
+                        if post_url in seen_urls:
                             continue
+                        seen_urls.add(post_url)
+
+                        # Parse publication timestamp
+                        published_at = None
+                        if created_utc:
+                            try:
+                                published_at = datetime.fromtimestamp(
+                                    created_utc, tz=timezone.utc
+                                )
+                            except Exception:
+                                pass
+
+                        # Extract post body and comment count
+                        body = post_data.get("selftext") or None
+                        num_comments = post_data.get("num_comments", 0)
+
+                        # Fetch top comments for posts that have them
+                        top_comments = None
+                        if num_comments and num_comments > 0:
+                            top_comments = await self._fetch_top_comments(
+                                session,
+                                base_url,
+                                headers,
+                                permalink,
+                                use_oauth,
+                            )
 
-                except Exception as e:
-                    logger.error(f"Failed to collect posts from r/{subreddit}: {e}")
-                    continue
+                        data_point = SocialSentiment(
+                            platform="reddit",
+                            content=title,
+                            author=post_data.get("author"),
+                            score=post_data.get("score"),
+                            sentiment=None,
+                            currencies=None,
+                            posted_at=published_at,
+                            collected_at=datetime.now(timezone.utc),
+                            body=body,
+                            comment_count=num_comments,
+                            top_comments=top_comments,
+                        )
+
+                        all_posts.append(data_point)
+
+                    except Exception as e:
+                        logger.debug(f"Failed to parse Reddit post: {e}")
+                        continue
+
+            except Exception as e:
+                logger.error(f"Failed to collect posts from r/{subreddit}: {e}")
+                continue
 
         logger.info(f"Collected {len(all_posts)} posts total")
         return all_posts
@@ -3,9 +3,9 @@ from email.utils import parsedate_to_datetime
 from typing import Any
 
 import aiohttp
-from bs4 import BeautifulSoup
 
 from app.core.collectors.base import ICollector
+from app.core.collectors.parsing import parse_rss
 from app.core.collectors.registry import CollectorRegistry
 from app.core.config import HTTP_USER_AGENT
 from app.models import NewsItem
@@ -14,6 +14,8 @@ logger = logging.getLogger(__name__)
 
 
 class CoinDeskCollector(ICollector):
+    RSS_URL = "https://www.coindesk.com/arc/outboundfeeds/rss/"
+
     @property
     def name(self) -> str:
         return "news_coindesk"
@@ -28,7 +30,7 @@ class CoinDeskCollector(ICollector):
             "properties": {
                 "rss_url": {
                     "type": "string",
-                    "default": "https://www.coindesk.com/arc/outboundfeeds/rss/",
+                    "default": self.RSS_URL,
                     "title": "RSS Feed URL",
                 },
                 "max_items": {
@@ -44,41 +46,41 @@ class CoinDeskCollector(ICollector):
         return "rss_url" in config and isinstance(config["rss_url"], str)
 
     async def test_connection(self, config: dict[str, Any]) -> bool:
-        url = config.get("rss_url", "https://www.coindesk.com/arc/outboundfeeds/rss/")
+        url = config.get("rss_url", self.RSS_URL)
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url,
-                    headers={"User-Agent": HTTP_USER_AGENT},
-                    timeout=aiohttp.ClientTimeout(total=10),
-                ) as response:
-                    return response.status == 200
+            session = self.http.aiohttp_session()
+            async with session.get(
+                url,
+                headers={"User-Agent": HTTP_USER_AGENT},
+                timeout=aiohttp.ClientTimeout(total=10),
+            ) as response:
+                return response.status == 200
         except Exception:
             return False
 
     async def collect(self, config: dict[str, Any]) -> list[Any]:
-        url = config.get("rss_url", "https://www.coindesk.com/arc/outboundfeeds/rss/")
+        url = config.get("rss_url", self.RSS_URL)
         limit = config.get("max_items", 10)
 
         results: list[Any] = []
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                url,
-                headers={"User-Agent": "OhMyCoins/1.0"},
-                timeout=aiohttp.ClientTimeout(total=30),
-            ) as response:
-                response.raise_for_status()
-                content = await response.text()
-
-        # Use BeautifulSoup with xml parser
-        soup = BeautifulSoup(content, "xml")
-        items = soup.find_all("item")
-
-        for item in items[:limit]:
-            title = item.title.text if item.title else "No Title"
-            link = item.link.text if item.link else ""
-            pub_date_text = item.pubDate.text if item.pubDate else ""
-            description = item.description.text if item.description else ""
+        content = await self.feeds.fetch(
+            self.http.aiohttp_session(),
+            url,
+            headers={"User-Agent": "OhMyCoins/1.0"},
+            timeout=aiohttp.ClientTimeout(total=30),
+        )
+        if content is None:
+            logger.debug("CoinDesk feed not modified since the last run")
+            return results
+
+        for item in await parse_rss(content, limit):
+            title = item.get("title", "No Title")
+            link = item.get("link", "")
+            guid = item.get("guid") or link
+            if guid and not self.feeds.is_new(url, guid):
+                continue
+            pub_date_text = item.get("pubDate", "")
+            description = item.get("description", "")
 
             # Parse published date from RFC 2822 format
             published_at = None
@@ -100,6 +102,12 @@ class CoinDeskCollector(ICollector):
 
         return results
 
+    def commit(self, config: dict[str, Any]) -> None:
+        self.feeds.commit(config.get("rss_url", self.RSS_URL))
+
+    def discard(self, config: dict[str, Any]) -> None:
+        self.feeds.discard(config.get("rss_url", self.RSS_URL))
+
 
 # Auto-register at module import
 CollectorRegistry.register(CoinDeskCollector)
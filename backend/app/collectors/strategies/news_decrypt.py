@@ -3,9 +3,9 @@ from email.utils import parsedate_to_datetime
 from typing import Any
 
 import aiohttp
-from bs4 import BeautifulSoup
 
 from app.core.collectors.base import ICollector
+from app.core.collectors.parsing import parse_rss
 from app.core.collectors.registry import CollectorRegistry
 from app.core.config import HTTP_USER_AGENT
 from app.models import NewsItem
@@ -41,13 +41,13 @@ class DecryptCollector(ICollector):
     async def test_connection(self, config: dict[str, Any]) -> bool:
         url = config.get("rss_url", self.RSS_URL)
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url,
-                    headers={"User-Agent": HTTP_USER_AGENT},
-                    timeout=aiohttp.ClientTimeout(total=10),
-                ) as resp:
-                    return resp.status == 200
+            session = self.http.aiohttp_session()
+            async with session.get(
+                url,
+                headers={"User-Agent": HTTP_USER_AGENT},
+                timeout=aiohttp.ClientTimeout(total=10),
+            ) as resp:
+                return resp.status == 200
         except Exception:
             return False
 
@@ -55,46 +55,50 @@ class DecryptCollector(ICollector):
         url = config.get("rss_url", self.RSS_URL)
         limit = config.get("max_items", 20)
 
-        async with aiohttp.ClientSession() as session:
-            async with session.get(
-                url,
-                headers={"User-Agent": "OhMyCoins/1.0"},
-                timeout=aiohttp.ClientTimeout(total=30),
-            ) as resp:
-                resp.raise_for_status()
-                text = await resp.text()
-
-        soup = BeautifulSoup(text, "xml")
-        items = soup.find_all("item")
+        content = await self.feeds.fetch(
+            self.http.aiohttp_session(),
+            url,
+            headers={"User-Agent": "OhMyCoins/1.0"},
+            timeout=aiohttp.ClientTimeout(total=30),
+        )
+        if content is None:
+            # Feed unchanged since the last run (304)
+            return []
 
         results: list[Any] = []
-        for item in items[:limit]:
-            title = item.find("title")
-            link = item.find("link")
-            pub_date = item.find("pubDate")
-            description = item.find("description")
+        for item in await parse_rss(content, limit):
+            link = item.get("link", "")
+            guid = item.get("guid") or link
+            if guid and not self.feeds.is_new(url, guid):
+                continue
+            pub_date = item.get("pubDate")
+            description = item.get("description")
 
             # Parse published date from RFC 2822 format
             published_at = None
             if pub_date:
                 try:
-                    published_at = parsedate_to_datetime(pub_date.get_text(strip=True))
+                    published_at = parsedate_to_datetime(pub_date)
                 except Exception:
                     pass
 
             results.append(
                 NewsItem(
-                    title=title.get_text(strip=True) if title else "No Title",
-                    link=link.get_text(strip=True) if link else "",
+                    title=item.get("title", "No Title"),
+                    link=link,
                     published_at=published_at,
-                    summary=description.get_text(strip=True)[:500]
-                    if description
-                    else None,
+                    summary=description[:500] if description is not None else None,
                     source=self.SOURCE_NAME,
                 )
             )
 
         return results
 
+    def commit(self, config: dict[str, Any]) -> None:
+        self.feeds.commit(config.get("rss_url", self.RSS_URL))
+
+    def discard(self, config: dict[str, Any]) -> None:
+        self.feeds.discard(config.get("rss_url", self.RSS_URL))
+
 
 CollectorRegistry.register(DecryptCollector)
@@ -1,12 +1,29 @@
 from abc import ABC, abstractmethod
 from typing import Any
 
+from app.core.collectors.feeds import FeedCache, get_feed_cache
+from app.core.collectors.http import HttpClientRegistry, get_http_clients
+
 
 class ICollector(ABC):
     """
     Abstract Base Class for all data collectors.
     """
 
+    # Set to inject HTTP clients / a feed cache (tests); default to the shared ones
+    http_clients: HttpClientRegistry | None = None
+    feed_cache: FeedCache | None = None
+
+    @property
+    def http(self) -> HttpClientRegistry:
+        """Pooled HTTP clients to use instead of creating a client per call."""
+        return self.http_clients or get_http_clients()
+
+    @property
+    def feeds(self) -> FeedCache:
+        """Conditional GET validators and seen items of RSS feeds."""
+        return self.feed_cache or get_feed_cache()
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -48,3 +65,18 @@ class ICollector(ABC):
         Returns a list of standardized data objects (Signal, NewsItem, etc).
         """
         pass
+
+    def commit(self, config: dict[str, Any]) -> None:  # noqa: B027
+        """
+        Called once the items of the last collect(config) were stored.
+        Strategies remembering what they returned (feed validators, seen
+        items) keep it only from here.
+        """
+        pass
+
+    def discard(self, config: dict[str, Any]) -> None:  # noqa: B027
+        """
+        Called when the items of the last collect(config) failed to store,
+        so the next run returns them again.
+        """
+        pass
@@ -0,0 +1,216 @@
+"""
+Feed fetch cache for RSS collector strategies.
+
+News collectors used to download and parse the whole feed on every run and
+leave duplicates to the unique link constraint. FeedCache keeps per feed:
+
+- The ETag / Last-Modified validators of the last response, sent back as
+  If-None-Match / If-Modified-Since so an unchanged feed costs a 304 and no
+  parsing
+- A bloom filter of item GUIDs already returned, so known items are skipped
+  before NewsItem objects are built
+
+Both are staged per run and only kept once the runner confirms the items
+were stored (commit); a run whose items failed to store is fetched and
+returned again next time instead of getting a 304 or being filtered out.
+
+State is in memory only. After a restart every feed is fetched in full once
+and the unique link constraint still rejects items stored before. A bloom
+filter can report a new GUID as seen with probability error_rate; such an
+item is skipped.
+"""
+
+import hashlib
+import math
+from dataclasses import dataclass, field
+from typing import Any
+
+import aiohttp
+
+
+class SeenFilter:
+    """
+    Bloom filter of item keys with bounded memory.
+
+    Keys are kept in two generations of `capacity` keys each. When the
+    current generation is full it replaces the previous one, so the oldest
+    keys age out instead of saturating the filter.
+    """
+
+    def __init__(self, capacity: int = 5000, error_rate: float = 0.001):
+        self.capacity = capacity
+        self._size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self._hashes = max(1, round(self._size / capacity * math.log(2)))
+        self._current = bytearray((self._size + 7) // 8)
+        self._previous: bytearray | None = None
+        self._count = 0
+
+    def add(self, key: str) -> None:
+        if self._count >= self.capacity:
+            self._previous = self._current
+            self._current = bytearray(len(self._current))
+            self._count = 0
+        for position in self._positions(key):
+            self._current[position >> 3] |= 1 << (position & 7)
+        self._count += 1
+
+    def __contains__(self, key: object) -> bool:
+        if not isinstance(key, str):
+            return False
+        positions = self._positions(key)
+        for bits in (self._current, self._previous):
+            if bits is not None and all(
+                bits[position >> 3] & (1 << (position & 7)) for position in positions
+            ):
+                return True
+        return False
+
+    def _positions(self, key: str) -> list[int]:
+        # Double hashing from one 128-bit digest
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [(first + i * second) % self._size for i in range(self._hashes)]
+
+
+@dataclass
+class FeedUpdate:
+    """Validators and items of a run, kept once the run is committed"""
+
+    etag: str | None = None
+    last_modified: str | None = None
+    guids: set[str] = field(default_factory=set)
+
+
+@dataclass
+class FeedState:
+    """Cached validators and seen items of one feed"""
+
+    etag: str | None = None
+    last_modified: str | None = None
+    seen: SeenFilter = field(default_factory=SeenFilter)
+    pending: FeedUpdate | None = None
+
+
+class FeedCache:
+    """
+    Conditional GET and seen-item tracking per feed URL.
+
+    Features:
+    - If-None-Match / If-Modified-Since from the last response, 304 short-circuit
+    - Seen-GUID bloom filter per feed
+    - Updates staged per run, kept by commit() and dropped by discard()
+    """
+
+    def __init__(self) -> None:
+        self._feeds: dict[str, FeedState] = {}
+        self.fetched = 0
+        self.not_modified = 0
+        self.items_skipped = 0
+
+    async def fetch(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        headers: dict[str, str] | None = None,
+        timeout: aiohttp.ClientTimeout | None = None,
+    ) -> bytes | None:
+        """
+        GET a feed, sending the validators of the last committed response.
+
+        Starts a new run of the feed: the new validators are staged until
+        commit(url).
+
+        Args:
+            session: HTTP session to use
+            url: Feed URL
+            headers: Extra request headers
+            timeout: Request timeout
+
+        Returns:
+            Raw feed body, or None if the feed is unchanged (304)
+
+        Raises:
+            aiohttp.ClientResponseError: For error statuses
+        """
+        state = self._feeds.setdefault(url, FeedState())
+        state.pending = None
+        headers = dict(headers or {})
+        if state.etag:
+            headers["If-None-Match"] = state.etag
+        if state.last_modified:
+            headers["If-Modified-Since"] = state.last_modified
+
+        async with session.get(url, headers=headers, timeout=timeout) as response:
+            if response.status == 304:
+                self.not_modified += 1
+                return None
+            response.raise_for_status()
+            content = await response.read()
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+
+        state.pending = FeedUpdate(
+            etag=etag if isinstance(etag, str) else None,
+            last_modified=last_modified if isinstance(last_modified, str) else None,
+        )
+        self.fetched += 1
+        return content
+
+    def is_new(self, url: str, guid: str) -> bool:
+        """
+        Check whether a feed item was not returned before.
+
+        New items are staged as seen until commit(url); an item repeated
+        within the run is not new either.
+
+        Args:
+            url: Feed URL
+            guid: Item GUID (or link when the feed has no GUIDs)
+        """
+        state = self._feeds.setdefault(url, FeedState())
+        if state.pending is None:
+            state.pending = FeedUpdate(state.etag, state.last_modified)
+        if guid in state.seen or guid in state.pending.guids:
+            self.items_skipped += 1
+            return False
+        state.pending.guids.add(guid)
+        return True
+
+    def commit(self, url: str) -> None:
+        """Keep the validators and items of the last run, once they are stored."""
+        state = self._feeds.get(url)
+        if state is None or state.pending is None:
+            return
+        pending, state.pending = state.pending, None
+        state.etag = pending.etag
+        state.last_modified = pending.last_modified
+        for guid in pending.guids:
+            state.seen.add(guid)
+
+    def discard(self, url: str) -> None:
+        """Drop the last run, so its items are fetched and returned again."""
+        state = self._feeds.get(url)
+        if state is not None:
+            state.pending = None
+
+    def stats(self) -> dict[str, Any]:
+        """Get cache statistics."""
+        return {
+            "feeds": len(self._feeds),
+            "fetched": self.fetched,
+            "not_modified": self.not_modified,
+            "items_skipped": self.items_skipped,
+        }
+
+
+# Process-wide instance
+_feed_cache: FeedCache | None = None
+
+
+def get_feed_cache() -> FeedCache:
+    """Get the process-wide feed cache."""
+    global _feed_cache
+    if _feed_cache is None:
+        _feed_cache = FeedCache()
+    return _feed_cache
@@ -0,0 +1,171 @@
+"""
+Shared HTTP clients for collector strategies.
+
+Strategies used to open a new aiohttp.ClientSession or httpx.AsyncClient
+for every collect() and test_connection() call, paying DNS, TCP and TLS
+setup on every run. HttpClientRegistry keeps one pooled client of each
+library per process:
+
+- Keep-alive connection pools, limited in total and per host
+- DNS cache (aiohttp) and HTTP/2 (httpx, when the h2 package is installed)
+- Shared default timeouts; requests can still pass their own
+
+Clients belong to the event loop they were created on. When used from
+another loop (tests, scripts calling asyncio.run more than once), new
+clients are created for that loop.
+"""
+
+import asyncio
+import importlib.util
+import logging
+from typing import Any
+
+import aiohttp
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class HostLimitedTransport(httpx.AsyncBaseTransport):
+    """httpx transport limiting the requests in flight per host."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, max_per_host: int):
+        self._transport = transport
+        self._max_per_host = max_per_host
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores[host] = asyncio.Semaphore(self._max_per_host)
+        async with semaphore:
+            return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class HttpClientRegistry:
+    """
+    Process-wide pooled HTTP clients.
+
+    Features:
+    - One aiohttp.ClientSession and one httpx.AsyncClient per event loop
+    - Connection pools with keep-alive, limited in total and per host
+    - Shared default timeout
+    """
+
+    def __init__(
+        self,
+        max_connections: int | None = None,
+        max_per_host: int | None = None,
+        timeout: float | None = None,
+        keepalive_seconds: float = 30.0,
+    ):
+        """
+        Initialize the registry; clients are created on first use.
+
+        Args:
+            max_connections: Pool size (default: settings.COLLECTOR_HTTP_MAX_CONNECTIONS)
+            max_per_host: Concurrent requests per host
+                (default: settings.COLLECTOR_HTTP_MAX_PER_HOST)
+            timeout: Default total request timeout in seconds
+                (default: settings.COLLECTOR_HTTP_TIMEOUT)
+            keepalive_seconds: How long idle connections are kept open
+        """
+        self.max_connections = (
+            max_connections or settings.COLLECTOR_HTTP_MAX_CONNECTIONS
+        )
+        self.max_per_host = max_per_host or settings.COLLECTOR_HTTP_MAX_PER_HOST
+        self.timeout = timeout or settings.COLLECTOR_HTTP_TIMEOUT
+        self.keepalive_seconds = keepalive_seconds
+
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._aiohttp: aiohttp.ClientSession | None = None
+        self._httpx: httpx.AsyncClient | None = None
+        self.clients_created = 0
+
+    def aiohttp_session(self) -> aiohttp.ClientSession:
+        """Get the shared aiohttp session of the running event loop."""
+        self._check_loop()
+        if self._aiohttp is None or self._aiohttp.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_per_host,
+                ttl_dns_cache=300,
+                keepalive_timeout=self.keepalive_seconds,
+            )
+            self._aiohttp = aiohttp.ClientSession(
+                connector=connector,
+                # No cookies shared between runs and strategies
+                cookie_jar=aiohttp.DummyCookieJar(),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self.clients_created += 1
+        return self._aiohttp
+
+    def httpx_client(self) -> httpx.AsyncClient:
+        """Get the shared httpx client of the running event loop."""
+        self._check_loop()
+        if self._httpx is None or self._httpx.is_closed:
+            transport = httpx.AsyncHTTPTransport(
+                http2=HTTP2_AVAILABLE,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=self.keepalive_seconds,
+                ),
+            )
+            self._httpx = httpx.AsyncClient(
+                transport=HostLimitedTransport(transport, self.max_per_host),
+                timeout=self.timeout,
+            )
+            self.clients_created += 1
+        return self._httpx
+
+    async def close(self) -> None:
+        """Close the clients of the running event loop."""
+        if self._loop is not asyncio.get_running_loop():
+            return
+        if self._aiohttp is not None:
+            await self._aiohttp.close()
+        if self._httpx is not None:
+            await self._httpx.aclose()
+        self._aiohttp = None
+        self._httpx = None
+
+    def stats(self) -> dict[str, Any]:
+        """Get registry statistics."""
+        return {
+            "clients_created": self.clients_created,
+            "aiohttp_open": self._aiohttp is not None and not self._aiohttp.closed,
+            "httpx_open": self._httpx is not None and not self._httpx.is_closed,
+            "http2": HTTP2_AVAILABLE,
+        }
+
+    def _check_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            if self._loop is not None:
+                # Clients of another loop cannot be used (or closed) here
+                logger.debug("Event loop changed, creating new HTTP clients")
+            self._loop = loop
+            self._aiohttp = None
+            self._httpx = None
+
+
+# Process-wide instance
+_http_clients: HttpClientRegistry | None = None
+
+
+def get_http_clients() -> HttpClientRegistry:
+    """Get the process-wide HTTP client registry."""
+    global _http_clients
+    if _http_clients is None:
+        _http_clients = HttpClientRegistry()
+    return _http_clients
@@ -0,0 +1,144 @@
+"""
+Incremental feed and page parsing for collector strategies.
+
+Strategies used to build a full BeautifulSoup tree of every RSS feed and
+scraped page on the event loop, then search it for the few fields they
+need. The parsers here use lxml.etree.iterparse instead:
+
+- Only the needed elements are read; each one is cleared once handled, so
+  memory stays flat regardless of the document size
+- RSS parsing stops after the requested number of items
+- The async wrappers run the parse in a worker thread, keeping the event
+  loop free for the API and other collectors
+
+Inputs are the raw response bytes, so lxml applies the encoding declared
+by the document itself.
+"""
+
+import asyncio
+import io
+import logging
+from collections.abc import Iterable
+
+from lxml import etree  # type: ignore[import-untyped]
+
+logger = logging.getLogger(__name__)
+
+RSS_FIELDS = ("title", "link", "guid", "pubDate", "description")
+
+
+def _text(element: etree._Element) -> str:
+    return "".join(element.itertext()).strip()
+
+
+def _release(element: etree._Element) -> None:
+    # Drop the handled element and the siblings already parsed before it
+    element.clear()
+    parent = element.getparent()
+    if parent is not None:
+        while element.getprevious() is not None:
+            del parent[0]
+
+
+def parse_rss_items(
+    content: bytes,
+    limit: int | None = None,
+    fields: Iterable[str] = RSS_FIELDS,
+) -> list[dict[str, str]]:
+    """
+    Extract fields of the <item> elements of an RSS feed.
+
+    Items are matched by local name, so namespaced feeds (RSS 1.0) work too.
+
+    Args:
+        content: Raw feed body
+        limit: Stop after this many items (default: all)
+        fields: Child elements to extract; the first occurrence is used
+
+    Returns:
+        One dict per item, holding the stripped text of the fields present.
+        A malformed feed yields the items parsed before the error.
+    """
+    wanted = set(fields)
+    items: list[dict[str, str]] = []
+    if limit is not None and limit <= 0:
+        return items
+
+    events = etree.iterparse(
+        io.BytesIO(content),
+        events=("end",),
+        tag="{*}item",
+        recover=True,
+        resolve_entities=False,
+        no_network=True,
+    )
+    try:
+        for _, item in events:
+            # RSS 0.9x/2.0 items have no namespace, RSS 1.0 (RDF) items a
+            # default one; fields are children in the item's own namespace
+            namespace = etree.QName(item).namespace
+            entry: dict[str, str] = {}
+            for child in item:
+                if not isinstance(child.tag, str):
+                    continue  # comments and processing instructions
+                name = etree.QName(child)
+                tag = name.localname
+                if name.namespace == namespace and tag in wanted and tag not in entry:
+                    entry[tag] = _text(child)
+            items.append(entry)
+            _release(item)
+            if limit is not None and len(items) >= limit:
+                break
+    except etree.XMLSyntaxError as e:
+        # Keep the items before the damage, as the recovering parser does
+        logger.warning(f"Malformed feed after {len(items)} items: {e}")
+    return items
+
+
+def parse_html_rows(
+    content: bytes, row_attribute: str, cell_attribute: str
+) -> list[tuple[str, list[str | None]]]:
+    """
+    Extract attribute values of the table rows of an HTML page.
+
+    Args:
+        content: Raw page body
+        row_attribute: Only <tr> elements with this attribute are returned
+        cell_attribute: Attribute read from each <td> of a row
+
+    Returns:
+        (row attribute value, [cell attribute value or None per <td>]) per row
+    """
+    rows: list[tuple[str, list[str | None]]] = []
+    events = etree.iterparse(
+        io.BytesIO(content),
+        events=("end",),
+        tag="tr",
+        html=True,
+        recover=True,
+        no_network=True,
+    )
+    try:
+        for _, row in events:
+            key = row.get(row_attribute)
+            if key is not None:
+                cells = [cell.get(cell_attribute) for cell in row.iterchildren("td")]
+                rows.append((key, cells))
+            _release(row)
+    except etree.XMLSyntaxError as e:
+        logger.warning(f"Malformed page after {len(rows)} rows: {e}")
+    return rows
+
+
+async def parse_rss(content: bytes, limit: int | None = None) -> list[dict[str, str]]:
+    """parse_rss_items in a worker thread."""
+    return await asyncio.to_thread(parse_rss_items, content, limit)
+
+
+async def parse_rows(
+    content: bytes, row_attribute: str, cell_attribute: str
+) -> list[tuple[str, list[str | None]]]:
+    """parse_html_rows in a worker thread."""
+    return await asyncio.to_thread(
+        parse_html_rows, content, row_attribute, cell_attribute
+    )
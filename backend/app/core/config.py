@@ -78,6 +78,10 @@ class Settings(BaseSettings):
     # Phase 2.5 Collector Configuration
     # Controls whether this instance runs data collection jobs
     RUN_COLLECTORS: bool = True
+    # Shared HTTP client pools of the collector strategies
+    COLLECTOR_HTTP_MAX_CONNECTIONS: int = 100
+    COLLECTOR_HTTP_MAX_PER_HOST: int = 10
+    COLLECTOR_HTTP_TIMEOUT: float = 30.0
 
     @computed_field  # type: ignore[prop-decorator]
     @property
@@ -159,6 +163,8 @@ class Settings(BaseSettings):
 
     # Trading System Configuration
     TRADING_MODE: Literal["live", "paper"] = "paper"
+    ORDER_EXECUTOR_CONCURRENCY: int = 8
+    SCHEDULER_BATCH_TICKS: bool = False
 
     # Access Control
     EMAIL_WHITELIST_ENABLED: bool = False
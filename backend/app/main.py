@@ -15,6 +15,7 @@ from starlette.middleware.cors import CORSMiddleware
 from app.api.main import api_router
 from app.api.middleware import RateLimitMiddleware
 from app.api.routes import websockets
+from app.core.collectors.http import get_http_clients
 from app.core.config import settings
 from app.core.db import engine
 from app.services.agent.runner import shutdown_runner
@@ -24,6 +25,7 @@ from app.services.collectors.config import (
     stop_collection,
 )
 from app.services.scheduler import stop_scheduler
+from app.services.trading.audit import get_audit_writer
 from app.services.trading.executor import get_order_queue
 from app.services.trading.scheduler import get_execution_scheduler
 
@@ -85,6 +87,7 @@ async def lifespan(_app: FastAPI):
 
     # Shutdown: Stop Phase 2.5 Collectors
     stop_collection()
+    await get_http_clients().close()
 
     # Shutdown: Stop the scheduler gracefully
     await stop_scheduler()
@@ -102,6 +105,9 @@ async def lifespan(_app: FastAPI):
         except asyncio.CancelledError:
             pass
 
+    # Write buffered audit log entries
+    await asyncio.to_thread(get_audit_writer().stop)
+
 
 def custom_generate_unique_id(route: APIRoute) -> str:
     return f"{route.tags[0]}-{route.name}"
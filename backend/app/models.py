@@ -1548,6 +1548,182 @@ class OrderResponse(OrderPublic):
     pass
 
 
+# =============================================================================
+# Phase 6: P&L Lot Ledger Models
+# =============================================================================
+
+
+class PnLLot(SQLModel, table=True):
+    """
+    Open (or exhausted) FIFO lot created by a filled buy order
+
+    Lots are kept per ledger book: the 'user' book matches all of a user's
+    fills for a coin, the 'algorithm' book matches only fills placed by the
+    same algorithm.
+    """
+
+    __tablename__ = "pnl_lots"
+
+    id: uuid.UUID = Field(
+        default_factory=uuid.uuid4,
+        primary_key=True,
+        description="The unique identifier for the lot.",
+    )
+    user_id: uuid.UUID = Field(
+        foreign_key="user.id",
+        index=True,
+        description="The UUID of the user who owns this lot.",
+    )
+    book: str = Field(
+        max_length=10,
+        default="user",
+        description="The ledger book this lot belongs to ('user' or 'algorithm').",
+    )
+    algorithm_id: uuid.UUID | None = Field(
+        default=None,
+        description="The algorithm owning this lot (set for the 'algorithm' book only).",
+    )
+    coin_type: str = Field(
+        max_length=20, description="The type of coin (e.g., 'BTC', 'ETH')."
+    )
+    buy_order_id: uuid.UUID = Field(
+        description="The filled buy order that opened this lot."
+    )
+    quantity: Decimal = Field(
+        sa_column=Column(DECIMAL(precision=20, scale=10), nullable=False),
+        description="The quantity originally bought.",
+    )
+    remaining_quantity: Decimal = Field(
+        sa_column=Column(DECIMAL(precision=20, scale=10), nullable=False),
+        description="The quantity not yet matched against sells.",
+    )
+    price: Decimal = Field(
+        sa_column=Column(DECIMAL(precision=20, scale=8), nullable=False),
+        description="The buy price of the lot.",
+    )
+    opened_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+        description="The fill timestamp of the buy order.",
+    )
+
+    __table_args__ = (
+        Index(
+            "idx_pnl_lot_book",
+            "user_id",
+            "book",
+            "algorithm_id",
+            "coin_type",
+            "opened_at",
+        ),
+    )
+
+
+class PnLRealizedMatch(SQLModel, table=True):
+    """
+    Realized FIFO match between a sell fill and an earlier buy lot
+
+    Realized P&L for any window is the SUM of realized_pnl over the
+    matches whose realized_at falls inside that window.
+    """
+
+    __tablename__ = "pnl_realized_matches"
+
+    id: uuid.UUID = Field(
+        default_factory=uuid.uuid4,
+        primary_key=True,
+        description="The unique identifier for the match.",
+    )
+    user_id: uuid.UUID = Field(
+        foreign_key="user.id",
+        index=True,
+        description="The UUID of the user who realized this P&L.",
+    )
+    book: str = Field(
+        max_length=10,
+        default="user",
+        description="The ledger book this match belongs to ('user' or 'algorithm').",
+    )
+    algorithm_id: uuid.UUID | None = Field(
+        default=None,
+        description="The algorithm owning this match (set for the 'algorithm' book only).",
+    )
+    coin_type: str = Field(
+        max_length=20, description="The type of coin (e.g., 'BTC', 'ETH')."
+    )
+    sell_order_id: uuid.UUID = Field(
+        description="The filled sell order that closed the quantity."
+    )
+    buy_order_id: uuid.UUID = Field(
+        description="The buy order whose lot was consumed."
+    )
+    quantity: Decimal = Field(
+        sa_column=Column(DECIMAL(precision=20, scale=10), nullable=False),
+        description="The matched quantity.",
+    )
+    buy_price: Decimal = Field(
+        sa_column=Column(DECIMAL(precision=20, scale=8), nullable=False),
+        description="The buy price of the consumed lot.",
+    )
+    sell_price: Decimal = Field(
+        sa_column=Column(DECIMAL(precision=20, scale=8), nullable=False),
+        description="The execution price of the sell.",
+    )
+    realized_pnl: Decimal = Field(
+        sa_column=Column(DECIMAL(precision=30, scale=10), nullable=False),
+        description="quantity * (sell_price - buy_price).",
+    )
+    realized_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+        description="The fill timestamp of the sell order.",
+    )
+
+    __table_args__ = (
+        Index(
+            "idx_pnl_match_book_time",
+            "user_id",
+            "book",
+            "algorithm_id",
+            "coin_type",
+            "realized_at",
+        ),
+        Index("idx_pnl_match_user_time", "user_id", "book", "realized_at"),
+    )
+
+
+class PnLLedgerState(SQLModel, table=True):
+    """
+    Per-user watermark of the fills already applied to the lot ledger
+
+    Fills are applied in (filled_at, id) order. applied_orders is compared
+    against the number of filled orders to detect backfilled fills, which
+    trigger a rebuild of the user's ledger.
+    """
+
+    __tablename__ = "pnl_ledger_state"
+
+    user_id: uuid.UUID = Field(
+        foreign_key="user.id",
+        primary_key=True,
+        description="The UUID of the user this watermark belongs to.",
+    )
+    last_filled_at: datetime | None = Field(
+        default=None,
+        sa_column=Column(DateTime(timezone=True), nullable=True),
+        description="Fill timestamp of the last applied order.",
+    )
+    last_order_id: uuid.UUID | None = Field(
+        default=None, description="The ID of the last applied order."
+    )
+    applied_orders: int = Field(
+        default=0, description="Number of filled orders applied to the ledger."
+    )
+    updated_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+        description="The timestamp when the ledger was last updated.",
+    )
+
+
 # =============================================================================
 # Phase 5/6: Algorithm Deployment Models
 # =============================================================================
@@ -1896,7 +2072,12 @@ class BacktestRun(BacktestRunBase, table=True):
         default=None, description="JSON metrics from backtest"
     )
     equity_curve_json: str | None = Field(
-        default=None, description="JSON equity curve data"
+        default=None, description="JSON equity curve preview (LTTB-downsampled)"
+    )
+    equity_curve_blob: bytes | None = Field(
+        default=None,
+        sa_column=Column(sa.LargeBinary, nullable=True),
+        description="Full-resolution equity curve, packed binary",
     )
     trade_log_json: str | None = Field(
         default=None, description="JSON list of simulated trades"
@@ -1941,6 +2122,21 @@ class BacktestRunList(SQLModel):
     count: int
 
 
+class EquityCurvePoint(SQLModel):
+    """One point of a backtest equity curve"""
+
+    timestamp: str
+    equity: float
+
+
+class EquityCurvePublic(SQLModel):
+    """Downsampled backtest equity curve"""
+
+    data: list[EquityCurvePoint]
+    count: int
+    total_points: int
+
+
 # ============================================================================
 # Risk Management & Kill Switch Models
 # ============================================================================
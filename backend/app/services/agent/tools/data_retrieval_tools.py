@@ -21,6 +21,7 @@ from app.models import (
     PriceData5Min,
     SocialSentiment,
 )
+from app.services.backtesting.price_loader import load_price_frame
 
 
 async def fetch_price_data(
@@ -46,30 +47,16 @@ async def fetch_price_data(
 
     coin_type = coin_type.lower()
 
-    statement = (
-        select(PriceData5Min)
-        .where(
-            and_(
-                PriceData5Min.coin_type == coin_type,
-                PriceData5Min.timestamp >= start_date,
-                PriceData5Min.timestamp <= end_date,
-            )
-        )
-        .order_by(PriceData5Min.timestamp)
+    df = load_price_frame(
+        session,
+        coin_type,
+        start_date,
+        end_date,
+        columns=("coin_type", "bid", "ask", "last"),
     )
 
-    results = session.exec(statement).all()
-
-    return [
-        {
-            "timestamp": result.timestamp.isoformat(),
-            "coin_type": result.coin_type,
-            "bid": float(result.bid),
-            "ask": float(result.ask),
-            "last": float(result.last),
-        }
-        for result in results
-    ]
+    df["timestamp"] = [ts.isoformat() for ts in df["timestamp"]]
+    return df.to_dict("records")
 
 
 async def fetch_sentiment_data(
@@ -15,10 +15,20 @@ from typing import Any
 
 import numpy as np
 import pandas as pd
-from sqlmodel import Session, select
-
-from app.models import PriceData5Min
-from app.services.backtesting.schemas import BacktestConfig, BacktestResult
+from sqlmodel import Session
+
+from app.services.backtesting.price_loader import load_price_frame
+from app.services.backtesting.schemas import (
+    BacktestConfig,
+    BacktestResult,
+    SweepConfig,
+    SweepResult,
+)
+from app.services.trading.equity_curve import (
+    EQUITY_CURVE_PREVIEW_POINTS,
+    downsample_equity_curve,
+)
+from app.services.trading.metrics import extract_position_trades
 
 logger = logging.getLogger(__name__)
 
@@ -37,42 +47,22 @@ class BacktestService:
         """
         Fetch historical data from the database and convert to a Pandas DataFrame.
         Resolves 'isolation of data' by strictly querying the historical table.
+        Only the `last` column is loaded, via the columnar price loader.
         """
-        statement = (
-            select(PriceData5Min)
-            .where(
-                PriceData5Min.coin_type == coin_type,
-                PriceData5Min.timestamp >= start_date,
-                PriceData5Min.timestamp <= end_date,
-            )
-            .order_by(PriceData5Min.timestamp)
+        df = load_price_frame(
+            self.session, coin_type, start_date, end_date, columns=("last",)
         )
 
-        results = self.session.exec(statement).all()
-
-        if not results:
+        if df.empty:
             return pd.DataFrame()
 
-        # Convert to list of dicts for pandas
-        data = [
-            {
-                "timestamp": r.timestamp,
-                "open": float(
-                    r.last
-                ),  # Proxying open with last/close if open not available in current model
-                "high": float(r.last),  # Proxying high
-                "low": float(r.last),  # Proxying low
-                "close": float(r.last),
-                # If PriceData5Min had OHLC, we would use it.
-                # Currently it has bid/ask/last based on `PriceDataBase`.
-                # Assuming `last` is the close price.
-            }
-            for r in results
-        ]
-
-        df = pd.DataFrame(data)
-        df.set_index("timestamp", inplace=True)
-        return df
+        # PriceData5Min has bid/ask/last rather than OHLC, so `last` is used as
+        # the close and proxies open/high/low.
+        close = df["last"].to_numpy()
+        return pd.DataFrame(
+            {"open": close, "high": close, "low": close, "close": close},
+            index=pd.DatetimeIndex(df["timestamp"], name="timestamp"),
+        )
 
     def run_backtest(
         self,
@@ -121,6 +111,23 @@ class BacktestService:
 
         return result
 
+    def run_sweep(
+        self, config: SweepConfig, max_workers: int | None = None
+    ) -> SweepResult:
+        """
+        Run the default strategy over a parameter grid for several coins.
+
+        Each coin is loaded once and shared with a process pool; see
+        ParameterSweepRunner.
+
+        Args:
+            config: SweepConfig with coins, window grids and fee rates
+            max_workers: Worker processes (default: CPU count, 1 = in-process)
+        """
+        from app.services.backtesting.sweep import ParameterSweepRunner
+
+        return ParameterSweepRunner(self, max_workers=max_workers).run(config)
+
     def _default_strategy(self, df: pd.DataFrame, params: dict) -> pd.DataFrame:
         """
         A simple default strategy (e.g., Simple Moving Average Crossover) if none provided.
@@ -206,13 +213,21 @@ class BacktestService:
         winning_trades = [t for t in trades if t["pnl"] > 0]
         win_rate = len(winning_trades) / len(trades) if trades else 0.0
 
-        # Equity Curve for chart
-        equity_curve = [
-            {"time": str(ts), "value": val}
-            for ts, val in df["equity"].items()
-            if isinstance(ts, datetime)  # Filter generic index
-        ]
-        # Downsample for UI if needed, but returning full for now
+        # Equity curve for charts, LTTB-downsampled so long ranges stay small
+        equity_curve = []
+        if isinstance(df.index, pd.DatetimeIndex) and len(df):
+            index = (
+                df.index.tz_localize("UTC")
+                if df.index.tz is None
+                else df.index.tz_convert("UTC")
+            )
+            equity_curve = downsample_equity_curve(
+                index.asi8,
+                df["equity"].to_numpy(dtype=float),
+                EQUITY_CURVE_PREVIEW_POINTS,
+                time_key="time",
+                value_key="value",
+            )
 
         return BacktestResult(
             strategy_name="Unknown",  # To be filled by caller
@@ -224,12 +239,7 @@ class BacktestService:
             win_rate=win_rate,
             total_trades=len(trades),
             trades=trades,
-            equity_curve=equity_curve[
-                -100:
-            ],  # Just return last 100 for brevity in result, or full?
-            # Usually full is needed for charts.
-            # But large payloads can be an issue.
-            # I'll return full list but be careful with large ranges.
+            equity_curve=equity_curve,
         )
 
     def _extract_trades(
@@ -237,6 +247,22 @@ class BacktestService:
     ) -> list[dict[str, Any]]:
         """
         Reconstruct discrete trades from position series.
+        Trade boundaries come from position-change indices (see
+        extract_position_trades) rather than a row-by-row walk.
+        """
+        return extract_position_trades(
+            df.index,
+            df["close"].to_numpy(dtype=float),
+            df["position"].to_numpy(dtype=float),
+            fee_rate + slippage,
+        )
+
+    def _extract_trades_iterative(
+        self, df: pd.DataFrame, fee_rate: float, slippage: float
+    ) -> list[dict[str, Any]]:
+        """
+        Reconstruct discrete trades from position series, row by row.
+        Reference implementation for _extract_trades.
         """
         trades = []
         in_trade = False
@@ -33,3 +33,44 @@ class BacktestResult(BaseModel):
     equity_curve: list[dict[str, Any]] = []
 
     model_config = ConfigDict(from_attributes=True)
+
+
+class SweepConfig(BaseModel):
+    """Configuration for a parameter sweep of the default MA crossover strategy"""
+
+    coin_types: list[str]
+    start_date: datetime
+    end_date: datetime
+    initial_capital: Decimal = Decimal("10000.0")
+    fast_windows: list[int]
+    slow_windows: list[int]
+    fee_rates: list[float] = [0.001]
+    slippage: float = 0.0005
+    rank_by: str = "sharpe_ratio"
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SweepResultRow(BaseModel):
+    """Metrics for one coin and parameter combination"""
+
+    rank: int
+    coin_type: str
+    fast_window: int
+    slow_window: int
+    fee_rate: float
+    total_return: float
+    total_return_percent: float
+    max_drawdown: float
+    sharpe_ratio: float
+    win_rate: float
+    total_trades: int
+
+
+class SweepResult(BaseModel):
+    """Ranked results of a parameter sweep"""
+
+    rank_by: str
+    combinations: int
+    rows: list[SweepResultRow] = []
+    coins_without_data: list[str] = []
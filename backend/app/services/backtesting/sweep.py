@@ -0,0 +1,331 @@
+"""
+Parameter Sweep Runner
+
+Evaluates the default MA crossover strategy of BacktestService over a grid of
+fast_window x slow_window x fee_rate for several coins.
+
+Each coin's close series is loaded once and placed in shared memory. Workers
+in a process pool attach to it by name instead of receiving a pickled copy.
+Rolling means are cached per worker and coin, so a window that appears in
+many combinations (every fast_window is paired with every slow_window) is
+computed once. Fee rates only change transaction costs, so positions,
+returns and trade boundaries are also computed once per window pair.
+"""
+
+import logging
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import product
+from multiprocessing import shared_memory
+from typing import Any
+
+import numpy as np
+import pandas as pd  # type: ignore[import-untyped]
+
+from app.services.backtesting.engine import BacktestService
+from app.services.backtesting.schemas import SweepConfig, SweepResult, SweepResultRow
+
+logger = logging.getLogger(__name__)
+
+# Matches BacktestService._calculate_performance (5-minute candles)
+PERIODS_PER_YEAR = 288 * 365
+
+RANKABLE_METRICS = (
+    "total_return",
+    "total_return_percent",
+    "max_drawdown",
+    "sharpe_ratio",
+    "win_rate",
+    "total_trades",
+)
+
+
+@dataclass(frozen=True)
+class SharedSeries:
+    """Handle to a float64 series in shared memory (picklable)"""
+
+    name: str
+    length: int
+
+
+class RollingMeanCache:
+    """Rolling means of one close series, computed once per window"""
+
+    def __init__(self) -> None:
+        self._means: dict[int, np.ndarray] = {}
+        self.returns: np.ndarray | None = None
+
+    def get(self, close: np.ndarray, window: int) -> np.ndarray:
+        means = self._means.get(window)
+        if means is None:
+            means = pd.Series(close).rolling(window=window).mean().to_numpy()
+            self._means[window] = means
+        return means
+
+    def get_returns(self, close: np.ndarray) -> np.ndarray:
+        if self.returns is None:
+            self.returns = pd.Series(close).pct_change().to_numpy()
+        return self.returns
+
+
+def evaluate_grid(
+    close: np.ndarray,
+    cache: RollingMeanCache,
+    combos: list[tuple[int, int]],
+    fee_rates: list[float],
+    slippage: float,
+    initial_capital: float,
+) -> list[dict[str, Any]]:
+    """
+    Evaluate MA crossover combinations on one close series.
+
+    Mirrors BacktestService._default_strategy and _calculate_performance:
+    long while the fast MA is above the slow MA, entered on the next candle,
+    with (fee + slippage) charged on every position change.
+
+    Args:
+        close: Close prices
+        cache: Rolling mean cache for this series
+        combos: (fast_window, slow_window) pairs
+        fee_rates: Fee assumptions evaluated for every pair
+        slippage: Slippage as a decimal
+        initial_capital: Starting equity
+
+    Returns:
+        One metrics dict per (pair, fee_rate)
+    """
+    returns = cache.get_returns(close)
+    n = len(close)
+    rows = []
+
+    for fast_window, slow_window in combos:
+        fast_ma = cache.get(close, fast_window)
+        slow_ma = cache.get(close, slow_window)
+
+        # Signal valid for the next candle; NaN comparisons are flat
+        signal = (fast_ma > slow_ma).astype(np.float64)
+        position = np.concatenate(([0.0], signal[:-1]))
+
+        gross = position * returns
+        position_change = np.abs(np.diff(position, prepend=0.0))
+
+        # Discrete trades from position changes (long-only, 0/1 positions)
+        entries = np.flatnonzero(position_change * position > 0)
+        exits = np.flatnonzero(position_change * (1 - position) > 0)
+        exits = np.concatenate((exits, [n - 1]))[: len(entries)]
+        trade_returns = (close[exits] - close[entries]) / close[entries]
+
+        for fee_rate in fee_rates:
+            cost = fee_rate + slippage
+            strategy_returns = gross - position_change * cost
+            strategy_returns = np.where(
+                np.isnan(strategy_returns), 0.0, strategy_returns
+            )
+            equity = initial_capital * np.cumprod(1 + strategy_returns)
+
+            total_return_percent = equity[-1] / initial_capital - 1
+            drawdown = equity / np.maximum.accumulate(equity) - 1
+
+            std = strategy_returns.std(ddof=1) if n > 1 else math.nan
+            sharpe_ratio = (
+                0.0
+                if std == 0
+                else strategy_returns.mean() / std * math.sqrt(PERIODS_PER_YEAR)
+            )
+
+            trade_pnls = trade_returns - 2 * cost
+            total_trades = len(trade_pnls)
+            win_rate = (
+                float(np.count_nonzero(trade_pnls > 0)) / total_trades
+                if total_trades
+                else 0.0
+            )
+
+            rows.append(
+                {
+                    "fast_window": fast_window,
+                    "slow_window": slow_window,
+                    "fee_rate": fee_rate,
+                    "total_return": float(initial_capital * total_return_percent),
+                    "total_return_percent": float(total_return_percent),
+                    "max_drawdown": float(drawdown.min()),
+                    "sharpe_ratio": float(sharpe_ratio),
+                    "win_rate": win_rate,
+                    "total_trades": total_trades,
+                }
+            )
+
+    return rows
+
+
+# Per-process rolling mean caches, keyed by shared memory block name
+_worker_caches: dict[str, RollingMeanCache] = {}
+
+
+def _run_task(
+    coin_type: str,
+    series: SharedSeries,
+    combos: list[tuple[int, int]],
+    fee_rates: list[float],
+    slippage: float,
+    initial_capital: float,
+) -> list[dict[str, Any]]:
+    """Process-pool entry point: evaluate a chunk of combos for one coin"""
+    block = shared_memory.SharedMemory(name=series.name)
+    try:
+        close = np.ndarray((series.length,), dtype=np.float64, buffer=block.buf)
+        cache = _worker_caches.setdefault(series.name, RollingMeanCache())
+        rows = evaluate_grid(close, cache, combos, fee_rates, slippage, initial_capital)
+        del close
+    finally:
+        block.close()
+
+    for row in rows:
+        row["coin_type"] = coin_type
+    return rows
+
+
+class ParameterSweepRunner:
+    """
+    Runs a SweepConfig across a process pool.
+
+    Features:
+    - One price load per coin, shared with workers via shared memory
+    - Rolling means cached per worker and coin
+    - Ranked result table
+    """
+
+    def __init__(self, service: BacktestService, max_workers: int | None = None):
+        """
+        Initialize the runner
+
+        Args:
+            service: BacktestService used to load price data
+            max_workers: Worker processes (default: CPU count). 1 runs the
+                grid in-process without a pool.
+        """
+        self.service = service
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    def run(self, config: SweepConfig) -> SweepResult:
+        """
+        Run the sweep
+
+        Args:
+            config: Sweep configuration. Pairs with fast_window >= slow_window
+                are skipped.
+
+        Returns:
+            SweepResult with rows sorted by config.rank_by (best first)
+        """
+        if config.rank_by not in RANKABLE_METRICS:
+            raise ValueError(
+                f"rank_by must be one of {', '.join(RANKABLE_METRICS)}, got {config.rank_by}"
+            )
+
+        combos = sorted(
+            (fast, slow)
+            for fast, slow in product(
+                set(config.fast_windows), set(config.slow_windows)
+            )
+            if 0 < fast < slow
+        )
+        fee_rates = list(dict.fromkeys(config.fee_rates))
+        initial_capital = float(config.initial_capital)
+
+        closes: dict[str, np.ndarray] = {}
+        missing: list[str] = []
+        for coin_type in dict.fromkeys(config.coin_types):
+            df = self.service._fetch_data(coin_type, config.start_date, config.end_date)
+            if df.empty:
+                missing.append(coin_type)
+            else:
+                closes[coin_type] = df["close"].to_numpy(dtype=np.float64)
+
+        logger.info(
+            f"Sweeping {len(combos) * len(fee_rates)} combinations over "
+            f"{len(closes)} coins with {self.max_workers} workers"
+        )
+
+        if self.max_workers == 1 or not closes or not combos:
+            rows = []
+            for coin_type, close in closes.items():
+                for row in evaluate_grid(
+                    close,
+                    RollingMeanCache(),
+                    combos,
+                    fee_rates,
+                    config.slippage,
+                    initial_capital,
+                ):
+                    row["coin_type"] = coin_type
+                    rows.append(row)
+        else:
+            rows = self._run_pool(
+                closes, combos, fee_rates, config.slippage, initial_capital
+            )
+
+        # Higher is better for every metric (max_drawdown is <= 0)
+        rows.sort(
+            key=lambda row: (
+                -math.inf if math.isnan(row[config.rank_by]) else row[config.rank_by]
+            ),
+            reverse=True,
+        )
+
+        return SweepResult(
+            rank_by=config.rank_by,
+            combinations=len(combos) * len(fee_rates),
+            rows=[
+                SweepResultRow(rank=rank, **row)
+                for rank, row in enumerate(rows, start=1)
+            ],
+            coins_without_data=missing,
+        )
+
+    def _run_pool(
+        self,
+        closes: dict[str, np.ndarray],
+        combos: list[tuple[int, int]],
+        fee_rates: list[float],
+        slippage: float,
+        initial_capital: float,
+    ) -> list[dict[str, Any]]:
+        """Fan coin x combo chunks out to the process pool"""
+        blocks: list[shared_memory.SharedMemory] = []
+        chunk_size = math.ceil(len(combos) / self.max_workers)
+        try:
+            tasks = []
+            for coin_type, close in closes.items():
+                block = shared_memory.SharedMemory(create=True, size=close.nbytes)
+                blocks.append(block)
+                np.ndarray(close.shape, dtype=np.float64, buffer=block.buf)[:] = close
+                series = SharedSeries(name=block.name, length=len(close))
+                for start in range(0, len(combos), chunk_size):
+                    tasks.append(
+                        (coin_type, series, combos[start : start + chunk_size])
+                    )
+
+            rows = []
+            with ProcessPoolExecutor(max_workers=self.max_workers) as pool:
+                futures = [
+                    pool.submit(
+                        _run_task,
+                        coin_type,
+                        series,
+                        chunk,
+                        fee_rates,
+                        slippage,
+                        initial_capital,
+                    )
+                    for coin_type, series, chunk in tasks
+                ]
+                for future in futures:
+                    rows.extend(future.result())
+            return rows
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
@@ -2,7 +2,8 @@ import logging
 from datetime import datetime
 from typing import Any
 
-from sqlmodel import Session, select
+from sqlalchemy import insert
+from sqlmodel import Session, col, select
 
 from app.models import NewsItem, SentimentScore, Signal
 
@@ -21,23 +22,33 @@ class DataIngestionService:
         """
         Ingests a list of raw data items from a collector.
         Returns the count of new items added.
+
+        Items are normalized first, then news links are checked for
+        duplicates in one query and each table is written with one bulk
+        insert, so a batch costs a constant number of round trips.
         """
-        count = 0
+        news: dict[str, dict[str, Any]] = {}
+        signals: list[dict[str, Any]] = []
+        sentiments: list[dict[str, Any]] = []
+        collected_at = datetime.utcnow()
+
         for item in data:
             try:
                 # Basic heuristic
                 if "title" in item and "link" in item:
-                    # Likely a News Item
-                    if self._save_news_item(collector_name, item):
-                        count += 1
+                    # Likely a News Item (first occurrence of a link wins)
+                    news.setdefault(
+                        item["link"],
+                        self._news_row(collector_name, item, collected_at),
+                    )
                 elif "type" in item and "asset" in item and "strength" in item:
                     # Likely a Signal
-                    if self._save_signal(collector_name, item):
-                        count += 1
+                    signals.append(self._signal_row(collector_name, item, collected_at))
                 elif "asset" in item and "score" in item:
                     # Likely a Sentiment Score
-                    if self._save_sentiment(collector_name, item):
-                        count += 1
+                    sentiments.append(
+                        self._sentiment_row(collector_name, item, collected_at)
+                    )
                 else:
                     logging.warning(
                         f"Unknown data format from {collector_name}: {list(item.keys())}"
@@ -47,6 +58,16 @@ class DataIngestionService:
                 logging.error(f"Error ingesting item from {collector_name}: {e}")
 
         try:
+            news_rows = self._new_news_rows(list(news.values()))
+            count = 0
+            for model, rows in (
+                (NewsItem, news_rows),
+                (Signal, signals),
+                (SentimentScore, sentiments),
+            ):
+                if rows:
+                    self.session.execute(insert(model), rows)
+                    count += len(rows)
             self.session.commit()
         except Exception as e:
             logging.error(f"Commit failed during ingestion: {e}")
@@ -55,46 +76,55 @@ class DataIngestionService:
 
         return count
 
-    def _save_news_item(self, source: str, data: dict[str, Any]) -> bool:
-        # Check for duplicates using link
-        query = select(NewsItem).where(NewsItem.link == data["link"])
-        existing = self.session.exec(query).first()
-        if existing:
-            return False
+    def _new_news_rows(self, rows: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Drop news rows whose link is already stored (one query)"""
+        if not rows:
+            return []
+        links = [row["link"] for row in rows]
+        existing = set(
+            self.session.exec(
+                select(NewsItem.link).where(col(NewsItem.link).in_(links))
+            )
+        )
+        return [row for row in rows if row["link"] not in existing]
 
+    def _news_row(
+        self, source: str, data: dict[str, Any], collected_at: datetime
+    ) -> dict[str, Any]:
         # published date is not stored in the current model schema
+        return {
+            "title": data.get("title"),
+            "link": data.get("link"),
+            # "published_at": published, # Assume pre-parsed or valid type for now
+            "summary": data.get("summary"),
+            "source": source,
+            "collected_at": collected_at,
+        }
 
-        news = NewsItem(
-            title=data.get("title"),
-            link=data.get("link"),
-            # published_at=published, # Assume pre-parsed or valid type for now
-            summary=data.get("summary"),
-            source=source,
-            collected_at=datetime.utcnow(),
-        )
-        self.session.add(news)
-        return True
-
-    def _save_signal(self, source: str, data: dict[str, Any]) -> bool:
-        signal = Signal(
-            type=data.get("type"),
-            asset=data.get("asset"),
-            strength=data.get("strength"),
-            source=source,
-            context=data.get("context", {}),
-            generated_at=datetime.utcnow(),
-        )
-        self.session.add(signal)
-        return True
-
-    def _save_sentiment(self, source: str, data: dict[str, Any]) -> bool:
-        sentiment = SentimentScore(
-            asset=data.get("asset"),
-            source=source,
-            score=data.get("score"),
-            magnitude=data.get("magnitude"),
-            raw_data=data.get("raw_data", {}),
-            timestamp=datetime.utcnow(),
-        )
-        self.session.add(sentiment)
-        return True
+    def _signal_row(
+        self, source: str, data: dict[str, Any], generated_at: datetime
+    ) -> dict[str, Any]:
+        strength = data.get("strength")
+        return {
+            "type": data.get("type"),
+            "asset": data.get("asset"),
+            # An explicit NULL would bypass the model default
+            "strength": 0.0 if strength is None else strength,
+            "source": source,
+            "context": data.get("context", {}),
+            "generated_at": generated_at,
+        }
+
+    def _sentiment_row(
+        self, source: str, data: dict[str, Any], timestamp: datetime
+    ) -> dict[str, Any]:
+        score = data.get("score")
+        return {
+            "asset": data.get("asset"),
+            "source": source,
+            # An explicit NULL would bypass the model default
+            "score": 0.0 if score is None else score,
+            "magnitude": data.get("magnitude"),
+            "raw_data": data.get("raw_data", {}),
+            "timestamp": timestamp,
+        }
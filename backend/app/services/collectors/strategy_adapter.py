@@ -1,6 +1,10 @@
 import logging
+from collections import defaultdict
+from collections.abc import Callable
 from typing import Any
 
+from sqlalchemy import inspect
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session
 
@@ -14,6 +18,12 @@ from app.services.collectors.base import BaseCollector
 
 logger = logging.getLogger(__name__)
 
+# Dialects supporting INSERT ... ON CONFLICT DO NOTHING RETURNING
+BULK_INSERT: dict[str, Callable[..., postgresql.Insert | sqlite.Insert]] = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
 
 class StrategyAdapterCollector(BaseCollector):
     """
@@ -30,6 +40,16 @@ class StrategyAdapterCollector(BaseCollector):
         self.strategy = strategy
         self.default_config = default_config or {}
 
+    async def run(self) -> bool:
+        success = await super().run()
+        # The strategy keeps what it returned (feed validators, seen items)
+        # only once the run's items are committed
+        if success:
+            self.strategy.commit(self.default_config)
+        else:
+            self.strategy.discard(self.default_config)
+        return success
+
     async def collect(self) -> list[Any]:
         logger.info(f"Running strategy: {self.strategy.name}")
         # In a real impl, config would come from DB dynamically
@@ -49,24 +69,83 @@ class StrategyAdapterCollector(BaseCollector):
         if not data:
             return 0
 
-        count = 0
-        stored_items: list[NewsItem] = []
-
+        # Group model instances by class for one bulk insert each
+        groups: defaultdict[type, list[Any]] = defaultdict(list)
         for item in data:
             if not hasattr(item, "id"):
                 logger.warning(
                     f"Item {item} is not a valid model instance, skipping storage."
                 )
                 continue
+            groups[type(item)].append(item)
+
+        count = 0
+        stored_items: list[NewsItem] = []
+
+        for items in groups.values():
+            stored = self._bulk_insert(items, session)
+            if stored is None:
+                stored = self._insert_each(items, session)
+            count += len(stored)
+            # Track NewsItem objects for enrichment
+            stored_items.extend(item for item in stored if isinstance(item, NewsItem))
+
+        # Auto-trigger enrichment for newly stored news items
+        if stored_items:
+            await self._enrich_items(stored_items, session)
+
+        return count
+
+    def _bulk_insert(self, items: list[Any], session: Session) -> list[Any] | None:
+        """
+        Insert items of one model with INSERT ... ON CONFLICT DO NOTHING RETURNING.
+
+        Duplicates are skipped by the database, so only newly inserted rows
+        are returned (as persistent instances with their ids).
+
+        Returns:
+            Newly stored rows, or None if the dialect has no bulk path or the
+            batch failed (the caller then stores items one by one)
+        """
+        insert = BULK_INSERT.get(session.get_bind().dialect.name)
+        if insert is None:
+            return None
+
+        model = type(items[0])
+        # Leave unset (autoincrement) keys to the database
+        primary_keys = {column.key for column in inspect(model).primary_key}
+        rows = [
+            {
+                key: value
+                for key, value in item.model_dump().items()
+                if value is not None or key not in primary_keys
+            }
+            for item in items
+        ]
+
+        try:
+            with session.begin_nested():
+                return list(
+                    session.scalars(
+                        insert(model).on_conflict_do_nothing().returning(model), rows
+                    )
+                )
+        except Exception as e:
+            logger.warning(
+                f"Bulk insert of {len(items)} {model.__name__} rows failed for "
+                f"{self.strategy.name}, storing one by one: {e}"
+            )
+            return None
 
+    def _insert_each(self, items: list[Any], session: Session) -> list[Any]:
+        """Insert items one by one, each in its own savepoint."""
+        stored = []
+        for item in items:
             try:
                 with session.begin_nested():
                     session.add(item)
                     session.flush()
-                count += 1
-                # Track NewsItem objects for enrichment
-                if isinstance(item, NewsItem):
-                    stored_items.append(item)
+                stored.append(item)
             except IntegrityError:
                 logger.debug(
                     f"Duplicate item skipped for {self.strategy.name}: "
@@ -74,12 +153,7 @@ class StrategyAdapterCollector(BaseCollector):
                 )
             except Exception as e:
                 logger.error(f"Failed to store item for {self.strategy.name}: {e}")
-
-        # Auto-trigger enrichment for newly stored news items
-        if stored_items:
-            await self._enrich_items(stored_items, session)
-
-        return count
+        return stored
 
     async def _enrich_items(self, items: list[NewsItem], session: Session) -> None:
         """Run enrichment pipeline on newly stored news items."""
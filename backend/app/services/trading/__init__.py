@@ -16,8 +16,10 @@ from app.services.trading.algorithm_executor import (
 )
 from app.services.trading.client import CoinspotTradingClient
 from app.services.trading.executor import OrderExecutor, OrderQueue, get_order_queue
+from app.services.trading.ledger import PnLLedger, get_pnl_ledger
 from app.services.trading.pnl import PnLEngine, PnLMetrics, get_pnl_engine
 from app.services.trading.positions import PositionManager, get_position_manager
+from app.services.trading.price_cache import LatestPriceCache, get_price_cache
 from app.services.trading.recorder import TradeRecorder, get_trade_recorder
 from app.services.trading.safety import (
     SafetyViolation,
@@ -34,6 +36,8 @@ __all__ = [
     "get_order_queue",
     "PositionManager",
     "get_position_manager",
+    "LatestPriceCache",
+    "get_price_cache",
     # Weeks 3-4: Algorithm execution and safety
     "TradingSafetyManager",
     "get_safety_manager",
@@ -49,4 +53,6 @@ __all__ = [
     "PnLEngine",
     "PnLMetrics",
     "get_pnl_engine",
+    "PnLLedger",
+    "get_pnl_ledger",
 ]
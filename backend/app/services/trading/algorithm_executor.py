@@ -13,7 +13,7 @@ from uuid import UUID
 
 from sqlmodel import Session
 
-from app.models import AuditLog
+from app.services.trading.audit import get_audit_writer
 from app.services.trading.exceptions import AlgorithmExecutionError
 from app.services.trading.executor import get_order_queue
 from app.services.trading.recorder import TradeRecorder, get_trade_recorder
@@ -64,6 +64,7 @@ class AlgorithmExecutor:
     - Execute trades via Coinspot API
     - Manage algorithm state and performance
     - Apply safety checks before execution
+    - Batch execution of algorithms sharing a tick
     """
 
     def __init__(
@@ -119,101 +120,201 @@ class AlgorithmExecutor:
             # Generate trading signal
             signal = algorithm.generate_signal(market_data)
 
-            # Check if signal recommends action
-            action = signal.get("action")
-            if action == "hold" or not action:
-                logger.debug(
-                    f"Algorithm {algorithm_id} recommends holding, no action taken"
-                )
-                # Optional: Log 'hold' signals if needed, but might be spammy
-                return {"executed": False, "reason": "hold_signal", "signal": signal}
+            trade, result = await self._check_signal(
+                user_id, algorithm_id, signal, market_data
+            )
+            if trade is None:
+                return result
 
-            # Log the signal to AuditLog (The "Why")
-            # Convert signal decimals to strings for JSON serialization
-            serializable_signal = {
-                k: str(v) if isinstance(v, Decimal) else v for k, v in signal.items()
-            }
+            # Log trade attempt
+            order = self.trade_recorder.log_trade_attempt(**trade)
 
-            audit_log = AuditLog(
-                event_type="ALGORITHM_SIGNAL",
-                severity="info",
-                user_id=user_id,
-                details={
-                    "algorithm_id": str(algorithm_id),
-                    "signal": serializable_signal,
-                    "market_data_snapshot": {
-                        k: v
-                        for k, v in market_data.items()
-                        if k in ["price", "coin_type", "volume_24h"]
-                    },
-                },
-                timestamp=datetime.now(timezone.utc),
+            # Submit order to execution queue
+            await self.order_queue.submit(order.id, user_id, trade["coin_type"])
+
+            logger.info(
+                f"Algorithm {algorithm_id} submitted order {order.id}: "
+                f"{trade['side']} {trade['quantity']} {trade['coin_type']} "
+                f"(confidence: {signal.get('confidence', 0.0):.2f})"
             )
-            self.session.add(audit_log)
-            self.session.commit()
 
-            # Extract trade parameters
-            coin_type = signal.get("coin_type")
-            quantity = Decimal(str(signal.get("quantity", 0)))
-            confidence = signal.get("confidence", 0.0)
+            return {"executed": True, "order_id": str(order.id), **result}
 
-            if not coin_type or quantity <= 0:
-                logger.warning(
-                    f"Invalid signal from algorithm {algorithm_id}: {signal}"
-                )
-                return {"executed": False, "reason": "invalid_signal", "signal": signal}
+        except Exception as e:
+            logger.error(
+                f"Error executing algorithm {algorithm_id}: {e}", exc_info=True
+            )
+            raise AlgorithmExecutionError(f"Algorithm execution failed: {e}")
 
-            # Get estimated price
-            estimated_price = self._get_estimated_price(market_data, coin_type)
+    async def execute_batch(
+        self,
+        executions: list[tuple[UUID, UUID, TradingAlgorithm]],
+        market_data: dict[str, Any],
+    ) -> list[dict[str, Any]]:
+        """
+        Execute the algorithms due at one tick against a shared snapshot
 
-            # Validate trade with safety checks
+        Signals are generated for every algorithm first, then safety-checked,
+        recorded with a single commit and submitted to the order queue as one
+        batch. A failing algorithm gets an error result instead of stopping
+        the batch.
+
+        Args:
+            executions: (user_id, algorithm_id, algorithm) tuples
+            market_data: Market data snapshot shared by the batch
+
+        Returns:
+            One execution result per entry, in order
+        """
+        results: list[dict[str, Any]] = [{} for _ in executions]
+
+        signals = []
+        for index, (_, algorithm_id, algorithm) in enumerate(executions):
             try:
-                validation = await self.safety_manager.validate_trade(
-                    user_id=user_id,
-                    coin_type=coin_type,
-                    side=action,
-                    quantity=quantity,
-                    estimated_price=estimated_price,
-                    algorithm_id=algorithm_id,
+                signals.append((index, algorithm.generate_signal(market_data)))
+            except Exception as e:
+                logger.error(
+                    f"Error generating signal for algorithm {algorithm_id}: {e}"
                 )
-            except SafetyViolation as e:
-                logger.warning(f"Safety check failed for algorithm {algorithm_id}: {e}")
-                return {
-                    "executed": False,
-                    "reason": "safety_violation",
-                    "error": str(e),
-                    "signal": signal,
-                }
+                results[index] = {"executed": False, "reason": "error", "error": str(e)}
 
-            # Log trade attempt
-            order = self.trade_recorder.log_trade_attempt(
-                user_id=user_id,
-                coin_type=coin_type,
-                side=action,
-                quantity=quantity,
-                algorithm_id=algorithm_id,
-            )
+        trades = []
+        for index, signal in signals:
+            user_id, algorithm_id, _ = executions[index]
+            try:
+                trade, results[index] = await self._check_signal(
+                    user_id, algorithm_id, signal, market_data
+                )
+            except Exception as e:
+                logger.error(f"Error checking signal of algorithm {algorithm_id}: {e}")
+                results[index] = {"executed": False, "reason": "error", "error": str(e)}
+                continue
+            if trade is not None:
+                trades.append((index, trade))
 
-            # Submit order to execution queue
-            await self.order_queue.submit(order.id)
+        if not trades:
+            return results
 
-            logger.info(
-                f"Algorithm {algorithm_id} submitted order {order.id}: "
-                f"{action} {quantity} {coin_type} (confidence: {confidence:.2f})"
+        try:
+            order_ids = self.trade_recorder.log_trade_attempts(
+                [trade for _, trade in trades]
             )
+            await self.order_queue.submit_many(
+                [
+                    (order_id, trade["user_id"], trade["coin_type"])
+                    for order_id, (_, trade) in zip(order_ids, trades, strict=True)
+                ]
+            )
+        except Exception as e:
+            logger.error(f"Error submitting batch of {len(trades)} orders: {e}")
+            for index, _ in trades:
+                results[index] = {"executed": False, "reason": "error", "error": str(e)}
+            return results
 
-            return {
+        for order_id, (index, _) in zip(order_ids, trades, strict=True):
+            results[index] = {
                 "executed": True,
-                "order_id": str(order.id),
+                "order_id": str(order_id),
+                **results[index],
+            }
+        logger.info(
+            f"Batch of {len(executions)} algorithms submitted {len(trades)} orders"
+        )
+        return results
+
+    async def _check_signal(
+        self,
+        user_id: UUID,
+        algorithm_id: UUID,
+        signal: dict[str, Any],
+        market_data: dict[str, Any],
+    ) -> tuple[dict[str, Any] | None, dict[str, Any]]:
+        """
+        Audit and safety-check a signal
+
+        Args:
+            user_id: User ID
+            algorithm_id: Algorithm ID
+            signal: Signal generated by the algorithm
+            market_data: Market data the signal was generated from
+
+        Returns:
+            (trade, result): trade holds the log_trade_attempt arguments, or is
+            None when no order should be placed and result says why
+        """
+        # Check if signal recommends action
+        action = signal.get("action")
+        if action == "hold" or not action:
+            logger.debug(
+                f"Algorithm {algorithm_id} recommends holding, no action taken"
+            )
+            # Optional: Log 'hold' signals if needed, but might be spammy
+            return None, {"executed": False, "reason": "hold_signal", "signal": signal}
+
+        # Log the signal to AuditLog (The "Why")
+        # Convert signal decimals to strings for JSON serialization
+        serializable_signal = {
+            k: str(v) if isinstance(v, Decimal) else v for k, v in signal.items()
+        }
+
+        get_audit_writer().log(
+            event_type="ALGORITHM_SIGNAL",
+            severity="info",
+            user_id=user_id,
+            details={
+                "algorithm_id": str(algorithm_id),
+                "signal": serializable_signal,
+                "market_data_snapshot": {
+                    k: v
+                    for k, v in market_data.items()
+                    if k in ["price", "coin_type", "volume_24h"]
+                },
+            },
+            timestamp=datetime.now(timezone.utc),
+        )
+
+        # Extract trade parameters
+        coin_type = signal.get("coin_type")
+        quantity = Decimal(str(signal.get("quantity", 0)))
+
+        if not coin_type or quantity <= 0:
+            logger.warning(f"Invalid signal from algorithm {algorithm_id}: {signal}")
+            return None, {
+                "executed": False,
+                "reason": "invalid_signal",
                 "signal": signal,
-                "validation": validation,
             }
 
-        except Exception as e:
-            logger.error(
-                f"Error executing algorithm {algorithm_id}: {e}", exc_info=True
+        # Get estimated price
+        estimated_price = self._get_estimated_price(market_data, coin_type)
+
+        # Validate trade with safety checks
+        try:
+            validation = await self.safety_manager.validate_trade(
+                user_id=user_id,
+                coin_type=coin_type,
+                side=action,
+                quantity=quantity,
+                estimated_price=estimated_price,
+                algorithm_id=algorithm_id,
             )
-            raise AlgorithmExecutionError(f"Algorithm execution failed: {e}")
+        except SafetyViolation as e:
+            logger.warning(f"Safety check failed for algorithm {algorithm_id}: {e}")
+            return None, {
+                "executed": False,
+                "reason": "safety_violation",
+                "error": str(e),
+                "signal": signal,
+            }
+
+        trade = {
+            "user_id": user_id,
+            "coin_type": coin_type,
+            "side": action,
+            "quantity": quantity,
+            "algorithm_id": algorithm_id,
+        }
+        return trade, {"signal": signal, "validation": validation}
 
     def _get_estimated_price(
         self, market_data: dict[str, Any], coin_type: str
@@ -0,0 +1,212 @@
+"""
+Buffered Audit Log Writer
+
+Trading and safety events used to add an AuditLog row and commit the
+caller's session inline, putting a database round trip on every trade
+decision. Entries are now buffered in a bounded queue and bulk-inserted by
+a background thread, one multi-row INSERT per batch, on its own
+connections.
+
+CRITICAL events (kill switch changes) are still written synchronously so
+they are durable before the call returns. When the buffer is full the
+caller writes the pending entries itself instead of dropping them, and
+stop() drains the buffer on application shutdown (also registered with
+atexit).
+"""
+
+import atexit
+import logging
+import queue
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import insert
+from sqlalchemy.engine import Engine
+
+from app.models import AuditLog
+
+logger = logging.getLogger(__name__)
+
+SYNC_SEVERITIES = frozenset({"critical"})
+
+
+class AuditLogWriter:
+    """
+    Buffered AuditLog sink
+
+    Features:
+    - Bounded queue, bulk-inserted in batches by a background thread
+    - Synchronous writes for CRITICAL events
+    - Backpressure instead of loss when the queue is full
+    - flush() / stop() to drain the buffer
+    """
+
+    def __init__(
+        self,
+        engine: Engine | None = None,
+        max_queue_size: int = 10_000,
+        batch_size: int = 500,
+        flush_interval: float = 0.5,
+    ):
+        """
+        Initialize the writer
+
+        Args:
+            engine: Engine to write with (default: app.core.db.engine)
+            max_queue_size: Buffered entries before callers write inline
+            batch_size: Maximum rows per INSERT
+            flush_interval: Seconds the writer waits for more entries
+        """
+        self._engine = engine
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: queue.Queue[dict[str, Any]] = queue.Queue(max_queue_size)
+        self._thread: threading.Thread | None = None
+        self._thread_lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._atexit_registered = False
+        self.written = 0
+        self.failed = 0
+
+    @property
+    def engine(self) -> Engine:
+        if self._engine is None:
+            from app.core.db import engine
+
+            self._engine = engine
+        return self._engine
+
+    def log(
+        self,
+        event_type: str,
+        details: dict[str, Any],
+        severity: str = "info",
+        user_id: uuid.UUID | None = None,
+        timestamp: datetime | None = None,
+    ) -> None:
+        """
+        Record an audit event
+
+        Args:
+            event_type: AuditLog.event_type
+            details: JSON-serializable event details
+            severity: info, warning, error or critical (critical is written
+                before returning)
+            user_id: Acting or affected user
+            timestamp: Event time (default: now)
+        """
+        row = {
+            "id": uuid.uuid4(),
+            "timestamp": timestamp or datetime.now(timezone.utc),
+            "event_type": event_type,
+            "severity": severity.lower(),
+            "details": details,
+            "user_id": user_id,
+        }
+
+        if row["severity"] in SYNC_SEVERITIES:
+            self._write([row])
+            return
+
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            logger.warning("Audit log buffer full, writing inline")
+            backlog = self._drain(self.batch_size - 1)
+            try:
+                self._write([row, *backlog])
+            finally:
+                for _ in backlog:
+                    self._queue.task_done()
+
+    def flush(self) -> None:
+        """Block until every buffered entry has been written"""
+        if self._thread is None or not self._thread.is_alive():
+            while batch := self._drain(self.batch_size):
+                self._write_queued(batch)
+            return
+        self._queue.join()
+
+    def stop(self) -> None:
+        """Write buffered entries and stop the background thread"""
+        self._stopping.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join()
+            self._thread = None
+        self.flush()
+        self._stopping.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Get writer statistics"""
+        return {
+            "buffered": self._queue.qsize(),
+            "written": self.written,
+            "failed": self.failed,
+        }
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._thread_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="audit-log-writer", daemon=True
+                )
+                self._thread.start()
+                if not self._atexit_registered:
+                    # Once per writer, however often the thread is restarted
+                    atexit.register(self.stop)
+                    self._atexit_registered = True
+
+    def _run(self) -> None:
+        """Background loop: wait for an entry, then insert it with any backlog"""
+        while not (self._stopping.is_set() and self._queue.empty()):
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            self._write_queued([first, *self._drain(self.batch_size - 1)])
+
+    def _drain(self, limit: int) -> list[dict[str, Any]]:
+        """Take up to limit buffered entries without waiting"""
+        rows: list[dict[str, Any]] = []
+        while len(rows) < limit:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    def _write_queued(self, rows: list[dict[str, Any]]) -> None:
+        """Insert rows taken from the queue and mark them done"""
+        try:
+            self._write(rows)
+        finally:
+            for _ in rows:
+                self._queue.task_done()
+
+    def _write(self, rows: list[dict[str, Any]]) -> None:
+        """Insert rows with one multi-row INSERT"""
+        try:
+            with self.engine.begin() as connection:
+                connection.execute(insert(AuditLog.__table__), rows)  # type: ignore[attr-defined]
+            self.written += len(rows)
+        except Exception as e:
+            self.failed += len(rows)
+            logger.error(f"Failed to write {len(rows)} audit log entries: {e}")
+
+
+# Process-wide instance
+_audit_writer: AuditLogWriter | None = None
+
+
+def get_audit_writer() -> AuditLogWriter:
+    """Get the process-wide audit log writer"""
+    global _audit_writer
+    if _audit_writer is None:
+        _audit_writer = AuditLogWriter()
+    return _audit_writer
@@ -3,19 +3,41 @@
 
 import json
 import logging
+import statistics
 import uuid
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from typing import Any
 
+import numpy as np
 import pandas as pd
-from sqlmodel import Session, select
-
-from app.models import Algorithm, BacktestRun, PriceData5Min
+from sqlmodel import Session
+
+from app.models import Algorithm, BacktestRun
+from app.services.backtesting.price_loader import load_price_frame
+from app.services.trading.equity_curve import (
+    EQUITY_CURVE_PREVIEW_POINTS,
+    lttb_indices,
+    pack_equity_curve,
+)
 from app.services.trading.metrics import calculate_backtest_metrics
 
 logger = logging.getLogger(__name__)
 
+# Rows skipped before the first ML prediction so rolling features can warm up
+ML_WARMUP_ROWS = 50
+
+DEFAULT_FEATURE_COLUMNS = (
+    "SMA_10",
+    "SMA_50",
+    "RSI_14",
+    "returns_1d",
+    "returns_5d",
+    "volatility_20d",
+    "volume_ma_10",
+)
+
 
 def generate_features(prices_df: pd.DataFrame) -> pd.DataFrame:
     """
@@ -56,11 +78,254 @@ def generate_features(prices_df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+def _prediction_signal(prediction: Any) -> int:
+    """Interpret a model prediction: 1=buy, 0=hold/sell."""
+    return int(prediction) if isinstance(prediction, int | float) else 0
+
+
+def _resolve_hold_state(
+    prices: np.ndarray,
+    buy: np.ndarray,
+    sell: np.ndarray,
+    initial_capital: float,
+) -> np.ndarray:
+    """
+    Resolve the long/flat state when the cash check blocks an entry.
+
+    Walks only the rows that carry a buy or sell signal, tracking cash so a
+    buy is taken only while flat and cash exceeds the price.
+    """
+    state = np.zeros(len(prices), dtype=bool)
+    cash = initial_capital
+    holding = False
+    entry_idx = 0
+
+    for i in np.flatnonzero(buy | sell):
+        price = prices[i]
+        if buy[i] and not holding and cash > price:
+            holding = True
+            entry_idx = i
+        elif sell[i] and holding:
+            state[entry_idx:i] = True
+            cash = cash / prices[entry_idx] * price
+            holding = False
+
+    if holding:
+        state[entry_idx:] = True
+    return state
+
+
+def simulate_long_only(
+    timestamps: pd.Series,
+    prices: np.ndarray,
+    buy: np.ndarray,
+    sell: np.ndarray,
+    initial_capital: float,
+) -> tuple[list[dict], list[dict]]:
+    """
+    Simulate an all-in, long-only strategy with array operations.
+
+    Produces the same trade log and equity curve as the row-by-row loops:
+    a buy signal while flat invests all cash when cash exceeds the price, and
+    a sell signal while long liquidates the position.
+
+    Args:
+        timestamps: Row timestamps
+        prices: Execution prices per row
+        buy: Boolean buy signal per row
+        sell: Boolean sell signal per row (mutually exclusive with buy)
+        initial_capital: Starting cash
+
+    Returns:
+        Tuple of (trades, equity_curve)
+    """
+    n = len(prices)
+    if n == 0:
+        return [], []
+
+    buy = np.asarray(buy, dtype=bool)
+    sell = np.asarray(sell, dtype=bool)
+
+    # Long/flat state after each row: the most recent signal wins
+    row_idx = np.arange(n)
+    last_signal = np.maximum.accumulate(np.where(buy | sell, row_idx, -1))
+    state = (last_signal >= 0) & buy[np.maximum(last_signal, 0)]
+
+    for resolved in (False, True):
+        prev_state = np.concatenate(([False], state[:-1]))
+        entry_mask = state & ~prev_state
+        exit_mask = prev_state & ~state
+        entry_idx = np.flatnonzero(entry_mask)
+        exit_idx = np.flatnonzero(exit_mask)
+
+        entry_prices = prices[entry_idx]
+        exit_prices = prices[exit_idx]
+
+        # Cash after each round trip compounds by exit/entry price ratio
+        growth = exit_prices / entry_prices[: len(exit_idx)]
+        cash_after_exit = initial_capital * np.concatenate(([1.0], np.cumprod(growth)))
+        cash_at_entry = cash_after_exit[: len(entry_idx)]
+
+        if resolved or np.all(cash_at_entry > entry_prices):
+            break
+        # An entry lacked cash; the position path is path-dependent from here
+        state = _resolve_hold_state(prices, buy, sell, initial_capital)
+
+    quantities = cash_at_entry / entry_prices
+
+    # Equity is the open quantity marked to price while long, else cash
+    flat_equity = cash_after_exit[np.cumsum(exit_mask)]
+    if len(entry_idx):
+        open_quantity = quantities[np.maximum(np.cumsum(entry_mask) - 1, 0)]
+        equity = np.where(state, open_quantity * prices, flat_equity)
+    else:
+        equity = flat_equity
+
+    timestamp_strs = [str(ts) for ts in timestamps]
+
+    trades: list[dict[str, Any]] = []
+    for k, i in enumerate(entry_idx.tolist()):
+        quantity = float(quantities[k])
+        entry_price = float(entry_prices[k])
+        trades.append(
+            {
+                "timestamp": timestamp_strs[i],
+                "action": "buy",
+                "price": entry_price,
+                "quantity": quantity,
+                "pnl": 0.0,
+            }
+        )
+        if k < len(exit_idx):
+            exit_price = float(exit_prices[k])
+            trades.append(
+                {
+                    "timestamp": timestamp_strs[exit_idx[k]],
+                    "action": "sell",
+                    "price": exit_price,
+                    "quantity": quantity,
+                    "pnl": quantity * exit_price - entry_price * quantity,
+                }
+            )
+
+    equity_curve = [
+        {"timestamp": ts, "equity": value}
+        for ts, value in zip(timestamp_strs, equity.tolist(), strict=True)
+    ]
+    return trades, equity_curve
+
+
+def _as_utc(moment: datetime) -> datetime:
+    """Treat naive datetimes as UTC."""
+    return moment if moment.tzinfo else moment.replace(tzinfo=timezone.utc)
+
+
+def walk_forward_windows(
+    start_date: datetime,
+    end_date: datetime,
+    train_window: timedelta,
+    test_window: timedelta,
+    step: timedelta | None = None,
+) -> list[tuple[datetime, datetime, datetime]]:
+    """
+    Split a range into rolling train/test windows.
+
+    Args:
+        start_date: Start of the first train window
+        end_date: Latest allowed end of a test window
+        train_window: Length of each in-sample window
+        test_window: Length of each out-of-sample window
+        step: Offset between consecutive windows (default: test_window,
+            i.e. non-overlapping test windows)
+
+    Returns:
+        List of (train_start, test_start, test_end) tuples
+
+    Raises:
+        ValueError: If a window length is not positive or no window fits
+    """
+    step = step or test_window
+    if min(train_window, test_window, step) <= timedelta(0):
+        raise ValueError("train_window, test_window and step must be positive")
+
+    windows = []
+    train_start = start_date
+    while train_start + train_window + test_window <= end_date:
+        test_start = train_start + train_window
+        windows.append((train_start, test_start, test_start + test_window))
+        train_start += step
+
+    if not windows:
+        raise ValueError(
+            f"Range {start_date} to {end_date} is shorter than one "
+            f"train + test window ({train_window + test_window})"
+        )
+    return windows
+
+
+def aggregate_walk_forward(windows: list[dict], chained: bool) -> dict:
+    """
+    Aggregate per-window walk-forward metrics.
+
+    Args:
+        windows: Window dicts with train_metrics and test_metrics
+        chained: Whether test windows are contiguous and non-overlapping, so
+            their returns can be compounded
+
+    Returns:
+        Aggregate out-of-sample metrics
+    """
+    test_returns = [w["test_metrics"]["total_return"] for w in windows]
+    train_returns = [w["train_metrics"]["total_return"] for w in windows]
+    mean_test_return = statistics.fmean(test_returns)
+    mean_train_return = statistics.fmean(train_returns)
+
+    compounded = None
+    if chained:
+        compounded = 1.0
+        for r in test_returns:
+            compounded *= 1 + r
+        compounded -= 1
+
+    return {
+        "num_windows": len(windows),
+        "mean_test_return": round(mean_test_return, 6),
+        "median_test_return": round(statistics.median(test_returns), 6),
+        "compounded_test_return": (
+            round(compounded, 6) if compounded is not None else None
+        ),
+        "positive_window_ratio": round(
+            sum(1 for r in test_returns if r > 0) / len(windows), 4
+        ),
+        "mean_test_sharpe": round(
+            statistics.fmean(w["test_metrics"]["sharpe_ratio"] for w in windows), 4
+        ),
+        "worst_test_drawdown": max(w["test_metrics"]["max_drawdown"] for w in windows),
+        "total_test_trades": sum(w["test_metrics"]["num_trades"] for w in windows),
+        "mean_train_return": round(mean_train_return, 6),
+        # Out-of-sample return relative to in-sample (None when in-sample <= 0)
+        "walk_forward_efficiency": (
+            round(mean_test_return / mean_train_return, 4)
+            if mean_train_return > 0
+            else None
+        ),
+    }
+
+
 class BacktestEngine:
     """Engine for running historical backtests on algorithms."""
 
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, vectorized: bool = True):
+        """
+        Initialize the engine.
+
+        Args:
+            session: Database session
+            vectorized: Simulate with array operations and batched model
+                predictions (default: True). False uses the row-by-row loops.
+        """
         self.session = session
+        self.vectorized = vectorized
 
     def run(
         self,
@@ -72,54 +337,13 @@ class BacktestEngine:
         user_id: uuid.UUID,
     ) -> BacktestRun:
         """Run a backtest and return the persisted BacktestRun."""
-        # Create the run record
-        backtest_run = BacktestRun(
-            user_id=user_id,
-            algorithm_id=algorithm_id,
-            coin_type=coin_type,
-            start_date=start_date,
-            end_date=end_date,
-            initial_capital=initial_capital,
-            status="running",
+        backtest_run = self._create_run(
+            algorithm_id, coin_type, start_date, end_date, initial_capital, user_id
         )
-        self.session.add(backtest_run)
-        self.session.commit()
-        self.session.refresh(backtest_run)
 
         try:
-            # Load algorithm
-            algorithm = self.session.get(Algorithm, algorithm_id)
-            if not algorithm:
-                raise ValueError(f"Algorithm {algorithm_id} not found")
-
-            # Query price data
-            statement = (
-                select(PriceData5Min)
-                .where(PriceData5Min.coin_type == coin_type)
-                .where(PriceData5Min.timestamp >= start_date)
-                .where(PriceData5Min.timestamp <= end_date)
-                .order_by(PriceData5Min.timestamp)
-            )
-            prices = self.session.exec(statement).all()
-
-            if not prices:
-                raise ValueError(
-                    f"No price data found for {coin_type} between {start_date} and {end_date}"
-                )
-
-            # Convert to DataFrame
-            prices_df = pd.DataFrame(
-                [
-                    {
-                        "timestamp": p.timestamp,
-                        "bid": float(p.bid),
-                        "ask": float(p.ask),
-                        "last": float(p.last),
-                    }
-                    for p in prices
-                ]
-            )
-            prices_df = prices_df.sort_values("timestamp").reset_index(drop=True)
+            algorithm = self._load_algorithm(algorithm_id)
+            prices_df = self._load_prices(coin_type, start_date, end_date)
 
             # Determine strategy type and run simulation
             if algorithm.algorithm_type == "ml_model" and algorithm.artifact_id:
@@ -138,7 +362,7 @@ class BacktestEngine:
             # Update run
             backtest_run.status = "completed"
             backtest_run.results_json = json.dumps(metrics)
-            backtest_run.equity_curve_json = json.dumps(equity_curve)
+            self._store_equity_curve(backtest_run, equity_curve)
             backtest_run.trade_log_json = json.dumps(trades)
             backtest_run.completed_at = datetime.now(timezone.utc)
 
@@ -153,6 +377,209 @@ class BacktestEngine:
         self.session.refresh(backtest_run)
         return backtest_run
 
+    def run_walk_forward(
+        self,
+        algorithm_id: uuid.UUID,
+        coin_type: str,
+        start_date: datetime,
+        end_date: datetime,
+        initial_capital: Decimal,
+        user_id: uuid.UUID,
+        train_window: timedelta,
+        test_window: timedelta,
+        step: timedelta | None = None,
+        max_workers: int = 1,
+    ) -> BacktestRun:
+        """
+        Run a walk-forward backtest over rolling train/test windows.
+
+        Prices are loaded once, and features, model predictions and moving
+        averages are computed once over the full range and sliced per
+        window. Every indicator only looks backwards, so each slice matches
+        what a standalone run would see with the train window as history.
+        Each window is simulated in-sample (train) and out-of-sample (test),
+        starting from initial_capital.
+
+        Args:
+            algorithm_id: Algorithm to evaluate
+            coin_type: Coin symbol
+            start_date: Start of the first train window
+            end_date: Latest allowed end of a test window
+            initial_capital: Starting capital per window
+            user_id: Owner of the run
+            train_window: Length of each in-sample window
+            test_window: Length of each out-of-sample window
+            step: Offset between windows (default: test_window)
+            max_workers: Threads used to simulate windows in parallel
+
+        Returns:
+            Persisted BacktestRun. results_json holds the per-window metrics
+            and the aggregate; the equity curve and trade log hold the
+            out-of-sample segments tagged with their window index.
+        """
+        backtest_run = self._create_run(
+            algorithm_id, coin_type, start_date, end_date, initial_capital, user_id
+        )
+
+        try:
+            windows = walk_forward_windows(
+                _as_utc(start_date), _as_utc(end_date), train_window, test_window, step
+            )
+            algorithm = self._load_algorithm(algorithm_id)
+            prices_df = self._load_prices(coin_type, start_date, end_date)
+
+            # Signals for the full range, computed once
+            if algorithm.algorithm_type == "ml_model" and algorithm.artifact_id:
+                model, scaler, features_df, feature_columns = self._prepare_ml(
+                    algorithm, prices_df
+                )
+                signals = self._ml_signals(model, scaler, features_df, feature_columns)
+                buy, sell = signals == 1, signals == 0
+                first_tradable = ML_WARMUP_ROWS
+            else:
+                first_tradable = self._add_moving_averages(algorithm, prices_df)
+                buy, sell = self._crossover_signals(prices_df)
+
+            timestamps = prices_df["timestamp"]
+            prices = prices_df["last"].to_numpy(dtype=float)
+            capital = float(initial_capital)
+
+            def bounds(moment: datetime) -> int:
+                index = int(timestamps.searchsorted(pd.Timestamp(moment)))
+                return max(index, first_tradable)
+
+            def simulate(index: int) -> tuple[dict, list[dict], list[dict]]:
+                train_start, test_start, test_end = windows[index]
+                segments = {}
+                for name, lo, hi in (
+                    ("train", bounds(train_start), bounds(test_start)),
+                    ("test", bounds(test_start), bounds(test_end)),
+                ):
+                    trades, equity_curve = simulate_long_only(
+                        timestamps.iloc[lo:hi],
+                        prices[lo:hi],
+                        buy[lo:hi],
+                        sell[lo:hi],
+                        capital,
+                    )
+                    segments[name] = (trades, equity_curve)
+
+                test_trades, test_equity = segments["test"]
+                summary = {
+                    "window": index,
+                    "train_start": train_start.isoformat(),
+                    "test_start": test_start.isoformat(),
+                    "test_end": test_end.isoformat(),
+                }
+                for name, (trades, equity_curve) in segments.items():
+                    summary[f"{name}_metrics"] = calculate_backtest_metrics(
+                        [e["equity"] for e in equity_curve], trades
+                    )
+                for record in (*test_trades, *test_equity):
+                    record["window"] = index
+                return summary, test_trades, test_equity
+
+            if max_workers > 1:
+                with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                    results = list(pool.map(simulate, range(len(windows))))
+            else:
+                results = [simulate(index) for index in range(len(windows))]
+
+            summaries = [summary for summary, _, _ in results]
+            chained = (step or test_window) >= test_window
+
+            backtest_run.status = "completed"
+            backtest_run.results_json = json.dumps(
+                {
+                    "mode": "walk_forward",
+                    "train_window_seconds": train_window.total_seconds(),
+                    "test_window_seconds": test_window.total_seconds(),
+                    "step_seconds": (step or test_window).total_seconds(),
+                    "windows": summaries,
+                    "aggregate": aggregate_walk_forward(summaries, chained),
+                }
+            )
+            self._store_equity_curve(
+                backtest_run, [point for _, _, equity in results for point in equity]
+            )
+            backtest_run.trade_log_json = json.dumps(
+                [trade for _, trades, _ in results for trade in trades]
+            )
+            backtest_run.completed_at = datetime.now(timezone.utc)
+
+        except Exception as e:
+            logger.error(f"Walk-forward backtest failed: {e}")
+            backtest_run.status = "failed"
+            backtest_run.error_message = str(e)
+            backtest_run.completed_at = datetime.now(timezone.utc)
+
+        self.session.add(backtest_run)
+        self.session.commit()
+        self.session.refresh(backtest_run)
+        return backtest_run
+
+    def _create_run(
+        self,
+        algorithm_id: uuid.UUID,
+        coin_type: str,
+        start_date: datetime,
+        end_date: datetime,
+        initial_capital: Decimal,
+        user_id: uuid.UUID,
+    ) -> BacktestRun:
+        """Persist a BacktestRun in the running state."""
+        backtest_run = BacktestRun(
+            user_id=user_id,
+            algorithm_id=algorithm_id,
+            coin_type=coin_type,
+            start_date=start_date,
+            end_date=end_date,
+            initial_capital=initial_capital,
+            status="running",
+        )
+        self.session.add(backtest_run)
+        self.session.commit()
+        self.session.refresh(backtest_run)
+        return backtest_run
+
+    @staticmethod
+    def _store_equity_curve(
+        backtest_run: BacktestRun, equity_curve: list[dict[str, Any]]
+    ) -> None:
+        """
+        Store the full curve packed and an LTTB-downsampled preview as JSON.
+
+        The preview keeps the original point dicts (including any extra keys
+        such as the walk-forward window index).
+        """
+        timestamps = pd.to_datetime(
+            [point["timestamp"] for point in equity_curve], utc=True, format="ISO8601"
+        )
+        equity = np.array([point["equity"] for point in equity_curve], dtype=float)
+
+        backtest_run.equity_curve_blob = pack_equity_curve(timestamps, equity)
+        ns = timestamps.asi8
+        keep = lttb_indices(
+            (ns - ns[0]) / 1e9 if len(ns) else ns, equity, EQUITY_CURVE_PREVIEW_POINTS
+        )
+        backtest_run.equity_curve_json = json.dumps([equity_curve[i] for i in keep])
+
+    def _load_algorithm(self, algorithm_id: uuid.UUID) -> Algorithm:
+        algorithm = self.session.get(Algorithm, algorithm_id)
+        if not algorithm:
+            raise ValueError(f"Algorithm {algorithm_id} not found")
+        return algorithm
+
+    def _load_prices(
+        self, coin_type: str, start_date: datetime, end_date: datetime
+    ) -> pd.DataFrame:
+        prices_df = load_price_frame(self.session, coin_type, start_date, end_date)
+        if prices_df.empty:
+            raise ValueError(
+                f"No price data found for {coin_type} between {start_date} and {end_date}"
+            )
+        return prices_df
+
     def _run_ml_backtest(
         self,
         algorithm: Algorithm,
@@ -160,6 +587,22 @@ class BacktestEngine:
         initial_capital: float,
     ) -> tuple[list[dict], list[dict]]:
         """Run backtest using ML model predictions."""
+        model, scaler, features_df, feature_columns = self._prepare_ml(
+            algorithm, prices_df
+        )
+
+        if self.vectorized:
+            return self._simulate_ml_vectorized(
+                model, scaler, features_df, feature_columns, initial_capital
+            )
+        return self._simulate_ml_iterative(
+            model, scaler, features_df, feature_columns, initial_capital
+        )
+
+    def _prepare_ml(
+        self, algorithm: Algorithm, prices_df: pd.DataFrame
+    ) -> tuple[Any, Any, pd.DataFrame, list[str]]:
+        """Load the algorithm's model and generate features for the full range."""
         from app.services.agent.playground import ModelPlaygroundService
 
         # Load model
@@ -174,26 +617,102 @@ class BacktestEngine:
 
         # If no feature columns in metadata, use default generated features
         if not feature_columns:
-            feature_columns = [
-                "SMA_10",
-                "SMA_50",
-                "RSI_14",
-                "returns_1d",
-                "returns_5d",
-                "volatility_20d",
-                "volume_ma_10",
+            feature_columns = list(DEFAULT_FEATURE_COLUMNS)
+
+        return model, scaler, features_df, feature_columns
+
+    def _simulate_ml_vectorized(
+        self,
+        model: Any,
+        scaler: Any,
+        features_df: pd.DataFrame,
+        feature_columns: list[str],
+        initial_capital: float,
+    ) -> tuple[list[dict], list[dict]]:
+        """
+        Simulate an ML strategy with one batched model.predict call.
+
+        Falls back to per-row prediction if the model rejects the batch or
+        returns the wrong number of predictions.
+        """
+        if len(features_df) <= ML_WARMUP_ROWS:
+            return [], []
+
+        signals = self._ml_signals(model, scaler, features_df, feature_columns)
+        window = slice(ML_WARMUP_ROWS, None)
+        return simulate_long_only(
+            features_df["timestamp"].iloc[window],
+            features_df["last"].to_numpy(dtype=float)[window],
+            signals[window] == 1,
+            signals[window] == 0,
+            initial_capital,
+        )
+
+    def _ml_signals(
+        self,
+        model: Any,
+        scaler: Any,
+        features_df: pd.DataFrame,
+        feature_columns: list[str],
+    ) -> np.ndarray:
+        """
+        Predict signals for every row after the warmup in one batch.
+
+        Returns:
+            Signal per row of features_df (1=buy, 0=sell, -1 during warmup)
+        """
+        signals = np.full(len(features_df), -1, dtype=np.int64)
+        window = features_df.iloc[ML_WARMUP_ROWS:]
+        if window.empty:
+            return signals
+
+        columns = [col for col in feature_columns if col in window.columns]
+        features = window[columns].astype(float).reset_index(drop=True)
+
+        try:
+            batch = features
+            if scaler is not None:
+                batch = pd.DataFrame(scaler.transform(batch), columns=columns)
+            predictions = model.predict(batch)
+            if len(predictions) != len(batch):
+                raise ValueError(
+                    f"Model returned {len(predictions)} predictions for {len(batch)} rows"
+                )
+        except Exception as e:
+            logger.warning(f"Batch prediction failed, predicting per row: {e}")
+            predictions = [
+                self._predict_row(model, scaler, features.iloc[[i]])
+                for i in range(len(features))
             ]
 
-        # Simulate
+        signals[ML_WARMUP_ROWS:] = [_prediction_signal(p) for p in predictions]
+        return signals
+
+    @staticmethod
+    def _predict_row(model: Any, scaler: Any, row: pd.DataFrame) -> Any:
+        """Predict a single feature row, returning 0 (hold) on failure."""
+        try:
+            if scaler is not None:
+                row = pd.DataFrame(scaler.transform(row), columns=list(row.columns))
+            return model.predict(row)[0]
+        except Exception:
+            return 0  # Hold
+
+    def _simulate_ml_iterative(
+        self,
+        model: Any,
+        scaler: Any,
+        features_df: pd.DataFrame,
+        feature_columns: list[str],
+        initial_capital: float,
+    ) -> tuple[list[dict], list[dict]]:
+        """Simulate an ML strategy row by row (reference implementation)."""
         cash = initial_capital
         holdings = 0.0
         trades: list[dict[str, Any]] = []
         equity_curve: list[dict[str, Any]] = []
 
-        # Need enough data for feature generation
-        start_idx = 50  # Skip first 50 rows for feature warmup
-
-        for i in range(start_idx, len(features_df)):
+        for i in range(ML_WARMUP_ROWS, len(features_df)):
             row = features_df.iloc[i]
             price = row["last"]
             timestamp = str(row["timestamp"])
@@ -206,18 +725,10 @@ class BacktestEngine:
             }
 
             # Get prediction
-            try:
-                df_pred = pd.DataFrame([feature_values])
-                if scaler is not None:
-                    df_pred = pd.DataFrame(
-                        scaler.transform(df_pred), columns=list(feature_values.keys())
-                    )
-                prediction = model.predict(df_pred)[0]
-            except Exception:
-                prediction = 0  # Hold
-
-            # Simple signal interpretation: 1=buy, 0=hold/sell
-            signal = int(prediction) if isinstance(prediction, int | float) else 0
+            prediction = self._predict_row(
+                model, scaler, pd.DataFrame([feature_values])
+            )
+            signal = _prediction_signal(prediction)
 
             if signal == 1 and cash > price and holdings == 0:
                 # Buy
@@ -262,6 +773,19 @@ class BacktestEngine:
         initial_capital: float,
     ) -> tuple[list[dict], list[dict]]:
         """Run backtest using simple MA crossover strategy."""
+        long_window = self._add_moving_averages(algorithm, prices_df)
+
+        if self.vectorized:
+            return self._simulate_crossover_vectorized(
+                prices_df, long_window, initial_capital
+            )
+        return self._simulate_crossover_iterative(
+            prices_df, long_window, initial_capital
+        )
+
+    @staticmethod
+    def _add_moving_averages(algorithm: Algorithm, prices_df: pd.DataFrame) -> int:
+        """Add sma_short/sma_long columns from the algorithm config; returns long_window."""
         # Parse configuration
         config = {}
         if algorithm.configuration_json:
@@ -277,13 +801,51 @@ class BacktestEngine:
         prices_df["sma_long"] = (
             prices_df["last"].rolling(window=long_window, min_periods=1).mean()
         )
+        return long_window
+
+    @staticmethod
+    def _crossover_signals(prices_df: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+        """Golden and death cross flags per row from shifted SMA comparisons."""
+        short = prices_df["sma_short"].to_numpy(dtype=float)
+        long = prices_df["sma_long"].to_numpy(dtype=float)
+        prev_short = np.roll(short, 1)
+        prev_long = np.roll(long, 1)
+
+        golden_cross = (prev_short <= prev_long) & (short > long)
+        death_cross = (prev_short >= prev_long) & (short < long)
+        return golden_cross, death_cross
+
+    def _simulate_crossover_vectorized(
+        self,
+        prices_df: pd.DataFrame,
+        start_idx: int,
+        initial_capital: float,
+    ) -> tuple[list[dict], list[dict]]:
+        """Simulate an MA crossover strategy with shifted array comparisons."""
+        golden_cross, death_cross = self._crossover_signals(prices_df)
+
+        window = slice(start_idx, None)
+        return simulate_long_only(
+            prices_df["timestamp"].iloc[window],
+            prices_df["last"].to_numpy(dtype=float)[window],
+            golden_cross[window],
+            death_cross[window],
+            initial_capital,
+        )
 
+    def _simulate_crossover_iterative(
+        self,
+        prices_df: pd.DataFrame,
+        start_idx: int,
+        initial_capital: float,
+    ) -> tuple[list[dict], list[dict]]:
+        """Simulate an MA crossover strategy row by row (reference implementation)."""
         cash = initial_capital
         holdings = 0.0
         trades: list[dict[str, Any]] = []
         equity_curve: list[dict[str, Any]] = []
 
-        for i in range(long_window, len(prices_df)):
+        for i in range(start_idx, len(prices_df)):
             row = prices_df.iloc[i]
             prev_row = prices_df.iloc[i - 1]
             price = row["last"]
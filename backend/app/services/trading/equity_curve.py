@@ -0,0 +1,167 @@
+"""
+Compact Equity Curve Storage
+
+Backtest equity curves are stored as a packed binary blob instead of a JSON
+list of {"timestamp", "equity"} dicts. Timestamps are delta-encoded int64
+nanoseconds (a regular 5-minute grid collapses to a run of identical deltas)
+and equity values are raw float64, the whole payload zlib-compressed.
+
+Charts rarely need more than a few hundred points, so readers downsample
+with Largest-Triangle-Three-Buckets (LTTB), which keeps the visual shape of
+the curve (peaks, troughs, drawdowns) far better than taking every n-th
+point. Only the selected points are turned into Python objects.
+"""
+
+import struct
+import zlib
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+import pandas as pd  # type: ignore[import-untyped]
+
+# Magic + version byte, followed by the point count
+_HEADER = struct.Struct("<4sBI")
+_MAGIC = b"EQCV"
+_VERSION = 1
+
+# Points kept in BacktestRun.equity_curve_json and returned by default
+EQUITY_CURVE_PREVIEW_POINTS = 1000
+
+# Upper bound for a single downsampled read
+MAX_EQUITY_CURVE_POINTS = 10_000
+
+
+def pack_equity_curve(timestamps: Any, equity: Sequence[float] | np.ndarray) -> bytes:
+    """
+    Pack an equity curve into a compact binary blob.
+
+    Args:
+        timestamps: Point timestamps (anything pd.to_datetime accepts;
+            naive values are treated as UTC)
+        equity: Equity value per point
+
+    Returns:
+        Blob for BacktestRun.equity_curve_blob
+    """
+    ts = pd.DatetimeIndex(pd.to_datetime(timestamps, utc=True, format="ISO8601"))
+    ns = np.asarray(ts.asi8, dtype=np.int64)
+    values = np.asarray(equity, dtype=np.float64)
+    if len(ns) != len(values):
+        raise ValueError(
+            f"timestamps and equity differ in length ({len(ns)} != {len(values)})"
+        )
+
+    deltas = np.diff(ns, prepend=np.int64(0))
+    payload = zlib.compress(
+        deltas.astype("<i8").tobytes() + values.astype("<f8").tobytes()
+    )
+    return _HEADER.pack(_MAGIC, _VERSION, len(values)) + payload
+
+
+def unpack_equity_curve(blob: bytes) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Unpack a blob written by pack_equity_curve.
+
+    Args:
+        blob: Packed equity curve
+
+    Returns:
+        Tuple of (UTC timestamps as int64 nanoseconds, float64 equity)
+    """
+    magic, version, count = _HEADER.unpack_from(blob)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("Not a packed equity curve")
+
+    raw = zlib.decompress(blob[_HEADER.size :])
+    if len(raw) != count * 16:
+        raise ValueError("Packed equity curve is truncated")
+
+    ns = np.cumsum(np.frombuffer(raw, dtype="<i8", count=count))
+    equity = np.frombuffer(raw, dtype="<f8", count=count, offset=count * 8)
+    return ns.astype(np.int64), equity.astype(np.float64)
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, points: int) -> np.ndarray:
+    """
+    Select points with Largest-Triangle-Three-Buckets downsampling.
+
+    The first and last points are always kept. The points in between are
+    split into points - 2 buckets, and each bucket keeps the point forming
+    the largest triangle with the previously kept point and the average of
+    the next bucket.
+
+    Args:
+        x: Monotonic x values (e.g. timestamps)
+        y: Values
+        points: Number of points wanted
+
+    Returns:
+        Sorted indices of the kept points (all indices when points >= len(x),
+        always at least the first and last point otherwise)
+    """
+    n = len(x)
+    if points >= n or n <= 2:
+        return np.arange(n)
+    if points <= 2:
+        return np.array([0, n - 1])
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # Bucket boundaries over the interior points 1 .. n-2
+    edges = (np.arange(points - 1) * ((n - 2) / (points - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+
+    selected = np.empty(points, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n - 1
+    a = 0
+    for i in range(points - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        next_start = end if i + 2 < len(edges) else n - 1
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:end] - y[a])
+            - (x[a] - x[start:end]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+
+    return selected
+
+
+def downsample_equity_curve(
+    timestamps_ns: np.ndarray,
+    equity: np.ndarray,
+    points: int = EQUITY_CURVE_PREVIEW_POINTS,
+    time_key: str = "timestamp",
+    value_key: str = "equity",
+) -> list[dict[str, Any]]:
+    """
+    Downsample an equity curve to at most `points` chart points.
+
+    Args:
+        timestamps_ns: UTC timestamps as int64 nanoseconds
+        equity: Equity value per point
+        points: Maximum number of points returned
+        time_key: Key used for the timestamp in each point
+        value_key: Key used for the equity value in each point
+
+    Returns:
+        List of {time_key: str, value_key: float} in time order
+    """
+    indices = lttb_indices(
+        (timestamps_ns - timestamps_ns[0]) / 1e9
+        if len(timestamps_ns)
+        else timestamps_ns,
+        equity,
+        points,
+    )
+    kept = pd.to_datetime(timestamps_ns[indices], utc=True)
+    return [
+        {time_key: str(ts), value_key: float(value)}
+        for ts, value in zip(kept, equity[indices], strict=True)
+    ]
@@ -0,0 +1,145 @@
+"""
+Trading Event Publisher
+
+Publishes price and position changes on Redis pub/sub so services in other
+processes (the hard-stop watcher) can react to them instead of polling the
+database. Publishing is best effort: a Redis failure is logged and never
+breaks price ingest or order execution.
+
+Payloads are JSON with Decimals as strings. Position events carry the new
+absolute quantity (0 when closed), so replaying or reordering them is safe.
+"""
+
+import json
+import logging
+import time
+from collections.abc import Mapping
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+import redis.asyncio as redis
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+PRICE_CHANNEL = "omc:events:prices"
+POSITION_CHANNEL = "omc:events:positions"
+
+
+class TradingEventPublisher:
+    """
+    Publishes trading events on Redis pub/sub
+
+    Features:
+    - Price batches (one message per collector run)
+    - Absolute position updates per (user, coin)
+    - Lazy connection; after an error, events are dropped for retry_seconds
+      so an unavailable Redis does not slow down every caller
+    - Can be disabled, e.g. for historical replays that must not reach the
+      live subscribers
+    """
+
+    def __init__(
+        self,
+        redis_url: str | None = None,
+        retry_seconds: float = 5.0,
+        enabled: bool = True,
+    ):
+        """
+        Initialize the publisher
+
+        Args:
+            redis_url: Redis URL (default: settings.REDIS_URL)
+            retry_seconds: Pause after a failure before reconnecting
+            enabled: Publish events (False: drop them without connecting)
+        """
+        self.redis_url = redis_url or settings.REDIS_URL
+        self.retry_seconds = retry_seconds
+        self.enabled = enabled
+        self.redis_client: redis.Redis | None = None
+        self._retry_at = 0.0
+        self.published = 0
+        self.failed = 0
+
+    async def publish_prices(
+        self, prices: Mapping[str, Decimal], observed_at: datetime
+    ) -> None:
+        """
+        Publish the latest prices of a collector run
+
+        Args:
+            prices: coin_type -> last price
+            observed_at: Time of the observation
+        """
+        if not prices:
+            return
+        await self._publish(
+            PRICE_CHANNEL,
+            {
+                "prices": {coin: str(price) for coin, price in prices.items()},
+                "timestamp": observed_at.isoformat(),
+            },
+        )
+
+    async def publish_position(
+        self,
+        user_id: UUID,
+        coin_type: str,
+        quantity: Decimal,
+        average_price: Decimal,
+    ) -> None:
+        """
+        Publish the new state of a position
+
+        Args:
+            user_id: Position owner
+            coin_type: Coin of the position
+            quantity: New quantity (0 when the position was closed)
+            average_price: Average entry price
+        """
+        await self._publish(
+            POSITION_CHANNEL,
+            {
+                "user_id": str(user_id),
+                "coin_type": coin_type,
+                "quantity": str(quantity),
+                "average_price": str(average_price),
+            },
+        )
+
+    async def _publish(self, channel: str, payload: dict[str, Any]) -> None:
+        if not self.enabled:
+            return
+        if self.redis_client is None and time.monotonic() < self._retry_at:
+            self.failed += 1
+            return
+        try:
+            if self.redis_client is None:
+                self.redis_client = redis.from_url(
+                    self.redis_url,
+                    encoding="utf-8",
+                    decode_responses=True,
+                    socket_connect_timeout=1,
+                )
+            await self.redis_client.publish(channel, json.dumps(payload))
+            self.published += 1
+        except Exception as e:
+            self.failed += 1
+            self.redis_client = None
+            self._retry_at = time.monotonic() + self.retry_seconds
+            logger.warning(f"Failed to publish event on {channel}: {e}")
+
+
+# Process-wide instance
+_event_publisher: TradingEventPublisher | None = None
+
+
+def get_event_publisher() -> TradingEventPublisher:
+    """Get the process-wide trading event publisher"""
+    global _event_publisher
+    if _event_publisher is None:
+        _event_publisher = TradingEventPublisher()
+    return _event_publisher
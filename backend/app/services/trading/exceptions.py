@@ -35,3 +35,9 @@ class SafetyViolationError(Exception):
     """Exception raised when a safety check is violated."""
 
     pass
+
+
+class ReplayError(Exception):
+    """Exception raised when a historical replay cannot run."""
+
+    pass
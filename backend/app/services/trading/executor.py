@@ -4,10 +4,20 @@ Order Execution Service
 
 This module provides queue-based order execution with retry logic
 and order status tracking.
+
+Orders are queued in lanes keyed by (user_id, coin_type). A pool of workers
+executes lanes concurrently, but a lane is only ever held by one worker, so
+orders for the same user and coin run one at a time in submission order
+(position updates for a coin are read-modify-write) while a slow exchange
+call or retry backoff for one lane never blocks the others. Each order runs
+in its own database session, so a failed statement in one lane never leaves
+another lane's session needing a rollback.
 """
 
 import asyncio
 import logging
+import time
+from collections import deque
 from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Any
@@ -22,13 +32,32 @@ from app.services.trading.client import (
     CoinspotAPIError,
     CoinspotTradingClient,
 )
+from app.services.trading.events import TradingEventPublisher, get_event_publisher
 from app.services.trading.exceptions import OrderExecutionError
+from app.services.trading.ledger import PnLLedger
 from app.services.trading.paper_exchange import PaperExchange
 from app.services.trading.safety import SafetyViolation, TradingSafetyManager
 from app.services.websocket_manager import manager
 
 logger = logging.getLogger(__name__)
 
+# Latency samples kept for OrderExecutor.stats()
+LATENCY_SAMPLES = 1000
+
+LaneKey = tuple[UUID | None, str | None]
+
+
+def latency_summary(samples: deque[float]) -> dict[str, float]:
+    """p50 / p95 / max of latency samples in milliseconds"""
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "max": 0.0}
+    ordered = sorted(samples)
+    return {
+        "p50": ordered[len(ordered) // 2] * 1000,
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+        "max": ordered[-1] * 1000,
+    }
+
 
 class OrderExecutor:
     """
@@ -36,6 +65,9 @@ class OrderExecutor:
 
     Features:
     - Queue-based order submission
+    - Concurrent workers, serialized per (user_id, coin_type)
+    - A database session per order
+    - Queue depth and latency metrics
     - Exponential backoff retry logic
     - Order status tracking
     - Position updates after execution
@@ -50,46 +82,116 @@ class OrderExecutor:
         api_secret: str,
         max_retries: int = 3,
         retry_delay: float = 1.0,
+        max_concurrency: int | None = None,
+        paper_exchange: PaperExchange | None = None,
+        safety_manager: TradingSafetyManager | None = None,
+        event_publisher: TradingEventPublisher | None = None,
     ):
         """
         Initialize order executor
 
         Args:
-            session: Database session
+            session: Database session; workers run each order in a new
+                session on the same engine
             api_key: Coinspot API key
             api_secret: Coinspot API secret
             max_retries: Maximum number of retry attempts (default: 3)
             retry_delay: Initial retry delay in seconds (default: 1.0)
+            max_concurrency: Number of workers, i.e. orders in flight at once
+                (default: settings.ORDER_EXECUTOR_CONCURRENCY)
+            paper_exchange: Exchange used in paper mode (default: a fresh
+                PaperExchange created on start)
+            safety_manager: Safety manager (default: a new one on session)
+            event_publisher: Publisher of position events (default: the
+                process-wide one)
         """
         self.session = session
         self.api_key = api_key
         self.api_secret = api_secret
         self.max_retries = max_retries
         self.retry_delay = retry_delay
-        self._queue: asyncio.Queue[UUID] | None = None
+        self.max_concurrency = max(
+            1, max_concurrency or settings.ORDER_EXECUTOR_CONCURRENCY
+        )
+        # Ready queue of lane keys; a key is queued or held by a worker only
+        # while its lane exists, so each lane has at most one worker
+        self._queue: asyncio.Queue[LaneKey] | None = None
+        # Lane key -> pending (order_id, submitted_at monotonic)
+        self._lanes: dict[LaneKey, deque[tuple[UUID, float]]] = {}
         self._running = False
-        self.safety_manager = TradingSafetyManager(session)
-        self.paper_exchange: PaperExchange | None = None
+        self._active = 0
+        self.processed = 0
+        self._wait_samples: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self._execution_samples: deque[float] = deque(maxlen=LATENCY_SAMPLES)
+        self.safety_manager = safety_manager or TradingSafetyManager(session)
+        self.event_publisher = event_publisher or get_event_publisher()
+        self.paper_exchange: PaperExchange | None = paper_exchange
 
     @property
-    def queue(self) -> asyncio.Queue[UUID]:
-        """Get the order queue, initializing it if necessary"""
+    def queue(self) -> asyncio.Queue[LaneKey]:
+        """Get the ready-lane queue, initializing it if necessary"""
         if self._queue is None:
             self._queue = asyncio.Queue()
         return self._queue
 
-    async def submit_order(self, order_id: UUID) -> None:
+    async def submit_order(
+        self,
+        order_id: UUID,
+        user_id: UUID | None = None,
+        coin_type: str | None = None,
+    ) -> None:
         """
         Add an order to the execution queue
 
         Args:
             order_id: UUID of the order to execute
+            user_id: Owner of the order (loaded from the order if omitted)
+            coin_type: Coin of the order (loaded from the order if omitted)
         """
-        logger.info(f"Submitting order {order_id} to execution queue")
-        await self.queue.put(order_id)
+        if user_id is None or coin_type is None:
+            order = self.session.get(Order, order_id)
+            if order is not None:
+                user_id, coin_type = order.user_id, order.coin_type
+
+        key = (user_id, coin_type)
+        logger.info(f"Submitting order {order_id} to execution lane {key}")
+        self._enqueue(key, order_id, time.monotonic())
+
+    async def submit_orders(self, orders: list[tuple[UUID, UUID, str]]) -> None:
+        """
+        Add a batch of orders to the execution queue
+
+        Args:
+            orders: (order_id, user_id, coin_type) tuples, queued in order
+        """
+        submitted_at = time.monotonic()
+        for order_id, user_id, coin_type in orders:
+            self._enqueue((user_id, coin_type), order_id, submitted_at)
+        logger.info(f"Submitted batch of {len(orders)} orders")
+
+    def _enqueue(self, key: LaneKey, order_id: UUID, submitted_at: float) -> None:
+        """Append an order to its lane, queueing the lane if it was idle"""
+        lane = self._lanes.get(key)
+        if lane is None:
+            self._lanes[key] = deque([(order_id, submitted_at)])
+            self.queue.put_nowait(key)
+        else:
+            lane.append((order_id, submitted_at))
+
+    def stats(self) -> dict[str, Any]:
+        """Get queue depth and latency statistics"""
+        return {
+            "workers": self.max_concurrency,
+            "active": self._active,
+            "queue_depth": sum(len(lane) for lane in self._lanes.values()),
+            "lanes": len(self._lanes),
+            "processed": self.processed,
+            "queue_wait_ms": latency_summary(self._wait_samples),
+            "execution_ms": latency_summary(self._execution_samples),
+        }
 
     async def start(self) -> None:
-        """Start the order execution worker"""
+        """Start the order execution workers"""
         if self._running:
             logger.warning("Order executor is already running")
             return
@@ -99,32 +201,18 @@ class OrderExecutor:
 
         # Initialize PaperExchange if in paper mode
         if settings.TRADING_MODE == "paper":
-            logger.info("Initializing Paper Exchange")
-            self.paper_exchange = PaperExchange()
+            if self.paper_exchange is None:
+                logger.info("Initializing Paper Exchange")
+                self.paper_exchange = PaperExchange()
             await self.paper_exchange.__aenter__()
 
         self._running = True
-        logger.info("Starting order executor")
+        logger.info(f"Starting order executor with {self.max_concurrency} workers")
 
         try:
-            while self._running:
-                try:
-                    # Get next order from queue with timeout
-                    order_id = await asyncio.wait_for(self.queue.get(), timeout=1.0)
-
-                    # Execute the order
-                    await self._execute_order(order_id)
-
-                    # Mark task as done
-                    self.queue.task_done()
-
-                except asyncio.TimeoutError:
-                    # No orders in queue, continue waiting
-                    continue
-                except Exception as e:
-                    logger.error(
-                        f"Error in order executor main loop: {e}", exc_info=True
-                    )
+            await asyncio.gather(
+                *(self._worker(index) for index in range(self.max_concurrency))
+            )
         finally:
             self._running = False
             await self.safety_manager.disconnect()
@@ -135,22 +223,70 @@ class OrderExecutor:
             logger.info("Order executor stopped")
 
     async def stop(self) -> None:
-        """Stop the order execution worker"""
+        """Stop the order execution workers once queued orders are executed"""
         logger.info("Stopping order executor")
-        self._running = False
 
         # Wait for queue to be empty
-        await self._queue.join()
+        if self._running and self._queue is not None:
+            await self._queue.join()
+        self._running = False
+
+    async def drain(self) -> None:
+        """Wait until every submitted order has been executed"""
+        if self._running and self._queue is not None:
+            await self._queue.join()
+
+    async def _worker(self, index: int) -> None:
+        """Execute the next order of each ready lane until stopped"""
+        while self._running:
+            try:
+                # Get next ready lane with timeout
+                key = await asyncio.wait_for(self.queue.get(), timeout=1.0)
+            except asyncio.TimeoutError:
+                # No orders in queue, continue waiting
+                continue
+
+            try:
+                order_id, submitted_at = self._lanes[key].popleft()
+                started_at = time.monotonic()
+                self._wait_samples.append(started_at - submitted_at)
+                self._active += 1
+                try:
+                    with Session(self.session.get_bind()) as session:
+                        await self._execute_order(order_id, session)
+                finally:
+                    self._active -= 1
+                    self.processed += 1
+                    self._execution_samples.append(time.monotonic() - started_at)
+            except Exception as e:
+                logger.error(
+                    f"Error in order executor worker {index}: {e}", exc_info=True
+                )
+            finally:
+                # Hand the lane back if more orders arrived, else retire it
+                if self._lanes.get(key):
+                    self.queue.put_nowait(key)
+                else:
+                    self._lanes.pop(key, None)
+                self.queue.task_done()
 
-    async def _execute_order(self, order_id: UUID) -> None:
+    async def _execute_order(
+        self, order_id: UUID, session: Session | None = None
+    ) -> None:
         """
         Execute a single order with retry logic
 
         Args:
             order_id: UUID of the order to execute
+            session: Session to run the order in (default: the executor's)
         """
+        if session is None:
+            session = self.session
+        safety_manager = self.safety_manager.bind(session)
+        ledger = PnLLedger(session)
+
         # Load order from database
-        order = self.session.get(Order, order_id)
+        order = session.get(Order, order_id)
         if not order:
             logger.error(f"Order {order_id} not found in database")
             return
@@ -173,7 +309,7 @@ class OrderExecutor:
             # For limit orders, use the limit price
             estimated_price = order.price if order.price else Decimal("1.0")
 
-            await self.safety_manager.validate_trade(
+            await safety_manager.validate_trade(
                 user_id=order.user_id,
                 coin_type=order.coin_type,
                 side=order.side,
@@ -186,9 +322,9 @@ class OrderExecutor:
             order.status = "failed"
             order.error_message = f"Safety violation: {str(e)}"
             order.updated_at = datetime.now(timezone.utc)
-            self.session.add(order)
-            self.session.commit()
-            self.session.refresh(order)
+            session.add(order)
+            session.commit()
+            session.refresh(order)
 
             # Broadcast update
             await manager.broadcast_json(
@@ -205,9 +341,9 @@ class OrderExecutor:
                     order.status = "submitted"
                     order.submitted_at = datetime.now(timezone.utc)
                     order.updated_at = datetime.now(timezone.utc)
-                    self.session.add(order)
-                    self.session.commit()
-                    self.session.refresh(order)
+                    session.add(order)
+                    session.commit()
+                    session.refresh(order)
 
                     # Broadcast update
                     await manager.broadcast_json(
@@ -233,9 +369,9 @@ class OrderExecutor:
                 if "rate" in result:
                     order.price = Decimal(str(result["rate"]))
 
-                self.session.add(order)
-                self.session.commit()
-                self.session.refresh(order)
+                session.add(order)
+                session.commit()
+                session.refresh(order)
 
                 # Broadcast update
                 await manager.broadcast_json(
@@ -243,8 +379,18 @@ class OrderExecutor:
                     f"trading_{order.user_id}",
                 )
 
-                # Update position
-                await self._update_position(order, result)
+                # Update position and the cached risk state
+                position_cost = await self._update_position(order, result, session)
+                safety_manager.risk_state.record_fill(order, position_cost)
+
+                # Apply the fill to the P&L lot ledger
+                try:
+                    ledger.sync(order.user_id)
+                except Exception as e:
+                    session.rollback()
+                    logger.error(
+                        f"Failed to update P&L ledger for order {order_id}: {e}"
+                    )
 
                 logger.info(
                     f"Order {order_id} executed successfully: {order.coinspot_order_id}"
@@ -264,15 +410,15 @@ class OrderExecutor:
                     # Retry with exponential backoff
                     delay = self.retry_delay * (2**attempt)
                     logger.info(f"Retrying order {order_id} in {delay} seconds")
-                    self.session.add(order)
-                    self.session.commit()
+                    session.add(order)
+                    session.commit()
                     await asyncio.sleep(delay)
                 else:
                     # Max retries reached
                     order.status = "failed"
-                    self.session.add(order)
-                    self.session.commit()
-                    self.session.refresh(order)
+                    session.add(order)
+                    session.commit()
+                    session.refresh(order)
 
                     # Broadcast update
                     await manager.broadcast_json(
@@ -288,12 +434,13 @@ class OrderExecutor:
                 logger.error(
                     f"Unexpected error executing order {order_id}: {e}", exc_info=True
                 )
+                # A failed statement leaves the session needing a rollback
+                session.rollback()
                 order.status = "failed"
-                order.error_message = str(e)
-                self.session.refresh(order)
+                order.error_message = str(e)[:500]  # Database errors run long
                 order.updated_at = datetime.now(timezone.utc)
-                self.session.add(order)
-                self.session.commit()
+                session.add(order)
+                session.commit()
 
                 # Broadcast update
                 await manager.broadcast_json(
@@ -389,24 +536,37 @@ class OrderExecutor:
             return result
 
     async def _update_position(
-        self, order: Order, result: dict[str, Any] | None = None
-    ) -> None:
+        self,
+        order: Order,
+        result: dict[str, Any] | None = None,
+        session: Session | None = None,
+    ) -> Decimal | None:
         """
         Update user's position after order execution
 
         Args:
             order: Executed order
             result: Execution result from API (optional)
+            session: Session the order is executed in (default: the executor's)
+
+        Returns:
+            Total cost of the user's position in the coin after the update
+            (0 when closed), or None if the position could not be updated
         """
+        if session is None:
+            session = self.session
+
         # Get existing position
         statement = select(Position).where(
             Position.user_id == order.user_id, Position.coin_type == order.coin_type
         )
-        position = self.session.exec(statement).first()
+        position = session.exec(statement).first()
 
         # Determine coins bought/sold and cost
         coins_delta = Decimal("0")
         cost_delta = Decimal("0")
+        position_cost: Decimal | None = None
+        closed = False
 
         if result and "amount" in result:
             # If result provides amount (coins), use it.
@@ -432,7 +592,7 @@ class OrderExecutor:
                     logger.error(
                         f"Cannot calculate coins bought for order {order.id}: no price"
                     )
-                    return
+                    return None
 
             if position:
                 # Update existing position
@@ -461,7 +621,8 @@ class OrderExecutor:
                     updated_at=datetime.now(timezone.utc),
                 )
 
-            self.session.add(position)
+            session.add(position)
+            position_cost = position.total_cost
 
         elif order.side == "sell":
             if coins_delta == 0:
@@ -473,28 +634,44 @@ class OrderExecutor:
 
                 if position.quantity <= 0.00000001:  # Epsilon check for near zero
                     # Position closed
-                    self.session.delete(position)
+                    session.delete(position)
+                    position_cost = Decimal("0")
+                    closed = True
                 else:
                     # Reduce total cost proportionally
                     position.total_cost = position.quantity * position.average_price
                     position.updated_at = datetime.now(timezone.utc)
-                    self.session.add(position)
+                    session.add(position)
+                    position_cost = position.total_cost
             else:
                 logger.warning(
                     f"Sell order {order.id} executed but no position found for {order.coin_type}"
                 )
+                position_cost = Decimal("0")
+
+        # New state for event subscribers (read before commit expires it)
+        position_state = (
+            (Decimal("0") if closed else position.quantity, position.average_price)
+            if position
+            else None
+        )
 
-        self.session.commit()
+        session.commit()
 
         # Broadcast position update
         if position:
-            self.session.refresh(position)
+            session.refresh(position)
             await manager.broadcast_json(
                 {"type": "position_update", "data": jsonable_encoder(position)},
                 f"trading_{order.user_id}",
             )
+        if position_state:
+            await self.event_publisher.publish_position(
+                order.user_id, order.coin_type, *position_state
+            )
 
         logger.info(f"Position updated for {order.user_id}, {order.coin_type}")
+        return position_cost
 
     def _order_to_dict(self, order: Order) -> dict:
         """Helper to serialize order to dict manually to avoid encoder issues"""
@@ -540,6 +717,10 @@ class OrderQueue:
         api_secret: str,
         max_retries: int = 3,
         retry_delay: float = 1.0,
+        max_concurrency: int | None = None,
+        paper_exchange: PaperExchange | None = None,
+        safety_manager: TradingSafetyManager | None = None,
+        event_publisher: TradingEventPublisher | None = None,
     ) -> None:
         """
         Initialize the order executor
@@ -550,6 +731,10 @@ class OrderQueue:
             api_secret: Coinspot API secret
             max_retries: Maximum retry attempts
             retry_delay: Initial retry delay
+            max_concurrency: Number of concurrent workers
+            paper_exchange: Exchange used in paper mode
+            safety_manager: Safety manager (default: a new one on session)
+            event_publisher: Publisher of position events
         """
         if self._executor is None:
             self._executor = OrderExecutor(
@@ -558,13 +743,46 @@ class OrderQueue:
                 api_secret=api_secret,
                 max_retries=max_retries,
                 retry_delay=retry_delay,
+                max_concurrency=max_concurrency,
+                paper_exchange=paper_exchange,
+                safety_manager=safety_manager,
+                event_publisher=event_publisher,
             )
 
-    async def submit(self, order_id: UUID) -> None:
+    async def submit(
+        self,
+        order_id: UUID,
+        user_id: UUID | None = None,
+        coin_type: str | None = None,
+    ) -> None:
         """Submit an order for execution"""
         if self._executor is None:
             raise OrderExecutionError("OrderQueue not initialized")
-        await self._executor.submit_order(order_id)
+        await self._executor.submit_order(order_id, user_id, coin_type)
+
+    async def submit_many(self, orders: list[tuple[UUID, UUID, str]]) -> None:
+        """Submit a batch of (order_id, user_id, coin_type) orders"""
+        if self._executor is None:
+            raise OrderExecutionError("OrderQueue not initialized")
+        await self._executor.submit_orders(orders)
+
+    def stats(self) -> dict[str, Any]:
+        """Get executor queue and latency statistics"""
+        if self._executor is None:
+            return {}
+        return self._executor.stats()
+
+    @property
+    def paper_exchange(self) -> PaperExchange | None:
+        """PaperExchange the executor trades against in paper mode"""
+        if self._executor is None:
+            return None
+        return self._executor.paper_exchange
+
+    async def drain(self) -> None:
+        """Wait until every submitted order has been executed"""
+        if self._executor is not None:
+            await self._executor.drain()
 
     async def start(self) -> None:
         """Start the executor worker"""
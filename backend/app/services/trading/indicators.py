@@ -0,0 +1,334 @@
+"""
+Shared Rolling Indicators
+
+Live strategies used to keep their own list of prices, pop(0) the oldest
+and re-sum whole windows on every tick, one copy per deployed algorithm.
+IndicatorService keeps one set of rolling indicators per
+(coin, indicator, window), updated in O(1) per price:
+
+- SMA: running sum over a ring buffer (exact, Decimal)
+- EMA: seeded with the SMA of the first window, then exponential smoothing
+- RSI: Wilder's smoothing of average gains and losses
+
+Prices are bucketed into bars (5 minutes by default, matching
+PriceData5Min). A price for the bar already seen replaces that bar's close
+instead of adding a new value. Several deployments on the same coin, or
+scheduler jobs firing more often than the bar size, therefore never
+double-count a tick. Windows can be seeded from PriceData5Min at startup
+instead of waiting long_window ticks.
+"""
+
+import logging
+import threading
+from collections import deque
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any
+
+from sqlmodel import Session, col, select
+
+from app.models import PriceData5Min
+
+logger = logging.getLogger(__name__)
+
+ZERO = Decimal("0")
+HUNDRED = Decimal("100")
+
+
+class RollingSMA:
+    """Simple moving average over the last `window` closes"""
+
+    __slots__ = ("window", "_values", "_sum")
+
+    def __init__(self, window: int):
+        self.window = window
+        self._values: deque[Decimal] = deque()
+        self._sum = ZERO
+
+    def push(self, price: Decimal) -> None:
+        self._values.append(price)
+        self._sum += price
+        if len(self._values) > self.window:
+            self._sum -= self._values.popleft()
+
+    def replace_last(self, price: Decimal) -> None:
+        self._sum += price - self._values[-1]
+        self._values[-1] = price
+
+    @property
+    def value(self) -> Decimal | None:
+        if len(self._values) < self.window:
+            return None
+        return self._sum / self.window
+
+
+class RollingEMA:
+    """Exponential moving average, seeded with the SMA of the first window"""
+
+    __slots__ = ("window", "_alpha", "_count", "_value", "_previous")
+
+    def __init__(self, window: int):
+        self.window = window
+        self._alpha = Decimal(2) / (window + 1)
+        self._count = 0
+        self._value = ZERO  # Running seed sum until the window is full
+        self._previous = (0, ZERO)
+
+    def push(self, price: Decimal) -> None:
+        self._previous = (self._count, self._value)
+        self._count += 1
+        if self._count < self.window:
+            self._value += price
+        elif self._count == self.window:
+            self._value = (self._value + price) / self.window
+        else:
+            self._value += self._alpha * (price - self._value)
+
+    def replace_last(self, price: Decimal) -> None:
+        self._count, self._value = self._previous
+        self.push(price)
+
+    @property
+    def value(self) -> Decimal | None:
+        return self._value if self._count >= self.window else None
+
+
+class RollingRSI:
+    """Relative Strength Index with Wilder's smoothing"""
+
+    __slots__ = ("window", "_count", "_last", "_gain", "_loss", "_previous")
+
+    def __init__(self, window: int):
+        self.window = window
+        self._count = 0  # Price changes seen
+        self._last: Decimal | None = None
+        self._gain = ZERO  # Seed sums, then smoothed averages
+        self._loss = ZERO
+        # (count, last, gain, loss) before the latest push
+        self._previous: tuple[int, Decimal | None, Decimal, Decimal]
+        self._previous = (0, None, ZERO, ZERO)
+
+    def push(self, price: Decimal) -> None:
+        self._previous = (self._count, self._last, self._gain, self._loss)
+        if self._last is None:
+            self._last = price
+            return
+
+        change = price - self._last
+        self._last = price
+        gain = change if change > 0 else ZERO
+        loss = -change if change < 0 else ZERO
+
+        self._count += 1
+        if self._count <= self.window:
+            self._gain += gain
+            self._loss += loss
+            if self._count == self.window:
+                self._gain /= self.window
+                self._loss /= self.window
+        else:
+            self._gain = (self._gain * (self.window - 1) + gain) / self.window
+            self._loss = (self._loss * (self.window - 1) + loss) / self.window
+
+    def replace_last(self, price: Decimal) -> None:
+        self._count, self._last, self._gain, self._loss = self._previous
+        self.push(price)
+
+    @property
+    def value(self) -> Decimal | None:
+        if self._count < self.window:
+            return None
+        if self._loss == 0:
+            return HUNDRED if self._gain > 0 else Decimal("50")
+        return HUNDRED - HUNDRED / (1 + self._gain / self._loss)
+
+
+RollingIndicator = RollingSMA | RollingEMA | RollingRSI
+
+INDICATORS: dict[str, type[RollingIndicator]] = {
+    "sma": RollingSMA,
+    "ema": RollingEMA,
+    "rsi": RollingRSI,
+}
+
+
+class IndicatorService:
+    """
+    Rolling indicators shared by all strategies
+
+    Features:
+    - One indicator per (coin, indicator, window), however many strategies read it
+    - O(1) update per price and O(1) reads
+    - Bar bucketing so each bar is counted once
+    - Backfill of late subscriptions and seeding from PriceData5Min
+    """
+
+    def __init__(self, bar_seconds: int = 300):
+        """
+        Initialize the service
+
+        Args:
+            bar_seconds: Bar size; prices within one bar update its close
+        """
+        self.bar_seconds = bar_seconds
+        self._indicators: dict[tuple[str, str, int], RollingIndicator] = {}
+        self._by_coin: dict[str, list[RollingIndicator]] = {}
+        # Recent closes per coin, for backfilling new subscriptions
+        self._closes: dict[str, deque[Decimal]] = {}
+        self._last_bar: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.updates = 0
+
+    def subscribe(self, coin_type: str, indicator: str, window: int) -> None:
+        """
+        Make sure an indicator is maintained, backfilled from recent closes
+
+        Args:
+            coin_type: Coin symbol
+            indicator: sma, ema or rsi
+            window: Window length in bars
+        """
+        if indicator not in INDICATORS:
+            raise ValueError(f"Unknown indicator: {indicator}")
+        if window < 1:
+            raise ValueError("Indicator window must be at least 1")
+
+        key = (coin_type, indicator, window)
+        with self._lock:
+            if key in self._indicators:
+                return
+            instance = INDICATORS[indicator](window)
+            closes = self._closes.get(coin_type, deque())
+            for price in closes:
+                instance.push(price)
+            self._indicators[key] = instance
+            self._by_coin.setdefault(coin_type, []).append(instance)
+
+            # RSI needs window + 1 closes
+            keep = window + 1
+            if closes.maxlen is None or closes.maxlen < keep:
+                self._closes[coin_type] = deque(closes, maxlen=keep)
+
+    def update(
+        self, coin_type: str, price: Decimal, timestamp: datetime | None = None
+    ) -> None:
+        """
+        Apply a price to every indicator of the coin
+
+        Args:
+            coin_type: Coin symbol
+            price: Latest price
+            timestamp: Price time (default: now); prices older than the
+                latest bar are ignored
+        """
+        timestamp = timestamp or datetime.now(timezone.utc)
+        if timestamp.tzinfo is None:
+            timestamp = timestamp.replace(tzinfo=timezone.utc)
+        bar = int(timestamp.timestamp() // self.bar_seconds)
+        price = Decimal(str(price))
+
+        with self._lock:
+            last_bar = self._last_bar.get(coin_type)
+            if last_bar is not None and bar < last_bar:
+                return
+
+            closes = self._closes.setdefault(coin_type, deque(maxlen=1))
+            if bar == last_bar:
+                for instance in self._by_coin.get(coin_type, ()):
+                    instance.replace_last(price)
+                closes[-1] = price
+            else:
+                for instance in self._by_coin.get(coin_type, ()):
+                    instance.push(price)
+                closes.append(price)
+            self._last_bar[coin_type] = bar
+            self.updates += 1
+
+    def get(self, coin_type: str, indicator: str, window: int) -> Decimal | None:
+        """
+        Read an indicator
+
+        Returns:
+            Current value, or None until the window is full or if not subscribed
+        """
+        instance = self._indicators.get((coin_type, indicator, window))
+        return instance.value if instance is not None else None
+
+    def seed_from_history(
+        self,
+        session: Session,
+        coin_types: list[str] | None = None,
+        before: datetime | None = None,
+    ) -> int:
+        """
+        Rebuild indicators from stored 5-minute prices
+
+        Args:
+            session: Database session
+            coin_types: Coins to seed (default: every subscribed coin)
+            before: Only use prices before this time (default: latest)
+
+        Returns:
+            Number of prices loaded
+        """
+        with self._lock:
+            coins = coin_types or list(self._by_coin)
+            lookback = {
+                coin: self._closes[coin].maxlen or 1
+                for coin in coins
+                if coin in self._closes
+            }
+
+        loaded = 0
+        for coin, count in lookback.items():
+            stmt = select(col(PriceData5Min.timestamp), col(PriceData5Min.last)).where(
+                PriceData5Min.coin_type == coin
+            )
+            if before is not None:
+                stmt = stmt.where(PriceData5Min.timestamp < before)
+            rows = session.exec(
+                stmt.order_by(col(PriceData5Min.timestamp).desc()).limit(count)
+            ).all()
+
+            self._reset_coin(coin)
+            for timestamp, last in reversed(rows):
+                self.update(coin, last, timestamp)
+            loaded += len(rows)
+
+        logger.info(f"Seeded indicators for {len(lookback)} coins from {loaded} prices")
+        return loaded
+
+    def stats(self) -> dict[str, Any]:
+        """Get service statistics"""
+        with self._lock:
+            return {
+                "coins": len(self._by_coin),
+                "indicators": len(self._indicators),
+                "updates": self.updates,
+            }
+
+    def _reset_coin(self, coin_type: str) -> None:
+        """Restart every indicator of a coin from empty state"""
+        with self._lock:
+            instances = []
+            for key in list(self._indicators):
+                if key[0] == coin_type:
+                    instance = INDICATORS[key[1]](key[2])
+                    self._indicators[key] = instance
+                    instances.append(instance)
+            self._by_coin[coin_type] = instances
+            maxlen = self._closes[coin_type].maxlen
+            self._closes[coin_type] = deque(maxlen=maxlen)
+            self._last_bar.pop(coin_type, None)
+
+
+# Process-wide instance
+_indicator_service: IndicatorService | None = None
+
+
+def get_indicator_service() -> IndicatorService:
+    """Get the process-wide indicator service"""
+    global _indicator_service
+    if _indicator_service is None:
+        _indicator_service = IndicatorService()
+    return _indicator_service
@@ -0,0 +1,470 @@
+"""
+FIFO Lot Ledger
+
+This module persists the FIFO matching state used for realized P&L so that
+it no longer has to be recomputed by replaying a user's full order history.
+
+Each filled buy opens a lot, each filled sell consumes the oldest open lots
+and writes one realized-match row per lot consumed. Realized P&L for any
+window then becomes an indexed SUM over the match rows.
+
+Two books are maintained per user:
+- 'user': all fills for a coin are matched together
+- 'algorithm': fills are matched only against fills of the same algorithm
+
+sync() and rebuild() lock the user's watermark row (SELECT ... FOR UPDATE)
+for their transaction, so concurrent callers (executor, recorder, P&L
+routes, other processes) apply each fill exactly once.
+"""
+
+import logging
+from collections import deque
+from collections.abc import Callable, Sequence
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import and_, delete, func, or_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlmodel import Session, col, select
+
+from app.models import Order, PnLLedgerState, PnLLot, PnLRealizedMatch
+
+logger = logging.getLogger(__name__)
+
+USER_BOOK = "user"
+ALGORITHM_BOOK = "algorithm"
+
+# Dialects supporting INSERT ... ON CONFLICT DO NOTHING RETURNING
+INSERT_IF_MISSING: dict[str, Callable[..., postgresql.Insert | sqlite.Insert]] = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+class PnLLedger:
+    """
+    Incrementally maintained FIFO lot ledger
+
+    Fills are applied in (filled_at, id) order. A per-user watermark records
+    the last applied fill; anything newer is applied on the next sync. If a
+    fill is backfilled behind the watermark the user's ledger is rebuilt.
+    """
+
+    def __init__(self, session: Session):
+        """
+        Initialize the ledger
+
+        Args:
+            session: Database session
+        """
+        self.session = session
+
+    def sync(self, user_id: UUID) -> int:
+        """
+        Apply all filled orders not yet in the ledger
+
+        Args:
+            user_id: User UUID
+
+        Returns:
+            Number of orders applied
+        """
+        state, created = self._lock_state(user_id)
+        if created:
+            return self._rebuild(user_id, state)
+
+        query = select(Order).where(
+            Order.user_id == user_id,
+            Order.status == "filled",
+            col(Order.filled_at).is_not(None),
+        )
+        if state.last_filled_at is not None:
+            query = query.where(
+                or_(
+                    col(Order.filled_at) > state.last_filled_at,
+                    and_(
+                        col(Order.filled_at) == state.last_filled_at,
+                        col(Order.id) > state.last_order_id,
+                    ),
+                )
+            )
+        pending = self.session.exec(
+            query.order_by(col(Order.filled_at), col(Order.id))
+        ).all()
+
+        if state.applied_orders + len(pending) != self._count_filled(user_id):
+            # A fill landed behind the watermark (or an order left the
+            # 'filled' state); incremental matching would be wrong
+            logger.info(f"P&L ledger for user {user_id} out of order, rebuilding")
+            return self._rebuild(user_id, state)
+
+        if not pending:
+            # Release the lock
+            self.session.commit()
+            return 0
+
+        self._apply(user_id, pending, fresh=False)
+        self._advance(state, pending)
+        self.session.commit()
+        return len(pending)
+
+    def rebuild(self, user_id: UUID) -> int:
+        """
+        Discard and rebuild a user's ledger from their full fill history
+
+        Args:
+            user_id: User UUID
+
+        Returns:
+            Number of orders applied
+        """
+        state, _ = self._lock_state(user_id)
+        return self._rebuild(user_id, state)
+
+    def _rebuild(self, user_id: UUID, state: PnLLedgerState) -> int:
+        """Rebuild a user's ledger while holding the lock on their state"""
+        self.session.execute(
+            delete(PnLRealizedMatch).where(col(PnLRealizedMatch.user_id) == user_id)
+        )
+        self.session.execute(delete(PnLLot).where(col(PnLLot.user_id) == user_id))
+
+        orders = self.session.exec(
+            select(Order)
+            .where(
+                Order.user_id == user_id,
+                Order.status == "filled",
+                col(Order.filled_at).is_not(None),
+            )
+            .order_by(col(Order.filled_at), col(Order.id))
+        ).all()
+
+        self._apply(user_id, orders, fresh=True)
+
+        state.last_filled_at = None
+        state.last_order_id = None
+        state.applied_orders = 0
+        self._advance(state, orders)
+        self.session.commit()
+        return len(orders)
+
+    def realized_pnl(
+        self,
+        user_id: UUID,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        algorithm_id: UUID | None = None,
+        coin_type: str | None = None,
+    ) -> Decimal:
+        """
+        Sum realized P&L over a window
+
+        Args:
+            user_id: User UUID
+            start_date: Start of window (inclusive)
+            end_date: End of window (inclusive)
+            algorithm_id: Restrict to the algorithm's own book
+            coin_type: Filter by coin type
+
+        Returns:
+            Realized P&L as Decimal
+        """
+        query = self._matches_query(
+            select(func.coalesce(func.sum(PnLRealizedMatch.realized_pnl), 0)),
+            user_id,
+            start_date,
+            end_date,
+            algorithm_id,
+            coin_type,
+        )
+        return Decimal(str(self.session.exec(query).one()))
+
+    def realized_by_sell(
+        self,
+        user_id: UUID,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+    ) -> list[Any]:
+        """
+        Realized P&L per sell order within a window
+
+        Args:
+            user_id: User UUID
+            start_date: Start of window (inclusive)
+            end_date: End of window (inclusive)
+
+        Returns:
+            Rows of (sell_order_id, realized_pnl)
+        """
+        query = self._matches_query(
+            select(
+                PnLRealizedMatch.sell_order_id,
+                func.sum(PnLRealizedMatch.realized_pnl),
+            ),
+            user_id,
+            start_date,
+            end_date,
+        ).group_by(PnLRealizedMatch.sell_order_id)
+        return list(self.session.exec(query).all())
+
+    def realized_by_group(
+        self,
+        user_id: UUID,
+        group_by: str,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+    ) -> dict[Any, Decimal]:
+        """
+        Realized P&L for every coin or algorithm in one grouped aggregate
+
+        Args:
+            user_id: User UUID
+            group_by: 'coin_type' (user book) or 'algorithm_id' (algorithm books)
+            start_date: Start of window (inclusive)
+            end_date: End of window (inclusive)
+
+        Returns:
+            Mapping of group key to realized P&L
+        """
+        column: Any
+        if group_by == "coin_type":
+            column = PnLRealizedMatch.coin_type
+            book = USER_BOOK
+        elif group_by == "algorithm_id":
+            column = PnLRealizedMatch.algorithm_id
+            book = ALGORITHM_BOOK
+        else:
+            raise ValueError(f"Invalid group_by: {group_by}")
+
+        query = select(column, func.sum(PnLRealizedMatch.realized_pnl)).where(
+            PnLRealizedMatch.user_id == user_id,
+            PnLRealizedMatch.book == book,
+        )
+        if start_date:
+            query = query.where(PnLRealizedMatch.realized_at >= start_date)
+        if end_date:
+            query = query.where(PnLRealizedMatch.realized_at <= end_date)
+
+        return {
+            key: Decimal(str(total))
+            for key, total in self.session.exec(query.group_by(column)).all()
+        }
+
+    def realized_series(
+        self, user_id: UUID, start_date: datetime, end_date: datetime
+    ) -> list[Any]:
+        """
+        Realized matches of the user book in time order
+
+        Args:
+            user_id: User UUID
+            start_date: Start of window (inclusive)
+            end_date: End of window (exclusive)
+
+        Returns:
+            Rows of (realized_at, realized_pnl) ordered by realized_at
+        """
+        query = (
+            select(
+                col(PnLRealizedMatch.realized_at), col(PnLRealizedMatch.realized_pnl)
+            )
+            .where(
+                PnLRealizedMatch.user_id == user_id,
+                PnLRealizedMatch.book == USER_BOOK,
+                PnLRealizedMatch.realized_at >= start_date,
+                PnLRealizedMatch.realized_at < end_date,
+            )
+            .order_by(col(PnLRealizedMatch.realized_at))
+        )
+        return list(self.session.exec(query).all())
+
+    def _matches_query(
+        self,
+        query: Any,
+        user_id: UUID,
+        start_date: datetime | None = None,
+        end_date: datetime | None = None,
+        algorithm_id: UUID | None = None,
+        coin_type: str | None = None,
+    ) -> Any:
+        """Apply the book and window filters shared by match aggregates"""
+        query = query.where(PnLRealizedMatch.user_id == user_id)
+        if algorithm_id:
+            query = query.where(
+                PnLRealizedMatch.book == ALGORITHM_BOOK,
+                PnLRealizedMatch.algorithm_id == algorithm_id,
+            )
+        else:
+            query = query.where(PnLRealizedMatch.book == USER_BOOK)
+        if coin_type:
+            query = query.where(PnLRealizedMatch.coin_type == coin_type)
+        if start_date:
+            query = query.where(PnLRealizedMatch.realized_at >= start_date)
+        if end_date:
+            query = query.where(PnLRealizedMatch.realized_at <= end_date)
+        return query
+
+    def _lock_state(self, user_id: UUID) -> tuple[PnLLedgerState, bool]:
+        """
+        Lock a user's watermark row until the transaction ends, creating it
+        if missing
+
+        Returns:
+            The locked state and whether it was just created
+        """
+        insert = INSERT_IF_MISSING[self.session.get_bind().dialect.name]
+        created = (
+            self.session.execute(
+                insert(PnLLedgerState)
+                .values(
+                    user_id=user_id,
+                    applied_orders=0,
+                    updated_at=datetime.now(timezone.utc),
+                )
+                .on_conflict_do_nothing()
+                .returning(col(PnLLedgerState.user_id))
+            ).first()
+            is not None
+        )
+        state = self.session.exec(
+            select(PnLLedgerState)
+            .where(PnLLedgerState.user_id == user_id)
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        ).one()
+        return state, created
+
+    def _count_filled(self, user_id: UUID) -> int:
+        """Count a user's filled orders"""
+        return self.session.exec(
+            select(func.count(col(Order.id))).where(
+                Order.user_id == user_id,
+                Order.status == "filled",
+                col(Order.filled_at).is_not(None),
+            )
+        ).one()
+
+    def _apply(self, user_id: UUID, orders: Sequence[Order], fresh: bool) -> None:
+        """
+        Apply fills to the books in chronological order
+
+        Args:
+            user_id: User UUID
+            orders: Filled orders sorted by (filled_at, id)
+            fresh: True when the books are known to be empty (rebuild)
+        """
+        books: dict[tuple[str, UUID | None, str], deque[PnLLot]] = {}
+
+        def book_lots(key: tuple[str, UUID | None, str]) -> deque[PnLLot]:
+            if key not in books:
+                books[key] = deque() if fresh else deque(self._open_lots(user_id, *key))
+            return books[key]
+
+        for order in orders:
+            filled_at = order.filled_at
+            assert filled_at is not None  # only filled orders are applied
+            keys: list[tuple[str, UUID | None, str]] = [
+                (USER_BOOK, None, order.coin_type)
+            ]
+            if order.algorithm_id:
+                keys.append((ALGORITHM_BOOK, order.algorithm_id, order.coin_type))
+
+            price = order.price or Decimal("0")
+
+            for key in keys:
+                lots = book_lots(key)
+
+                if order.side == "buy":
+                    lot = PnLLot(
+                        user_id=user_id,
+                        book=key[0],
+                        algorithm_id=key[1],
+                        coin_type=order.coin_type,
+                        buy_order_id=order.id,
+                        quantity=order.filled_quantity,
+                        remaining_quantity=order.filled_quantity,
+                        price=price,
+                        opened_at=filled_at,
+                    )
+                    self.session.add(lot)
+                    lots.append(lot)
+
+                elif order.side == "sell":
+                    if not lots:
+                        if key[0] == USER_BOOK:
+                            logger.warning(
+                                f"Sell order {order.id} has no matching buy positions for {order.coin_type}"
+                            )
+                        continue
+
+                    sell_quantity = order.filled_quantity
+
+                    while sell_quantity > 0 and lots:
+                        lot = lots[0]
+                        match_quantity = min(sell_quantity, lot.remaining_quantity)
+
+                        self.session.add(
+                            PnLRealizedMatch(
+                                user_id=user_id,
+                                book=key[0],
+                                algorithm_id=key[1],
+                                coin_type=order.coin_type,
+                                sell_order_id=order.id,
+                                buy_order_id=lot.buy_order_id,
+                                quantity=match_quantity,
+                                buy_price=lot.price,
+                                sell_price=price,
+                                realized_pnl=match_quantity * (price - lot.price),
+                                realized_at=filled_at,
+                            )
+                        )
+
+                        sell_quantity -= match_quantity
+                        lot.remaining_quantity -= match_quantity
+                        self.session.add(lot)
+
+                        if lot.remaining_quantity <= 0:
+                            lots.popleft()
+
+    def _open_lots(
+        self, user_id: UUID, book: str, algorithm_id: UUID | None, coin_type: str
+    ) -> list[PnLLot]:
+        """Load a book's open lots, oldest first"""
+        query = select(PnLLot).where(
+            PnLLot.user_id == user_id,
+            PnLLot.book == book,
+            PnLLot.coin_type == coin_type,
+            PnLLot.remaining_quantity > 0,
+        )
+        if algorithm_id is None:
+            query = query.where(col(PnLLot.algorithm_id).is_(None))
+        else:
+            query = query.where(PnLLot.algorithm_id == algorithm_id)
+        return list(
+            self.session.exec(
+                query.order_by(col(PnLLot.opened_at), col(PnLLot.buy_order_id))
+            )
+        )
+
+    def _advance(self, state: PnLLedgerState, orders: Sequence[Order]) -> None:
+        """Move the watermark past the applied orders"""
+        if orders:
+            state.last_filled_at = orders[-1].filled_at
+            state.last_order_id = orders[-1].id
+        state.applied_orders += len(orders)
+        state.updated_at = datetime.now(timezone.utc)
+        self.session.add(state)
+
+
+def get_pnl_ledger(session: Session) -> PnLLedger:
+    """
+    Factory function to create a PnLLedger instance
+
+    Args:
+        session: Database session
+
+    Returns:
+        PnLLedger instance
+    """
+    return PnLLedger(session)
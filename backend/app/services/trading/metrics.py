@@ -2,15 +2,215 @@
 """Backtest performance metrics calculator."""
 
 import math
+from collections.abc import Sequence
+from typing import Any
+
+import numpy as np
+
+# Annualization factor used by calculate_backtest_metrics
+TRADING_DAYS = 252
+
+EMPTY_METRICS = {
+    "total_return": 0.0,
+    "sharpe_ratio": 0.0,
+    "sortino_ratio": 0.0,
+    "max_drawdown": 0.0,
+    "max_drawdown_duration": 0,
+    "win_rate": 0.0,
+    "profit_factor": 0.0,
+    "num_trades": 0,
+    "avg_trade_pnl": 0.0,
+    "best_trade": 0.0,
+    "worst_trade": 0.0,
+}
 
 
 def calculate_backtest_metrics(
-    equity_curve: list[float],
+    equity_curve: Sequence[float] | np.ndarray,
     trades: list[dict],
 ) -> dict:
     """
     Calculate comprehensive backtest performance metrics.
 
+    NumPy implementation of calculate_backtest_metrics_reference; results
+    agree to floating-point summation order.
+
+    Args:
+        equity_curve: Equity values over time (daily granularity assumed).
+        trades: List of trade dicts, each with at least a 'pnl' key (float).
+
+    Returns:
+        Dictionary of performance metrics.
+    """
+    equity = np.asarray(equity_curve, dtype=np.float64)
+    if len(equity) < 2:
+        return dict(EMPTY_METRICS)
+
+    initial = equity[0]
+    total_return = (equity[-1] - initial) / initial if initial != 0 else 0.0
+
+    # Period returns (0 where the previous equity is 0)
+    prev = equity[:-1]
+    safe_prev = np.where(prev != 0, prev, 1.0)
+    returns = np.where(prev != 0, (equity[1:] - prev) / safe_prev, 0.0)
+
+    # Sharpe ratio (annualized, population std)
+    mean_return = returns.mean()
+    std_return = returns.std() if len(returns) > 1 else 0.0
+    sharpe_ratio = (
+        mean_return / std_return * math.sqrt(TRADING_DAYS) if std_return > 0 else 0.0
+    )
+
+    # Sortino ratio (downside deviation only)
+    downside = returns[returns < 0]
+    if len(downside):
+        downside_std = math.sqrt(float(np.mean(downside**2)))
+        sortino_ratio = (
+            mean_return / downside_std * math.sqrt(TRADING_DAYS)
+            if downside_std > 0
+            else 0.0
+        )
+    else:
+        sortino_ratio = 0.0
+
+    max_drawdown, max_drawdown_duration = _drawdown_stats(equity)
+
+    # Trade metrics
+    pnls = np.fromiter(
+        (t.get("pnl", 0.0) for t in trades), dtype=np.float64, count=len(trades)
+    )
+    num_trades = len(pnls)
+
+    if num_trades > 0:
+        winning = pnls[pnls > 0]
+        gross_loss = abs(pnls[pnls < 0].sum())
+        win_rate = len(winning) / num_trades
+        profit_factor = winning.sum() / gross_loss if gross_loss > 0 else 0.0
+        avg_trade_pnl = pnls.mean()
+        best_trade = pnls.max()
+        worst_trade = pnls.min()
+    else:
+        win_rate = 0.0
+        profit_factor = 0.0
+        avg_trade_pnl = 0.0
+        best_trade = 0.0
+        worst_trade = 0.0
+
+    return {
+        "total_return": round(float(total_return), 6),
+        "sharpe_ratio": round(float(sharpe_ratio), 4),
+        "sortino_ratio": round(float(sortino_ratio), 4),
+        "max_drawdown": round(float(max_drawdown), 6),
+        "max_drawdown_duration": max_drawdown_duration,
+        "win_rate": round(win_rate, 4),
+        "profit_factor": round(float(profit_factor), 4),
+        "num_trades": num_trades,
+        "avg_trade_pnl": round(float(avg_trade_pnl), 4),
+        "best_trade": round(float(best_trade), 4),
+        "worst_trade": round(float(worst_trade), 4),
+    }
+
+
+def _drawdown_stats(equity: np.ndarray) -> tuple[float, int]:
+    """
+    Max drawdown and the longest drawdown duration in periods.
+
+    A drawdown period is a run of points that do not set a new high (the
+    first point starts one); it lasts until the next new high, or to the end
+    of the curve.
+    """
+    n = len(equity)
+    peaks = np.maximum.accumulate(equity)
+    prior_peaks = np.concatenate(([equity[0]], peaks[:-1]))
+    new_high = equity > prior_peaks
+
+    safe_peaks = np.where(peaks > 0, peaks, 1.0)
+    drawdowns = np.where(~new_high & (peaks > 0), (peaks - equity) / safe_peaks, 0.0)
+    max_drawdown = float(drawdowns.max())
+
+    high_idx = np.flatnonzero(new_high)
+    starts = np.flatnonzero(~new_high & np.concatenate(([True], new_high[:-1])))
+    if not len(starts):
+        return max_drawdown, 0
+
+    next_high = np.searchsorted(high_idx, starts)
+    ends = np.append(high_idx, n)[next_high]
+    return max_drawdown, int((ends - starts).max())
+
+
+def extract_position_trades(
+    index: Sequence[Any],
+    close: np.ndarray,
+    position: np.ndarray,
+    cost_per_side: float,
+) -> list[dict[str, Any]]:
+    """
+    Reconstruct discrete trades from a position series.
+
+    A trade opens at every change to a non-zero position and closes at the
+    next change, or at the last row if still open. PnL is the percentage
+    move in the trade direction minus the cost of entry and exit.
+
+    Args:
+        index: Row labels (timestamps) used for entry/exit times
+        close: Close price per row
+        position: Position per row (positive=long, negative=short, 0=flat)
+        cost_per_side: Fee + slippage charged on entry and on exit
+
+    Returns:
+        List of trade dicts (entry_time, exit_time, entry_price, exit_price,
+        type, pnl)
+    """
+    position = np.asarray(position, dtype=np.float64)
+    close = np.asarray(close, dtype=np.float64)
+    n = len(position)
+    if n == 0:
+        return []
+
+    changes = np.flatnonzero(position != np.concatenate(([0.0], position[:-1])))
+    opens = changes[position[changes] != 0]
+    if not len(opens):
+        return []
+
+    # Each trade closes at the next change, or at the last row
+    next_change = np.searchsorted(changes, opens, side="right")
+    closes = np.append(changes, n - 1)[next_change]
+
+    direction = np.where(position[opens] > 0, 1.0, -1.0)
+    entry_prices = close[opens]
+    exit_prices = close[closes]
+    pnls = (exit_prices - entry_prices) / entry_prices * direction - 2 * cost_per_side
+
+    return [
+        {
+            "entry_time": index[entry],
+            "exit_time": index[exit_],
+            "entry_price": entry_price,
+            "exit_price": exit_price,
+            "type": "long" if long else "short",
+            "pnl": pnl,
+        }
+        for entry, exit_, entry_price, exit_price, long, pnl in zip(
+            opens.tolist(),
+            closes.tolist(),
+            entry_prices.tolist(),
+            exit_prices.tolist(),
+            (direction > 0).tolist(),
+            pnls.tolist(),
+            strict=True,
+        )
+    ]
+
+
+def calculate_backtest_metrics_reference(
+    equity_curve: list[float],
+    trades: list[dict],
+) -> dict:
+    """
+    Calculate comprehensive backtest performance metrics (pure Python).
+
+    Reference implementation kept for parity tests and benchmarks.
+
     Args:
         equity_curve: List of equity values over time (daily granularity assumed).
         trades: List of trade dicts, each with at least a 'pnl' key (float).
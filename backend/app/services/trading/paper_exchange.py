@@ -1,57 +1,288 @@
 # mypy: ignore-errors
+import bisect
 import logging
 import random
 import uuid
+from collections import defaultdict, deque
+from collections.abc import Iterator
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from decimal import Decimal
+from itertools import islice
 from typing import Any
 
 from app.services.trading.base_exchange import BaseExchange
 
 logger = logging.getLogger(__name__)
 
+ZERO = Decimal("0")
+
+
+@dataclass(slots=True, eq=False)
+class BookOrder:
+    """
+    An order resting in the book.
+
+    order_id is None for synthetic market-maker liquidity.
+    """
+
+    order_id: str | None
+    side: str  # "buy" or "sell"
+    price: Decimal
+    remaining: Decimal  # Coins left to fill
+    held: Decimal = ZERO  # AUD reserved by a buy order
+    filled: Decimal = ZERO  # Coins filled so far
+    notional: Decimal = ZERO  # AUD paid (buy) or received (sell) so far
+
+
+@dataclass(slots=True)
+class Fill:
+    """A resting order (partially) filled at price"""
+
+    order: BookOrder
+    price: Decimal
+    quantity: Decimal
+    notional: Decimal  # AUD exchanged
+
+
+class PriceLevel:
+    """FIFO queue of resting orders at one price"""
+
+    __slots__ = ("price", "orders", "volume")
+
+    def __init__(self, price: Decimal):
+        self.price = price
+        self.orders: deque[BookOrder] = deque()
+        self.volume = ZERO
+
+
+class BookSide:
+    """
+    One side of the book.
+
+    Levels are kept in a dict keyed by price plus a sorted key list with the
+    best price last, so adding a level is a binary search and the best level
+    is read or dropped from the end of the list.
+    """
+
+    def __init__(self, is_bid: bool):
+        self.is_bid = is_bid
+        self._levels: dict[Decimal, PriceLevel] = {}
+        self._keys: list[Decimal] = []  # Ascending; best price last
+
+    def _key(self, price: Decimal) -> Decimal:
+        return price if self.is_bid else -price
+
+    def __len__(self) -> int:
+        return len(self._levels)
+
+    def best(self) -> PriceLevel | None:
+        if not self._keys:
+            return None
+        return self._levels[self._key(self._keys[-1])]
+
+    def levels(self) -> Iterator[PriceLevel]:
+        """Iterate levels from the best price outwards"""
+        for key in reversed(self._keys):
+            yield self._levels[self._key(key)]
+
+    def add(self, order: BookOrder) -> None:
+        level = self._levels.get(order.price)
+        if level is None:
+            level = self._levels[order.price] = PriceLevel(order.price)
+            bisect.insort(self._keys, self._key(order.price))
+        level.orders.append(order)
+        level.volume += order.remaining
+
+    def remove(self, order: BookOrder) -> None:
+        level = self._levels.get(order.price)
+        if level is None:
+            return
+        try:
+            level.orders.remove(order)
+        except ValueError:
+            return
+        level.volume -= order.remaining
+        if not level.orders:
+            self._drop(level)
+
+    def consume(self, level: PriceLevel, quantity: Decimal) -> BookOrder:
+        """Fill quantity of the first order of level and return that order"""
+        order = level.orders[0]
+        order.remaining -= quantity
+        level.volume -= quantity
+        if order.remaining <= 0:
+            level.orders.popleft()
+            if not level.orders:
+                self._drop(level)
+        return order
+
+    def _drop(self, level: PriceLevel) -> None:
+        del self._levels[level.price]
+        del self._keys[bisect.bisect_left(self._keys, self._key(level.price))]
+
 
 class OrderBook:
     """
-    In-memory OrderBook simulation.
+    In-memory price-level order book with price-time priority matching.
+
+    Holds the account's resting limit orders together with synthetic
+    market-maker liquidity around the last set price.
     """
 
-    def __init__(self):
-        self.bids: list[tuple[Decimal, Decimal]] = []  # [(price, amount), ...] desc
-        self.asks: list[tuple[Decimal, Decimal]] = []  # [(price, amount), ...] asc
+    def __init__(self, seed: int | None = None):
+        self.bids = BookSide(is_bid=True)
+        self.asks = BookSide(is_bid=False)
+        self._synthetic: list[BookOrder] = []
+        self._rng = random.Random(seed)
 
     def clear(self):
-        self.bids = []
-        self.asks = []
+        self.bids = BookSide(is_bid=True)
+        self.asks = BookSide(is_bid=False)
+        self._synthetic = []
+
+    def add(self, order: BookOrder) -> None:
+        """Rest an order in the book"""
+        (self.bids if order.side == "buy" else self.asks).add(order)
+
+    def cancel(self, order: BookOrder) -> None:
+        """Remove a resting order from the book"""
+        (self.bids if order.side == "buy" else self.asks).remove(order)
+
+    def best_bid(self) -> Decimal | None:
+        level = self.bids.best()
+        return level.price if level else None
+
+    def best_ask(self) -> Decimal | None:
+        level = self.asks.best()
+        return level.price if level else None
+
+    def depth(self, levels: int = 10) -> dict[str, list[tuple[Decimal, Decimal]]]:
+        """Aggregated (price, volume) per level, best first"""
+        return {
+            "bids": [
+                (lvl.price, lvl.volume)
+                for _, lvl in zip(range(levels), self.bids.levels(), strict=False)
+            ],
+            "asks": [
+                (lvl.price, lvl.volume)
+                for _, lvl in zip(range(levels), self.asks.levels(), strict=False)
+            ],
+        }
+
+    def match(
+        self,
+        side: str,
+        quantity: Decimal | None = None,
+        quote: Decimal | None = None,
+        limit: Decimal | None = None,
+    ) -> list[Fill]:
+        """
+        Match an incoming order against the opposite side of the book.
+
+        Args:
+            side: Side of the incoming order ("buy" walks the asks)
+            quantity: Coins to fill
+            quote: AUD to spend (buy orders, instead of quantity)
+            limit: Worst acceptable price (None for a market order)
+
+        Returns:
+            Fills of the resting orders, in execution order
+        """
+        book_side = self.asks if side == "buy" else self.bids
+        fills = []
+        while (quantity is None or quantity > 0) and (quote is None or quote > 0):
+            level = book_side.best()
+            if level is None:
+                break
+            if limit is not None and (
+                level.price > limit if side == "buy" else level.price < limit
+            ):
+                break
+
+            available = level.orders[0].remaining
+            if quantity is not None:
+                take = min(available, quantity)
+                notional = take * level.price
+                quantity -= take
+            elif available * level.price <= quote:
+                take = available
+                notional = take * level.price
+                quote -= notional
+            else:
+                # Spend exactly the rest of the budget
+                take = quote / level.price
+                notional = quote
+                quote = ZERO
+
+            order = book_side.consume(level, take)
+            fills.append(Fill(order, level.price, take, notional))
+        return fills
+
+    def uncross(self) -> list[Fill]:
+        """
+        Match resting bids and asks that cross after new liquidity arrives.
+
+        Trades execute at the price of the account's resting order.
+
+        Returns:
+            Fills of the account's orders (synthetic fills are not reported)
+        """
+        fills = []
+        while True:
+            bid, ask = self.bids.best(), self.asks.best()
+            if bid is None or ask is None or bid.price < ask.price:
+                return fills
+
+            buy, sell = bid.orders[0], ask.orders[0]
+            price = buy.price if buy.order_id is not None else sell.price
+            take = min(buy.remaining, sell.remaining)
+            for book_side, level in ((self.bids, bid), (self.asks, ask)):
+                order = book_side.consume(level, take)
+                if order.order_id is not None:
+                    fills.append(Fill(order, price, take, price * take))
 
     def set_simple_liquidity(
         self,
         mid_price: Decimal,
         spread_percent: Decimal = Decimal("0.001"),
         depth: int = 10,
-    ):
+    ) -> list[Fill]:
         """
-        Generates synthetic liquidity around mid_price.
+        Replace the synthetic liquidity around mid_price.
+
+        Resting account orders stay in the book; any that the new liquidity
+        crosses are filled.
+
+        Returns:
+            Fills of the account's resting orders
         """
-        self.clear()
+        for order in self._synthetic:
+            if order.remaining > 0:
+                self.cancel(order)
+        self._synthetic = []
+
         half_spread = mid_price * spread_percent / 2
 
         # Best bid/ask
         best_bid = mid_price - half_spread
         best_ask = mid_price + half_spread
 
-        # Generate levels
-        # Simple simulation: linear decay in price, random volume
+        # Simple simulation: linear decay in price, random volume (0.1 - 2.0)
         for i in range(depth):
-            # Bid: price decreases
-            bid_p = best_bid * (Decimal("1.0") - (Decimal(i) * Decimal("0.0005")))
-            bid_v = Decimal(random.uniform(0.1, 2.0))  # Random volume
-            self.bids.append((bid_p, bid_v))
+            step = Decimal(i) * Decimal("0.0005")
+            for side, price in (
+                ("buy", best_bid * (Decimal("1.0") - step)),
+                ("sell", best_ask * (Decimal("1.0") + step)),
+            ):
+                volume = Decimal(self._rng.randrange(10_000_000, 200_000_000)).scaleb(
+                    -8
+                )
+                order = BookOrder(None, side, price, volume)
+                self._synthetic.append(order)
+                self.add(order)
 
-            # Ask: price increases
-            ask_p = best_ask * (Decimal("1.0") + (Decimal(i) * Decimal("0.0005")))
-            ask_v = Decimal(random.uniform(0.1, 2.0))
-            self.asks.append((ask_p, ask_v))
+        return self.uncross()
 
 
 class PaperExchange(BaseExchange):
@@ -59,14 +290,47 @@ class PaperExchange(BaseExchange):
     Paper Trading Exchange implementation.
     Mimics CoinSpot API but executes simulated trades against local state.
     Stores orders and balances in memory.
+
+    Limit orders that do not fill immediately rest in the coin's OrderBook
+    and fill (possibly partially) when a later set_price or market order
+    crosses them.
+
+    Open orders are indexed per coin and finished (completed/cancelled)
+    orders are kept in a ring buffer in the order they finished, so order
+    queries never scan every order ever placed.
     """
 
-    def __init__(self, initial_aud_balance: Decimal = Decimal("100000.0")):
+    def __init__(
+        self,
+        initial_aud_balance: Decimal = Decimal("100000.0"),
+        seed: int | None = None,
+        history_limit: int = 10_000,
+        memory_bounded: bool = False,
+    ):
+        """
+        Args:
+            initial_aud_balance: Starting AUD balance
+            seed: Seed for the synthetic liquidity (reproducible replays)
+            history_limit: Finished orders kept for get_order_history
+            memory_bounded: Also drop orders that leave the history from
+                self.orders, bounding memory for multi-day simulations
+        """
+        if history_limit < 1:
+            raise ValueError("history_limit must be at least 1")
+
         self.balances: dict[str, Decimal] = {"AUD": initial_aud_balance}
         self.orders: dict[str, dict[str, Any]] = {}
         # self.prices is now derived from orderbooks, but we can keep it as reference or mid-price
         self.prices: dict[str, Decimal] = {}
         self.orderbooks: dict[str, OrderBook] = {}
+        # coin_type -> order_id -> resting limit order
+        self._open: dict[str, dict[str, BookOrder]] = defaultdict(dict)
+        # Finished orders, oldest first (overall and per coin)
+        self.history_limit = history_limit
+        self.memory_bounded = memory_bounded
+        self._history: deque[dict[str, Any]] = deque()
+        self._history_by_coin: dict[str, deque[dict[str, Any]]] = defaultdict(deque)
+        self._seed = seed
         self._session = False
 
         # Default mock price if not set
@@ -74,15 +338,14 @@ class PaperExchange(BaseExchange):
 
     def set_price(self, coin_type: str, price: Decimal):
         """
-        Sets the market price and generates a synthetic orderbook.
+        Sets the market price, refreshes the synthetic liquidity and fills
+        resting limit orders the new price crosses.
         """
         self.prices[coin_type] = price
         if coin_type not in self.orderbooks:
-            self.orderbooks[coin_type] = OrderBook()
+            self.orderbooks[coin_type] = OrderBook(seed=self._seed)
 
-        # Generate fresh liquidity
-        self.orderbooks[coin_type].set_simple_liquidity(price)
-        # Trigger limit order checks here? For now, no.
+        self._settle(self.orderbooks[coin_type].set_simple_liquidity(price))
 
     def _get_price(self, coin_type: str) -> Decimal:
         return self.prices.get(coin_type, self._default_price)
@@ -93,6 +356,74 @@ class PaperExchange(BaseExchange):
             price = self._get_price(coin_type)
             self.set_price(coin_type, price)
 
+    def _settle(self, fills: list[Fill]) -> None:
+        """
+        Apply fills of the account's resting orders.
+
+        The book has already reduced remaining by every fill, and one order
+        can fill against several levels, so all fills are credited before
+        each fully filled order is completed once.
+        """
+        filled: dict[str, BookOrder] = {}
+        for fill in fills:
+            if fill.order.order_id is not None:
+                self._apply_fill(fill.order, fill.quantity, fill.notional)
+                filled[fill.order.order_id] = fill.order
+        for book_order in filled.values():
+            if book_order.remaining <= 0:
+                self._complete(book_order)
+
+    def _close(self, order: dict[str, Any]) -> None:
+        """Record a finished order in the history ring buffer"""
+        if len(self._history) >= self.history_limit:
+            evicted = self._history.popleft()
+            coin_history = self._history_by_coin[evicted["cointype"]]
+            # Both buffers are in finishing order, so the evicted order is
+            # also the oldest of its coin
+            coin_history.popleft()
+            if not coin_history:
+                del self._history_by_coin[evicted["cointype"]]
+            if self.memory_bounded:
+                self.orders.pop(evicted["id"], None)
+
+        self._history.append(order)
+        self._history_by_coin[order["cointype"]].append(order)
+
+    def _apply_fill(
+        self, book_order: BookOrder, quantity: Decimal, notional: Decimal
+    ) -> None:
+        """Credit a limit order fill (see _complete once fully filled)"""
+        order = self.orders[book_order.order_id]
+        book_order.filled += quantity
+        book_order.notional += notional
+
+        if book_order.side == "buy":
+            coin_type = order["cointype"]
+            self.balances[coin_type] = self.balances.get(coin_type, ZERO) + quantity
+        else:
+            self.balances["AUD"] = self.balances.get("AUD", ZERO) + notional
+
+        order["filled"] = str(book_order.filled)
+
+    def _complete(self, book_order: BookOrder) -> None:
+        """Complete a fully filled limit order"""
+        order = self.orders[book_order.order_id]
+        if book_order.side == "buy":
+            # Release AUD held but not spent (fills better than the limit)
+            self.balances["AUD"] += book_order.held - book_order.notional
+        order["status"] = "completed"
+        order["amount"] = str(book_order.filled)
+        order["total"] = str(book_order.notional)
+        # A zero-quantity order completes unfilled, at its limit price
+        rate = (
+            book_order.notional / book_order.filled
+            if book_order.filled
+            else book_order.price
+        )
+        order["rate"] = str(rate)
+        self._open[order["cointype"]].pop(book_order.order_id, None)
+        self._close(order)
+
     async def __aenter__(self):
         self._session = True
         return self
@@ -114,40 +445,13 @@ class PaperExchange(BaseExchange):
         if current_aud < amount_aud:
             raise ValueError(f"Insufficient funds: {current_aud} < {amount_aud}")
 
-        # Execution Logic
-        filled_coin = Decimal("0")
-        spent_aud = Decimal("0")
-        remaining_aud = amount_aud
+        # Walk asks, consuming liquidity (and filling resting limit sells)
+        fills = book.match("buy", quote=amount_aud)
+        self._settle(fills)
 
-        # Walk asks
-        # Note: In a real simulation, we consume the orderbook.
-        # Here we should probably consume it (remove liquidity).
-        # But since we regenerate it constantly, maybe fine.
-        # Let's consume it to be realistic.
-
-        fills = []
-
-        while remaining_aud > 0 and book.asks:
-            ask_price, ask_vol = book.asks[0]
-
-            cost_of_level = ask_price * ask_vol
-
-            if cost_of_level <= remaining_aud:
-                # Fully consume level
-                filled_coin += ask_vol
-                spent_aud += cost_of_level
-                remaining_aud -= cost_of_level
-                book.asks.pop(0)  # Remove level
-                fills.append((ask_price, ask_vol))
-            else:
-                # Partially consume level
-                can_buy_vol = remaining_aud / ask_price
-                filled_coin += can_buy_vol
-                spent_aud += remaining_aud
-                remaining_aud = Decimal("0")
-                # Update level
-                book.asks[0] = (ask_price, ask_vol - can_buy_vol)
-                fills.append((ask_price, can_buy_vol))
+        filled_coin = sum((f.quantity for f in fills), ZERO)
+        spent_aud = sum((f.notional for f in fills), ZERO)
+        remaining_aud = amount_aud - spent_aud
 
         if remaining_aud > 0:
             # Ran out of liquidity? In paper mode, maybe just fill rest at last price or error?
@@ -155,7 +459,7 @@ class PaperExchange(BaseExchange):
             logger.warning(
                 f"PAPER: Ran out of liquidity for {coin_type}, filling rest at last price"
             )
-            last_price = fills[-1][0] if fills else self._get_price(coin_type)
+            last_price = fills[-1].price if fills else self._get_price(coin_type)
             rest_vol = remaining_aud / last_price
             filled_coin += rest_vol
             spent_aud += remaining_aud
@@ -181,9 +485,10 @@ class PaperExchange(BaseExchange):
             "created": datetime.now(timezone.utc).isoformat(),
             "action": "buy",
             "type": "market",
-            "fills": [(str(p), str(v)) for p, v in fills],  # Debug info
+            "fills": [(str(f.price), str(f.quantity)) for f in fills],  # Debug info
         }
         self.orders[order_id] = order
+        self._close(order)
         return order
 
     async def market_sell(self, coin_type: str, amount: Decimal) -> dict[str, Any]:
@@ -200,32 +505,18 @@ class PaperExchange(BaseExchange):
         if current_coin < amount:
             raise ValueError(f"Insufficient {coin_type}: {current_coin} < {amount}")
 
-        filled_aud = Decimal("0")
-        remaining_coin = amount
-        fills = []
-
-        while remaining_coin > 0 and book.bids:
-            bid_price, bid_vol = book.bids[0]
+        # Walk bids, consuming liquidity (and filling resting limit buys)
+        fills = book.match("sell", quantity=amount)
+        self._settle(fills)
 
-            if bid_vol <= remaining_coin:
-                # Fully consume level
-                filled_aud += bid_vol * bid_price
-                remaining_coin -= bid_vol
-                book.bids.pop(0)
-                fills.append((bid_price, bid_vol))
-            else:
-                # Partially consume level
-                filled_aud += remaining_coin * bid_price
-                # Update level
-                book.bids[0] = (bid_price, bid_vol - remaining_coin)
-                fills.append((bid_price, remaining_coin))
-                remaining_coin = Decimal("0")
+        filled_aud = sum((f.notional for f in fills), ZERO)
+        remaining_coin = amount - sum((f.quantity for f in fills), ZERO)
 
         if remaining_coin > 0:
             logger.warning(
                 f"PAPER: Ran out of liquidity for {coin_type}, filling rest at last price"
             )
-            last_price = fills[-1][0] if fills else self._get_price(coin_type)
+            last_price = fills[-1].price if fills else self._get_price(coin_type)
             filled_aud += remaining_coin * last_price
             # remaining_coin consumed
 
@@ -248,23 +539,44 @@ class PaperExchange(BaseExchange):
             "created": datetime.now(timezone.utc).isoformat(),
             "action": "sell",
             "type": "market",
-            "fills": [(str(p), str(v)) for p, v in fills],
+            "fills": [(str(f.price), str(f.quantity)) for f in fills],
         }
         self.orders[order_id] = order
+        self._close(order)
         return order
 
+    def _place_limit(
+        self, coin_type: str, book_order: BookOrder, order: dict[str, Any]
+    ) -> None:
+        """Match a new limit order and rest whatever does not fill"""
+        self._ensure_liquidity(coin_type)
+        book = self.orderbooks[coin_type]
+        self.orders[book_order.order_id] = order
+
+        fills = book.match(
+            book_order.side, quantity=book_order.remaining, limit=book_order.price
+        )
+        self._settle(fills)
+        for fill in fills:
+            book_order.remaining -= fill.quantity
+            self._apply_fill(book_order, fill.quantity, fill.notional)
+
+        if book_order.remaining > 0:
+            book.add(book_order)
+            self._open[coin_type][book_order.order_id] = book_order
+        else:
+            self._complete(book_order)
+
     async def limit_buy(
         self, coin_type: str, amount_aud: Decimal, rate: Decimal
     ) -> dict[str, Any]:
         """
         Simulate limit buy.
-        For simplicity, if price <= limit, fill immediately.
-        Otherwise add to open orders.
+        Fills against asks at or below rate; the rest rests in the book
+        with its AUD held until filled or cancelled.
         """
         logger.info(f"PAPER: Limit Buy {amount_aud} AUD of {coin_type} @ {rate}")
 
-        current_price = self._get_price(coin_type)
-
         # Check balance immediately (holds funds)
         current_aud = self.balances.get("AUD", Decimal("0"))
         if current_aud < amount_aud:
@@ -273,10 +585,12 @@ class PaperExchange(BaseExchange):
         self.balances["AUD"] -= amount_aud
 
         order_id = str(uuid.uuid4())
+        quantity = amount_aud / rate  # Target coins
         order = {
             "id": order_id,
+            "status": "open",
             "cointype": coin_type,
-            "amount": str(amount_aud / rate),  # Target coins (approx)
+            "amount": str(quantity),
             "rate": str(rate),
             "total": str(amount_aud),
             "market": f"{coin_type}/AUD",
@@ -284,26 +598,11 @@ class PaperExchange(BaseExchange):
             "action": "buy",
             "type": "limit",
         }
-
-        # Check execution
-        if current_price <= rate:
-            # Executing at limit price (or better? usually limit price)
-            # In paper trading, often fill at limit price if crossed
-            fill_price = rate
-            coin_amount = amount_aud / fill_price
-
-            order["status"] = "completed"
-            order["rate"] = str(fill_price)  # Completed rate
-            order["amount"] = str(coin_amount)
-
-            self.balances[coin_type] = (
-                self.balances.get(coin_type, Decimal("0")) + coin_amount
-            )
-        else:
-            order["status"] = "open"
-            # Funds are held (AUD deducted above)
-
-        self.orders[order_id] = order
+        self._place_limit(
+            coin_type,
+            BookOrder(order_id, "buy", rate, quantity, held=amount_aud),
+            order,
+        )
         return {"status": "ok", "id": order_id}
 
     async def limit_sell(
@@ -311,11 +610,11 @@ class PaperExchange(BaseExchange):
     ) -> dict[str, Any]:
         """
         Simulate limit sell.
+        Fills against bids at or above rate; the rest rests in the book
+        with its coins held until filled or cancelled.
         """
         logger.info(f"PAPER: Limit Sell {amount} {coin_type} @ {rate}")
 
-        current_price = self._get_price(coin_type)
-
         # Check balance
         current_coin = self.balances.get(coin_type, Decimal("0"))
         if current_coin < amount:
@@ -326,6 +625,7 @@ class PaperExchange(BaseExchange):
         order_id = str(uuid.uuid4())
         order = {
             "id": order_id,
+            "status": "open",
             "cointype": coin_type,
             "amount": str(amount),
             "rate": str(rate),
@@ -334,68 +634,53 @@ class PaperExchange(BaseExchange):
             "action": "sell",
             "type": "limit",
         }
-
-        if current_price >= rate:
-            fill_price = rate
-            aud_amount = amount * fill_price
-
-            order["status"] = "completed"
-            order["total"] = str(aud_amount)
-
-            self.balances["AUD"] = self.balances.get("AUD", Decimal("0")) + aud_amount
-        else:
-            order["status"] = "open"
-            # Coins held
-
-        self.orders[order_id] = order
+        self._place_limit(coin_type, BookOrder(order_id, "sell", rate, amount), order)
         return {"status": "ok", "id": order_id}
 
     async def get_orders(self, coin_type: str | None = None) -> dict[str, Any]:
         """Get open orders"""
-        # Filter for open orders
         buy_orders = []
         sell_orders = []
 
-        for o in self.orders.values():
-            if o["status"] != "open":
-                continue
-            if coin_type and o["cointype"] != coin_type:
-                continue
+        if coin_type:
+            open_orders = [self._open.get(coin_type, {})]
+        else:
+            open_orders = self._open.values()
 
-            formatted = o.copy()
-            if o["action"] == "buy":
-                buy_orders.append(formatted)
-            else:
-                sell_orders.append(formatted)
+        for coin_orders in open_orders:
+            for order_id in coin_orders:
+                o = self.orders[order_id]
+                formatted = o.copy()
+                if o["action"] == "buy":
+                    buy_orders.append(formatted)
+                else:
+                    sell_orders.append(formatted)
 
         return {"buyorders": buy_orders, "sellorders": sell_orders}
 
     async def get_order_history(
         self, coin_type: str | None = None, limit: int = 100
     ) -> dict[str, Any]:
-        """Get order history (completed/cancelled)"""
+        """
+        Get order history (completed/cancelled), most recently finished first.
+
+        Only the last history_limit finished orders are kept.
+        """
         buy_orders = []
         sell_orders = []
 
-        orders_sorted = sorted(
-            self.orders.values(), key=lambda x: x["created"], reverse=True
-        )
-
-        for o in orders_sorted:
-            if o["status"] == "open":
-                continue
-            if coin_type and o["cointype"] != coin_type:
-                continue
+        if coin_type:
+            history = self._history_by_coin.get(coin_type, ())
+        else:
+            history = self._history
 
+        for o in islice(reversed(history), limit):
             formatted = o.copy()
             if o["action"] == "buy":
                 buy_orders.append(formatted)
             else:
                 sell_orders.append(formatted)
 
-            if len(buy_orders) + len(sell_orders) >= limit:
-                break
-
         return {"buyorders": buy_orders, "sellorders": sell_orders}
 
     async def cancel_buy_order(self, order_id: str) -> dict[str, Any]:
@@ -407,12 +692,12 @@ class PaperExchange(BaseExchange):
             raise ValueError("Not an open buy order")
 
         order["status"] = "cancelled"
+        book_order = self._open[order["cointype"]].pop(order_id)
+        self.orderbooks[order["cointype"]].cancel(book_order)
+        self._close(order)
 
-        # Refund AUD (amount_aud was deducted)
-        # For limit buy, amount is AUD total roughly
-        # In limit_buy we did: self.orders[...]['total'] = str(amount_aud)
-        refund_aud = Decimal(order["total"])
-        self.balances["AUD"] += refund_aud
+        # Refund the AUD held for the unfilled part
+        self.balances["AUD"] += book_order.held - book_order.notional
 
         return {"status": "ok"}
 
@@ -425,10 +710,12 @@ class PaperExchange(BaseExchange):
             raise ValueError("Not an open sell order")
 
         order["status"] = "cancelled"
+        book_order = self._open[order["cointype"]].pop(order_id)
+        self.orderbooks[order["cointype"]].cancel(book_order)
+        self._close(order)
 
-        # Refund coins
-        refund_coins = Decimal(order["amount"])
-        self.balances[order["cointype"]] += refund_coins
+        # Refund the unfilled coins
+        self.balances[order["cointype"]] += book_order.remaining
 
         return {"status": "ok"}
 
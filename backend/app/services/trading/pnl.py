@@ -13,16 +13,19 @@ Features:
 - P&L aggregation by algorithm, coin, and time period
 """
 
+import calendar
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import desc
+from sqlalchemy import func
 from sqlmodel import Session, select
 
-from app.models import Order, Position, PriceData5Min
+from app.models import Order, Position
+from app.services.trading.ledger import PnLLedger
+from app.services.trading.price_cache import get_price_cache
 
 logger = logging.getLogger(__name__)
 
@@ -140,6 +143,7 @@ class PnLEngine:
             session: Database session
         """
         self.session = session
+        self.ledger = PnLLedger(session)
 
     def calculate_realized_pnl(
         self,
@@ -154,6 +158,8 @@ class PnLEngine:
 
         Realized P&L is calculated from the difference between sell price and
         matching buy prices using FIFO (First In First Out) accounting method.
+        Matches are read from the persisted lot ledger (see ledger.py), so the
+        cost is an indexed range aggregate rather than a full history replay.
 
         Args:
             user_id: User UUID
@@ -165,83 +171,17 @@ class PnLEngine:
         Returns:
             Realized P&L as Decimal
         """
-        # Build query for filled orders
-        query = select(Order).where(Order.user_id == user_id, Order.status == "filled")
-
-        # Apply filters
-        # Note: We don't filter by start_date in the query because we need
-        # historical buy orders to correctly calculate cost basis (FIFO).
-        # Filtering by start_date happens in memory during accumulation.
-        if end_date:
-            query = query.where(Order.filled_at <= end_date)
-        if algorithm_id:
-            query = query.where(Order.algorithm_id == algorithm_id)
-        if coin_type:
-            query = query.where(Order.coin_type == coin_type)
-
-        # Order by filled_at to process trades chronologically
-        query = query.order_by(Order.filled_at)
-
-        orders = self.session.exec(query).all()
-
-        # Calculate P&L using FIFO (First In, First Out) method
-        realized_pnl = Decimal("0")
-        positions_tracker: dict[
-            str, list[tuple[Decimal, Decimal]]
-        ] = {}  # coin -> [(quantity, price)]
-
-        for order in orders:
-            if order.side == "buy":
-                # Add to position tracker
-                if order.coin_type not in positions_tracker:
-                    positions_tracker[order.coin_type] = []
-                positions_tracker[order.coin_type].append(
-                    (order.filled_quantity, order.price or Decimal("0"))
-                )
-
-            elif order.side == "sell":
-                # Calculate realized P&L from sell
-                if (
-                    order.coin_type not in positions_tracker
-                    or not positions_tracker[order.coin_type]
-                ):
-                    # No buy positions to match against - skip
-                    logger.warning(
-                        f"Sell order {order.id} has no matching buy positions for {order.coin_type}"
-                    )
-                    continue
-
-                sell_quantity = order.filled_quantity
-                sell_price = order.price or Decimal("0")
-
-                # Match sells against buys using FIFO
-                while sell_quantity > 0 and positions_tracker[order.coin_type]:
-                    buy_quantity, buy_price = positions_tracker[order.coin_type][0]
-
-                    # Calculate how much we can match
-                    match_quantity = min(sell_quantity, buy_quantity)
-
-                    # Calculate P&L for this match
-                    trade_pnl = match_quantity * (sell_price - buy_price)
-
-                    # Only calculate/add P&L if within the requested window
-                    if not start_date or order.filled_at >= start_date:
-                        realized_pnl += trade_pnl
-
-                    # Update quantities
-                    sell_quantity -= match_quantity
-                    buy_quantity -= match_quantity
-
-                    # Update or remove buy position
-                    if buy_quantity > 0:
-                        positions_tracker[order.coin_type][0] = (
-                            buy_quantity,
-                            buy_price,
-                        )
-                    else:
-                        positions_tracker[order.coin_type].pop(0)
-
-        return realized_pnl
+        # Bring the lot ledger up to date with any new fills, then
+        # aggregate the persisted realized matches for the window
+        self.ledger.sync(user_id)
+
+        return self.ledger.realized_pnl(
+            user_id,
+            start_date=start_date,
+            end_date=end_date,
+            algorithm_id=algorithm_id,
+            coin_type=coin_type,
+        )
 
     def calculate_unrealized_pnl(
         self, user_id: UUID, coin_type: str | None = None
@@ -267,11 +207,25 @@ class PnLEngine:
 
         positions = self.session.exec(query).all()
 
-        unrealized_pnl = Decimal("0")
+        return sum(self._unrealized_by_coin(positions).values(), Decimal("0"))
+
+    def _unrealized_by_coin(self, positions: list[Position]) -> dict[str, Decimal]:
+        """
+        Unrealized P&L per coin for a set of positions
 
+        Latest prices for all coins are fetched with a single query.
+
+        Args:
+            positions: Positions to value
+
+        Returns:
+            Mapping of coin_type to unrealized P&L (coins without price data are omitted)
+        """
+        prices = self._get_current_prices({p.coin_type for p in positions})
+
+        result: dict[str, Decimal] = {}
         for position in positions:
-            # Get current price for this coin
-            current_price = self._get_current_price(position.coin_type)
+            current_price = prices.get(position.coin_type)
 
             if current_price is None:
                 logger.warning(
@@ -279,14 +233,13 @@ class PnLEngine:
                 )
                 continue
 
-            # Calculate current value
-            current_value = position.quantity * current_price
-
-            # Calculate unrealized P&L
-            position_pnl = current_value - position.total_cost
-            unrealized_pnl += position_pnl
+            # Current market value minus cost basis
+            position_pnl = position.quantity * current_price - position.total_cost
+            result[position.coin_type] = (
+                result.get(position.coin_type, Decimal("0")) + position_pnl
+            )
 
-        return unrealized_pnl
+        return result
 
     def get_pnl_summary(
         self,
@@ -309,82 +262,43 @@ class PnLEngine:
         realized_pnl = self.calculate_realized_pnl(user_id, start_date, end_date)
         unrealized_pnl = self.calculate_unrealized_pnl(user_id)
 
-        # Get trade statistics
-        query = select(Order).where(Order.user_id == user_id, Order.status == "filled")
-
-        if start_date:
-            query = query.where(Order.filled_at >= start_date)
-        if end_date:
-            query = query.where(Order.filled_at <= end_date)
-
-        orders = self.session.exec(query).all()
+        # Get trade statistics from the ledger's per-sell realized matches
+        trade_pnls = [
+            Decimal(str(trade_pnl))
+            for _, trade_pnl in self.ledger.realized_by_sell(
+                user_id, start_date, end_date
+            )
+        ]
 
-        # Calculate trade metrics
-        total_trades = 0
+        total_trades = len(trade_pnls)
         winning_trades = 0
         losing_trades = 0
         total_profit = Decimal("0")
         total_loss = Decimal("0")
         largest_win = Decimal("0")
         largest_loss = Decimal("0")
-        total_volume = Decimal("0")
-
-        # Track positions for P&L calculation per trade
-        positions_tracker: dict[str, list[tuple[Decimal, Decimal]]] = {}
-
-        for order in orders:
-            if order.side == "buy":
-                # Track buy positions
-                if order.coin_type not in positions_tracker:
-                    positions_tracker[order.coin_type] = []
-                positions_tracker[order.coin_type].append(
-                    (order.filled_quantity, order.price or Decimal("0"))
-                )
-                total_volume += order.filled_quantity * (order.price or Decimal("0"))
-
-            elif order.side == "sell":
-                # Calculate P&L for this sell
-                if (
-                    order.coin_type not in positions_tracker
-                    or not positions_tracker[order.coin_type]
-                ):
-                    continue
-
-                sell_quantity = order.filled_quantity
-                sell_price = order.price or Decimal("0")
-                trade_pnl = Decimal("0")
-
-                # Match against buys
-                while sell_quantity > 0 and positions_tracker[order.coin_type]:
-                    buy_quantity, buy_price = positions_tracker[order.coin_type][0]
-                    match_quantity = min(sell_quantity, buy_quantity)
-
-                    pnl = match_quantity * (sell_price - buy_price)
-                    trade_pnl += pnl
-
-                    sell_quantity -= match_quantity
-                    buy_quantity -= match_quantity
-
-                    if buy_quantity > 0:
-                        positions_tracker[order.coin_type][0] = (
-                            buy_quantity,
-                            buy_price,
-                        )
-                    else:
-                        positions_tracker[order.coin_type].pop(0)
-
-                # Update statistics
-                total_trades += 1
-                total_volume += order.filled_quantity * sell_price
-
-                if trade_pnl > 0:
-                    winning_trades += 1
-                    total_profit += trade_pnl
-                    largest_win = max(largest_win, trade_pnl)
-                elif trade_pnl < 0:
-                    losing_trades += 1
-                    total_loss += trade_pnl
-                    largest_loss = min(largest_loss, trade_pnl)
+
+        for trade_pnl in trade_pnls:
+            if trade_pnl > 0:
+                winning_trades += 1
+                total_profit += trade_pnl
+                largest_win = max(largest_win, trade_pnl)
+            elif trade_pnl < 0:
+                losing_trades += 1
+                total_loss += trade_pnl
+                largest_loss = min(largest_loss, trade_pnl)
+
+        # Total traded notional within the window
+        volume_query = select(
+            func.coalesce(func.sum(Order.filled_quantity * Order.price), 0)
+        ).where(Order.user_id == user_id, Order.status == "filled")
+
+        if start_date:
+            volume_query = volume_query.where(Order.filled_at >= start_date)
+        if end_date:
+            volume_query = volume_query.where(Order.filled_at <= end_date)
+
+        total_volume = Decimal(str(self.session.exec(volume_query).one()))
 
         return PnLMetrics(
             realized_pnl=realized_pnl,
@@ -434,15 +348,17 @@ class PnLEngine:
 
         algorithm_ids = self.session.exec(query).all()
 
-        result = {}
-        for algo_id in algorithm_ids:
-            realized_pnl = self.calculate_realized_pnl(
-                user_id, start_date, end_date, algorithm_id=algo_id
-            )
-            # Note: Unrealized P&L not split by algorithm as positions don't track algorithm
-            result[algo_id] = PnLMetrics(realized_pnl=realized_pnl)
+        # Realized P&L for every algorithm book in one grouped aggregate
+        self.ledger.sync(user_id)
+        realized = self.ledger.realized_by_group(
+            user_id, "algorithm_id", start_date, end_date
+        )
 
-        return result
+        # Note: Unrealized P&L not split by algorithm as positions don't track algorithm
+        return {
+            algo_id: PnLMetrics(realized_pnl=realized.get(algo_id, Decimal("0")))
+            for algo_id in algorithm_ids
+        }
 
     def get_pnl_by_coin(
         self,
@@ -475,17 +391,27 @@ class PnLEngine:
 
         coin_types = self.session.exec(query).all()
 
-        result = {}
-        for coin_type in coin_types:
-            realized_pnl = self.calculate_realized_pnl(
-                user_id, start_date, end_date, coin_type=coin_type
-            )
-            unrealized_pnl = self.calculate_unrealized_pnl(user_id, coin_type=coin_type)
-            result[coin_type] = PnLMetrics(
-                realized_pnl=realized_pnl, unrealized_pnl=unrealized_pnl
+        # Realized P&L for every coin in one grouped aggregate, and
+        # unrealized P&L for every position with one bulk price lookup
+        self.ledger.sync(user_id)
+        realized = self.ledger.realized_by_group(
+            user_id, "coin_type", start_date, end_date
+        )
+
+        positions = self.session.exec(
+            select(Position).where(
+                Position.user_id == user_id, Position.coin_type.in_(coin_types)
             )
+        ).all()
+        unrealized = self._unrealized_by_coin(positions)
 
-        return result
+        return {
+            coin_type: PnLMetrics(
+                realized_pnl=realized.get(coin_type, Decimal("0")),
+                unrealized_pnl=unrealized.get(coin_type, Decimal("0")),
+            )
+            for coin_type in coin_types
+        }
 
     def get_historical_pnl(
         self,
@@ -497,6 +423,10 @@ class PnLEngine:
         """
         Get historical P&L data aggregated by time interval
 
+        Each bucket covers [bucket_start, next_bucket_start). The whole range
+        is computed from a single ordered scan of realized matches, so the
+        cost does not grow with the number of buckets.
+
         Args:
             user_id: User UUID
             start_date: Start date for historical data
@@ -506,71 +436,107 @@ class PnLEngine:
         Returns:
             List of dictionaries with timestamp and P&L data
         """
-        # Determine time buckets based on interval
-        if interval == "hour":
-            delta = timedelta(hours=1)
-        elif interval == "day":
-            delta = timedelta(days=1)
-        elif interval == "week":
-            delta = timedelta(weeks=1)
-        elif interval == "month":
-            delta = timedelta(days=30)  # Approximate
-        else:
-            raise ValueError(f"Invalid interval: {interval}")
+        # Matches come back timezone-aware; treat naive bounds as UTC
+        if start_date.tzinfo is None:
+            start_date = start_date.replace(tzinfo=timezone.utc)
+        if end_date.tzinfo is None:
+            end_date = end_date.replace(tzinfo=timezone.utc)
+
+        boundaries = get_bucket_boundaries(start_date, end_date, interval)
+
+        # Bring the lot ledger up to date, then walk the realized matches
+        # once in time order, advancing a bucket cursor as we go
+        self.ledger.sync(user_id)
+        matches = self.ledger.realized_series(user_id, boundaries[0], boundaries[-1])
+
+        bucket_pnl = [Decimal("0")] * (len(boundaries) - 1)
+        bucket = 0
+
+        for realized_at, realized_pnl in matches:
+            while realized_at >= boundaries[bucket + 1]:
+                bucket += 1
+            bucket_pnl[bucket] += realized_pnl
+
+        return [
+            {
+                "timestamp": bucket_start.isoformat(),
+                "realized_pnl": float(pnl),
+                "interval": interval,
+            }
+            for bucket_start, pnl in zip(boundaries[:-1], bucket_pnl, strict=True)
+        ]
+
+    def _get_current_prices(self, coin_types: set[str]) -> dict[str, Decimal]:
+        """
+        Get the most recent price for several cryptocurrencies at once
 
-        result = []
-        current_date = start_date
+        Served from the shared latest-price cache; coins not cached are
+        loaded with a single DISTINCT ON (coin_type) query.
 
-        while current_date <= end_date:
-            next_date = current_date + delta
+        Args:
+            coin_types: Cryptocurrency symbols
 
-            # Calculate P&L for this time bucket
-            realized_pnl = self.calculate_realized_pnl(
-                user_id, start_date=current_date, end_date=next_date
-            )
+        Returns:
+            Mapping of coin_type to last price (coins without data are omitted)
+        """
+        if not coin_types:
+            return {}
 
-            result.append(
-                {
-                    "timestamp": current_date.isoformat(),
-                    "realized_pnl": float(realized_pnl),
-                    "interval": interval,
-                }
-            )
+        return get_price_cache().get_many(coin_types, self.session)
 
-            current_date = next_date
 
-        return result
+def _add_months(value: datetime, months: int) -> datetime:
+    """Add calendar months, clamping the day to the end of the target month"""
+    month_index = value.month - 1 + months
+    year = value.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(value.day, calendar.monthrange(year, month)[1])
+    return value.replace(year=year, month=month, day=day)
 
-    def _get_current_price(self, coin_type: str) -> Decimal | None:
-        """
-        Get the most recent price for a cryptocurrency
 
-        Args:
-            coin_type: Cryptocurrency symbol
+def get_bucket_boundaries(
+    start_date: datetime, end_date: datetime, interval: str
+) -> list[datetime]:
+    """
+    Compute the bucket start times for a historical P&L range
 
-        Returns:
-            Current price or None if not available
-        """
-        # Query for most recent price data
-        query = (
-            select(PriceData5Min)
-            .where(PriceData5Min.coin_type == coin_type)
-            .order_by(desc(PriceData5Min.timestamp))
-            .limit(1)
-        )
+    Buckets start at start_date and step by the interval until a bucket
+    start passes end_date. Months are real calendar months, always offset
+    from start_date so that short months do not drift later buckets.
 
-        price_data = self.session.exec(query).first()
+    Args:
+        start_date: Start of the range
+        end_date: End of the range
+        interval: Aggregation interval ('hour', 'day', 'week', 'month')
 
-        if price_data:
-            # Use last price (most recent trade price)
-            logger.debug(
-                f"Using price for {coin_type}: {price_data.last} "
-                f"(timestamp: {price_data.timestamp})"
-            )
-            return price_data.last
+    Returns:
+        Bucket start times followed by the end of the last bucket
+
+    Raises:
+        ValueError: If the interval is not supported
+    """
+    if interval == "hour":
+        delta = timedelta(hours=1)
+    elif interval == "day":
+        delta = timedelta(days=1)
+    elif interval == "week":
+        delta = timedelta(weeks=1)
+    elif interval == "month":
+        delta = None
+    else:
+        raise ValueError(f"Invalid interval: {interval}")
+
+    boundaries = [start_date]
+    step = 0
+
+    while boundaries[-1] <= end_date:
+        step += 1
+        if delta is None:
+            boundaries.append(_add_months(start_date, step))
+        else:
+            boundaries.append(start_date + delta * step)
 
-        logger.debug(f"No price data found for {coin_type}")
-        return None
+    return boundaries
 
 
 # Factory function for creating P&L engine instances
@@ -0,0 +1,193 @@
+"""
+Latest Price Cache
+
+This module provides an in-process cache of the most recent price per coin.
+Prices in PriceData5Min change at most every 5 minutes, so the hot trading
+paths (P&L, hard-stop watcher, executor) read from memory instead of issuing
+an ORDER BY timestamp DESC LIMIT 1 query per coin.
+
+The Coinspot exchange collector writes into the cache on ingest. Coins that
+are missing or older than max_age_seconds are loaded with a single
+DISTINCT ON (coin_type) query.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Iterable
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+
+from sqlalchemy import desc
+from sqlmodel import Session, col, select
+
+from app.models import PriceData5Min
+
+logger = logging.getLogger(__name__)
+
+
+class LatestPriceCache:
+    """
+    In-process cache of the latest price per coin
+
+    Features:
+    - Write-through from price ingest (update / update_many)
+    - Bulk reads (get_many) with one fallback query for all misses
+    - Out-of-order protection: older observations never replace newer ones
+    - Max-age refresh so processes without a local collector stay current
+    """
+
+    def __init__(self, max_age_seconds: float = 300.0):
+        """
+        Initialize the cache
+
+        Args:
+            max_age_seconds: How long an entry is served before it is reloaded
+                from the database (default: 300, one collection interval)
+        """
+        self.max_age_seconds = max_age_seconds
+        # coin_type -> (price, observed_at, cached_at monotonic)
+        self._entries: dict[str, tuple[Decimal, datetime, float]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def update(self, coin_type: str, price: Decimal, observed_at: datetime) -> Decimal:
+        """
+        Record a new price observation
+
+        An observation older than the cached one only refreshes the entry's
+        age; the newer price is kept.
+
+        Args:
+            coin_type: Cryptocurrency symbol
+            price: Last traded price
+            observed_at: Timestamp of the observation
+
+        Returns:
+            The price now cached for the coin
+        """
+        now = time.monotonic()
+        with self._lock:
+            current = self._entries.get(coin_type)
+            if current is not None and current[1] > observed_at:
+                price, observed_at = current[0], current[1]
+            self._entries[coin_type] = (price, observed_at, now)
+        return price
+
+    def update_many(self, records: Iterable[PriceData5Min]) -> int:
+        """
+        Record a batch of price rows (e.g. one collector run)
+
+        Args:
+            records: PriceData5Min rows
+
+        Returns:
+            Number of rows applied
+        """
+        count = 0
+        for record in records:
+            self.update(record.coin_type, record.last, record.timestamp)
+            count += 1
+        return count
+
+    def get(self, coin_type: str, session: Session | None = None) -> Decimal | None:
+        """
+        Get the latest price for one coin
+
+        Args:
+            coin_type: Cryptocurrency symbol
+            session: Database session used to load misses (optional)
+
+        Returns:
+            Latest price or None if unknown
+        """
+        return self.get_many([coin_type], session).get(coin_type)
+
+    def get_many(
+        self, coin_types: Iterable[str], session: Session | None = None
+    ) -> dict[str, Decimal]:
+        """
+        Get the latest prices for several coins
+
+        Fresh entries are served from memory. All misses are loaded together
+        with one DISTINCT ON (coin_type) query when a session is supplied.
+
+        Args:
+            coin_types: Cryptocurrency symbols
+            session: Database session used to load misses (optional)
+
+        Returns:
+            Mapping of coin_type to price (coins without data are omitted)
+        """
+        now = time.monotonic()
+        result: dict[str, Decimal] = {}
+        missing: set[str] = set()
+
+        with self._lock:
+            for coin_type in set(coin_types):
+                entry = self._entries.get(coin_type)
+                if entry is not None and now - entry[2] <= self.max_age_seconds:
+                    result[coin_type] = entry[0]
+                else:
+                    missing.add(coin_type)
+
+        self.hits += len(result)
+        self.misses += len(missing)
+
+        if missing and session is not None:
+            for coin_type, (price, observed_at) in self._load(session, missing).items():
+                result[coin_type] = self.update(coin_type, price, observed_at)
+
+        return result
+
+    def invalidate(self, coin_type: str | None = None) -> None:
+        """
+        Drop one entry, or the whole cache
+
+        Args:
+            coin_type: Coin to drop (default: all coins)
+        """
+        with self._lock:
+            if coin_type is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(coin_type, None)
+
+    def stats(self) -> dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            size = len(self._entries)
+        return {"size": size, "hits": self.hits, "misses": self.misses}
+
+    @staticmethod
+    def _load(
+        session: Session, coin_types: set[str]
+    ) -> dict[str, tuple[Decimal, datetime]]:
+        """Load the latest row for each coin with one DISTINCT ON query"""
+        query = (
+            select(
+                col(PriceData5Min.coin_type),
+                col(PriceData5Min.last),
+                col(PriceData5Min.timestamp),
+            )
+            .where(col(PriceData5Min.coin_type).in_(coin_types))
+            .order_by(col(PriceData5Min.coin_type), desc(col(PriceData5Min.timestamp)))
+            .distinct(col(PriceData5Min.coin_type))
+        )
+        rows = session.exec(query).all()
+        logger.debug(f"Loaded latest prices for {len(rows)}/{len(coin_types)} coins")
+        return {coin_type: (last, timestamp) for coin_type, last, timestamp in rows}
+
+
+# Process-wide instance
+_price_cache: LatestPriceCache | None = None
+
+
+def get_price_cache() -> LatestPriceCache:
+    """Get the process-wide latest price cache"""
+    global _price_cache
+    if _price_cache is None:
+        _price_cache = LatestPriceCache()
+    return _price_cache
@@ -15,6 +15,7 @@ from uuid import UUID
 from sqlmodel import Session, select
 
 from app.models import Order
+from app.services.trading.ledger import PnLLedger
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +40,7 @@ class TradeRecorder:
             session: Database session
         """
         self.session = session
+        self.ledger = PnLLedger(session)
 
     def log_trade_attempt(
         self,
@@ -89,6 +91,41 @@ class TradeRecorder:
 
         return order
 
+    def log_trade_attempts(self, attempts: list[dict[str, Any]]) -> list[UUID]:
+        """
+        Log several trade attempts with a single commit
+
+        Args:
+            attempts: Keyword arguments of log_trade_attempt, one dict per trade
+
+        Returns:
+            IDs of the created orders, in the order of attempts
+        """
+        now = datetime.now(timezone.utc)
+        orders = [
+            Order(
+                user_id=attempt["user_id"],
+                coin_type=attempt["coin_type"],
+                side=attempt["side"],
+                quantity=attempt["quantity"],
+                order_type=attempt.get("order_type", "market"),
+                price=attempt.get("price"),
+                algorithm_id=attempt.get("algorithm_id"),
+                status="pending",
+                created_at=now,
+                updated_at=now,
+            )
+            for attempt in attempts
+        ]
+        # IDs are generated client-side, so no refresh is needed after commit
+        order_ids = [order.id for order in orders]
+
+        self.session.add_all(orders)
+        self.session.commit()
+
+        logger.info(f"Trade attempts logged: {len(order_ids)} orders")
+        return order_ids
+
     def record_success(
         self,
         order_id: UUID,
@@ -126,6 +163,8 @@ class TradeRecorder:
             f"(Exchange ID: {coinspot_order_id})"
         )
 
+        self._update_ledger(order.user_id)
+
     def record_failure(self, order_id: UUID, error_message: str) -> None:
         """
         Record a failed trade attempt
@@ -232,8 +271,27 @@ class TradeRecorder:
             f"Status: {order.status}, Filled: {filled_amount}"
         )
 
+        if order.status == "filled":
+            self._update_ledger(order.user_id)
+
         return True
 
+    def _update_ledger(self, user_id: UUID) -> None:
+        """
+        Apply newly filled orders to the P&L lot ledger
+
+        Failures are logged rather than raised: the order itself is already
+        committed and the ledger catches up on its next sync.
+
+        Args:
+            user_id: User whose ledger should be updated
+        """
+        try:
+            self.ledger.sync(user_id)
+        except Exception as e:
+            self.session.rollback()
+            logger.error(f"Failed to update P&L ledger for user {user_id}: {e}")
+
     def get_trade_history(
         self,
         user_id: UUID,
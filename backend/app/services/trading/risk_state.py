@@ -0,0 +1,307 @@
+"""
+Risk State Cache
+
+Pre-trade validation needs each user's position costs, today's cash flow
+(daily P&L), per-algorithm exposure and the active risk rules. Instead of
+re-querying them on every TradingSafetyManager.validate_trade call, this
+module keeps one snapshot per user, loaded with three aggregate queries and
+then maintained incrementally as the OrderExecutor applies fills.
+
+Snapshots expire after a short TTL so writes made outside the executor
+(hard-stop liquidations, manual position edits, other processes) are picked
+up. Active risk rules are cached process-wide and dropped on rule changes.
+
+The daily P&L window follows the cache's clock: the wall clock normally,
+the simulated time of a historical replay.
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import case
+from sqlmodel import Session, col, func, select
+
+from app.models import Order, Position, RiskRule, User
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ActiveRule:
+    """Detached copy of an active RiskRule"""
+
+    name: str
+    rule_type: str
+    value: dict[str, Any]
+
+
+@dataclass
+class RiskSnapshot:
+    """Risk inputs for one user"""
+
+    user_id: UUID
+    # coin_type -> total cost of the open position
+    positions: dict[str, Decimal]
+    # Sell proceeds minus buy costs of today's fills (UTC day)
+    daily_pnl: Decimal
+    day: date
+    # algorithm_id -> filled buy value minus filled sell value
+    algorithm_exposure: dict[UUID, Decimal] = field(default_factory=dict)
+    loaded_at: float = 0.0
+
+    @property
+    def portfolio_value(self) -> Decimal:
+        """Total cost of all open positions"""
+        return sum(self.positions.values(), Decimal("0"))
+
+    def roll_day(self, today: date) -> None:
+        """Start a new daily P&L window when the UTC day changes"""
+        if today != self.day:
+            self.day = today
+            self.daily_pnl = Decimal("0")
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class RiskStateCache:
+    """
+    Per-user risk snapshots and active risk rules
+
+    Features:
+    - One snapshot load (3 queries) per user per TTL instead of ~8 per trade
+    - Incremental updates from executed fills (record_fill)
+    - Active rules cached process-wide, invalidated on rule changes
+    - Injectable clock for the daily P&L window
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 15.0,
+        rules_ttl_seconds: float = 60.0,
+        clock: Callable[[], datetime] = _utc_now,
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            ttl_seconds: How long a user snapshot is served before reloading
+            rules_ttl_seconds: How long the active rule set is served
+            clock: Current time (aware), which decides the UTC day of the
+                daily P&L window (default: the wall clock)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.rules_ttl_seconds = rules_ttl_seconds
+        self.clock = clock
+        self._snapshots: dict[UUID, RiskSnapshot] = {}
+        self._rules: dict[str, list[ActiveRule]] | None = None
+        self._rules_loaded_at = 0.0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, session: Session, user_id: UUID) -> RiskSnapshot | None:
+        """
+        Get a user's risk snapshot, loading it when missing or expired
+
+        Args:
+            session: Database session used for loads
+            user_id: User to look up
+
+        Returns:
+            Snapshot, or None if the user does not exist
+        """
+        now = time.monotonic()
+        with self._lock:
+            snapshot = self._snapshots.get(user_id)
+            if snapshot is not None and now - snapshot.loaded_at <= self.ttl_seconds:
+                self.hits += 1
+                snapshot.roll_day(self._today())
+                return snapshot
+
+        self.misses += 1
+        snapshot = self._load(session, user_id)
+        if snapshot is not None:
+            with self._lock:
+                self._snapshots[user_id] = snapshot
+        return snapshot
+
+    def get_rules(self, session: Session, rule_type: str) -> list[ActiveRule]:
+        """
+        Get the active risk rules of one type
+
+        Args:
+            session: Database session used for loads
+            rule_type: RiskRule.rule_type (e.g. max_position_size)
+
+        Returns:
+            Active rules of that type
+        """
+        now = time.monotonic()
+        with self._lock:
+            rules = self._rules
+            if (
+                rules is not None
+                and now - self._rules_loaded_at <= self.rules_ttl_seconds
+            ):
+                return rules.get(rule_type, [])
+
+        loaded: dict[str, list[ActiveRule]] = {}
+        for rule in session.exec(
+            select(RiskRule).where(RiskRule.is_active == True)  # noqa: E712
+        ).all():
+            loaded.setdefault(rule.rule_type, []).append(
+                ActiveRule(rule.name, rule.rule_type, dict(rule.value or {}))
+            )
+        with self._lock:
+            self._rules = loaded
+            self._rules_loaded_at = now
+        return loaded.get(rule_type, [])
+
+    def record_fill(self, order: Order, position_cost: Decimal | None) -> None:
+        """
+        Apply an executed order to the owner's snapshot
+
+        Args:
+            order: Filled order (filled_quantity and price set)
+            position_cost: Total cost of the user's position in the coin
+                after the fill, or None if unknown (the snapshot is dropped)
+        """
+        with self._lock:
+            snapshot = self._snapshots.get(order.user_id)
+            if snapshot is None:
+                return
+            if (
+                position_cost is None
+                or order.price is None
+                or order.filled_quantity is None
+            ):
+                del self._snapshots[order.user_id]
+                return
+
+            value = order.filled_quantity * order.price
+            signed = value if order.side == "sell" else -value
+
+            # Fills are recorded as they execute, so they count towards the
+            # clock's current day
+            snapshot.roll_day(self._today())
+            snapshot.daily_pnl += signed
+
+            if order.algorithm_id:
+                snapshot.algorithm_exposure[order.algorithm_id] = (
+                    snapshot.algorithm_exposure.get(order.algorithm_id, Decimal("0"))
+                    - signed
+                )
+
+            if position_cost > 0:
+                snapshot.positions[order.coin_type] = position_cost
+            else:
+                snapshot.positions.pop(order.coin_type, None)
+
+    def invalidate(self, user_id: UUID | None = None) -> None:
+        """
+        Drop one user's snapshot, or all snapshots
+
+        Args:
+            user_id: User to drop (default: all users)
+        """
+        with self._lock:
+            if user_id is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(user_id, None)
+
+    def invalidate_rules(self) -> None:
+        """Drop the cached rule set (call after creating/updating/deleting rules)"""
+        with self._lock:
+            self._rules = None
+
+    def stats(self) -> dict[str, Any]:
+        """Get cache statistics"""
+        with self._lock:
+            size = len(self._snapshots)
+        return {"size": size, "hits": self.hits, "misses": self.misses}
+
+    def _today(self) -> date:
+        return self.clock().astimezone(timezone.utc).date()
+
+    def _load(self, session: Session, user_id: UUID) -> RiskSnapshot | None:
+        """Load a snapshot with one query per component"""
+        if session.get(User, user_id) is None:
+            return None
+
+        positions: dict[str, Decimal] = dict(
+            session.exec(
+                select(col(Position.coin_type), col(Position.total_cost)).where(
+                    Position.user_id == user_id
+                )
+            ).all()
+        )
+
+        now = self.clock().astimezone(timezone.utc)
+        today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        value = col(Order.filled_quantity) * col(Order.price)
+        daily_pnl = session.exec(
+            select(
+                func.sum(
+                    case(
+                        (col(Order.side) == "sell", value),
+                        (col(Order.side) == "buy", -value),
+                        else_=0,
+                    )
+                )
+            ).where(
+                Order.user_id == user_id,
+                Order.status == "filled",
+                col(Order.filled_at) >= today_start,
+                col(Order.filled_at) < today_start + timedelta(days=1),
+            )
+        ).one()
+
+        exposure: dict[UUID, Decimal] = {}
+        for algorithm_id, side, total in session.exec(
+            select(col(Order.algorithm_id), col(Order.side), func.sum(value))
+            .where(
+                Order.user_id == user_id,
+                col(Order.algorithm_id).is_not(None),
+                Order.status == "filled",
+            )
+            .group_by(col(Order.algorithm_id), col(Order.side))
+        ).all():
+            assert algorithm_id is not None  # filtered in the query
+            total = total or Decimal("0")
+            signed = total if side == "buy" else -total if side == "sell" else 0
+            exposure[algorithm_id] = exposure.get(algorithm_id, Decimal("0")) + signed
+
+        logger.debug(
+            f"Loaded risk snapshot for {user_id}: {len(positions)} positions, "
+            f"{len(exposure)} algorithms"
+        )
+        return RiskSnapshot(
+            user_id=user_id,
+            positions=positions,
+            daily_pnl=Decimal(daily_pnl or 0),
+            day=today_start.date(),
+            algorithm_exposure=exposure,
+            loaded_at=time.monotonic(),
+        )
+
+
+# Process-wide instance
+_risk_state: RiskStateCache | None = None
+
+
+def get_risk_state() -> RiskStateCache:
+    """Get the process-wide risk state cache"""
+    global _risk_state
+    if _risk_state is None:
+        _risk_state = RiskStateCache()
+    return _risk_state
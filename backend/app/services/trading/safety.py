@@ -13,11 +13,16 @@ from typing import Any
 from uuid import UUID
 
 import redis.asyncio as redis
-from sqlmodel import Session, func, select
+from sqlmodel import Session
 
 from app import crud_risk
 from app.core.config import settings
-from app.models import AuditLog, Order, Position, RiskRule, User
+from app.services.trading.audit import get_audit_writer
+from app.services.trading.risk_state import (
+    RiskSnapshot,
+    RiskStateCache,
+    get_risk_state,
+)
 from app.utils.notifications import send_slack_alert
 
 logger = logging.getLogger(__name__)
@@ -36,6 +41,7 @@ class TradingSafetyManager:
     Features:
     - Maximum position size limits (Dynamic via RiskRules)
     - Kill Switch (Redis-backed for speed)
+    - Cached per-user risk state (see risk_state.py)
     - Audit Logging
     """
 
@@ -49,14 +55,21 @@ class TradingSafetyManager:
         max_algorithm_exposure_pct: Decimal = Decimal(
             "0.30"
         ),  # 30% per algorithm (Fallback)
+        risk_state: RiskStateCache | None = None,
     ):
         self.session = session
+        self._risk_state = risk_state
         self.max_position_pct = max_position_pct
         self.max_daily_loss_pct = max_daily_loss_pct
         self.max_algorithm_exposure_pct = max_algorithm_exposure_pct
         self._emergency_stop = False
         self.redis_client: redis.Redis | None = None
 
+    @property
+    def risk_state(self) -> RiskStateCache:
+        """Risk state cache (the process-wide one unless injected)"""
+        return self._risk_state or get_risk_state()
+
     async def connect(self) -> None:
         """Connect to Redis"""
         if self.redis_client is None:
@@ -72,6 +85,22 @@ class TradingSafetyManager:
             await self.redis_client.aclose()
             self.redis_client = None
 
+    def bind(self, session: Session) -> "TradingSafetyManager":
+        """
+        Get a manager with the same limits working in another session
+
+        The copy shares this manager's Redis connection and risk state cache.
+        """
+        bound = TradingSafetyManager(
+            session,
+            max_position_pct=self.max_position_pct,
+            max_daily_loss_pct=self.max_daily_loss_pct,
+            max_algorithm_exposure_pct=self.max_algorithm_exposure_pct,
+            risk_state=self._risk_state,
+        )
+        bound.redis_client = self.redis_client
+        return bound
+
     def _log_audit(
         self,
         action: str,
@@ -81,17 +110,17 @@ class TradingSafetyManager:
     ) -> None:
         """
         Create an immutable audit log entry (Risk Management Layer)
-        Adapts internal call to database model (AuditLog)
+
+        Entries go through the buffered audit writer; CRITICAL entries are
+        written before returning.
         """
         try:
-            log_entry = AuditLog(
+            get_audit_writer().log(
                 event_type=action,
                 details=details,
-                severity=severity.lower(),
+                severity=severity,
                 user_id=actor_id,
             )
-            self.session.add(log_entry)
-            self.session.commit()
             logger.info(f"Audit Log: {action} - {severity}")
         except Exception as e:
             logger.error(f"Failed to write audit log: {str(e)}")
@@ -115,16 +144,12 @@ class TradingSafetyManager:
             {
                 "status": "active",
                 "triggered_by": str(actor_id) if actor_id else "system",
+                "timestamp": str(datetime.now(timezone.utc)),
+                "source": "redis",
             },
             severity="CRITICAL",
             actor_id=actor_id,
         )
-        self._log_audit(
-            action="EMERGENCY_STOP_ACTIVATED",
-            details={"timestamp": str(datetime.now(timezone.utc)), "source": "redis"},
-            severity="CRITICAL",
-            actor_id=actor_id,
-        )
         logger.critical("EMERGENCY STOP ACTIVATED (Redis) - All trading halted")
 
         # Also sync to DB SystemSetting for redundancy (Track A legacy)
@@ -184,6 +209,16 @@ class TradingSafetyManager:
         status = await self.redis_client.get("omc:market_status")
         return status == "volatile"
 
+    async def _get_market_flags(self) -> tuple[bool, bool]:
+        """Read (emergency_stopped, volatile_market) with a single MGET"""
+        if not self.redis_client:
+            await self.connect()
+
+        emergency, market_status = await self.redis_client.mget(
+            "omc:emergency_stop", "omc:market_status"
+        )
+        return emergency == "true", market_status == "volatile"
+
     async def validate_trade(
         self,
         user_id: UUID,
@@ -195,10 +230,16 @@ class TradingSafetyManager:
     ) -> dict[str, Any]:
         """
         Validate a trade against all safety mechanisms
+
+        Uses one Redis round trip for the kill switch and market status and
+        the cached risk snapshot for the user; the database is only queried
+        when the snapshot has expired.
         """
         try:
+            emergency_stopped, is_volatile = await self._get_market_flags()
+
             # Check emergency stop
-            if await self.is_emergency_stopped():
+            if emergency_stopped:
                 # Log rejection
                 self._log_audit(
                     action="TRADE_REJECTED",
@@ -208,9 +249,9 @@ class TradingSafetyManager:
                 )
                 raise SafetyViolation("Emergency stop is active - trading is halted")
 
-            # Get user
-            user = self.session.get(User, user_id)
-            if not user:
+            # Get user risk state
+            snapshot = self.risk_state.get(self.session, user_id)
+            if snapshot is None:
                 raise SafetyViolation(f"User {user_id} not found")
 
             # Calculate trade value
@@ -218,15 +259,17 @@ class TradingSafetyManager:
 
             # Check position size limit (for buy orders)
             if side == "buy":
-                await self._check_position_size_limit(user_id, coin_type, trade_value)
+                self._check_position_size_limit(
+                    snapshot, coin_type, trade_value, is_volatile
+                )
 
             # Check daily loss limit
-            await self._check_daily_loss_limit(user_id)
+            self._check_daily_loss_limit(snapshot, is_volatile)
 
             # Check algorithm exposure limit (if algorithmic trade)
             if algorithm_id:
-                await self._check_algorithm_exposure_limit(
-                    user_id, algorithm_id, trade_value
+                self._check_algorithm_exposure_limit(
+                    snapshot, algorithm_id, trade_value
                 )
 
             # All checks passed
@@ -274,37 +317,30 @@ class TradingSafetyManager:
             )
             raise e
 
-    async def _check_position_size_limit(
-        self, user_id: UUID, coin_type: str, trade_value: Decimal
+    def _check_position_size_limit(
+        self,
+        snapshot: RiskSnapshot,
+        coin_type: str,
+        trade_value: Decimal,
+        is_volatile: bool,
     ) -> None:
         """
         Check that position size won't exceed limits
         """
-        # Calculate total portfolio value
-        portfolio_value = self._get_portfolio_value(user_id)
+        user_id = snapshot.user_id
+        portfolio_value = snapshot.portfolio_value
 
-        # Get current position value for this coin
-        statement = select(Position).where(
-            Position.user_id == user_id, Position.coin_type == coin_type
-        )
-        position = self.session.exec(statement).first()
-
-        current_position_value = Decimal("0")
-        if position:
-            current_position_value = position.total_cost
+        # Current position value for this coin
+        current_position_value = snapshot.positions.get(coin_type, Decimal("0"))
 
         # Calculate new position value after trade
         new_position_value = current_position_value + trade_value
 
         # --- Dynamic Risk Rule Check (Merged from Track A) ---
-        active_rules = self.session.exec(
-            select(RiskRule).where(
-                RiskRule.is_active is True, RiskRule.rule_type == "max_position_size"
-            )
-        ).all()
+        active_rules = self.risk_state.get_rules(self.session, "max_position_size")
 
         for rule in active_rules:
-            rule_value = rule.value or {}
+            rule_value = rule.value
 
             # Check absolute value limit
             if "max_value" in rule_value:
@@ -322,7 +358,7 @@ class TradingSafetyManager:
                 if new_position_value > max_allowed:
                     raise SafetyViolation(
                         f"Dynamic Risk Rule '{rule.name}' violated. "
-                        f"Position {new_position_value:.2f} > {limit_pct*100}% Portfolio ({max_allowed:.2f})"
+                        f"Position {new_position_value:.2f} > {limit_pct * 100}% Portfolio ({max_allowed:.2f})"
                     )
 
         if portfolio_value == 0:
@@ -332,7 +368,6 @@ class TradingSafetyManager:
             return
 
         # Volatility Check
-        is_volatile = await self.is_volatile_market()
         limit_multiplier = Decimal("0.5") if is_volatile else Decimal("1.0")
 
         effective_max_pct = self.max_position_pct * limit_multiplier
@@ -355,34 +390,20 @@ class TradingSafetyManager:
             f"{new_position_value:.2f}/{max_position_value:.2f} AUD"
         )
 
-    async def _check_daily_loss_limit(self, user_id: UUID) -> None:
+    def _check_daily_loss_limit(
+        self, snapshot: RiskSnapshot, is_volatile: bool
+    ) -> None:
         """Check that daily losses haven't exceeded limit"""
-        today_start = datetime.now(timezone.utc).replace(
-            hour=0, minute=0, second=0, microsecond=0
-        )
-
-        statement = select(Order).where(
-            Order.user_id == user_id,
-            Order.status == "filled",
-            Order.filled_at >= today_start,
-        )
-        today_orders = self.session.exec(statement).all()
-
-        daily_pnl = Decimal("0")
-        for order in today_orders:
-            if order.side == "sell":
-                daily_pnl += order.filled_quantity * order.price
-            elif order.side == "buy":
-                daily_pnl -= order.filled_quantity * order.price
-
-        portfolio_value = self._get_portfolio_value(user_id)
+        daily_pnl = snapshot.daily_pnl
+        portfolio_value = snapshot.portfolio_value
 
         if portfolio_value == 0:
-            logger.info(f"User {user_id} has no portfolio, skipping daily loss check")
+            logger.info(
+                f"User {snapshot.user_id} has no portfolio, skipping daily loss check"
+            )
             return
 
         # Volatility Check
-        is_volatile = await self.is_volatile_market()
         limit_multiplier = Decimal("0.5") if is_volatile else Decimal("1.0")
 
         effective_max_loss_pct = self.max_daily_loss_pct * limit_multiplier
@@ -394,52 +415,23 @@ class TradingSafetyManager:
                 msg += " [VOLATILE MARKET MODE ACTIVE]"
             raise SafetyViolation(msg)
 
-    async def _check_algorithm_exposure_limit(
-        self, user_id: UUID, algorithm_id: UUID, trade_value: Decimal
+    def _check_algorithm_exposure_limit(
+        self, snapshot: RiskSnapshot, algorithm_id: UUID, trade_value: Decimal
     ) -> None:
         """Check that algorithm exposure won't exceed limits"""
-        portfolio_value = self._get_portfolio_value(user_id)
+        portfolio_value = snapshot.portfolio_value
 
         if portfolio_value == 0:
             logger.info(
-                f"User {user_id} has no portfolio, allowing initial algorithmic trade"
+                f"User {snapshot.user_id} has no portfolio, allowing initial algorithmic trade"
             )
             return
 
-        # Calculate current exposure (Buys - Sells) for this algorithm
-        # Note: This is a simplified calculation. Ideally should track current position held by algo.
-        # Assuming algo only trades one direction or net value.
-
-        # Sum buys
-        buys = self.session.exec(
-            select(func.sum(Order.filled_quantity * Order.price)).where(
-                Order.user_id == user_id,
-                Order.algorithm_id == algorithm_id,
-                Order.status == "filled",
-                Order.side == "buy",
-            )
-        ).first() or Decimal("0")
-
-        # Sum sells
-        sells = self.session.exec(
-            select(func.sum(Order.filled_quantity * Order.price)).where(
-                Order.user_id == user_id,
-                Order.algorithm_id == algorithm_id,
-                Order.status == "filled",
-                Order.side == "sell",
-            )
-        ).first() or Decimal("0")
-
-        current_exposure = buys - sells
-        if current_exposure < 0:
-            current_exposure = Decimal(
-                "0"
-            )  # Should not be negative unless PnL is positive?
-            # Actually, if we sold more value than bought (profit), net exposure in currency terms is weird.
-            # Exposure should be Value of Chips on Table.
-            # Correct way: Sum(Sequence of Buys - Sequence of Sells) * Current Price.
-            # But we don't have current price easily here for all coins.
-            # Simple fallback: Net Invested Capital.
+        # Current exposure is net invested capital (filled buys - sells) for
+        # this algorithm; a net profit is not negative exposure
+        current_exposure = max(
+            snapshot.algorithm_exposure.get(algorithm_id, Decimal("0")), Decimal("0")
+        )
 
         new_exposure = current_exposure + trade_value
         max_exposure = portfolio_value * self.max_algorithm_exposure_pct
@@ -449,33 +441,11 @@ class TradingSafetyManager:
                 f"Algorithm exposure limit exceeded. New exposure: {new_exposure:.2f} AUD, Limit: {max_exposure:.2f} AUD"
             )
 
-    def _get_portfolio_value(self, user_id: UUID) -> Decimal:
-        """Calculate total portfolio value for a user"""
-        statement = select(Position).where(Position.user_id == user_id)
-        positions = self.session.exec(statement).all()
-        return sum(pos.total_cost for pos in positions)
-
     def get_safety_status(self, user_id: UUID) -> dict[str, Any]:
         """Get current safety status for a user"""
-        portfolio_value = self._get_portfolio_value(user_id)
-
-        # Get today's P&L (simplified duplication of logic above)
-        today_start = datetime.now(timezone.utc).replace(
-            hour=0, minute=0, second=0, microsecond=0
-        )
-        statement = select(Order).where(
-            Order.user_id == user_id,
-            Order.status == "filled",
-            Order.filled_at >= today_start,
-        )
-        today_orders = self.session.exec(statement).all()
-
-        daily_pnl = Decimal("0")
-        for order in today_orders:
-            if order.side == "sell":
-                daily_pnl += order.filled_quantity * order.price
-            elif order.side == "buy":
-                daily_pnl -= order.filled_quantity * order.price
+        snapshot = self.risk_state.get(self.session, user_id)
+        portfolio_value = snapshot.portfolio_value if snapshot else Decimal("0")
+        daily_pnl = snapshot.daily_pnl if snapshot else Decimal("0")
 
         return {
             "emergency_stop": self._emergency_stop,
@@ -4,10 +4,18 @@ Execution Scheduler for Trading Algorithms
 
 This module schedules and manages the execution of trading algorithms
 at configured frequencies.
+
+By default every algorithm gets its own job. In tick-batching mode all
+algorithms sharing a frequency run in one job per tick: market data is
+fetched once and the executor generates every signal before submitting the
+resulting orders together, so hundreds of deployments cost one price fetch
+and one commit per tick.
 """
 
 import json
 import logging
+import time
+from collections import deque
 from datetime import datetime, timezone
 from decimal import Decimal
 from typing import Any
@@ -18,6 +26,7 @@ from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 from sqlmodel import Session, select
 
+from app.core.config import settings
 from app.models import Algorithm, DeployedAlgorithm
 from app.services.trading.algorithm_executor import (
     TradingAlgorithm,
@@ -25,11 +34,52 @@ from app.services.trading.algorithm_executor import (
 )
 from app.services.trading.client import CoinspotTradingClient
 from app.services.trading.exceptions import SchedulerError
+from app.services.trading.executor import LATENCY_SAMPLES, latency_summary
+from app.services.trading.indicators import get_indicator_service
 from app.services.trading.strategies.ma_crossover import MACrossoverStrategy
 
 logger = logging.getLogger(__name__)
 
 
+def build_algorithm(
+    deployed_algo: DeployedAlgorithm, algo_def: Algorithm
+) -> TradingAlgorithm | None:
+    """
+    Instantiate the strategy of a deployment
+
+    Args:
+        deployed_algo: Deployment (parameters)
+        algo_def: Algorithm definition (name decides the strategy)
+
+    Returns:
+        Strategy instance, or None for unknown algorithm types
+    """
+    # Simple dispatch logic (to be replaced by a proper registry in Phase 3)
+    if "MA Crossover" in algo_def.name or "MACrossover" in algo_def.name:
+        # Parse parameters
+        params = {}
+        if deployed_algo.parameters_json:
+            try:
+                params = json.loads(deployed_algo.parameters_json)
+            except json.JSONDecodeError:
+                logger.warning(
+                    f"Invalid parameters JSON for deployment {deployed_algo.id}"
+                )
+
+        # Defaults
+        short_window = params.get("short_window", 10)
+        long_window = params.get("long_window", 50)
+        coin_type = params.get("coin_type", "BTC")
+
+        return MACrossoverStrategy(
+            short_window=short_window,
+            long_window=long_window,
+            coin_type=coin_type,
+        )
+
+    return None
+
+
 class ExecutionScheduler:
     """
     Schedules and manages algorithm execution
@@ -40,6 +90,7 @@ class ExecutionScheduler:
     - Resource allocation
     - Error recovery
     - Health monitoring
+    - Tick batching with per-tick timing
     """
 
     def __init__(
@@ -48,6 +99,7 @@ class ExecutionScheduler:
         api_key: str,
         api_secret: str,
         market_data_provider: Any | None = None,
+        batch_ticks: bool | None = None,
     ):
         """
         Initialize execution scheduler
@@ -57,6 +109,8 @@ class ExecutionScheduler:
             api_key: Coinspot API key
             api_secret: Coinspot API secret
             market_data_provider: Market data provider (optional)
+            batch_ticks: Run algorithms sharing a frequency in one job per tick
+                (default: settings.SCHEDULER_BATCH_TICKS)
         """
         self.session = session
         self.api_key = api_key
@@ -66,6 +120,17 @@ class ExecutionScheduler:
         self.scheduler = AsyncIOScheduler()
         self._running = False
         self._scheduled_algorithms: dict[str, dict[str, Any]] = {}
+        self.batch_ticks = (
+            settings.SCHEDULER_BATCH_TICKS if batch_ticks is None else batch_ticks
+        )
+        # Frequency -> job ID -> (user_id, algorithm_id, algorithm)
+        self._tick_groups: dict[
+            str, dict[str, tuple[UUID, UUID, TradingAlgorithm]]
+        ] = {}
+        self._paused: set[str] = set()
+        self.ticks = 0
+        self._last_tick: dict[str, Any] | None = None
+        self._tick_samples: deque[float] = deque(maxlen=LATENCY_SAMPLES)
 
     def start(self) -> None:
         """Start the scheduler"""
@@ -106,30 +171,7 @@ class ExecutionScheduler:
         for deployed_algo, algo_def in results:
             try:
                 # Instantiate based on algorithm type/name - minimal implementation for Sprint 2.26
-                algorithm_instance = None
-
-                # Simple dispatch logic (to be replaced by a proper registry in Phase 3)
-                if "MA Crossover" in algo_def.name or "MACrossover" in algo_def.name:
-                    # Parse parameters
-                    params = {}
-                    if deployed_algo.parameters_json:
-                        try:
-                            params = json.loads(deployed_algo.parameters_json)
-                        except json.JSONDecodeError:
-                            logger.warning(
-                                f"Invalid parameters JSON for deployment {deployed_algo.id}"
-                            )
-
-                    # Defaults
-                    short_window = params.get("short_window", 10)
-                    long_window = params.get("long_window", 50)
-                    coin_type = params.get("coin_type", "BTC")
-
-                    algorithm_instance = MACrossoverStrategy(
-                        short_window=short_window,
-                        long_window=long_window,
-                        coin_type=coin_type,
-                    )
+                algorithm_instance = build_algorithm(deployed_algo, algo_def)
 
                 if algorithm_instance:
                     # Calculate frequency
@@ -155,6 +197,13 @@ class ExecutionScheduler:
             except Exception as e:
                 logger.error(f"Failed to load deployment {deployed_algo.id}: {e}")
 
+        if count:
+            # Fill indicator windows from stored prices instead of waiting for ticks
+            try:
+                get_indicator_service().seed_from_history(self.session)
+            except Exception as e:
+                logger.error(f"Failed to seed indicators from price history: {e}")
+
         logger.info(f"Loaded {count} active algorithms from database")
         return count
 
@@ -194,14 +243,25 @@ class ExecutionScheduler:
 
         # Add job to scheduler
         try:
-            self.scheduler.add_job(
-                func=self._execute_algorithm_job,
-                trigger=trigger,
-                id=job_id,
-                args=[user_id, algorithm_id, algorithm],
-                replace_existing=True,
-                **kwargs,
-            )
+            if self.batch_ticks:
+                self._add_to_tick_group(
+                    job_id,
+                    user_id,
+                    algorithm_id,
+                    algorithm,
+                    frequency,
+                    trigger,
+                    **kwargs,
+                )
+            else:
+                self.scheduler.add_job(
+                    func=self._execute_algorithm_job,
+                    trigger=trigger,
+                    id=job_id,
+                    args=[user_id, algorithm_id, algorithm],
+                    replace_existing=True,
+                    **kwargs,
+                )
 
             # Track scheduled algorithm
             self._scheduled_algorithms[job_id] = {
@@ -225,6 +285,51 @@ class ExecutionScheduler:
             logger.error(f"Error scheduling algorithm {algorithm_id}: {e}")
             raise SchedulerError(f"Failed to schedule algorithm: {e}")
 
+    def _add_to_tick_group(
+        self,
+        job_id: str,
+        user_id: UUID,
+        algorithm_id: UUID,
+        algorithm: TradingAlgorithm,
+        frequency: str,
+        trigger: Any,
+        **kwargs,
+    ) -> None:
+        """Add an algorithm to the shared job of its frequency"""
+        # Rescheduling moves the algorithm to its new frequency
+        self._remove_from_tick_group(job_id)
+
+        group = self._tick_groups.get(frequency)
+        if group is None:
+            # One run at a time; late runs collapse into a single tick
+            self.scheduler.add_job(
+                func=self._execute_tick_job,
+                trigger=trigger,
+                id=self._tick_job_id(frequency),
+                args=[frequency],
+                replace_existing=True,
+                coalesce=True,
+                max_instances=1,
+                **kwargs,
+            )
+            group = self._tick_groups[frequency] = {}
+        group[job_id] = (user_id, algorithm_id, algorithm)
+
+    def _remove_from_tick_group(self, job_id: str) -> bool:
+        """Remove an algorithm from its tick group, dropping empty groups"""
+        for frequency, group in self._tick_groups.items():
+            if group.pop(job_id, None) is not None:
+                if not group:
+                    self.scheduler.remove_job(self._tick_job_id(frequency))
+                    del self._tick_groups[frequency]
+                self._paused.discard(job_id)
+                return True
+        return False
+
+    @staticmethod
+    def _tick_job_id(frequency: str) -> str:
+        return f"tick_{frequency}"
+
     def _parse_frequency(self, frequency: str) -> Any:
         """
         Parse frequency string into APScheduler trigger
@@ -329,6 +434,67 @@ class ExecutionScheduler:
 
             # TODO: Implement error threshold and auto-disable failing algorithms (Phase 6 Weeks 7-8 - Advanced Features)
 
+    async def _execute_tick_job(self, frequency: str) -> None:
+        """
+        Execute every algorithm of a frequency on one market data snapshot
+
+        Args:
+            frequency: Frequency shared by the tick group
+        """
+        entries = [
+            (job_id, execution)
+            for job_id, execution in self._tick_groups.get(frequency, {}).items()
+            if job_id not in self._paused
+        ]
+        if not entries:
+            return
+
+        started = time.monotonic()
+        try:
+            market_data = await self._get_market_data()
+            fetched = time.monotonic()
+            results = await self.executor.execute_batch(
+                [execution for _, execution in entries], market_data
+            )
+        except Exception as e:
+            logger.error(f"Error executing tick {frequency}: {e}", exc_info=True)
+            for job_id, _ in entries:
+                if job_id in self._scheduled_algorithms:
+                    self._scheduled_algorithms[job_id]["error_count"] += 1
+            return
+        finished = time.monotonic()
+
+        now = datetime.now(timezone.utc)
+        orders = errors = 0
+        for (job_id, _), result in zip(entries, results, strict=True):
+            info = self._scheduled_algorithms.get(job_id)
+            if result.get("reason") == "error":
+                errors += 1
+                if info:
+                    info["error_count"] += 1
+                continue
+            orders += bool(result.get("executed"))
+            if info:
+                info["last_execution"] = now
+                info["execution_count"] += 1
+
+        self.ticks += 1
+        self._tick_samples.append(finished - started)
+        self._last_tick = {
+            "frequency": frequency,
+            "timestamp": now.isoformat(),
+            "algorithms": len(entries),
+            "orders": orders,
+            "errors": errors,
+            "market_data_ms": (fetched - started) * 1000,
+            "execution_ms": (finished - fetched) * 1000,
+            "total_ms": (finished - started) * 1000,
+        }
+        logger.info(
+            f"Tick {frequency}: {len(entries)} algorithms, {orders} orders, "
+            f"{errors} errors in {self._last_tick['total_ms']:.1f}ms"
+        )
+
     async def _get_market_data(self) -> dict[str, Any]:
         """
         Get current market data
@@ -386,7 +552,11 @@ class ExecutionScheduler:
         job_id = f"{user_id}_{algorithm_id}"
 
         try:
-            self.scheduler.remove_job(job_id)
+            if self.batch_ticks:
+                if not self._remove_from_tick_group(job_id):
+                    raise SchedulerError(f"No scheduled job {job_id}")
+            else:
+                self.scheduler.remove_job(job_id)
 
             # Remove from tracking
             if job_id in self._scheduled_algorithms:
@@ -413,7 +583,12 @@ class ExecutionScheduler:
         job_id = f"{user_id}_{algorithm_id}"
 
         try:
-            self.scheduler.pause_job(job_id)
+            if self.batch_ticks:
+                if job_id not in self._scheduled_algorithms:
+                    raise SchedulerError(f"No scheduled job {job_id}")
+                self._paused.add(job_id)
+            else:
+                self.scheduler.pause_job(job_id)
             logger.info(f"Algorithm {algorithm_id} paused for user {user_id}")
             return True
 
@@ -435,7 +610,12 @@ class ExecutionScheduler:
         job_id = f"{user_id}_{algorithm_id}"
 
         try:
-            self.scheduler.resume_job(job_id)
+            if self.batch_ticks:
+                if job_id not in self._scheduled_algorithms:
+                    raise SchedulerError(f"No scheduled job {job_id}")
+                self._paused.discard(job_id)
+            else:
+                self.scheduler.resume_job(job_id)
             logger.info(f"Algorithm {algorithm_id} resumed for user {user_id}")
             return True
 
@@ -478,6 +658,12 @@ class ExecutionScheduler:
             "total_jobs": len(self.scheduler.get_jobs()),
             "scheduled_algorithms": len(self._scheduled_algorithms),
             "state": self.scheduler.state,
+            "batch_ticks": self.batch_ticks,
+            "ticks": {
+                "count": self.ticks,
+                "last": self._last_tick,
+                "tick_ms": latency_summary(self._tick_samples),
+            },
         }
 
 
@@ -1,21 +1,33 @@
 # mypy: ignore-errors
+from datetime import datetime
 from decimal import Decimal
 from typing import Any
 
+from app.services.trading.indicators import IndicatorService, get_indicator_service
+
 
 class MACrossoverStrategy:
     def __init__(
-        self, short_window: int = 10, long_window: int = 50, coin_type: str = "BTC"
+        self,
+        short_window: int = 10,
+        long_window: int = 50,
+        coin_type: str = "BTC",
+        indicators: IndicatorService | None = None,
     ):
         self.short_window = short_window
         self.long_window = long_window
         self.coin_type = coin_type
-        self.prices: list[Decimal] = []
+        # Moving averages are shared with every other strategy on this coin
+        self.indicators = indicators or get_indicator_service()
+        self.indicators.subscribe(coin_type, "sma", short_window)
+        self.indicators.subscribe(coin_type, "sma", long_window)
 
     def generate_signal(self, market_data: dict[str, Any]) -> dict[str, Any]:
         """
         Simple MA Crossover.
         market_data expected to have 'price' and 'coin_type'.
+        Prices update the shared moving averages once per bar of
+        market_data['timestamp'] (default: now).
         """
         # If market_data has specific coin info, use it. Otherwise fallback to self.coin_type
         # In a real system, market_data would be a large dict of all coins, so we'd pick ours.
@@ -27,12 +39,15 @@ class MACrossoverStrategy:
 
         current_price = Decimal(str(raw_price))
 
-        self.prices.append(current_price)
+        timestamp = market_data.get("timestamp")
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+        self.indicators.update(self.coin_type, current_price, timestamp)
 
-        if len(self.prices) > self.long_window:
-            self.prices.pop(0)
+        short_ma = self.indicators.get(self.coin_type, "sma", self.short_window)
+        long_ma = self.indicators.get(self.coin_type, "sma", self.long_window)
 
-        if len(self.prices) < self.long_window:
+        if long_ma is None:
             # Not enough data
             return {
                 "action": "hold",
@@ -41,10 +56,6 @@ class MACrossoverStrategy:
                 "confidence": 0.0,
             }
 
-        # Calculate MAs
-        short_ma = sum(self.prices[-self.short_window :]) / self.short_window
-        long_ma = sum(self.prices[-self.long_window :]) / self.long_window
-
         # Simple Logic:
         # If Short MA > Long MA: Bullish -> Buy
         # If Short MA < Long MA: Bearish -> Sell
@@ -1,6 +1,26 @@
 # mypy: ignore-errors
+"""
+Hard Stop Watcher
+
+Tracks total system equity (all positions at market price) and activates
+the global kill switch when it drops below drawdown_limit_pct of the
+initial equity.
+
+The watcher is event-driven: it subscribes to the price and position
+events of app.services.trading.events and keeps a running equity total
+that each event adjusts by a delta, so a breach is acted on as soon as
+the event arrives and an idle system costs no database queries. A full
+reconciliation (all positions, latest prices) runs every
+reconcile_interval seconds to correct any drift and pick up changes made
+outside the executor.
+"""
+
 import asyncio
+import json
 import logging
+import time
+from collections import defaultdict
+from datetime import datetime
 from decimal import Decimal
 
 import redis.asyncio as redis
@@ -8,22 +28,50 @@ from sqlmodel import Session, select
 
 from app.core.config import settings
 from app.core.db import engine
-from app.models import Position, PriceData5Min
+from app.models import Position
+from app.services.trading.events import POSITION_CHANNEL, PRICE_CHANNEL
+from app.services.trading.price_cache import get_price_cache
 from app.services.trading.safety import TradingSafetyManager
 
 logger = logging.getLogger(__name__)
 
 REDIS_KEY_INITIAL_EQUITY = "omc:initial_equity"
+REDIS_KEY_EMERGENCY_STOP = "omc:emergency_stop"
+
+ZERO = Decimal("0")
 
 
 class HardStopWatcher:
     def __init__(
-        self, check_interval: int = 5, drawdown_limit_pct: Decimal = Decimal("0.95")
+        self,
+        check_interval: int = 5,
+        drawdown_limit_pct: Decimal = Decimal("0.95"),
+        reconcile_interval: int = 60,
     ):
+        """
+        Initialize the watcher
+
+        Args:
+            check_interval: Longest wait for an event before checking whether
+                a reconciliation is due (seconds)
+            drawdown_limit_pct: Fraction of initial equity that triggers the stop
+            reconcile_interval: Seconds between full equity reconciliations
+        """
         self.check_interval = check_interval
         self.drawdown_limit_pct = drawdown_limit_pct
+        self.reconcile_interval = reconcile_interval
         self.redis_client = None
 
+        # Incremental equity state
+        self.equity = ZERO
+        self._initial_equity: Decimal | None = None
+        self._positions: dict[tuple[str, str], tuple[Decimal, Decimal]] = {}
+        self._quantities: defaultdict[str, Decimal] = defaultdict(Decimal)
+        # Sum of quantity * average_price, valued when a coin has no price
+        self._basis: defaultdict[str, Decimal] = defaultdict(Decimal)
+        self._prices: dict[str, Decimal] = {}
+        self.events = 0
+
     async def connect_redis(self):
         if not self.redis_client:
             self.redis_client = await redis.from_url(
@@ -32,58 +80,137 @@ class HardStopWatcher:
 
     async def get_latest_prices(self, session: Session) -> dict[str, Decimal]:
         """
-        Fetch the latest price for each coin type from PriceData5Min.
+        Fetch the latest price for each coin type held in positions.
+        Served from the shared latest-price cache, with one bulk query for misses.
         Returns: Dict[coin_type, price]
         """
-        prices = {}
         # Get all unique coins from positions to limit query
         coins_in_positions = session.exec(select(Position.coin_type).distinct()).all()
 
-        for coin in coins_in_positions:
-            # Get latest price entry
-            statement = (
-                select(PriceData5Min)
-                .where(PriceData5Min.coin_type == coin)
-                .order_by(PriceData5Min.timestamp.desc())
-                .limit(1)
-            )
-            price_data = session.exec(statement).first()
-            if price_data:
-                prices[coin] = price_data.last
-
-        return prices
+        return get_price_cache().get_many(coins_in_positions, session)
 
     async def calculate_total_equity(self, session: Session) -> Decimal:
         """
         Calculate the total equity (Positions only) of ALL users.
-        """
-        total_equity = Decimal("0")
 
-        # Total Position Value
+        Rebuilds the incremental state from the database; any difference to
+        the running total is logged as drift.
+        """
         positions = session.exec(select(Position)).all()
-        if not positions:
-            return total_equity
-
-        prices = await self.get_latest_prices(session)
+        prices = await self.get_latest_prices(session) if positions else {}
 
+        previous = self.equity
+        self._positions.clear()
+        self._quantities.clear()
+        self._basis.clear()
+        self._prices.update(prices)
         for pos in positions:
-            # Use market price if available, else fallback to avg price (safety fallback)
-            price = prices.get(pos.coin_type, pos.average_price)
-            total_equity += pos.quantity * price
+            self._positions[(str(pos.user_id), pos.coin_type)] = (
+                pos.quantity,
+                pos.average_price,
+            )
+            self._quantities[pos.coin_type] += pos.quantity
+            self._basis[pos.coin_type] += pos.quantity * pos.average_price
+
+        # Use market price if available, else fallback to avg price (safety fallback)
+        self.equity = sum((self._coin_value(coin) for coin in self._quantities), ZERO)
+        if previous and abs(self.equity - previous) > Decimal("0.01"):
+            logger.warning(
+                f"Equity drift corrected: {previous:.2f} -> {self.equity:.2f} AUD"
+            )
+        return self.equity
+
+    def apply_price(self, coin_type: str, price: Decimal) -> None:
+        """Apply a new market price to the running equity"""
+        if coin_type not in self._quantities:
+            self._prices[coin_type] = price
+            return
+        before = self._coin_value(coin_type)
+        self._prices[coin_type] = price
+        self.equity += self._coin_value(coin_type) - before
+
+    def apply_position(
+        self,
+        user_id: str,
+        coin_type: str,
+        quantity: Decimal,
+        average_price: Decimal,
+    ) -> None:
+        """Apply the new state of one position to the running equity"""
+        before = self._coin_value(coin_type)
+        old_quantity, old_average = self._positions.pop(
+            (user_id, coin_type), (ZERO, ZERO)
+        )
+        if quantity > 0:
+            self._positions[(user_id, coin_type)] = (quantity, average_price)
+        else:
+            quantity = ZERO
+
+        self._quantities[coin_type] += quantity - old_quantity
+        self._basis[coin_type] += quantity * average_price - old_quantity * old_average
+        self.equity += self._coin_value(coin_type) - before
+
+    def _coin_value(self, coin_type: str) -> Decimal:
+        price = self._prices.get(coin_type)
+        if price is None:
+            return self._basis.get(coin_type, ZERO)
+        return self._quantities.get(coin_type, ZERO) * price
+
+    async def handle_event(self, channel: str, data: str) -> bool:
+        """
+        Apply a price or position event and check the hard stop
 
-        return total_equity
+        Args:
+            channel: Pub/sub channel of the event
+            data: JSON payload
+
+        Returns:
+            True if the hard stop is (now) active
+        """
+        payload = json.loads(data)
+        if channel == PRICE_CHANNEL:
+            observed_at = datetime.fromisoformat(payload["timestamp"])
+            cache = get_price_cache()
+            for coin_type, price in payload["prices"].items():
+                # The cache keeps the newest observation, also for reconciliation
+                self.apply_price(
+                    coin_type, cache.update(coin_type, Decimal(price), observed_at)
+                )
+        elif channel == POSITION_CHANNEL:
+            self.apply_position(
+                payload["user_id"],
+                payload["coin_type"],
+                Decimal(payload["quantity"]),
+                Decimal(payload["average_price"]),
+            )
+        else:
+            return False
+
+        self.events += 1
+        if self._initial_equity is None:
+            # Not initialized yet; the next reconciliation sets the base
+            return False
+
+        threshold = self._initial_equity * self.drawdown_limit_pct
+        if self.equity >= threshold:
+            return False
+
+        await self.connect_redis()
+        if await self.redis_client.get(REDIS_KEY_EMERGENCY_STOP) == "true":
+            return True
+        with Session(engine) as session:
+            await self._trigger_hard_stop(session, self.equity, threshold)
+        return True
 
     async def check_equity(self, session: Session) -> bool:
         """
-        Checks equity against hard stop.
+        Checks equity against hard stop (full reconciliation).
         Returns True if Hard Stop Triggered, False otherwise.
         """
         await self.connect_redis()
 
-        safety = TradingSafetyManager(session)
-
         # Check Global Kill Switch Status first
-        is_active = await self.redis_client.get("omc:emergency_stop")
+        is_active = await self.redis_client.get(REDIS_KEY_EMERGENCY_STOP)
         if is_active == "true":
             logger.debug("Emergency Stop already active.")
             return True  # Already stopped
@@ -99,39 +226,65 @@ class HardStopWatcher:
                 await self.redis_client.set(
                     REDIS_KEY_INITIAL_EQUITY, str(current_equity)
                 )
+                self._initial_equity = current_equity
                 logger.info(f"Initialized Base Equity: {current_equity:.2f} AUD")
             else:
                 logger.warning("Total Equity is 0. Strategies not deployed?")
             return False
 
         initial_equity = Decimal(initial_equity_str)
+        self._initial_equity = initial_equity
 
         # Check Drawdown
         threshold = initial_equity * self.drawdown_limit_pct
 
         if current_equity < threshold:
-            logger.critical(
-                f"HARD STOP TRIGGERED! Equity {current_equity:.2f} < {threshold:.2f} "
-                f"(Initial: {initial_equity:.2f})"
-            )
-
-            # ACTIVATE KILL SWITCH
-            await safety.activate_emergency_stop()
+            await self._trigger_hard_stop(session, current_equity, threshold)
             return True
 
         else:
             logger.debug(f"Equity Safe: {current_equity:.2f} (Limit: {threshold:.2f})")
             return False
 
+    async def _trigger_hard_stop(
+        self, session: Session, equity: Decimal, threshold: Decimal
+    ) -> None:
+        logger.critical(
+            f"HARD STOP TRIGGERED! Equity {equity:.2f} < {threshold:.2f} "
+            f"(Initial: {self._initial_equity:.2f})"
+        )
+
+        # ACTIVATE KILL SWITCH
+        await TradingSafetyManager(session).activate_emergency_stop()
+
     async def start(self):
         logger.info("Starting Hard Stop Watcher Service...")
         await self.connect_redis()
 
+        # Subscribe before the first reconciliation so no event is missed
+        pubsub = self.redis_client.pubsub()
+        await pubsub.subscribe(PRICE_CHANNEL, POSITION_CHANNEL)
+        last_reconcile = None
+
         while True:
+            now = time.monotonic()
+            if (
+                last_reconcile is None
+                or now - last_reconcile >= self.reconcile_interval
+            ):
+                try:
+                    with Session(engine) as session:
+                        await self.check_equity(session)
+                except Exception as e:
+                    logger.error(f"Error in Watcher reconciliation: {e}")
+                last_reconcile = now
+
             try:
-                with Session(engine) as session:
-                    await self.check_equity(session)
+                message = await pubsub.get_message(
+                    ignore_subscribe_messages=True, timeout=self.check_interval
+                )
+                if message:
+                    await self.handle_event(message["channel"], message["data"])
             except Exception as e:
                 logger.error(f"Error in Watcher Loop: {e}")
-
-            await asyncio.sleep(self.check_interval)
+                await asyncio.sleep(self.check_interval)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Backtest Metrics Benchmark
+
+Times the NumPy metrics suite and position-change trade extraction against
+the pure-Python / iterrows reference implementations at 100k and 1M points.
+
+No database is needed.
+
+Usage:
+    python scripts/benchmark_backtest_metrics.py [--sizes 100000 1000000]
+        [--max-reference-rows 1000000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pandas as pd
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.backtesting.engine import BacktestService
+from app.services.trading.metrics import (
+    calculate_backtest_metrics,
+    calculate_backtest_metrics_reference,
+)
+
+
+def make_inputs(points: int) -> tuple[list[float], list[dict], pd.DataFrame]:
+    """Random-walk equity curve, trade PnLs and a position frame"""
+    rng = np.random.default_rng(42)
+    equity = (10000 * np.cumprod(1 + rng.normal(0, 0.001, points))).tolist()
+    trades = [{"pnl": float(p)} for p in rng.normal(1, 20, points // 50)]
+    frame = pd.DataFrame(
+        {
+            "close": 50000 * np.cumprod(1 + rng.normal(0, 0.001, points)),
+            "position": np.repeat(rng.choice([0.0, 1.0], points // 20 + 1), 20)[
+                :points
+            ],
+        },
+        index=pd.date_range("2025-01-01", periods=points, freq="5min", tz="UTC"),
+    )
+    return equity, trades, frame
+
+
+def timed(fn, *args) -> float:
+    t0 = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - t0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument(
+        "--max-reference-rows",
+        type=int,
+        default=1_000_000,
+        help="Skip the reference implementations above this size",
+    )
+    args = parser.parse_args()
+
+    service = BacktestService(session=MagicMock())
+
+    print(
+        f"{'benchmark':<20}{'points':>10}{'reference (s)':>16}{'numpy (s)':>12}{'speedup':>10}"
+    )
+    for points in args.sizes:
+        equity, trades, frame = make_inputs(points)
+        run_reference = points <= args.max_reference_rows
+
+        for label, reference, fast, fn_args in (
+            (
+                "metrics",
+                calculate_backtest_metrics_reference,
+                calculate_backtest_metrics,
+                (equity, trades),
+            ),
+            (
+                "trade extraction",
+                service._extract_trades_iterative,
+                service._extract_trades,
+                (frame, 0.001, 0.0005),
+            ),
+        ):
+            fast_time = timed(fast, *fn_args)
+            if run_reference:
+                ref_time = timed(reference, *fn_args)
+                print(
+                    f"{label:<20}{points:>10}{ref_time:>16.3f}{fast_time:>12.4f}"
+                    f"{ref_time / fast_time:>9.1f}x"
+                )
+            else:
+                print(
+                    f"{label:<20}{points:>10}{'skipped':>16}{fast_time:>12.4f}{'-':>10}"
+                )
+
+
+if __name__ == "__main__":
+    main()
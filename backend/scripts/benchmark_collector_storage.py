@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Collector Storage Benchmark
+
+Compares the two storage paths of StrategyAdapterCollector on one batch of
+PriceData5Min rows (a CoinSpot run is a few hundred rows), part of which
+are duplicates of rows already stored:
+
+- savepoints: one SAVEPOINT + INSERT per row, duplicates raise IntegrityError
+- bulk: one INSERT ... ON CONFLICT DO NOTHING RETURNING per model
+
+Each path runs in a transaction that is rolled back, so no data is kept.
+Runs against the configured database by default; --sqlite uses an
+in-memory database instead.
+
+Usage:
+    python scripts/benchmark_collector_storage.py [--rows 500] [--duplicates 0.2]
+        [--repeat 5] [--sqlite]
+"""
+
+import argparse
+import logging
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from unittest.mock import MagicMock
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import Engine
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core.db import engine as default_engine
+from app.models import PriceData5Min
+from app.services.collectors.strategy_adapter import StrategyAdapterCollector
+
+# Far in the past so the batch never collides with collected data
+START = datetime(2000, 1, 1, tzinfo=timezone.utc)
+
+
+def make_rows(count: int) -> list[PriceData5Min]:
+    coins = [f"BENCH{i}" for i in range(20)]
+    return [
+        PriceData5Min(
+            coin_type=coins[i % len(coins)],
+            timestamp=START + timedelta(minutes=5 * (i // len(coins))),
+            bid=Decimal("100"),
+            ask=Decimal("101"),
+            last=Decimal("100.5"),
+        )
+        for i in range(count)
+    ]
+
+
+def run_once(
+    engine: Engine, adapter: StrategyAdapterCollector, path: str, rows: int, dups: int
+) -> float:
+    with Session(engine) as session:
+        # Rows stored by an earlier run, so part of the batch are duplicates
+        for row in make_rows(dups):
+            session.add(row)
+        session.flush()
+
+        batch = make_rows(rows)
+        start = time.perf_counter()
+        if path == "bulk":
+            stored = adapter._bulk_insert(batch, session)
+        else:
+            stored = adapter._insert_each(batch, session)
+        elapsed = time.perf_counter() - start
+
+        if stored is None or len(stored) != rows - dups:
+            raise RuntimeError(f"{path} stored an unexpected number of rows")
+        session.rollback()
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=500)
+    parser.add_argument(
+        "--duplicates", type=float, default=0.2, help="Fraction already stored"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--sqlite", action="store_true")
+    args = parser.parse_args()
+
+    if args.sqlite:
+        engine = create_engine("sqlite://")
+        SQLModel.metadata.create_all(engine, tables=[PriceData5Min.__table__])
+    else:
+        engine = default_engine
+
+    # Duplicates are expected; keep per-row logging out of the measurement
+    logging.getLogger("app.services.collectors.strategy_adapter").disabled = True
+    strategy = MagicMock()
+    strategy.name = "benchmark"
+    adapter = StrategyAdapterCollector(strategy, ledger_name="exchange")
+    dups = int(args.rows * args.duplicates)
+
+    rates = {}
+    for path in ("savepoints", "bulk"):
+        best = min(
+            run_once(engine, adapter, path, args.rows, dups) for _ in range(args.repeat)
+        )
+        rates[path] = args.rows / best
+        print(f"{path:>10}: {best * 1000:.1f}ms, {rates[path]:,.0f} rows/sec")
+
+    print(f"speedup: {rates['bulk'] / rates['savepoints']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
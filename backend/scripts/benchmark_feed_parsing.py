@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Collector Parsing Benchmark
+
+Parses the saved fixture pages in scripts/fixtures with the previous
+BeautifulSoup code paths and with app.core.collectors.parsing:
+
+- rss_feed.xml: a 30-item RSS feed with full article bodies, as served by
+  the news feeds (the collectors read the first 20 items)
+- coinspot_tradecoins.html: a Coinspot tradecoins-like page of ~300 coin rows
+
+For each page it reports the parse time and the worst event loop stall
+seen by a 1 ms ticker while --parses parses run: inline on the loop (as
+before) and in a worker thread (as the collectors do now).
+
+No database or network access is needed.
+
+Usage:
+    python scripts/benchmark_feed_parsing.py [--iterations 20] [--parses 10]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bs4 import BeautifulSoup
+
+from app.core.collectors.parsing import parse_html_rows, parse_rss_items
+
+FIXTURES = Path(__file__).parent / "fixtures"
+RSS_LIMIT = 20
+
+
+def soup_rss(content: bytes) -> list[dict[str, str]]:
+    """Previous news collector parsing"""
+    soup = BeautifulSoup(content, "xml")
+    items = []
+    for item in soup.find_all("item")[:RSS_LIMIT]:
+        entry = {}
+        for field in ("title", "link", "guid", "pubDate", "description"):
+            element = item.find(field)
+            if element:
+                entry[field] = element.get_text(strip=True)
+        items.append(entry)
+    return items
+
+
+def lxml_rss(content: bytes) -> list[dict[str, str]]:
+    return parse_rss_items(content, RSS_LIMIT)
+
+
+def soup_rows(content: bytes) -> list[tuple[str, list[Any]]]:
+    """Previous Coinspot scraper parsing"""
+    soup = BeautifulSoup(content.decode(), "html.parser")
+    return [
+        (row.get("data-coin"), [td.get("data-value") for td in row.find_all("td")])
+        for row in soup.find_all("tr", attrs={"data-coin": True})
+    ]
+
+
+def lxml_rows(content: bytes) -> list[tuple[str, list[str | None]]]:
+    return parse_html_rows(content, "data-coin", "data-value")
+
+
+def parse_time(parse: Callable[[bytes], Any], content: bytes, iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        parse(content)
+    return (time.perf_counter() - start) / iterations
+
+
+async def max_stall(
+    parse: Callable[[bytes], Any], content: bytes, parses: int, in_thread: bool
+) -> float:
+    """Longest gap between ticks of a 1 ms ticker while parsing"""
+    stall = 0.0
+    done = False
+
+    async def ticker() -> None:
+        nonlocal stall
+        last = time.perf_counter()
+        while not done:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            stall = max(stall, now - last)
+            last = now
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    for _ in range(parses):
+        if in_thread:
+            await asyncio.to_thread(parse, content)
+        else:
+            parse(content)
+            await asyncio.sleep(0)
+    done = True
+    await task
+    return stall
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--parses", type=int, default=10)
+    args = parser.parse_args()
+
+    pages = (
+        ("rss_feed.xml", soup_rss, lxml_rss),
+        ("coinspot_tradecoins.html", soup_rows, lxml_rows),
+    )
+    for name, old, new in pages:
+        content = (FIXTURES / name).read_bytes()
+        if old(content) != new(content):
+            raise SystemExit(f"{name}: parsers disagree")
+
+        old_time = parse_time(old, content, args.iterations)
+        new_time = parse_time(new, content, args.iterations)
+        old_stall = asyncio.run(max_stall(old, content, args.parses, False))
+        new_stall = asyncio.run(max_stall(new, content, args.parses, True))
+
+        print(f"{name} ({len(content) / 1024:.0f} KiB)")
+        print(
+            f"  parse: BeautifulSoup {old_time * 1000:7.2f} ms, "
+            f"lxml iterparse {new_time * 1000:7.2f} ms "
+            f"({old_time / new_time:.1f}x)"
+        )
+        print(
+            f"  loop stall: inline BeautifulSoup {old_stall * 1000:7.2f} ms, "
+            f"threaded iterparse {new_stall * 1000:7.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Collector HTTP Client Benchmark
+
+Runs collector-like workloads (--runs runs of --requests GETs each) against
+a local HTTP/1.1 keep-alive stub server and counts the TCP connections it
+accepts:
+
+- per-run: a new aiohttp.ClientSession / httpx.AsyncClient for every run,
+  as the strategies did before
+- shared: the pooled clients of HttpClientRegistry
+
+Plain HTTP on localhost only shows the TCP setup saved; against real feeds
+every avoided connection also saves DNS and TLS handshakes.
+
+No database or network access is needed.
+
+Usage:
+    python scripts/benchmark_http_clients.py [--runs 50] [--requests 5]
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from collections.abc import Awaitable, Callable
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import aiohttp
+import httpx
+
+from app.core.collectors.http import HttpClientRegistry
+
+BODY = b"<rss><channel><item><title>stub</title></item></channel></rss>"
+RESPONSE = (
+    b"HTTP/1.1 200 OK\r\n"
+    b"Content-Type: application/rss+xml\r\n"
+    b"Content-Length: " + str(len(BODY)).encode() + b"\r\n\r\n" + BODY
+)
+
+
+class StubServer:
+    """Minimal keep-alive HTTP server counting accepted connections"""
+
+    def __init__(self) -> None:
+        self.connections = 0
+        self.url = ""
+        self._server: asyncio.Server | None = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        port = self._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/feed"
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        try:
+            while await reader.readuntil(b"\r\n\r\n"):
+                writer.write(RESPONSE)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def aiohttp_get(session: aiohttp.ClientSession, url: str) -> None:
+    async with session.get(url) as response:
+        await response.read()
+
+
+async def measure(
+    server: StubServer, runs: int, run: Callable[[], Awaitable[None]]
+) -> tuple[int, float]:
+    before = server.connections
+    start = time.perf_counter()
+    for _ in range(runs):
+        await run()
+    return server.connections - before, time.perf_counter() - start
+
+
+async def benchmark(runs: int, requests: int) -> None:
+    server = StubServer()
+    await server.start()
+    registry = HttpClientRegistry()
+    url = server.url
+
+    async def aiohttp_per_run() -> None:
+        async with aiohttp.ClientSession() as session:
+            for _ in range(requests):
+                await aiohttp_get(session, url)
+
+    async def aiohttp_shared() -> None:
+        session = registry.aiohttp_session()
+        for _ in range(requests):
+            await aiohttp_get(session, url)
+
+    async def httpx_per_run() -> None:
+        async with httpx.AsyncClient() as client:
+            for _ in range(requests):
+                (await client.get(url)).raise_for_status()
+
+    async def httpx_shared() -> None:
+        client = registry.httpx_client()
+        for _ in range(requests):
+            (await client.get(url)).raise_for_status()
+
+    total = runs * requests
+    for name, run in (
+        ("aiohttp per-run", aiohttp_per_run),
+        ("aiohttp shared", aiohttp_shared),
+        ("httpx per-run", httpx_per_run),
+        ("httpx shared", httpx_shared),
+    ):
+        connections, elapsed = await measure(server, runs, run)
+        print(
+            f"{name:>16}: {connections:4d} connections for {total} requests, "
+            f"{total / elapsed:,.0f} req/s"
+        )
+
+    await registry.close()
+    await server.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=5)
+    args = parser.parse_args()
+
+    asyncio.run(benchmark(args.runs, args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Paper Exchange Matching Benchmark
+
+Replays synthetic market days through PaperExchange: every 5-minute tick
+moves the price (random walk) and submits a mix of market orders, limit
+orders around the price and cancels of resting orders. Reports orders/sec,
+the number of resting-order fills and how many orders the exchange retains
+(bounded with --memory-bounded).
+
+No database is needed.
+
+Usage:
+    python scripts/benchmark_paper_exchange.py [--days 1] [--orders-per-tick 100]
+        [--memory-bounded]
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from decimal import Decimal
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.services.trading import paper_exchange
+from app.services.trading.paper_exchange import PaperExchange
+
+TICKS_PER_DAY = 288  # 5-minute candles
+
+
+async def replay(
+    days: int, orders_per_tick: int, seed: int, memory_bounded: bool = False
+) -> dict[str, float]:
+    rng = random.Random(seed)
+    exchange = PaperExchange(
+        initial_aud_balance=Decimal("1000000000"),
+        seed=seed,
+        memory_bounded=memory_bounded,
+    )
+    exchange.balances["BTC"] = Decimal("100000")
+    price = Decimal("100000")
+    orders = 0
+    resting_fills = 0
+
+    apply_fill = exchange._apply_fill
+
+    def counting_apply_fill(book_order, quantity, notional):
+        nonlocal resting_fills
+        resting_fills += 1
+        apply_fill(book_order, quantity, notional)
+
+    exchange._apply_fill = counting_apply_fill
+
+    start = time.perf_counter()
+    for _ in range(days * TICKS_PER_DAY):
+        price = (price * Decimal(str(1 + rng.gauss(0, 0.002)))).quantize(
+            Decimal("0.01")
+        )
+        exchange.set_price("BTC", price)
+
+        for _ in range(orders_per_tick):
+            kind = rng.random()
+            offset = Decimal(str(1 + rng.uniform(-0.01, 0.01)))
+            rate = (price * offset).quantize(Decimal("0.01"))
+            if kind < 0.2:
+                await exchange.market_buy("BTC", Decimal(rng.randint(100, 5000)))
+            elif kind < 0.4:
+                await exchange.market_sell("BTC", Decimal("0.01"))
+            elif kind < 0.65:
+                await exchange.limit_buy("BTC", Decimal(rng.randint(100, 5000)), rate)
+            elif kind < 0.9:
+                await exchange.limit_sell("BTC", Decimal("0.02"), rate)
+            elif exchange._open["BTC"]:
+                order_id = rng.choice(list(exchange._open["BTC"]))
+                if exchange.orders[order_id]["action"] == "buy":
+                    await exchange.cancel_buy_order(order_id)
+                else:
+                    await exchange.cancel_sell_order(order_id)
+            orders += 1
+    elapsed = time.perf_counter() - start
+
+    return {
+        "orders": orders,
+        "seconds": elapsed,
+        "orders_per_sec": orders / elapsed,
+        "resting_fills": resting_fills,
+        "resting_open": len(exchange._open["BTC"]),
+        "orders_retained": len(exchange.orders),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=1)
+    parser.add_argument("--orders-per-tick", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--memory-bounded",
+        action="store_true",
+        help="Drop finished orders that leave the history buffer",
+    )
+    args = parser.parse_args()
+
+    # Keep per-order log lines out of the measurement
+    paper_exchange.logger.disabled = True
+
+    result = asyncio.run(
+        replay(args.days, args.orders_per_tick, args.seed, args.memory_bounded)
+    )
+    print(
+        f"{result['orders']} orders over {args.days} day(s) in "
+        f"{result['seconds']:.2f}s: {result['orders_per_sec']:,.0f} orders/sec"
+    )
+    print(
+        f"resting order fills: {result['resting_fills']}, "
+        f"still resting: {result['resting_open']}, "
+        f"orders retained: {result['orders_retained']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
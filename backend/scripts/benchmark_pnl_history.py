@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Historical P&L Benchmark
+
+Measures PnLEngine.get_historical_pnl latency as the number of buckets grows.
+The single-pass implementation should stay roughly flat between a 7-day and
+a 90-day hourly chart, since the cost is one ordered scan of realized trades
+rather than one query per bucket.
+
+Usage:
+    python scripts/benchmark_pnl_history.py [--fills 20000]
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from pathlib import Path
+from uuid import uuid4
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlalchemy import delete
+from sqlmodel import Session
+
+from app.core.db import engine
+from app.models import Order, PnLLedgerState, PnLLot, PnLRealizedMatch, User
+from app.services.trading.pnl import PnLEngine
+
+RANGES = [
+    ("7d hourly", timedelta(days=7), "hour"),
+    ("30d hourly", timedelta(days=30), "hour"),
+    ("90d hourly", timedelta(days=90), "hour"),
+    ("365d daily", timedelta(days=365), "day"),
+    ("730d monthly", timedelta(days=730), "month"),
+]
+
+
+def seed_fills(session: Session, user_id, fills: int, end: datetime) -> None:
+    """Insert alternating buy/sell fills spread over the last two years"""
+    start = end - timedelta(days=730)
+    step = (end - start) / fills
+    price = 50000.0
+
+    for i in range(fills):
+        price *= 1 + random.uniform(-0.01, 0.01)
+        session.add(
+            Order(
+                user_id=user_id,
+                coin_type="BTC",
+                side="buy" if i % 2 == 0 else "sell",
+                quantity=Decimal("0.01"),
+                price=Decimal(f"{price:.2f}"),
+                filled_quantity=Decimal("0.01"),
+                status="filled",
+                filled_at=start + step * i,
+            )
+        )
+    session.commit()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--fills", type=int, default=20000)
+    args = parser.parse_args()
+
+    end = datetime.now(timezone.utc)
+
+    with Session(engine) as session:
+        user = User(
+            id=uuid4(),
+            email=f"bench_pnl_{uuid4()}@example.com",
+            hashed_password="hash",
+            is_active=True,
+        )
+        session.add(user)
+        session.commit()
+
+        try:
+            seed_fills(session, user.id, args.fills, end)
+            pnl_engine = PnLEngine(session)
+
+            t0 = time.perf_counter()
+            pnl_engine.ledger.sync(user.id)
+            print(f"Ledger build for {args.fills} fills: {time.perf_counter() - t0:.3f}s")
+
+            print(f"{'range':<16}{'buckets':>10}{'seconds':>12}")
+            for label, span, interval in RANGES:
+                t0 = time.perf_counter()
+                history = pnl_engine.get_historical_pnl(
+                    user.id, end - span, end, interval=interval
+                )
+                elapsed = time.perf_counter() - t0
+                print(f"{label:<16}{len(history):>10}{elapsed:>12.4f}")
+        finally:
+            for model in (PnLRealizedMatch, PnLLot, PnLLedgerState, Order):
+                session.execute(delete(model).where(model.user_id == user.id))
+            session.delete(user)
+            session.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Rate Limit Middleware Benchmark
+
+Measures the per-request overhead of RateLimitMiddleware: the same
+authenticated requests are sent in-process (ASGI, no network) to an app
+without and with the middleware, and the difference in latency is
+reported. With Redis available the overhead includes the script round
+trip; --no-redis replaces the script with an in-process stub to isolate
+token decoding and middleware cost.
+
+Usage:
+    python scripts/benchmark_rate_limit.py [--requests 2000] [--concurrency 1]
+        [--no-redis]
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+from fastapi import FastAPI
+
+from app.api.middleware.rate_limiting import RateLimitMiddleware
+from app.core import security
+
+
+class StubbedRateLimitMiddleware(RateLimitMiddleware):
+    """Rate limiting with the Redis script call replaced by an allow-all stub"""
+
+    def __init__(self, app: Any) -> None:
+        super().__init__(app)
+
+        async def allow(keys: list[str], args: list[int]) -> list[int]:  # noqa: ARG001
+            return [1] + [0, 0, 0] * len(keys)
+
+        self._script = allow
+
+
+def build_app(rate_limited: bool, no_redis: bool) -> FastAPI:
+    app = FastAPI()
+    if rate_limited:
+        app.add_middleware(
+            StubbedRateLimitMiddleware if no_redis else RateLimitMiddleware
+        )
+
+    @app.get("/ping")
+    def ping() -> dict[str, str]:
+        return {"status": "ok"}
+
+    return app
+
+
+async def run(app: FastAPI, requests: int, concurrency: int, users: int) -> list[float]:
+    tokens = [
+        security.create_access_token(str(uuid4()), timedelta(hours=1))
+        for _ in range(users)
+    ]
+    latencies: list[float] = []
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+
+        async def worker(offset: int) -> None:
+            for i in range(offset, requests, concurrency):
+                headers = {"Authorization": f"Bearer {tokens[i % users]}"}
+                start = time.perf_counter()
+                response = await client.get("/ping", headers=headers)
+                latencies.append((time.perf_counter() - start) * 1000)
+                if response.status_code not in (200, 429):
+                    raise RuntimeError(f"Unexpected status {response.status_code}")
+
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return latencies
+
+
+def summary(latencies: list[float]) -> dict[str, float]:
+    ordered = sorted(latencies)
+    return {
+        "mean": statistics.fmean(ordered),
+        "p50": ordered[len(ordered) // 2],
+        "p95": ordered[int(len(ordered) * 0.95)],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument(
+        "--no-redis", action="store_true", help="Stub the Redis script call"
+    )
+    args = parser.parse_args()
+
+    results = {}
+    for name, rate_limited in (("baseline", False), ("rate limited", True)):
+        app = build_app(rate_limited, args.no_redis)
+        start = time.perf_counter()
+        latencies = asyncio.run(run(app, args.requests, args.concurrency, args.users))
+        rate = args.requests / (time.perf_counter() - start)
+        results[name] = summary(latencies)
+        print(
+            f"{name:>12}: mean {results[name]['mean']:.3f}ms, "
+            f"p50 {results[name]['p50']:.3f}ms, p95 {results[name]['p95']:.3f}ms, "
+            f"{rate:,.0f} req/s"
+        )
+
+    overhead = results["rate limited"]["mean"] - results["baseline"]["mean"]
+    print(f"middleware overhead: {overhead:.3f}ms per request")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,7 +3,8 @@
 Hard Stop Watcher (The Guard)
 Sprint 2.26 - Track A: Production Hardening
 
-This services monitors the Total System Equity in a loop.
+This services monitors the Total System Equity from price and position
+events (Redis pub/sub), with a periodic full reconciliation.
 If the Total Equity drops below 95% of the "Initial Equity" (set at startup),
 it triggers the Global Kill Switch via Redis.
 
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Historical Replay Soak Test
+
+Replays PriceData5Min history through paper trading: active deployed
+algorithms run through AlgorithmExecutor (safety checks, trade recording)
+and their orders are filled by the OrderExecutor against PaperExchange at
+replayed prices. Prints events/sec and per-tick end-to-end latency.
+
+Algorithms trade as throwaway replay users (deleted when the replay ends),
+daily risk limits follow the simulated clock and no position events are
+published, so live accounts and the hard-stop watcher are unaffected.
+
+Requires the database (and Redis for safety checks). Forces paper mode.
+
+Usage:
+    python scripts/replay_paper_trading.py --start 2025-01-01 --end 2025-04-01
+        [--coins BTC ETH] [--speed 3600] [--chunk-size 5000] [--no-wait]
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+# Add backend to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from sqlmodel import Session, select
+
+from app.core.config import settings
+from app.core.db import engine
+from app.models import Algorithm, DeployedAlgorithm
+from app.services.trading.algorithm_executor import AlgorithmExecutor
+from app.services.trading.audit import get_audit_writer
+from app.services.trading.events import TradingEventPublisher
+from app.services.trading.executor import get_order_queue
+from app.services.trading.indicators import get_indicator_service
+from app.services.trading.paper_exchange import PaperExchange
+from app.services.trading.replay import HistoricalReplayFeed, ReplayAccounts
+from app.services.trading.safety import TradingSafetyManager
+from app.services.trading.scheduler import build_algorithm
+
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+# Force Paper Mode
+settings.TRADING_MODE = "paper"
+
+
+def parse_date(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+async def run(args: argparse.Namespace) -> None:
+    with Session(engine) as session:
+        exchange = PaperExchange(memory_bounded=True)
+        queue = get_order_queue()
+        feed = HistoricalReplayFeed(
+            session=session,
+            start=args.start,
+            end=args.end,
+            coin_types=args.coins,
+            exchange=exchange,
+            order_queue=queue,
+            speed=args.speed,
+            chunk_size=args.chunk_size,
+            wait_for_orders=not args.no_wait,
+        )
+        safety_manager = TradingSafetyManager(session, risk_state=feed.risk_state)
+        queue.initialize(
+            session=session,
+            api_key="replay",
+            api_secret="replay",
+            paper_exchange=exchange,
+            safety_manager=safety_manager,
+            event_publisher=TradingEventPublisher(enabled=False),
+        )
+        feed.executor = AlgorithmExecutor(
+            session=session,
+            api_key="replay",
+            api_secret="replay",
+            safety_manager=safety_manager,
+        )
+        accounts = ReplayAccounts(session)
+        queue_task = asyncio.create_task(queue.start())
+
+        try:
+            deployments = session.exec(
+                select(DeployedAlgorithm, Algorithm)
+                .join(Algorithm)
+                .where(DeployedAlgorithm.is_active == True)  # noqa: E712
+            ).all()
+            for deployed_algo, algo_def in deployments:
+                algorithm = build_algorithm(deployed_algo, algo_def)
+                if algorithm is None:
+                    logger.warning(f"Skipping unsupported algorithm {algo_def.name}")
+                    continue
+                feed.add_algorithm(
+                    user_id=accounts.user_for(deployed_algo.user_id),
+                    algorithm_id=deployed_algo.algorithm_id,
+                    algorithm=algorithm,
+                    frequency_seconds=deployed_algo.execution_frequency
+                    or algo_def.default_execution_frequency
+                    or 300,
+                )
+            get_indicator_service().seed_from_history(session, before=args.start)
+            print(f"Replaying {len(feed.algorithms)} deployed algorithm(s)")
+
+            report = await feed.run()
+        finally:
+            await queue.stop()
+            await queue_task
+            get_audit_writer().stop()
+            accounts.cleanup()
+
+        print(json.dumps(report.to_dict(), indent=2))
+        print(f"order executor: {json.dumps(queue.stats())}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--start", type=parse_date, required=True)
+    parser.add_argument("--end", type=parse_date, required=True)
+    parser.add_argument("--coins", nargs="+")
+    parser.add_argument(
+        "--speed",
+        type=float,
+        help="Simulated seconds per second (default: as fast as possible)",
+    )
+    parser.add_argument("--chunk-size", type=int, default=5000)
+    parser.add_argument(
+        "--no-wait",
+        action="store_true",
+        help="Do not wait for each tick's orders to execute",
+    )
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
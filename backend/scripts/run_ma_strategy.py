@@ -15,6 +15,7 @@ from app.core.db import engine
 from app.models import Algorithm, Position, User
 from app.services.trading.algorithm_executor import AlgorithmExecutor
 from app.services.trading.executor import get_order_queue
+from app.services.trading.indicators import IndicatorService
 from app.services.trading.strategies.ma_crossover import MACrossoverStrategy
 
 # Setup logging
@@ -97,7 +98,10 @@ async def main() -> None:
         asyncio.create_task(queue.start())
 
         # 4. Setup Strategy & Executor
-        strategy = MACrossoverStrategy(short_window=2, long_window=5)
+        # One-second ticks, so use one-second bars instead of the shared 5-minute ones
+        strategy = MACrossoverStrategy(
+            short_window=2, long_window=5, indicators=IndicatorService(bar_seconds=1)
+        )
 
         algo_executor = AlgorithmExecutor(
             session=session,
@@ -149,6 +153,7 @@ async def main() -> None:
                         }
                     },
                     'price': float(current_price),
+                    coin_type: {'price': float(current_price)},
                     'volume_24h': 1000
                 }
 
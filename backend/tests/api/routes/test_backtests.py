@@ -6,11 +6,14 @@ from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from unittest.mock import MagicMock, patch
 
+import numpy as np
+import pandas as pd
 import pytest
 from fastapi.testclient import TestClient
 from sqlmodel import Session
 
 from app.models import Algorithm, BacktestRun
+from app.services.trading.equity_curve import pack_equity_curve
 
 
 @pytest.fixture
@@ -110,6 +113,54 @@ class TestBacktestAPI:
         assert "data" in data
         assert "count" in data
 
+    def test_get_equity_curve_downsampled(
+        self,
+        client: TestClient,
+        session: Session,
+        auth_headers: dict[str, str],
+        user_id_from_headers: uuid.UUID,
+        test_algorithm: Algorithm,
+    ) -> None:
+        """Test reading a packed equity curve at a requested resolution."""
+        timestamps = pd.date_range("2025-01-01", periods=5000, freq="5min", tz="UTC")
+        equity = 10000 + np.sin(np.arange(5000) / 100) * 500
+        now = datetime.now(timezone.utc)
+        run = BacktestRun(
+            user_id=user_id_from_headers,
+            algorithm_id=test_algorithm.id,
+            coin_type="BTC",
+            start_date=now - timedelta(days=30),
+            end_date=now,
+            status="completed",
+            equity_curve_blob=pack_equity_curve(timestamps, equity),
+        )
+        session.add(run)
+        session.commit()
+
+        response = client.get(
+            f"/api/v1/floor/backtests/{run.id}/equity-curve",
+            params={"points": 250},
+            headers=auth_headers,
+        )
+        assert response.status_code == 200
+        data = response.json()
+        assert data["count"] == 250
+        assert data["total_points"] == 5000
+        assert data["data"][0]["timestamp"] == str(timestamps[0])
+        assert data["data"][-1]["equity"] == pytest.approx(equity[-1])
+
+    def test_get_equity_curve_not_found(
+        self,
+        client: TestClient,
+        auth_headers: dict[str, str],
+    ) -> None:
+        """Test reading the equity curve of a non-existent backtest."""
+        response = client.get(
+            f"/api/v1/floor/backtests/{uuid.uuid4()}/equity-curve",
+            headers=auth_headers,
+        )
+        assert response.status_code == 404
+
     def test_backtest_requires_auth(
         self,
         client: TestClient,
@@ -0,0 +1,125 @@
+"""
+Tests for RateLimitMiddleware
+
+Tests cover:
+- One script call checking the minute and hour windows
+- Rate limit headers and 429 responses
+- Failing open (with backoff) when Redis is unavailable
+- Reusing the decoded token claims in the auth dependencies
+"""
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from redis.exceptions import ConnectionError as RedisConnectionError
+
+from app.api.deps import decode_token
+from app.api.middleware.rate_limiting import RateLimitMiddleware
+from app.core import security
+from app.core.config import settings
+
+
+def _headers(subject="user-1"):
+    token = security.create_access_token(subject, timedelta(minutes=5))
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.fixture
+def script():
+    """The registered Lua script, replaced by an AsyncMock"""
+    script = AsyncMock()
+    redis_client = MagicMock()
+    redis_client.register_script.return_value = script
+    with patch(
+        "app.api.middleware.rate_limiting.redis.from_url", return_value=redis_client
+    ):
+        yield script
+
+
+@pytest.fixture
+def limited_client(script):
+    app = FastAPI()
+    app.add_middleware(RateLimitMiddleware)
+
+    @app.get("/claims")
+    def claims(request: Request):
+        cached = getattr(request.state, "token_claims", None)
+        return {"sub": cached[1]["sub"] if cached else None}
+
+    return TestClient(app)
+
+
+def test_windows_checked_in_one_call(limited_client, script):
+    """Both windows go to a single script call, headers show the minute window"""
+    script.return_value = [1, 199, 300, 0, 4999, 720, 0]
+
+    r = limited_client.get("/claims", headers=_headers())
+
+    assert r.status_code == 200
+    assert r.json() == {"sub": "user-1"}
+    script.assert_awaited_once_with(
+        keys=["rate_limit:user-1:minute", "rate_limit:user-1:hour"],
+        args=[
+            settings.RATE_LIMIT_PER_MINUTE,
+            60000,
+            settings.RATE_LIMIT_PER_HOUR,
+            3600000,
+        ],
+    )
+    assert r.headers["X-RateLimit-Limit"] == str(settings.RATE_LIMIT_PER_MINUTE)
+    assert r.headers["X-RateLimit-Remaining"] == "199"
+    assert int(r.headers["X-RateLimit-Reset"]) > 0
+
+
+def test_blocking_window_reported(limited_client, script):
+    """A 429 reports the window that blocks the request"""
+    script.return_value = [0, 5, 12000, 0, 0, 3600000, 1500]
+
+    r = limited_client.get("/claims", headers=_headers())
+
+    assert r.status_code == 429
+    assert r.json() == {"detail": "Rate limit exceeded. Please try again later."}
+    assert r.headers["X-RateLimit-Limit"] == str(settings.RATE_LIMIT_PER_HOUR)
+    assert r.headers["X-RateLimit-Remaining"] == "0"
+    assert r.headers["Retry-After"] == "2"
+
+
+def test_redis_errors_fail_open(limited_client, script):
+    """Requests are allowed without Redis, which is not retried immediately"""
+    script.side_effect = RedisConnectionError("down")
+
+    first = limited_client.get("/claims", headers=_headers())
+    second = limited_client.get("/claims", headers=_headers())
+
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert second.headers["X-RateLimit-Remaining"] == str(
+        settings.RATE_LIMIT_PER_MINUTE
+    )
+    assert script.await_count == 1
+
+
+def test_unauthenticated_requests_skipped(limited_client, script):
+    """Requests without a valid token are left to the auth dependencies"""
+    anonymous = limited_client.get("/claims")
+    invalid = limited_client.get(
+        "/claims", headers={"Authorization": "Bearer not-a-token"}
+    )
+
+    assert anonymous.json() == {"sub": None}
+    assert invalid.json() == {"sub": None}
+    script.assert_not_awaited()
+
+
+def test_decode_token_reuses_cached_claims():
+    """The auth dependency only decodes tokens the middleware has not seen"""
+    token = _headers()["Authorization"].split(" ")[1]
+    request = MagicMock()
+    request.state.token_claims = (token, {"sub": "cached"})
+
+    assert decode_token(request, token) == {"sub": "cached"}
+
+    other = security.create_access_token("user-2", timedelta(minutes=5))
+    assert decode_token(request, other)["sub"] == "user-2"
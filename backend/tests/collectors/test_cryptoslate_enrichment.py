@@ -1,6 +1,6 @@
 """Tests for CryptoSlate collector keyword enrichment."""
 
-from unittest.mock import AsyncMock, MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
@@ -45,17 +45,17 @@ async def test_collect_returns_newsitem_and_keyword_matches() -> None:
     mock_resp = MagicMock()
     mock_resp.status = 200
     mock_resp.raise_for_status = MagicMock()
-    mock_resp.text = AsyncMock(return_value=SAMPLE_RSS_WITH_KEYWORDS)
+    mock_resp.read = AsyncMock(return_value=SAMPLE_RSS_WITH_KEYWORDS.encode())
     mock_resp.__aenter__ = AsyncMock(return_value=mock_resp)
     mock_resp.__aexit__ = AsyncMock(return_value=False)
 
     mock_session = MagicMock()
     mock_session.get = MagicMock(return_value=mock_resp)
-    mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session.__aexit__ = AsyncMock(return_value=False)
+    collector.http_clients = MagicMock(
+        aiohttp_session=MagicMock(return_value=mock_session)
+    )
 
-    with patch("aiohttp.ClientSession", return_value=mock_session):
-        results = await collector.collect({})
+    results = await collector.collect({})
 
     # After migration to pipeline architecture, collectors only return NewsItem
     # Enrichment happens asynchronously via EnrichmentPipeline
@@ -84,17 +84,17 @@ async def test_collect_no_keywords_for_generic_text() -> None:
     mock_resp = MagicMock()
     mock_resp.status = 200
     mock_resp.raise_for_status = MagicMock()
-    mock_resp.text = AsyncMock(return_value=generic_rss)
+    mock_resp.read = AsyncMock(return_value=generic_rss.encode())
     mock_resp.__aenter__ = AsyncMock(return_value=mock_resp)
     mock_resp.__aexit__ = AsyncMock(return_value=False)
 
     mock_session = MagicMock()
     mock_session.get = MagicMock(return_value=mock_resp)
-    mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session.__aexit__ = AsyncMock(return_value=False)
+    collector.http_clients = MagicMock(
+        aiohttp_session=MagicMock(return_value=mock_session)
+    )
 
-    with patch("aiohttp.ClientSession", return_value=mock_session):
-        results = await collector.collect({})
+    results = await collector.collect({})
 
     keyword_matches = [r for r in results if isinstance(r, NewsKeywordMatch)]
     assert len(keyword_matches) == 0
@@ -118,17 +118,17 @@ async def test_sentiment_populated_on_newsitem() -> None:
     mock_resp = MagicMock()
     mock_resp.status = 200
     mock_resp.raise_for_status = MagicMock()
-    mock_resp.text = AsyncMock(return_value=rss)
+    mock_resp.read = AsyncMock(return_value=rss.encode())
     mock_resp.__aenter__ = AsyncMock(return_value=mock_resp)
     mock_resp.__aexit__ = AsyncMock(return_value=False)
 
     mock_session = MagicMock()
     mock_session.get = MagicMock(return_value=mock_resp)
-    mock_session.__aenter__ = AsyncMock(return_value=mock_session)
-    mock_session.__aexit__ = AsyncMock(return_value=False)
+    collector.http_clients = MagicMock(
+        aiohttp_session=MagicMock(return_value=mock_session)
+    )
 
-    with patch("aiohttp.ClientSession", return_value=mock_session):
-        results = await collector.collect({})
+    results = await collector.collect({})
 
     news_items = [r for r in results if isinstance(r, NewsItem)]
     assert len(news_items) == 1
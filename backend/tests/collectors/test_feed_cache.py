@@ -0,0 +1,168 @@
+"""Tests for the RSS feed fetch cache."""
+
+import aiohttp
+import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from app.collectors.strategies.news_cointelegraph import CoinTelegraphCollector
+from app.core.collectors.feeds import FeedCache, SeenFilter
+from app.core.collectors.http import HttpClientRegistry
+
+ETAG = '"v1"'
+LAST_MODIFIED = "Sat, 17 Oct 2026 08:00:00 GMT"
+
+
+def _feed(*guids: str) -> str:
+    items = "".join(
+        f"<item><title>Item {guid}</title><link>https://example.com/{guid}</link>"
+        f"<guid>{guid}</guid></item>"
+        for guid in guids
+    )
+    return f'<?xml version="1.0"?><rss><channel>{items}</channel></rss>'
+
+
+class FeedServer:
+    """Local feed answering 304 when the client sends the current ETag"""
+
+    def __init__(self) -> None:
+        self.body = _feed("a", "b")
+        self.requests: list[dict[str, str]] = []
+        self.server: TestServer | None = None
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests.append(dict(request.headers))
+        if request.headers.get("If-None-Match") == ETAG:
+            return web.Response(status=304)
+        return web.Response(
+            text=self.body,
+            content_type="application/rss+xml",
+            headers={"ETag": ETAG, "Last-Modified": LAST_MODIFIED},
+        )
+
+    async def __aenter__(self) -> str:
+        app = web.Application()
+        app.router.add_get("/feed", self.handle)
+        self.server = TestServer(app)
+        await self.server.start_server()
+        return str(self.server.make_url("/feed"))
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        assert self.server is not None
+        await self.server.close()
+
+
+@pytest.mark.asyncio
+async def test_fetch_sends_validators_and_short_circuits_on_304() -> None:
+    cache = FeedCache()
+    feed = FeedServer()
+
+    async with feed as url, aiohttp.ClientSession() as session:
+        assert await cache.fetch(session, url) == feed.body.encode()
+        cache.commit(url)
+        assert await cache.fetch(session, url) is None
+
+    assert "If-None-Match" not in feed.requests[0]
+    assert feed.requests[1]["If-None-Match"] == ETAG
+    assert feed.requests[1]["If-Modified-Since"] == LAST_MODIFIED
+    assert cache.stats() == {
+        "feeds": 1,
+        "fetched": 1,
+        "not_modified": 1,
+        "items_skipped": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_fetch_raises_for_error_status() -> None:
+    async def handle(request: web.Request) -> web.Response:  # noqa: ARG001
+        return web.Response(status=503)
+
+    app = web.Application()
+    app.router.add_get("/feed", handle)
+    async with TestServer(app) as server, aiohttp.ClientSession() as session:
+        with pytest.raises(aiohttp.ClientResponseError):
+            await FeedCache().fetch(session, str(server.make_url("/feed")))
+
+
+def test_is_new_per_feed() -> None:
+    cache = FeedCache()
+
+    assert cache.is_new("https://a.test/rss", "guid-1")
+    assert not cache.is_new("https://a.test/rss", "guid-1")
+    assert cache.is_new("https://b.test/rss", "guid-1")
+    assert cache.items_skipped == 1
+
+
+def test_seen_items_kept_only_when_committed() -> None:
+    cache = FeedCache()
+    url = "https://a.test/rss"
+
+    assert cache.is_new(url, "guid-1")
+    cache.discard(url)
+    assert cache.is_new(url, "guid-1")
+    cache.commit(url)
+    assert not cache.is_new(url, "guid-1")
+
+
+@pytest.mark.asyncio
+async def test_validators_kept_only_when_committed() -> None:
+    cache = FeedCache()
+    feed = FeedServer()
+
+    async with feed as url, aiohttp.ClientSession() as session:
+        assert await cache.fetch(session, url) is not None
+        cache.discard(url)
+        # Not stored: fetched in full again
+        assert await cache.fetch(session, url) is not None
+        cache.commit(url)
+        assert await cache.fetch(session, url) is None
+
+    assert [request.get("If-None-Match") for request in feed.requests] == [
+        None,
+        None,
+        ETAG,
+    ]
+
+
+def test_seen_filter_keeps_two_generations() -> None:
+    seen = SeenFilter(capacity=100)
+    keys = [f"guid-{i}" for i in range(300)]
+    for key in keys:
+        seen.add(key)
+
+    # Last two generations are remembered without false negatives
+    assert all(key in seen for key in keys[100:])
+    # The oldest generation aged out (allowing the configured error rate)
+    assert sum(key in seen for key in keys[:100]) < 5
+
+
+@pytest.mark.asyncio
+async def test_collector_skips_seen_items() -> None:
+    feed = FeedServer()
+    collector = CoinTelegraphCollector()
+    collector.http_clients = HttpClientRegistry()
+    collector.feed_cache = FeedCache()
+
+    async with feed as url:
+        config = {"rss_url": url}
+        first = await collector.collect(config)
+        # Storing failed: the same items are returned again
+        collector.discard(config)
+        retried = await collector.collect(config)
+        collector.commit(config)
+
+        feed.body = _feed("a", "b", "c")
+        collector.feed_cache._feeds[url].etag = None  # force a full fetch
+        second = await collector.collect(config)
+        collector.commit(config)
+        third = await collector.collect(config)
+
+    await collector.http_clients.close()
+    assert [item.link for item in first] == [
+        "https://example.com/a",
+        "https://example.com/b",
+    ]
+    assert [item.link for item in retried] == [item.link for item in first]
+    assert [item.link for item in second] == ["https://example.com/c"]
+    assert third == []
@@ -30,6 +30,13 @@ def _make_response(json_body: dict, status_code: int = 200) -> httpx.Response:
     return resp
 
 
+def _use_client(walker: GlassChainWalker, post) -> None:
+    """Inject a shared httpx client whose post() is the given coroutine."""
+    mock_client = AsyncMock()
+    mock_client.post = post
+    walker.http_clients = MagicMock(httpx_client=MagicMock(return_value=mock_client))
+
+
 # ---------------------------------------------------------------------------
 # _get_rpc_endpoints
 # ---------------------------------------------------------------------------
@@ -83,14 +90,9 @@ class TestCollectFallback:
                 return _make_response({"jsonrpc": "2.0", "id": 2, "result": "0x3B9ACA00"})
             raise AssertionError(f"Unexpected method: {json}")
 
-        with patch("app.collectors.strategies.glass_chain_walker.httpx.AsyncClient") as mock_cls:
-            mock_client = AsyncMock()
-            mock_client.post = fake_post
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            mock_cls.return_value = mock_client
+        _use_client(walker, fake_post)
 
-            results = await walker.collect({"chain": "ethereum"})
+        results = await walker.collect({"chain": "ethereum"})
 
         assert len(results) == 2
         block = next(r for r in results if r.metric_name == "block_height")
@@ -103,15 +105,10 @@ class TestCollectFallback:
         async def fail_post(url, *, json, **kwargs):
             raise httpx.ConnectError("Connection refused")
 
-        with patch("app.collectors.strategies.glass_chain_walker.httpx.AsyncClient") as mock_cls:
-            mock_client = AsyncMock()
-            mock_client.post = fail_post
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            mock_cls.return_value = mock_client
+        _use_client(walker, fail_post)
 
-            with pytest.raises(RuntimeError, match="All RPC endpoints exhausted"):
-                await walker.collect({"chain": "ethereum"})
+        with pytest.raises(RuntimeError, match="All RPC endpoints exhausted"):
+            await walker.collect({"chain": "ethereum"})
 
     @pytest.mark.asyncio
     async def test_custom_rpc_url_takes_priority(self, walker):
@@ -127,14 +124,9 @@ class TestCollectFallback:
                 return _make_response({"jsonrpc": "2.0", "id": 2, "result": "0x3B9ACA00"})
             raise AssertionError(f"Unexpected method: {json}")
 
-        with patch("app.collectors.strategies.glass_chain_walker.httpx.AsyncClient") as mock_cls:
-            mock_client = AsyncMock()
-            mock_client.post = tracking_post
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            mock_cls.return_value = mock_client
+        _use_client(walker, tracking_post)
 
-            results = await walker.collect({"chain": "ethereum", "rpc_url": custom_url})
+        results = await walker.collect({"chain": "ethereum", "rpc_url": custom_url})
 
         # The custom URL should be the one that was called (successfully on first try)
         assert all(custom_url in u for u in called_urls)
@@ -153,14 +145,9 @@ class TestCollectFallback:
                 return _make_response({"jsonrpc": "2.0", "id": 2, "result": "0x1"})
             raise AssertionError(f"Unexpected method: {json}")
 
-        with patch("app.collectors.strategies.glass_chain_walker.httpx.AsyncClient") as mock_cls:
-            mock_client = AsyncMock()
-            mock_client.post = timeout_then_ok
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            mock_cls.return_value = mock_client
+        _use_client(walker, timeout_then_ok)
 
-            results = await walker.collect({"chain": "ethereum"})
+        results = await walker.collect({"chain": "ethereum"})
 
         assert len(results) == 2
         block = next(r for r in results if r.metric_name == "block_height")
@@ -183,14 +170,9 @@ class TestCollectFallback:
                     return _make_response({"jsonrpc": "2.0", "id": 2, "result": "0x1"})
                 raise AssertionError(f"Unexpected method: {json}")
 
-            with patch("app.collectors.strategies.glass_chain_walker.httpx.AsyncClient") as mock_cls:
-                mock_client = AsyncMock()
-                mock_client.post = ok_post
-                mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-                mock_client.__aexit__ = AsyncMock(return_value=False)
-                mock_cls.return_value = mock_client
+            _use_client(walker, ok_post)
 
-                await walker.collect({"chain": "ethereum"})
+            await walker.collect({"chain": "ethereum"})
 
             mock_timeout.assert_called_with(CONNECTION_TIMEOUT_SECONDS, connect=CONNECTION_TIMEOUT_SECONDS)
 
@@ -211,14 +193,9 @@ class TestTestConnection:
         async def fail_post(url, *, json, **kwargs):
             raise httpx.ConnectError("refused")
 
-        with patch("app.collectors.strategies.glass_chain_walker.httpx.AsyncClient") as mock_cls:
-            mock_client = AsyncMock()
-            mock_client.post = fail_post
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            mock_cls.return_value = mock_client
+        _use_client(walker, fail_post)
 
-            result = await walker.test_connection({"chain": "ethereum"})
+        result = await walker.test_connection({"chain": "ethereum"})
 
         assert result is False
 
@@ -229,14 +206,9 @@ class TestTestConnection:
                 raise httpx.ConnectError("refused")
             return _make_response({"jsonrpc": "2.0", "id": 1, "result": "0x1"})
 
-        with patch("app.collectors.strategies.glass_chain_walker.httpx.AsyncClient") as mock_cls:
-            mock_client = AsyncMock()
-            mock_client.post = second_ok
-            mock_client.__aenter__ = AsyncMock(return_value=mock_client)
-            mock_client.__aexit__ = AsyncMock(return_value=False)
-            mock_cls.return_value = mock_client
+        _use_client(walker, second_ok)
 
-            result = await walker.test_connection({"chain": "ethereum"})
+        result = await walker.test_connection({"chain": "ethereum"})
 
         assert result is True
 
@@ -0,0 +1,70 @@
+"""Tests for the shared collector HTTP clients."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from app.collectors.strategies.news_coindesk import CoinDeskCollector
+from app.core.collectors.http import HostLimitedTransport, HttpClientRegistry
+
+
+@pytest.mark.asyncio
+async def test_clients_are_reused() -> None:
+    registry = HttpClientRegistry()
+
+    session = registry.aiohttp_session()
+    client = registry.httpx_client()
+
+    assert registry.aiohttp_session() is session
+    assert registry.httpx_client() is client
+    assert registry.stats()["clients_created"] == 2
+
+    await registry.close()
+    assert session.closed
+    assert client.is_closed
+    assert registry.aiohttp_session() is not session
+    await registry.close()
+
+
+def test_new_clients_per_event_loop() -> None:
+    registry = HttpClientRegistry()
+
+    async def get_client() -> httpx.AsyncClient:
+        return registry.httpx_client()
+
+    first = asyncio.run(get_client())
+    second = asyncio.run(get_client())
+
+    assert first is not second
+
+
+@pytest.mark.asyncio
+async def test_requests_limited_per_host() -> None:
+    in_flight: dict[str, int] = {}
+    peak: dict[str, int] = {}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        in_flight[host] = in_flight.get(host, 0) + 1
+        peak[host] = max(peak.get(host, 0), in_flight[host])
+        await asyncio.sleep(0.01)
+        in_flight[host] -= 1
+        return httpx.Response(200)
+
+    transport = HostLimitedTransport(httpx.MockTransport(handler), max_per_host=2)
+    async with httpx.AsyncClient(transport=transport) as client:
+        await asyncio.gather(
+            *(client.get(f"https://{host}/") for host in ["a.test", "b.test"] * 5)
+        )
+
+    assert peak == {"a.test": 2, "b.test": 2}
+
+
+def test_strategies_use_injected_clients() -> None:
+    collector = CoinDeskCollector()
+    registry = HttpClientRegistry()
+
+    assert collector.http is not registry
+    collector.http_clients = registry
+    assert collector.http is registry
@@ -0,0 +1,101 @@
+"""Tests for the incremental collector parsers."""
+
+import pytest
+
+from app.core.collectors.parsing import (
+    parse_html_rows,
+    parse_rows,
+    parse_rss,
+    parse_rss_items,
+)
+
+RSS = """<?xml version="1.0" encoding="ISO-8859-1"?>
+<rss xmlns:dc="http://purl.org/dc/elements/1.1/">
+  <channel>
+    <title>Feed</title>
+    <link>https://example.com</link>
+    <item>
+      <title> Caf\xe9 &amp; markets </title>
+      <link>https://example.com/1</link>
+      <guid isPermaLink="false">guid-1</guid>
+      <pubDate>Sat, 17 Oct 2026 08:00:00 GMT</pubDate>
+      <description><![CDATA[<p>Summary</p>]]></description>
+      <dc:creator>Reporter</dc:creator>
+    </item>
+    <!-- comment -->
+    <item><title>Second</title><link>https://example.com/2</link></item>
+    <item><title>Third</title></item>
+  </channel>
+</rss>
+""".encode("latin-1")
+
+HTML = b"""<html><body><table>
+<tr><th>Coin</th><th>Buy</th></tr>
+<tr data-coin="btc"><td><img src="btc.png"></td><td>Bitcoin</td>
+  <td data-value="45000.00">$45,000</td><td data-value="45100.00">$45,100</td></tr>
+<tr data-coin="eth"><td>Ethereum<td data-value="3000">
+</table></body></html>"""
+
+
+def test_parse_rss_items_extracts_fields() -> None:
+    items = parse_rss_items(RSS)
+
+    assert items[0] == {
+        "title": "Caf\xe9 & markets",
+        "link": "https://example.com/1",
+        "guid": "guid-1",
+        "pubDate": "Sat, 17 Oct 2026 08:00:00 GMT",
+        "description": "<p>Summary</p>",
+    }
+    assert items[1:] == [
+        {"title": "Second", "link": "https://example.com/2"},
+        {"title": "Third"},
+    ]
+
+
+def test_parse_rss_items_default_namespace() -> None:
+    rdf = b"""<?xml version="1.0"?>
+<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"
+         xmlns="http://purl.org/rss/1.0/"
+         xmlns:atom="http://www.w3.org/2005/Atom">
+  <channel rdf:about="https://example.com"><title>Feed</title></channel>
+  <item rdf:about="https://example.com/1">
+    <atom:link href="https://example.com/other"/>
+    <title>First</title>
+    <link>https://example.com/1</link>
+    <description>Summary</description>
+  </item>
+</rdf:RDF>"""
+
+    assert parse_rss_items(rdf) == [
+        {
+            "title": "First",
+            "link": "https://example.com/1",
+            "description": "Summary",
+        }
+    ]
+
+
+def test_parse_rss_items_limit_and_malformed_input() -> None:
+    assert [item["title"] for item in parse_rss_items(RSS, limit=2)] == [
+        "Caf\xe9 & markets",
+        "Second",
+    ]
+    assert parse_rss_items(b"not a feed") == []
+    truncated = b"<rss><channel><item><title>Kept</title></item><item><title>Cut"
+    assert parse_rss_items(truncated)[0] == {"title": "Kept"}
+
+
+def test_parse_html_rows_reads_cell_attributes() -> None:
+    assert parse_html_rows(HTML, "data-coin", "data-value") == [
+        ("btc", [None, None, "45000.00", "45100.00"]),
+        ("eth", [None, "3000"]),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_async_wrappers() -> None:
+    assert await parse_rss(RSS, 1) == parse_rss_items(RSS, 1)
+    assert await parse_rows(HTML, "data-coin", "data-value") == parse_html_rows(
+        HTML, "data-coin", "data-value"
+    )
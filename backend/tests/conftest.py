@@ -12,6 +12,7 @@ import pytest
 from fastapi.testclient import TestClient
 from sqlmodel import Session, SQLModel, delete
 
+from app.core.collectors import feeds
 from app.core.config import settings
 from app.core.db import engine, init_db
 from app.main import app
@@ -33,6 +34,9 @@ from app.models import (
     NewsSentiment,
     OnChainMetrics,
     Order,
+    PnLLedgerState,
+    PnLLot,
+    PnLRealizedMatch,
     Position,
     PriceData5Min,
     ProtocolFundamentals,
@@ -42,6 +46,8 @@ from app.models import (
     User,
     UserLLMCredentials,
 )
+from app.services.trading import events, indicators, price_cache, risk_state
+from app.services.trading.audit import get_audit_writer
 from app.services.trading.executor import OrderQueue
 
 # Import test fixtures for use across tests
@@ -58,8 +64,18 @@ from tests.utils.utils import get_superuser_token_headers
 def reset_singletons():
     """Reset singletons between tests to prevent loop binding errors"""
     OrderQueue._instance = None
+    price_cache._price_cache = None
+    risk_state._risk_state = None
+    indicators._indicator_service = None
+    events._event_publisher = None
+    feeds._feed_cache = None
     yield
     OrderQueue._instance = None
+    price_cache._price_cache = None
+    risk_state._risk_state = None
+    indicators._indicator_service = None
+    events._event_publisher = None
+    feeds._feed_cache = None
 
 
 @pytest.fixture(scope="session", autouse=True)
@@ -74,6 +90,8 @@ def db() -> Generator[Session, None, None]:
     with Session(engine) as session:
         init_db(session)
         yield session
+        # Write buffered audit entries before their users are deleted
+        get_audit_writer().stop()
         # Clean up test data with cascading deletes in correct order
         # Delete child records first to avoid foreign key violations
         try:
@@ -83,6 +101,9 @@ def db() -> Generator[Session, None, None]:
             session.execute(delete(AgentSession))
 
             # Delete trading-related data
+            session.execute(delete(PnLRealizedMatch))
+            session.execute(delete(PnLLot))
+            session.execute(delete(PnLLedgerState))
             session.execute(delete(Order))
             session.execute(delete(Position))
             session.execute(delete(DeployedAlgorithm))
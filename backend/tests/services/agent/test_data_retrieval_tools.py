@@ -44,15 +44,10 @@ class TestFetchPriceData:
         """Test basic price data fetching."""
         start_date, end_date = sample_date_range
 
-        # Mock price data
-        mock_price = Mock()
-        mock_price.timestamp = datetime.now()
-        mock_price.coin_type = "BTC"
-        mock_price.bid = Decimal("50000.00")
-        mock_price.ask = Decimal("50100.00")
-        mock_price.last = Decimal("50050.00")
-
-        mock_session.exec.return_value.all.return_value = [mock_price]
+        # Mock price rows (timestamp, coin_type, bid, ask, last)
+        mock_session.exec.return_value.partitions.return_value = [
+            [(datetime.now(), "BTC", 50000.00, 50100.00, 50050.00)]
+        ]
 
         # Execute
         result = await fetch_price_data(mock_session, "BTC", start_date, end_date)
@@ -69,7 +64,7 @@ class TestFetchPriceData:
         """Test fetching when no data is available."""
         start_date, end_date = sample_date_range
 
-        mock_session.exec.return_value.all.return_value = []
+        mock_session.exec.return_value.partitions.return_value = []
 
         result = await fetch_price_data(mock_session, "BTC", start_date, end_date)
 
@@ -80,7 +75,7 @@ class TestFetchPriceData:
         """Test fetching with default end date."""
         start_date = datetime.now() - timedelta(days=7)
 
-        mock_session.exec.return_value.all.return_value = []
+        mock_session.exec.return_value.partitions.return_value = []
 
         result = await fetch_price_data(mock_session, "ETH", start_date)
 
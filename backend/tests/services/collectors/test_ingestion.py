@@ -0,0 +1,85 @@
+"""
+Tests for the data ingestion service.
+"""
+
+from uuid import uuid4
+
+from sqlalchemy import event
+from sqlmodel import Session, select
+
+from app.models import NewsItem, SentimentScore, Signal
+from app.services.collectors.ingestion import DataIngestionService
+
+
+def _news(link):
+    return {"title": "Title", "link": link, "summary": "Summary"}
+
+
+class TestDataIngestionService:
+    """Test suite for DataIngestionService."""
+
+    def test_ingest_skips_stored_and_repeated_links(self, session: Session):
+        """Links already stored or repeated in the batch are inserted once."""
+        stored, new = f"https://example.com/{uuid4()}", f"https://example.com/{uuid4()}"
+        session.add(NewsItem(title="Old", link=stored, source="feed"))
+        session.commit()
+
+        count = DataIngestionService(session).ingest(
+            "feed", [_news(stored), _news(new), _news(new)]
+        )
+
+        assert count == 1
+        rows = session.exec(select(NewsItem).where(NewsItem.link == new)).all()
+        assert len(rows) == 1
+        assert rows[0].source == "feed"
+
+    def test_ingest_batches_round_trips(self, session: Session):
+        """A batch costs one duplicate check and one insert per table."""
+        asset = f"T{uuid4().hex[:8]}"
+        data = [_news(f"https://example.com/{uuid4()}") for _ in range(50)]
+        data += [
+            {"type": "buy", "asset": asset, "strength": 0.5} for _ in range(20)
+        ]
+        data += [{"asset": asset, "score": 0.1} for _ in range(20)]
+        data.append({"unknown": True})
+
+        statements = []
+
+        def count_statement(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        bind = session.get_bind()
+        event.listen(bind, "before_cursor_execute", count_statement)
+        try:
+            count = DataIngestionService(session).ingest("feed", data)
+        finally:
+            event.remove(bind, "before_cursor_execute", count_statement)
+
+        assert count == 90
+        assert len(statements) <= 5  # SELECT + 3 INSERTs (+ COMMIT on some drivers)
+        assert len(session.exec(select(Signal).where(Signal.asset == asset)).all()) == 20
+        assert (
+            len(
+                session.exec(
+                    select(SentimentScore).where(SentimentScore.asset == asset)
+                ).all()
+            )
+            == 20
+        )
+
+    def test_ingest_missing_values_use_defaults(self, session: Session):
+        """A None strength or score stores the model default, not NULL."""
+        asset = f"T{uuid4().hex[:8]}"
+        data = [
+            {"type": "buy", "asset": asset, "strength": None},
+            {"type": "sell", "asset": asset, "strength": 0.5},
+            {"asset": asset, "score": None},
+        ]
+
+        assert DataIngestionService(session).ingest("feed", data) == 3
+        signals = session.exec(select(Signal).where(Signal.asset == asset)).all()
+        assert sorted(signal.strength for signal in signals) == [0.0, 0.5]
+        score = session.exec(
+            select(SentimentScore).where(SentimentScore.asset == asset)
+        ).one()
+        assert score.score == 0.0
@@ -1,14 +1,15 @@
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
 from decimal import Decimal
 from unittest.mock import MagicMock
 
+import numpy as np
 import pandas as pd
 import pytest
 from sqlmodel import Session
 
-from app.models import PriceData5Min
 from app.services.backtesting.engine import BacktestService
-from app.services.backtesting.schemas import BacktestConfig
+from app.services.backtesting.price_loader import load_price_frame
+from app.services.backtesting.schemas import BacktestConfig, SweepConfig
 
 
 @pytest.fixture
@@ -17,23 +18,15 @@ def mock_session():
 
 @pytest.fixture
 def sample_price_data():
-    """Create sample price data for testing"""
+    """Create sample (timestamp, last) price rows for testing"""
     base_time = pd.Timestamp("2026-01-01 00:00:00", tz="UTC")
-    data = []
     prices = [100, 101, 102, 101, 100, 99, 98, 99, 100, 102, 104, 105]
 
-    for i, p in enumerate(prices):
-        # Create mock PriceData5Min objects
-        # Note: BacktestService uses .last, and .timestamp
-        mock_item = MagicMock(spec=PriceData5Min)
-        mock_item.coin_type = "BTC"
-        mock_item.timestamp = base_time + pd.Timedelta(minutes=5*i)
-        mock_item.last = Decimal(str(p))
-        mock_item.bid = Decimal(str(p))
-        mock_item.ask = Decimal(str(p))
-        data.append(mock_item)
-
-    return data
+    # BacktestService only loads the `last` column
+    return [
+        ((base_time + pd.Timedelta(minutes=5 * i)).to_pydatetime(), float(p))
+        for i, p in enumerate(prices)
+    ]
 
 def test_backtest_service_initialization(mock_session):
     service = BacktestService(session=mock_session)
@@ -43,7 +36,7 @@ def test_fetch_data(mock_session, sample_price_data):
     """Test fetching data from mock session"""
     service = BacktestService(session=mock_session)
 
-    mock_session.exec.return_value.all.return_value = sample_price_data
+    mock_session.exec.return_value.partitions.return_value = [sample_price_data]
 
     df = service._fetch_data(
         coin_type="BTC",
@@ -60,7 +53,7 @@ def test_fetch_data(mock_session, sample_price_data):
 def test_run_backtest_default_strategy(mock_session, sample_price_data):
     """Test full backtest run with default strategy (SMA)"""
     service = BacktestService(session=mock_session)
-    mock_session.exec.return_value.all.return_value = sample_price_data
+    mock_session.exec.return_value.partitions.return_value = [sample_price_data]
 
     config = BacktestConfig(
         strategy_name="Test Strategy",
@@ -102,3 +95,167 @@ def test_run_backtest_default_strategy(mock_session, sample_price_data):
     assert result.total_trades >= 0
     assert result.total_return != 0 or result.total_trades == 0
     # Actually if 0 trades, returns could be 0.
+
+def test_load_price_frame_concatenates_chunks(mock_session):
+    """Chunks from the server-side cursor are stitched into typed columns"""
+    base_time = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    rows = [
+        (base_time + timedelta(minutes=5 * i), Decimal(100 + i), 101.0 + i, 100.5 + i)
+        for i in range(5)
+    ]
+    mock_session.exec.return_value.partitions.return_value = [rows[:3], rows[3:]]
+
+    df = load_price_frame(
+        mock_session, "btc", base_time, base_time + timedelta(hours=1), chunk_size=3
+    )
+
+    assert list(df.columns) == ["timestamp", "bid", "ask", "last"]
+    assert len(df) == 5
+    assert str(df["timestamp"].dt.tz) == "UTC"
+    assert df["bid"].dtype == "float64"
+    assert df["bid"].tolist() == [100.0, 101.0, 102.0, 103.0, 104.0]
+    assert df["last"].iloc[-1] == 104.5
+    mock_session.exec.return_value.partitions.assert_called_once_with(3)
+
+def test_load_price_frame_empty(mock_session):
+    """An empty range returns an empty frame with the requested columns"""
+    mock_session.exec.return_value.partitions.return_value = []
+
+    df = load_price_frame(
+        mock_session,
+        "btc",
+        datetime(2026, 1, 1),
+        datetime(2026, 1, 2),
+        columns=("coin_type", "last"),
+    )
+
+    assert df.empty
+    assert list(df.columns) == ["timestamp", "coin_type", "last"]
+
+def _sweep_session(rows_by_coin):
+    """Mock session whose price query returns rows for the coin being loaded"""
+    session = MagicMock(spec=Session)
+    coins = iter(rows_by_coin.values())
+    session.exec.return_value.partitions.side_effect = lambda *args: [
+        rows for rows in [next(coins)] if rows
+    ]
+    return session
+
+def _random_walk_rows(n, seed):
+    rng = np.random.default_rng(seed)
+    base_time = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    prices = 100 * np.cumprod(1 + rng.normal(0, 0.005, n))
+    return [(base_time + timedelta(minutes=5 * i), float(p)) for i, p in enumerate(prices)]
+
+def test_run_sweep_matches_run_backtest():
+    """Every sweep row matches a standalone run_backtest of the same parameters"""
+    rows = _random_walk_rows(2000, seed=3)
+    service = BacktestService(session=_sweep_session({"btc": rows}))
+    config = SweepConfig(
+        coin_types=["btc"],
+        start_date=datetime(2026, 1, 1),
+        end_date=datetime(2026, 2, 1),
+        fast_windows=[5, 10],
+        slow_windows=[20, 40],
+        fee_rates=[0.001, 0.0025],
+    )
+
+    result = service.run_sweep(config, max_workers=1)
+
+    assert result.combinations == 8
+    assert [row.rank for row in result.rows] == list(range(1, 9))
+    sharpes = [row.sharpe_ratio for row in result.rows]
+    assert sharpes == sorted(sharpes, reverse=True)
+
+    single_session = MagicMock(spec=Session)
+    single_session.exec.return_value.partitions.side_effect = lambda *args: [rows]
+    single = BacktestService(session=single_session)
+    for row in result.rows:
+        expected = single.run_backtest(
+            BacktestConfig(
+                strategy_name="single",
+                coin_type="btc",
+                start_date=config.start_date,
+                end_date=config.end_date,
+                parameters={
+                    "fast_window": row.fast_window,
+                    "slow_window": row.slow_window,
+                },
+            ),
+            fee_rate=row.fee_rate,
+        )
+        assert row.total_return == pytest.approx(expected.total_return)
+        assert row.max_drawdown == pytest.approx(expected.max_drawdown)
+        assert row.sharpe_ratio == pytest.approx(expected.sharpe_ratio)
+        assert row.win_rate == pytest.approx(expected.win_rate)
+        assert row.total_trades == expected.total_trades
+
+def test_run_sweep_process_pool():
+    """The process pool returns the same table as the in-process run"""
+    rows_by_coin = {
+        "btc": _random_walk_rows(1500, seed=1),
+        "eth": _random_walk_rows(1500, seed=2),
+        "doge": [],
+    }
+    config = SweepConfig(
+        coin_types=list(rows_by_coin),
+        start_date=datetime(2026, 1, 1),
+        end_date=datetime(2026, 2, 1),
+        fast_windows=[5, 10, 50],
+        slow_windows=[10, 30],
+        rank_by="total_return",
+    )
+
+    pooled = BacktestService(session=_sweep_session(rows_by_coin)).run_sweep(
+        config, max_workers=2
+    )
+    serial = BacktestService(session=_sweep_session(rows_by_coin)).run_sweep(
+        config, max_workers=1
+    )
+
+    # (10, 10), (50, 10) and (50, 30) are skipped
+    assert pooled.combinations == 3
+    assert pooled.coins_without_data == ["doge"]
+    assert len(pooled.rows) == 6
+    assert [r.model_dump() for r in pooled.rows] == [r.model_dump() for r in serial.rows]
+
+def test_run_sweep_rejects_unknown_metric(mock_session):
+    """rank_by must name a result metric"""
+    config = SweepConfig(
+        coin_types=["btc"],
+        start_date=datetime(2026, 1, 1),
+        end_date=datetime(2026, 2, 1),
+        fast_windows=[5],
+        slow_windows=[20],
+        rank_by="vibes",
+    )
+
+    with pytest.raises(ValueError, match="rank_by"):
+        BacktestService(session=mock_session).run_sweep(config)
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_extract_trades_matches_iterative(mock_session, seed):
+    """Position-change trade extraction matches the iterrows reference"""
+    rng = np.random.default_rng(seed)
+    n = 3000
+    df = pd.DataFrame(
+        {
+            "close": 100 * np.cumprod(1 + rng.normal(0, 0.01, n)),
+            # Sticky random long/flat/short positions
+            "position": np.repeat(rng.choice([-1.0, 0.0, 1.0], n // 10), 10),
+        },
+        index=pd.date_range("2026-01-01", periods=n, freq="5min", tz="UTC"),
+    )
+    service = BacktestService(session=mock_session)
+
+    trades = service._extract_trades(df, fee_rate=0.001, slippage=0.0005)
+    expected = service._extract_trades_iterative(df, fee_rate=0.001, slippage=0.0005)
+
+    assert len(trades) == len(expected)
+    for trade, ref in zip(trades, expected, strict=True):
+        assert trade["entry_time"] == ref["entry_time"]
+        assert trade["exit_time"] == ref["exit_time"]
+        assert trade["type"] == ref["type"]
+        assert trade["entry_price"] == ref["entry_price"]
+        assert trade["exit_price"] == ref["exit_price"]
+        assert trade["pnl"] == pytest.approx(ref["pnl"])
@@ -71,7 +71,7 @@ async def test_collect_scraping():
     with patch("httpx.AsyncClient.get", new_callable=AsyncMock) as mock_get:
         mock_response = MagicMock()
         mock_response.status_code = 200
-        mock_response.text = MOCK_HTML_RESPONSE
+        mock_response.content = MOCK_HTML_RESPONSE.encode()
         mock_get.return_value = mock_response
 
         results = await collector.collect(config)
@@ -1,11 +1,16 @@
-"""Tests for StrategyAdapterCollector duplicate handling with savepoints."""
+"""Tests for StrategyAdapterCollector duplicate handling (bulk inserts and savepoints)."""
 
-from unittest.mock import MagicMock
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
 
 import pytest
 from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
 
-from app.models import NewsItem
+from app.models import NewsItem, PriceData5Min
+from app.services.collectors import strategy_adapter
 from app.services.collectors.strategy_adapter import StrategyAdapterCollector
 
 
@@ -123,3 +128,95 @@ async def test_store_data_handles_generic_exception() -> None:
     item = _make_news_item("https://example.com/1")
     count = await adapter.store_data([item], session)
     assert count == 0
+
+
+@pytest.mark.asyncio
+async def test_bulk_store_skips_duplicates(session: Session) -> None:
+    adapter = StrategyAdapterCollector(
+        strategy=_make_strategy(), ledger_name="test"
+    )
+    adapter._enrich_items = AsyncMock()  # type: ignore[method-assign]
+    links = [f"https://example.com/{uuid4()}" for _ in range(2)]
+
+    items = [_make_news_item(links[0]), _make_news_item(links[0]), _make_news_item(links[1])]
+    count = await adapter.store_data(items, session)
+    assert count == 2
+
+    # Only new rows are enriched, as persistent instances with ids
+    enriched = adapter._enrich_items.await_args.args[0]
+    assert sorted(item.link for item in enriched) == sorted(links)
+    assert all(item.id is not None for item in enriched)
+
+    # A second run stores nothing and enriches nothing
+    adapter._enrich_items.reset_mock()
+    count = await adapter.store_data([_make_news_item(links[1])], session)
+    assert count == 0
+    adapter._enrich_items.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+async def test_bulk_store_groups_models(session: Session) -> None:
+    adapter = StrategyAdapterCollector(
+        strategy=_make_strategy(), ledger_name="test"
+    )
+    adapter._enrich_items = AsyncMock()  # type: ignore[method-assign]
+    timestamp = datetime(2020, 1, 1, tzinfo=timezone.utc)
+    prices = [
+        PriceData5Min(
+            coin_type=coin,
+            bid=Decimal("1"),
+            ask=Decimal("2"),
+            last=Decimal("1.5"),
+            timestamp=timestamp,
+        )
+        for coin in ("BULKA", "BULKB", "BULKA")
+    ]
+    news = _make_news_item(f"https://example.com/{uuid4()}")
+
+    count = await adapter.store_data([*prices, news], session)
+
+    assert count == 3
+    enriched = adapter._enrich_items.await_args.args[0]
+    assert [item.link for item in enriched] == [news.link]
+
+
+@pytest.mark.asyncio
+async def test_bulk_failure_falls_back_to_savepoints(session: Session) -> None:
+    adapter = StrategyAdapterCollector(
+        strategy=_make_strategy(), ledger_name="test"
+    )
+    adapter._enrich_items = AsyncMock()  # type: ignore[method-assign]
+    dialect = session.get_bind().dialect.name
+    failing = MagicMock(side_effect=RuntimeError("bulk insert failed"))
+
+    with patch.dict(strategy_adapter.BULK_INSERT, {dialect: failing}):
+        count = await adapter.store_data(
+            [_make_news_item(f"https://example.com/{uuid4()}")], session
+        )
+
+    assert count == 1
+    failing.assert_called_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("success", [True, False])
+async def test_run_commits_or_discards_strategy_state(success: bool) -> None:
+    """The strategy keeps its per-run state only when the run was stored."""
+    strategy = _make_strategy()
+    config = {"rss_url": "https://example.com/rss"}
+    adapter = StrategyAdapterCollector(
+        strategy=strategy, ledger_name="test", default_config=config
+    )
+
+    with patch(
+        "app.services.collectors.base.BaseCollector.run",
+        new=AsyncMock(return_value=success),
+    ):
+        assert await adapter.run() is success
+
+    if success:
+        strategy.commit.assert_called_once_with(config)
+        strategy.discard.assert_not_called()
+    else:
+        strategy.discard.assert_called_once_with(config)
+        strategy.commit.assert_not_called()
@@ -1,8 +1,13 @@
+import json
+from datetime import datetime, timezone
 from decimal import Decimal
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
 
 import pytest
 
+from app.models import Position
+from app.services.trading.events import POSITION_CHANNEL, PRICE_CHANNEL
 from app.services.trading.safety import TradingSafetyManager
 from app.services.trading.watcher import HardStopWatcher
 
@@ -88,3 +93,91 @@ async def test_hard_stop_safe(mock_redis):
             mock_stop.assert_not_called()
 
 # Integration style test with DB session mocking more deeply (optional, but good for coverage)
+
+def _position(coin_type, quantity, average_price):
+    return Position(
+        user_id=uuid4(),
+        coin_type=coin_type,
+        quantity=Decimal(quantity),
+        average_price=Decimal(average_price),
+        total_cost=Decimal(quantity) * Decimal(average_price),
+    )
+
+
+def _price_event(**prices):
+    return PRICE_CHANNEL, json.dumps({
+        "prices": prices,
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+    })
+
+
+def _position_event(user_id, coin_type, quantity, average_price):
+    return POSITION_CHANNEL, json.dumps({
+        "user_id": str(user_id),
+        "coin_type": coin_type,
+        "quantity": quantity,
+        "average_price": average_price,
+    })
+
+
+@pytest.mark.asyncio
+async def test_incremental_equity_matches_reconciliation():
+    watcher = HardStopWatcher()
+    btc, eth = _position("BTC", "2", "100"), _position("ETH", "10", "5")
+    session = MagicMock()
+    session.exec.return_value.all.return_value = [btc, eth]
+
+    with patch.object(watcher, "get_latest_prices", new_callable=AsyncMock) as mock_prices:
+        mock_prices.return_value = {"BTC": Decimal("110")}
+        assert await watcher.calculate_total_equity(session) == Decimal("270")
+
+        # ETH has no market price yet and is valued at its average price
+        await watcher.handle_event(*_price_event(ETH="6", SOL="1"))
+        assert watcher.equity == Decimal("280")
+
+        await watcher.handle_event(*_position_event(btc.user_id, "BTC", "1", "100"))
+        await watcher.handle_event(*_position_event(eth.user_id, "ETH", "0", "5"))
+        new_user = uuid4()
+        await watcher.handle_event(*_position_event(new_user, "SOL", "20", "1"))
+        assert watcher.equity == Decimal("130")
+
+        # A full pass over the same state agrees with the running total
+        btc.quantity = Decimal("1")
+        sol = _position("SOL", "20", "1")
+        session.exec.return_value.all.return_value = [btc, sol]
+        mock_prices.return_value = {"BTC": Decimal("110"), "SOL": Decimal("1")}
+        assert await watcher.calculate_total_equity(session) == Decimal("130")
+
+
+@pytest.mark.asyncio
+async def test_price_event_triggers_hard_stop(mock_redis):
+    watcher = HardStopWatcher()
+    watcher.redis_client = mock_redis
+    watcher._initial_equity = Decimal("10000")
+    user_id = uuid4()
+
+    with patch("app.services.trading.watcher.Session"), patch.object(
+        TradingSafetyManager, "activate_emergency_stop", new_callable=AsyncMock
+    ) as mock_stop:
+        await watcher.handle_event(*_position_event(user_id, "BTC", "1", "10000"))
+        assert await watcher.handle_event(*_price_event(BTC="9600")) is False
+        mock_stop.assert_not_called()
+
+        assert await watcher.handle_event(*_price_event(BTC="9000")) is True
+        mock_stop.assert_called_once()
+
+        # Already stopped: later events do not activate it again
+        mock_redis.get.return_value = "true"
+        assert await watcher.handle_event(*_price_event(BTC="8000")) is True
+        mock_stop.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_events_before_initialization_do_not_trigger(mock_redis):
+    watcher = HardStopWatcher()
+    watcher.redis_client = mock_redis
+
+    with patch.object(TradingSafetyManager, "activate_emergency_stop", new_callable=AsyncMock) as mock_stop:
+        await watcher.handle_event(*_position_event(uuid4(), "BTC", "1", "100"))
+        assert await watcher.handle_event(*_price_event(BTC="1")) is False
+        mock_stop.assert_not_called()
@@ -7,9 +7,11 @@ Tests cover:
 - Safety integration
 - Scheduler functionality
 - Job management
+- Batched tick execution
 """
 from decimal import Decimal
 from typing import Any
+from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
 
 import pytest
@@ -55,6 +57,13 @@ class MockAlgorithm:
         return self._signal
 
 
+class FailingAlgorithm:
+    """Algorithm whose signal generation raises"""
+
+    def generate_signal(self, market_data: dict[str, Any]) -> dict[str, Any]:
+        raise RuntimeError('bad signal')
+
+
 class TestAlgorithmExecutor:
     """Tests for AlgorithmExecutor"""
 
@@ -158,6 +167,48 @@ class TestAlgorithmExecutor:
                 await safety_manager.redis_client.delete("omc:emergency_stop")
                 await safety_manager.disconnect()
 
+    @pytest.mark.asyncio
+    async def test_execute_batch(self):
+        """A batch records its orders with one commit and submits them together"""
+        order_id = uuid4()
+        recorder = MagicMock()
+        recorder.log_trade_attempts.return_value = [order_id]
+        safety_manager = MagicMock()
+        safety_manager.validate_trade = AsyncMock(return_value={'approved': True})
+        executor = AlgorithmExecutor(
+            session=MagicMock(),
+            api_key='test_key',
+            api_secret='test_secret',
+            safety_manager=safety_manager,
+            trade_recorder=recorder,
+        )
+        executor.order_queue = MagicMock(submit_many=AsyncMock())
+        user_id = uuid4()
+        buy = MockAlgorithm({
+            'action': 'buy',
+            'coin_type': 'BTC',
+            'quantity': Decimal('0.5'),
+            'confidence': 0.9
+        })
+
+        results = await executor.execute_batch(
+            [
+                (user_id, uuid4(), MockAlgorithm({'action': 'hold'})),
+                (user_id, uuid4(), FailingAlgorithm()),
+                (user_id, uuid4(), buy),
+            ],
+            {'prices': {'BTC': {'last': 100}}},
+        )
+
+        assert results[0]['reason'] == 'hold_signal'
+        assert results[1] == {'executed': False, 'reason': 'error', 'error': 'bad signal'}
+        assert results[2]['executed'] is True
+        assert results[2]['order_id'] == str(order_id)
+        assert results[2]['validation'] == {'approved': True}
+        recorder.log_trade_attempts.assert_called_once()
+        assert recorder.log_trade_attempts.call_args.args[0][0]['quantity'] == Decimal('0.5')
+        executor.order_queue.submit_many.assert_awaited_once_with([(order_id, user_id, 'BTC')])
+
     def test_get_algorithm_performance_placeholder(
         self,
         algorithm_executor: AlgorithmExecutor
@@ -370,3 +421,60 @@ class TestExecutionScheduler:
         # but the function signature suggests singleton pattern
         assert isinstance(scheduler1, ExecutionScheduler)
         assert isinstance(scheduler2, ExecutionScheduler)
+
+
+class TestExecutionSchedulerBatching:
+    """Tests for ExecutionScheduler tick batching"""
+
+    @pytest.mark.asyncio
+    async def test_algorithms_share_tick_job(self):
+        """Algorithms with one frequency share a job and a market data fetch"""
+        provider = MagicMock(get_data=AsyncMock(return_value={'price': 1}))
+        scheduler = ExecutionScheduler(
+            session=MagicMock(),
+            api_key='test_key',
+            api_secret='test_secret',
+            market_data_provider=provider,
+            batch_ticks=True,
+        )
+        scheduler.executor = MagicMock()
+        scheduler.executor.execute_batch = AsyncMock(
+            side_effect=lambda executions, market_data: [
+                {'executed': True} for _ in executions
+            ]
+        )
+        scheduler.start()
+        try:
+            user_id = uuid4()
+            algorithm_ids = [uuid4() for _ in range(3)]
+            for algorithm_id in algorithm_ids:
+                scheduler.schedule_algorithm(
+                    user_id, algorithm_id, MockAlgorithm({'action': 'hold'}), 'interval:5:minutes'
+                )
+            scheduler.schedule_algorithm(
+                user_id, uuid4(), MockAlgorithm({'action': 'hold'}), 'interval:1:hours'
+            )
+            assert len(scheduler.scheduler.get_jobs()) == 2
+
+            await scheduler._execute_tick_job('interval:5:minutes')
+
+            provider.get_data.assert_awaited_once()
+            executions = scheduler.executor.execute_batch.await_args.args[0]
+            assert [e[1] for e in executions] == algorithm_ids
+            status = scheduler.get_scheduler_status()
+            assert status['ticks']['count'] == 1
+            assert status['ticks']['last']['algorithms'] == 3
+            assert status['ticks']['last']['orders'] == 3
+            assert scheduler._scheduled_algorithms[f"{user_id}_{algorithm_ids[0]}"]['execution_count'] == 1
+
+            # Paused algorithms are skipped, unscheduling the last one drops the job
+            assert scheduler.pause_algorithm(user_id, algorithm_ids[0]) is True
+            await scheduler._execute_tick_job('interval:5:minutes')
+            assert len(scheduler.executor.execute_batch.await_args.args[0]) == 2
+
+            for algorithm_id in algorithm_ids:
+                assert scheduler.unschedule_algorithm(user_id, algorithm_id) is True
+            assert len(scheduler.scheduler.get_jobs()) == 1
+            assert scheduler.unschedule_algorithm(user_id, algorithm_ids[0]) is False
+        finally:
+            scheduler.stop()
@@ -0,0 +1,127 @@
+"""
+Tests for the buffered audit log writer
+
+Tests cover:
+- Background batching of buffered entries
+- Synchronous writes for CRITICAL events
+- Inline writes when the buffer is full
+- Draining on stop and write failures
+"""
+from unittest.mock import MagicMock, patch
+from uuid import uuid4
+
+from sqlmodel import Session, select
+
+from app.core.db import engine
+from app.models import AuditLog, User
+from app.services.trading.audit import AuditLogWriter, get_audit_writer
+
+
+def _recording_engine():
+    """Engine mock that records the rows passed to each INSERT"""
+    batches = []
+    connection = MagicMock()
+    connection.execute.side_effect = lambda stmt, rows: batches.append(list(rows))
+    mock_engine = MagicMock()
+    mock_engine.begin.return_value.__enter__.return_value = connection
+    return mock_engine, batches
+
+
+class TestAuditLogWriter:
+    """Tests for AuditLogWriter"""
+
+    def test_entries_written_in_batches(self):
+        """Buffered entries are inserted in batches of at most batch_size"""
+        mock_engine, batches = _recording_engine()
+        writer = AuditLogWriter(engine=mock_engine, batch_size=100)
+        writer._ensure_started = lambda: None
+
+        for i in range(250):
+            writer.log('TRADE_VALIDATED', {'n': i})
+        assert batches == []
+
+        writer.flush()
+
+        assert [len(b) for b in batches] == [100, 100, 50]
+        assert [row['details']['n'] for b in batches for row in b] == list(range(250))
+        assert writer.stats() == {'buffered': 0, 'written': 250, 'failed': 0}
+
+    def test_background_thread_drains_queue(self):
+        """The writer thread inserts entries and stop() waits for it"""
+        mock_engine, batches = _recording_engine()
+        writer = AuditLogWriter(engine=mock_engine, flush_interval=0.01)
+
+        for i in range(20):
+            writer.log('ALGORITHM_SIGNAL', {'n': i}, severity='INFO')
+        writer.stop()
+
+        assert sum(len(b) for b in batches) == 20
+        assert all(row['severity'] == 'info' for b in batches for row in b)
+        assert writer._thread is None
+
+    def test_critical_written_synchronously(self):
+        """CRITICAL entries are inserted before log() returns"""
+        mock_engine, batches = _recording_engine()
+        writer = AuditLogWriter(engine=mock_engine)
+        writer._ensure_started = lambda: None
+
+        writer.log('EMERGENCY_STOP_ACTIVATED', {}, severity='CRITICAL')
+
+        assert len(batches) == 1
+        assert batches[0][0]['severity'] == 'critical'
+        assert writer.stats()['buffered'] == 0
+
+    def test_full_buffer_written_inline(self):
+        """A full buffer is written by the caller instead of dropping entries"""
+        mock_engine, batches = _recording_engine()
+        writer = AuditLogWriter(engine=mock_engine, max_queue_size=3)
+        writer._ensure_started = lambda: None
+
+        for i in range(4):
+            writer.log('TRADE_VALIDATED', {'n': i})
+
+        assert len(batches) == 1
+        assert {row['details']['n'] for row in batches[0]} == {0, 1, 2, 3}
+        writer.flush()
+        assert writer.stats()['written'] == 4
+
+    def test_write_failure_is_counted(self):
+        """Database errors are logged and counted, not raised"""
+        failing_engine = MagicMock()
+        failing_engine.begin.side_effect = RuntimeError('database down')
+        writer = AuditLogWriter(engine=failing_engine)
+
+        writer.log('EMERGENCY_STOP_CLEARED', {}, severity='critical')
+
+        assert writer.stats()['failed'] == 1
+
+    def test_stop_registered_at_exit_once(self):
+        """Restarting the writer thread does not register stop() again"""
+        mock_engine, _ = _recording_engine()
+        writer = AuditLogWriter(engine=mock_engine, flush_interval=0.01)
+
+        with patch('app.services.trading.audit.atexit.register') as register:
+            for _ in range(3):
+                writer.log('TRADE_VALIDATED', {})
+                writer.stop()
+
+        register.assert_called_once_with(writer.stop)
+
+    def test_rows_persisted(self, session: Session, test_user: User):
+        """Flushed entries are stored as AuditLog rows"""
+        event_type = f'TEST_{uuid4().hex[:8]}'
+        session.commit()
+        writer = AuditLogWriter(engine=engine)
+
+        writer.log(event_type, {'k': 'v'}, user_id=test_user.id)
+        writer.stop()
+
+        row = session.exec(
+            select(AuditLog).where(AuditLog.event_type == event_type)
+        ).one()
+        assert row.details == {'k': 'v'}
+        assert row.user_id == test_user.id
+
+    def test_get_audit_writer_singleton(self):
+        """The process-wide writer is shared"""
+        assert get_audit_writer() is get_audit_writer()
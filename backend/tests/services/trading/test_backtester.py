@@ -4,13 +4,62 @@ import json
 import uuid
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
+import numpy as np
+import pandas as pd
 import pytest
 from sqlmodel import Session
 
 from app.models import Algorithm, BacktestRun, PriceData5Min
-from app.services.trading.backtester import BacktestEngine, generate_features
+from app.services.trading.backtester import (
+    BacktestEngine,
+    generate_features,
+    simulate_long_only,
+    walk_forward_windows,
+)
+from app.services.trading.equity_curve import (
+    EQUITY_CURVE_PREVIEW_POINTS,
+    unpack_equity_curve,
+)
+
+
+def _random_walk(n: int, start: float = 100.0, seed: int = 7) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    last = start * np.cumprod(1 + rng.normal(0, 0.01, n))
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2025-01-01", periods=n, freq="5min", tz="UTC"),
+        "bid": last - 0.5,
+        "ask": last + 0.5,
+        "last": last,
+    })
+
+
+class _RSIModel:
+    """Buys when RSI is low; accepts single rows and batches."""
+
+    def predict(self, features: pd.DataFrame) -> list[float]:
+        return [float(v < 45) for v in features["RSI_14"]]
+
+
+def _assert_same_results(
+    vectorized: tuple[list[dict], list[dict]],
+    iterative: tuple[list[dict], list[dict]],
+) -> None:
+    v_trades, v_equity = vectorized
+    i_trades, i_equity = iterative
+
+    assert len(v_trades) == len(i_trades)
+    for v, i in zip(v_trades, i_trades, strict=True):
+        assert v["timestamp"] == i["timestamp"]
+        assert v["action"] == i["action"]
+        for key in ("price", "quantity", "pnl"):
+            assert v[key] == pytest.approx(i[key], rel=1e-9, abs=1e-9)
+
+    assert [e["timestamp"] for e in v_equity] == [e["timestamp"] for e in i_equity]
+    assert [e["equity"] for e in v_equity] == pytest.approx(
+        [e["equity"] for e in i_equity], rel=1e-9
+    )
 
 
 class TestGenerateFeatures:
@@ -65,7 +114,9 @@ class TestBacktestEngine:
             ))
 
         mock_session.get.return_value = algo
-        mock_session.exec.return_value.all.return_value = prices
+        mock_session.exec.return_value.partitions.return_value = [
+            [(p.timestamp, p.bid, p.ask, p.last) for p in prices]
+        ]
 
         # Mock add/commit/refresh
         mock_session.add = MagicMock()
@@ -94,7 +145,7 @@ class TestBacktestEngine:
             created_by=uuid.uuid4(),
         )
         mock_session.get.return_value = algo
-        mock_session.exec.return_value.all.return_value = []
+        mock_session.exec.return_value.partitions.return_value = []
         mock_session.add = MagicMock()
         mock_session.commit = MagicMock()
         mock_session.refresh = MagicMock()
@@ -160,7 +211,9 @@ class TestBacktestEngine:
             ))
 
         mock_session.get.return_value = algo
-        mock_session.exec.return_value.all.return_value = prices
+        mock_session.exec.return_value.partitions.return_value = [
+            [(p.timestamp, p.bid, p.ask, p.last) for p in prices]
+        ]
         mock_session.add = MagicMock()
         mock_session.commit = MagicMock()
         mock_session.refresh = MagicMock()
@@ -185,3 +238,269 @@ class TestBacktestEngine:
             status="completed",
         )
         assert result.status in ("completed", "failed")
+
+
+class TestEquityCurveStorage:
+    def test_run_packs_full_curve_and_stores_preview(self) -> None:
+        """The blob holds every point; the JSON column holds an LTTB preview."""
+        prices_df = _random_walk(3000)
+        algo = Algorithm(
+            id=uuid.uuid4(),
+            name="Test MA",
+            algorithm_type="rule_based",
+            created_by=uuid.uuid4(),
+            configuration_json=json.dumps({"short_window": 5, "long_window": 20}),
+        )
+        session = MagicMock(spec=Session)
+        session.get.return_value = algo
+        session.exec.return_value.partitions.return_value = [
+            list(prices_df[["timestamp", "bid", "ask", "last"]].itertuples(index=False))
+        ]
+
+        result = BacktestEngine(session).run(
+            algorithm_id=algo.id,
+            coin_type="BTC",
+            start_date=prices_df["timestamp"].iloc[0],
+            end_date=prices_df["timestamp"].iloc[-1],
+            initial_capital=Decimal("10000"),
+            user_id=uuid.uuid4(),
+        )
+
+        assert result.status == "completed", result.error_message
+        timestamps, equity = unpack_equity_curve(result.equity_curve_blob)
+        # Simulation starts once the long moving average is available
+        assert len(equity) == 3000 - 20
+        assert timestamps[-1] == prices_df["timestamp"].iloc[-1].value
+
+        preview = json.loads(result.equity_curve_json)
+        assert len(preview) == EQUITY_CURVE_PREVIEW_POINTS
+        assert preview[0]["equity"] == equity[0]
+        assert preview[-1]["equity"] == equity[-1]
+
+
+class TestVectorizedSimulation:
+    @pytest.mark.parametrize("initial_capital", [10000.0, 150.0])
+    @pytest.mark.parametrize("windows", [(5, 10), (10, 50)])
+    def test_crossover_matches_iterative(
+        self, initial_capital: float, windows: tuple[int, int]
+    ) -> None:
+        """Vectorized MA crossover produces the same trades and equity curve."""
+        short_window, long_window = windows
+        prices = _random_walk(2000)
+        prices["sma_short"] = prices["last"].rolling(short_window, min_periods=1).mean()
+        prices["sma_long"] = prices["last"].rolling(long_window, min_periods=1).mean()
+
+        vectorized = BacktestEngine(MagicMock(), vectorized=True)
+        iterative = BacktestEngine(MagicMock(), vectorized=False)
+
+        result = vectorized._simulate_crossover_vectorized(
+            prices, long_window, initial_capital
+        )
+        _assert_same_results(
+            result,
+            iterative._simulate_crossover_iterative(
+                prices, long_window, initial_capital
+            ),
+        )
+        assert result[0], "expected crossovers in the random walk"
+
+    @pytest.mark.parametrize("initial_capital", [10000.0, 150.0])
+    def test_ml_matches_iterative(self, initial_capital: float) -> None:
+        """Batched predictions produce the same trades and equity curve."""
+        features = generate_features(_random_walk(1500))
+        columns = ["SMA_10", "RSI_14"]
+
+        vectorized = BacktestEngine(MagicMock(), vectorized=True)
+        iterative = BacktestEngine(MagicMock(), vectorized=False)
+
+        _assert_same_results(
+            vectorized._simulate_ml_vectorized(
+                _RSIModel(), None, features, columns, initial_capital
+            ),
+            iterative._simulate_ml_iterative(
+                _RSIModel(), None, features, columns, initial_capital
+            ),
+        )
+
+    def test_ml_batch_predicts_once(self) -> None:
+        """The whole feature matrix is predicted in a single call."""
+        features = generate_features(_random_walk(500))
+        model = MagicMock()
+        model.predict.side_effect = lambda batch: [1] * len(batch)
+
+        engine = BacktestEngine(MagicMock(), vectorized=True)
+        trades, equity_curve = engine._simulate_ml_vectorized(
+            model, None, features, ["SMA_10", "RSI_14"], 10000.0
+        )
+
+        assert model.predict.call_count == 1
+        assert len(equity_curve) == 450
+        assert [t["action"] for t in trades] == ["buy"]
+
+    def test_blocked_entry_waits_for_next_signal(self) -> None:
+        """A buy signal is skipped when cash does not cover the price."""
+        prices = np.array([100.0, 50.0, 60.0, 200.0, 110.0])
+        trades, equity_curve = simulate_long_only(
+            pd.Series(pd.date_range("2025-01-01", periods=5, freq="5min")),
+            prices,
+            np.array([False, True, False, True, True]),
+            np.array([False, False, True, False, False]),
+            initial_capital=100.0,
+        )
+
+        # Buy 2 @ 50, sell @ 60 -> 120 cash, which cannot buy @ 200 but can @ 110
+        assert [(t["action"], t["price"]) for t in trades] == [
+            ("buy", 50.0),
+            ("sell", 60.0),
+            ("buy", 110.0),
+        ]
+        assert trades[1]["pnl"] == pytest.approx(20.0)
+        assert [e["equity"] for e in equity_curve] == pytest.approx(
+            [100.0, 100.0, 120.0, 120.0, 120.0]
+        )
+
+
+class TestWalkForward:
+    @pytest.fixture
+    def mock_session(self) -> MagicMock:
+        prices = _random_walk(3 * 288, seed=11)
+        session = MagicMock(spec=Session)
+        session.exec.return_value.partitions.return_value = [
+            list(
+                zip(
+                    prices["timestamp"].dt.to_pydatetime(),
+                    prices["bid"],
+                    prices["ask"],
+                    prices["last"],
+                    strict=True,
+                )
+            )
+        ]
+        return session
+
+    def test_windows(self) -> None:
+        """Windows roll by step and never run past the end date."""
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        windows = walk_forward_windows(
+            start, start + timedelta(days=10), timedelta(days=3), timedelta(days=2)
+        )
+
+        assert len(windows) == 3
+        assert windows[0] == (
+            start,
+            start + timedelta(days=3),
+            start + timedelta(days=5),
+        )
+        assert windows[-1][2] == start + timedelta(days=9)
+
+        with pytest.raises(ValueError):
+            walk_forward_windows(
+                start, start + timedelta(days=1), timedelta(days=3), timedelta(days=2)
+            )
+
+    @pytest.mark.parametrize("max_workers", [1, 4])
+    def test_ml_walk_forward_predicts_once(
+        self, mock_session: MagicMock, max_workers: int
+    ) -> None:
+        """Features and predictions are computed once and sliced per window."""
+        algo = Algorithm(
+            id=uuid.uuid4(),
+            name="ML Model",
+            algorithm_type="ml_model",
+            artifact_id=uuid.uuid4(),
+            created_by=uuid.uuid4(),
+        )
+        mock_session.get.return_value = algo
+        model = MagicMock()
+        model.predict.side_effect = _RSIModel().predict
+
+        engine = BacktestEngine(mock_session)
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        with patch(
+            "app.services.trading.backtester.generate_features",
+            wraps=generate_features,
+        ) as features_spy, patch.object(
+            BacktestEngine,
+            "_prepare_ml",
+            lambda self, algorithm, prices_df: (
+                model,
+                None,
+                features_spy(prices_df),
+                ["SMA_10", "RSI_14"],
+            ),
+        ):
+            result = engine.run_walk_forward(
+                algorithm_id=algo.id,
+                coin_type="BTC",
+                start_date=start,
+                end_date=start + timedelta(days=3),
+                initial_capital=Decimal("10000"),
+                user_id=uuid.uuid4(),
+                train_window=timedelta(hours=12),
+                test_window=timedelta(hours=6),
+                max_workers=max_workers,
+            )
+
+        assert result.status == "completed", result.error_message
+        assert features_spy.call_count == 1
+        assert model.predict.call_count == 1
+
+        results = json.loads(result.results_json)
+        assert results["mode"] == "walk_forward"
+        assert len(results["windows"]) == 10
+        assert results["aggregate"]["num_windows"] == 10
+        assert "walk_forward_efficiency" in results["aggregate"]
+
+        equity_curve = json.loads(result.equity_curve_json)
+        # Each 6-hour test window holds 72 five-minute candles
+        assert len(equity_curve) == 10 * 72
+        assert {point["window"] for point in equity_curve} == set(range(10))
+
+        timestamps, equity = unpack_equity_curve(result.equity_curve_blob)
+        assert len(equity) == 10 * 72
+        assert equity.tolist() == pytest.approx([p["equity"] for p in equity_curve])
+
+    def test_rule_based_window_matches_standalone_run(
+        self, mock_session: MagicMock
+    ) -> None:
+        """A test window equals a standalone simulation over the same rows."""
+        algo = Algorithm(
+            id=uuid.uuid4(),
+            name="MA",
+            algorithm_type="rule_based",
+            created_by=uuid.uuid4(),
+            configuration_json=json.dumps({"short_window": 5, "long_window": 20}),
+        )
+        mock_session.get.return_value = algo
+        start = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+        result = BacktestEngine(mock_session).run_walk_forward(
+            algorithm_id=algo.id,
+            coin_type="BTC",
+            start_date=start,
+            end_date=start + timedelta(days=3),
+            initial_capital=Decimal("10000"),
+            user_id=uuid.uuid4(),
+            train_window=timedelta(days=1),
+            test_window=timedelta(days=1),
+        )
+        assert result.status == "completed", result.error_message
+
+        # Window 1 tests day 3 with the full history before it
+        prices = _random_walk(3 * 288, seed=11)
+        prices["sma_short"] = prices["last"].rolling(5, min_periods=1).mean()
+        prices["sma_long"] = prices["last"].rolling(20, min_periods=1).mean()
+        expected_trades, expected_equity = BacktestEngine(
+            MagicMock(), vectorized=False
+        )._simulate_crossover_iterative(prices, 2 * 288, 10000.0)
+
+        equity_curve = [
+            p for p in json.loads(result.equity_curve_json) if p["window"] == 1
+        ]
+        trades = [t for t in json.loads(result.trade_log_json) if t["window"] == 1]
+        assert [p["equity"] for p in equity_curve] == pytest.approx(
+            [p["equity"] for p in expected_equity]
+        )
+        assert [t["timestamp"] for t in trades] == [
+            t["timestamp"] for t in expected_trades
+        ]
@@ -0,0 +1,118 @@
+"""Tests for compact equity curve storage and LTTB downsampling."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.trading.equity_curve import (
+    downsample_equity_curve,
+    lttb_indices,
+    pack_equity_curve,
+    unpack_equity_curve,
+)
+
+
+def _curve(n: int) -> tuple[pd.DatetimeIndex, np.ndarray]:
+    rng = np.random.default_rng(3)
+    timestamps = pd.date_range("2025-01-01", periods=n, freq="5min", tz="UTC")
+    return timestamps, 10000 * np.cumprod(1 + rng.normal(0, 0.001, n))
+
+
+class TestPackEquityCurve:
+    def test_round_trip(self) -> None:
+        """Timestamps and equity survive packing exactly."""
+        timestamps, equity = _curve(5000)
+
+        unpacked_ts, unpacked_equity = unpack_equity_curve(
+            pack_equity_curve(timestamps, equity)
+        )
+
+        assert np.array_equal(unpacked_ts, timestamps.asi8)
+        assert np.array_equal(unpacked_equity, equity)
+
+    def test_accepts_timestamp_strings(self) -> None:
+        """String timestamps from the simulation dicts are parsed as UTC."""
+        timestamps, equity = _curve(10)
+
+        unpacked_ts, _ = unpack_equity_curve(
+            pack_equity_curve([str(ts) for ts in timestamps], equity)
+        )
+
+        assert np.array_equal(unpacked_ts, timestamps.asi8)
+
+    def test_smaller_than_json(self) -> None:
+        """A regular 5-minute curve packs far smaller than its JSON form."""
+        timestamps, equity = _curve(10000)
+        json_size = len(
+            str(
+                [
+                    {"timestamp": str(t), "equity": v}
+                    for t, v in zip(timestamps, equity, strict=True)
+                ]
+            )
+        )
+
+        assert len(pack_equity_curve(timestamps, equity)) < json_size / 5
+
+    def test_empty_curve(self) -> None:
+        """An empty curve round-trips to empty arrays."""
+        timestamps, equity = unpack_equity_curve(pack_equity_curve([], []))
+
+        assert len(timestamps) == 0
+        assert len(equity) == 0
+
+    def test_rejects_foreign_blob(self) -> None:
+        """Blobs without the header are rejected."""
+        with pytest.raises(ValueError):
+            unpack_equity_curve(b"not an equity curve")
+
+    def test_rejects_length_mismatch(self) -> None:
+        """Timestamps and equity must have the same length."""
+        timestamps, equity = _curve(10)
+
+        with pytest.raises(ValueError):
+            pack_equity_curve(timestamps, equity[:-1])
+
+
+class TestLTTB:
+    def test_keeps_endpoints_and_count(self) -> None:
+        """Exactly `points` sorted indices, including the first and last."""
+        _, equity = _curve(10000)
+
+        indices = lttb_indices(np.arange(10000.0), equity, 500)
+
+        assert len(indices) == 500
+        assert indices[0] == 0
+        assert indices[-1] == 9999
+        assert np.all(np.diff(indices) > 0)
+
+    def test_keeps_spike(self) -> None:
+        """A single outlier survives downsampling."""
+        y = np.zeros(1000)
+        y[617] = 50.0
+
+        indices = lttb_indices(np.arange(1000.0), y, 20)
+
+        assert 617 in indices
+
+    def test_short_series_unchanged(self) -> None:
+        """Series no longer than `points` are returned whole."""
+        assert lttb_indices(np.arange(5.0), np.arange(5.0), 10).tolist() == [
+            0,
+            1,
+            2,
+            3,
+            4,
+        ]
+
+    def test_downsample_points(self) -> None:
+        """Downsampled points carry string timestamps and float equity."""
+        timestamps, equity = _curve(2000)
+
+        points = downsample_equity_curve(
+            timestamps.asi8, equity, 100, time_key="time", value_key="value"
+        )
+
+        assert len(points) == 100
+        assert points[0] == {"time": str(timestamps[0]), "value": equity[0]}
+        assert points[-1]["time"] == str(timestamps[-1])
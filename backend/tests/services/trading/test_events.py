@@ -0,0 +1,77 @@
+"""
+Tests for the trading event publisher
+
+Tests cover:
+- Price and position payloads
+- Redis failures never reaching the caller
+- Disabled publishers dropping events
+"""
+import json
+from datetime import datetime, timezone
+from decimal import Decimal
+from unittest.mock import AsyncMock
+from uuid import uuid4
+
+import pytest
+
+from app.services.trading.events import (
+    POSITION_CHANNEL,
+    PRICE_CHANNEL,
+    TradingEventPublisher,
+)
+
+
+class TestTradingEventPublisher:
+    """Tests for TradingEventPublisher"""
+
+    @pytest.mark.asyncio
+    async def test_publish_payloads(self):
+        """Prices and positions are published as JSON with string decimals"""
+        publisher = TradingEventPublisher()
+        publisher.redis_client = AsyncMock()
+        observed_at = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        user_id = uuid4()
+
+        await publisher.publish_prices({'btc': Decimal('100.5')}, observed_at)
+        await publisher.publish_prices({}, observed_at)  # Nothing to publish
+        await publisher.publish_position(user_id, 'btc', Decimal('0'), Decimal('90'))
+
+        calls = publisher.redis_client.publish.await_args_list
+        assert len(calls) == 2
+        assert calls[0].args[0] == PRICE_CHANNEL
+        assert json.loads(calls[0].args[1]) == {
+            'prices': {'btc': '100.5'},
+            'timestamp': observed_at.isoformat(),
+        }
+        assert calls[1].args[0] == POSITION_CHANNEL
+        assert json.loads(calls[1].args[1]) == {
+            'user_id': str(user_id),
+            'coin_type': 'btc',
+            'quantity': '0',
+            'average_price': '90',
+        }
+        assert publisher.published == 2
+
+    @pytest.mark.asyncio
+    async def test_publish_failure_is_swallowed(self):
+        """A Redis error is counted and publishing pauses before reconnecting"""
+        publisher = TradingEventPublisher()
+        client = publisher.redis_client = AsyncMock()
+        client.publish.side_effect = ConnectionError('down')
+
+        await publisher.publish_position(uuid4(), 'eth', Decimal('1'), Decimal('2'))
+        await publisher.publish_position(uuid4(), 'eth', Decimal('1'), Decimal('2'))
+
+        assert publisher.failed == 2
+        assert publisher.redis_client is None
+        assert client.publish.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_disabled_publisher_drops_events(self):
+        """A disabled publisher never connects or publishes"""
+        publisher = TradingEventPublisher(enabled=False)
+
+        await publisher.publish_position(uuid4(), 'eth', Decimal('1'), Decimal('2'))
+
+        assert publisher.redis_client is None
+        assert publisher.published == 0
@@ -1,15 +1,20 @@
 """
 Tests for Order Executor
 """
+import asyncio
+from collections import defaultdict
 from datetime import datetime, timezone
 from decimal import Decimal
 from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 import pytest
+from sqlmodel import Session, select
 
-from app.models import Order, Position
+from app.models import Order, Position, User
 from app.services.trading.executor import OrderExecutor, OrderQueue, get_order_queue
+from app.services.trading.paper_exchange import PaperExchange
+from app.services.trading.safety import TradingSafetyManager
 
 
 class TestOrderExecutor:
@@ -29,13 +34,18 @@ class TestOrderExecutor:
     @pytest.fixture
     def executor(self, mock_session):
         """Create an order executor instance"""
-        return OrderExecutor(
-            session=mock_session,
-            api_key='test_key',
-            api_secret='test_secret',
-            max_retries=3,
-            retry_delay=0.1  # Fast retry for tests
-        )
+        # Safety checks load a risk snapshot the mock session cannot provide;
+        # they are covered by test_safety.py
+        with patch.object(
+            TradingSafetyManager, 'validate_trade', new_callable=AsyncMock
+        ):
+            yield OrderExecutor(
+                session=mock_session,
+                api_key='test_key',
+                api_secret='test_secret',
+                max_retries=3,
+                retry_delay=0.1  # Fast retry for tests
+            )
 
     @pytest.fixture
     def sample_order(self):
@@ -208,6 +218,207 @@ class TestOrderExecutor:
             assert not mock_trade.called
 
 
+class _SlowPaperExchange(PaperExchange):
+    """PaperExchange with a simulated round trip that records concurrency"""
+
+    def __init__(self, latency: float):
+        super().__init__(initial_aud_balance=Decimal('10000000'))
+        self.latency = latency
+        self.in_flight: dict[str, int] = defaultdict(int)
+        self.max_in_flight = 0
+        self.max_in_flight_per_lane = 0
+        self.fill_order: dict[str, list[Decimal]] = defaultdict(list)
+
+    async def market_buy(self, coin_type, amount_aud):
+        # coin_type is prefixed with the user so lanes are distinguishable
+        self.in_flight[coin_type] += 1
+        self.max_in_flight = max(self.max_in_flight, sum(self.in_flight.values()))
+        self.max_in_flight_per_lane = max(
+            self.max_in_flight_per_lane, self.in_flight[coin_type]
+        )
+        try:
+            await asyncio.sleep(self.latency)
+            self.fill_order[coin_type].append(amount_aud)
+            return await super().market_buy(coin_type, amount_aud)
+        finally:
+            self.in_flight[coin_type] -= 1
+
+
+class TestConcurrentExecution:
+    """Load test of the lane-sharded worker pool against PaperExchange"""
+
+    @pytest.mark.asyncio
+    async def test_load_preserves_per_lane_order(self):
+        """Hundreds of orders run in parallel across lanes, serially within one"""
+        users = [uuid4() for _ in range(20)]
+        coins = ['BTC', 'ETH', 'SOL', 'XRP', 'ADA']
+        orders = {}
+        expected = defaultdict(list)
+        for sequence in range(400):
+            user_id = users[sequence % len(users)]
+            coin = coins[(sequence // len(users)) % len(coins)]
+            order = Order(
+                id=uuid4(),
+                user_id=user_id,
+                coin_type=f'{user_id.hex[:6]}-{coin}',
+                side='buy',
+                order_type='market',
+                quantity=Decimal(sequence + 1),
+                filled_quantity=Decimal('0'),
+                status='pending',
+                created_at=datetime.now(timezone.utc),
+                updated_at=datetime.now(timezone.utc),
+            )
+            orders[order.id] = order
+            expected[order.coin_type].append(order.quantity)
+
+        session = MagicMock()
+        session.__enter__.return_value = session
+        session.get.side_effect = lambda model, order_id: orders.get(order_id)
+        session.exec.return_value.first.return_value = None
+
+        exchange = _SlowPaperExchange(latency=0.005)
+        executor = OrderExecutor(
+            session=session,
+            api_key='test_key',
+            api_secret='test_secret',
+            max_concurrency=16,
+        )
+        executor.safety_manager = MagicMock()
+        executor.safety_manager.connect = AsyncMock()
+        executor.safety_manager.disconnect = AsyncMock()
+        executor.safety_manager.validate_trade = AsyncMock()
+        executor.safety_manager.bind.return_value = executor.safety_manager
+
+        with patch('app.services.trading.executor.settings') as mock_settings, patch(
+            'app.services.trading.executor.PaperExchange', return_value=exchange
+        ), patch(
+            'app.services.trading.executor.Session', return_value=session
+        ), patch('app.services.trading.executor.PnLLedger'), patch(
+            'app.services.trading.executor.manager.broadcast_json',
+            new_callable=AsyncMock,
+        ):
+            mock_settings.TRADING_MODE = 'paper'
+            for order in orders.values():
+                await executor.submit_order(order.id, order.user_id, order.coin_type)
+            assert executor.stats()['queue_depth'] == 400
+
+            worker_task = asyncio.create_task(executor.start())
+            await asyncio.wait_for(executor.stop(), timeout=30)
+            await asyncio.wait_for(worker_task, timeout=5)
+
+        assert all(order.status == 'filled' for order in orders.values())
+        assert dict(exchange.fill_order) == dict(expected)
+        assert exchange.max_in_flight_per_lane == 1
+        assert 1 < exchange.max_in_flight <= 16
+
+        stats = executor.stats()
+        assert stats['processed'] == 400
+        assert stats['queue_depth'] == 0
+        assert stats['lanes'] == 0
+        assert stats['execution_ms']['p50'] >= 5
+
+    @pytest.mark.asyncio
+    async def test_database_error_stays_in_its_lane(
+        self, session: Session, test_user: User
+    ):
+        """A failed statement in one lane does not break orders in the others"""
+        other_user = User(
+            id=uuid4(),
+            email=f'{uuid4()}@test.com',
+            hashed_password='test_hash',
+            is_active=True,
+            is_superuser=False,
+        )
+        session.add(other_user)
+        orders = [
+            Order(
+                user_id=user.id,
+                coin_type='BTC',
+                side='buy',
+                order_type='market',
+                quantity=Decimal('100'),
+                filled_quantity=Decimal('0'),
+                status='pending',
+            )
+            for _ in range(3)
+            for user in (test_user, other_user)
+        ]
+        session.add_all(orders)
+        session.commit()
+
+        async def execute_trade(order):
+            await asyncio.sleep(0.01)
+            # Overflows Order.filled_quantity for the first user's orders
+            amount = '1e12' if order.user_id == test_user.id else '0.001'
+            return {'id': str(order.id), 'rate': '100000', 'amount': amount}
+
+        safety_manager = MagicMock()
+        safety_manager.connect = AsyncMock()
+        safety_manager.disconnect = AsyncMock()
+        safety_manager.validate_trade = AsyncMock()
+        safety_manager.bind.return_value = safety_manager
+        publisher = MagicMock(publish_position=AsyncMock())
+        executor = OrderExecutor(
+            session=session,
+            api_key='key',
+            api_secret='secret',
+            max_concurrency=2,
+            safety_manager=safety_manager,
+            event_publisher=publisher,
+        )
+
+        with patch('app.services.trading.executor.settings') as mock_settings, patch.object(
+            executor, '_execute_trade', side_effect=execute_trade
+        ), patch(
+            'app.services.trading.executor.manager.broadcast_json',
+            new_callable=AsyncMock,
+        ):
+            mock_settings.TRADING_MODE = 'live'
+            await executor.submit_orders(
+                [(order.id, order.user_id, order.coin_type) for order in orders]
+            )
+            worker_task = asyncio.create_task(executor.start())
+            await asyncio.wait_for(executor.stop(), timeout=10)
+            await asyncio.wait_for(worker_task, timeout=5)
+
+        session.expire_all()
+        statuses = {
+            user.id: {order.status for order in orders if order.user_id == user.id}
+            for user in (test_user, other_user)
+        }
+        assert statuses == {test_user.id: {'failed'}, other_user.id: {'filled'}}
+        position = session.exec(
+            select(Position).where(Position.user_id == other_user.id)
+        ).one()
+        assert position.quantity == Decimal('0.003')
+        assert publisher.publish_position.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_submit_looks_up_lane(self):
+        """Orders submitted by id alone share the lane of their user and coin"""
+        order = Order(
+            id=uuid4(),
+            user_id=uuid4(),
+            coin_type='BTC',
+            side='buy',
+            order_type='market',
+            quantity=Decimal('10'),
+        )
+        session = MagicMock()
+        session.get.return_value = order
+        executor = OrderExecutor(
+            session=session, api_key='key', api_secret='secret', max_concurrency=4
+        )
+
+        await executor.submit_order(order.id)
+        await executor.submit_order(order.id, order.user_id, 'BTC')
+
+        assert executor.queue.qsize() == 1
+        assert executor.stats()['lanes'] == 1
+        assert executor.stats()['queue_depth'] == 2
+
+
 class TestOrderQueue:
     """Test suite for OrderQueue singleton"""
 
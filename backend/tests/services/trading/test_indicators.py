@@ -0,0 +1,213 @@
+"""
+Tests for the shared rolling indicators
+
+Tests cover:
+- SMA, EMA and RSI matching direct recomputation
+- Replacing the close of the current bar
+- Sharing one indicator between strategies, updated once per bar
+- Backfilling late subscriptions and seeding from PriceData5Min
+- MACrossoverStrategy signals on the shared moving averages
+"""
+import random
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+from sqlmodel import Session
+
+from app.models import PriceData5Min
+from app.services.trading.indicators import (
+    IndicatorService,
+    RollingEMA,
+    RollingRSI,
+    RollingSMA,
+)
+from app.services.trading.strategies.ma_crossover import MACrossoverStrategy
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _prices(count, seed=3):
+    rng = random.Random(seed)
+    return [Decimal(rng.randrange(9000, 11000)) / 100 for _ in range(count)]
+
+
+def _ema(prices, window):
+    alpha = Decimal(2) / (window + 1)
+    value = sum(prices[:window]) / window
+    for price in prices[window:]:
+        value += alpha * (price - value)
+    return value
+
+
+def _rsi(prices, window):
+    changes = [b - a for a, b in zip(prices[:-1], prices[1:], strict=True)]
+    gains = [max(c, Decimal(0)) for c in changes]
+    losses = [max(-c, Decimal(0)) for c in changes]
+    avg_gain = sum(gains[:window]) / window
+    avg_loss = sum(losses[:window]) / window
+    for gain, loss in zip(gains[window:], losses[window:], strict=True):
+        avg_gain = (avg_gain * (window - 1) + gain) / window
+        avg_loss = (avg_loss * (window - 1) + loss) / window
+    return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+def _bar(i):
+    return START + timedelta(minutes=5 * i)
+
+
+class TestRollingIndicators:
+    """Tests for the rolling indicator primitives"""
+
+    def test_sma_matches_window_mean(self):
+        """The running sum equals the mean of the last window prices"""
+        prices = _prices(60)
+        sma = RollingSMA(10)
+
+        for i, price in enumerate(prices):
+            sma.push(price)
+            if i < 9:
+                assert sma.value is None
+            else:
+                assert sma.value == sum(prices[i - 9 : i + 1]) / 10
+
+    def test_ema_matches_recomputation(self):
+        """EMA is seeded with the first window's SMA"""
+        prices = _prices(40)
+        ema = RollingEMA(10)
+        for price in prices:
+            ema.push(price)
+
+        assert ema.value == _ema(prices, 10)
+
+    def test_rsi_matches_wilder(self):
+        """RSI uses Wilder's smoothing of gains and losses"""
+        prices = _prices(50)
+        rsi = RollingRSI(14)
+        for price in prices[:14]:
+            rsi.push(price)
+        assert rsi.value is None
+
+        for price in prices[14:]:
+            rsi.push(price)
+
+        assert rsi.value == _rsi(prices, 14)
+
+    def test_rsi_without_losses(self):
+        """A window of only gains is 100, a flat window is 50"""
+        rising, flat = RollingRSI(3), RollingRSI(3)
+        for i in range(4):
+            rising.push(Decimal(100 + i))
+            flat.push(Decimal('100'))
+
+        assert rising.value == Decimal('100')
+        assert flat.value == Decimal('50')
+
+    @pytest.mark.parametrize('indicator', [RollingSMA, RollingEMA, RollingRSI])
+    def test_replace_last(self, indicator):
+        """Replacing the last price equals having pushed the new price"""
+        prices = _prices(30)
+        replaced, direct = indicator(5), indicator(5)
+        for price in prices[:-1]:
+            replaced.push(price)
+            direct.push(price)
+        replaced.push(Decimal('1'))
+
+        replaced.replace_last(prices[-1])
+        direct.push(prices[-1])
+
+        assert replaced.value == direct.value
+
+
+class TestIndicatorService:
+    """Tests for IndicatorService"""
+
+    def test_same_bar_replaces_close(self):
+        """Several updates within one bar count as a single price"""
+        service = IndicatorService()
+        service.subscribe('BTC', 'sma', 2)
+
+        service.update('BTC', Decimal('100'), _bar(0))
+        service.update('BTC', Decimal('200'), _bar(1))
+        service.update('BTC', Decimal('300'), _bar(1) + timedelta(minutes=2))
+        service.update('BTC', Decimal('999'), _bar(0))  # Stale, ignored
+
+        assert service.get('BTC', 'sma', 2) == Decimal('200')
+
+    def test_strategies_share_indicators(self):
+        """Strategies on one coin read the same state, updated once per bar"""
+        service = IndicatorService()
+        first = MACrossoverStrategy(2, 3, 'BTC', indicators=service)
+        second = MACrossoverStrategy(2, 3, 'BTC', indicators=service)
+
+        for i, price in enumerate(('100', '100', '100', '130')):
+            data = {'BTC': {'price': Decimal(price)}, 'timestamp': _bar(i).isoformat()}
+            first.generate_signal(data)
+            signal = second.generate_signal(data)
+
+        assert service.stats()['indicators'] == 2
+        assert service.get('BTC', 'sma', 3) == Decimal('110')
+        assert signal['action'] == 'buy'
+
+    def test_late_subscription_backfilled(self):
+        """New indicators start from the closes already seen"""
+        service = IndicatorService()
+        service.subscribe('ETH', 'sma', 3)
+        for i, price in enumerate(_prices(5)):
+            service.update('ETH', price, _bar(i))
+
+        service.subscribe('ETH', 'ema', 3)
+
+        assert service.get('ETH', 'ema', 3) == _ema(_prices(5)[-4:], 3)
+
+    def test_unknown_indicator(self):
+        """Only supported indicators and positive windows are accepted"""
+        service = IndicatorService()
+        with pytest.raises(ValueError):
+            service.subscribe('BTC', 'macd', 10)
+        with pytest.raises(ValueError):
+            service.subscribe('BTC', 'sma', 0)
+
+    def test_seed_from_history(self, session: Session):
+        """Windows are filled from the latest stored prices before a time"""
+        prices = _prices(10)
+        for i, price in enumerate(prices):
+            session.add(
+                PriceData5Min(
+                    timestamp=_bar(i),
+                    coin_type='SOL',
+                    bid=price,
+                    ask=price,
+                    last=price,
+                )
+            )
+        session.commit()
+        service = IndicatorService()
+        service.subscribe('SOL', 'sma', 3)
+        service.update('SOL', Decimal('1'), _bar(0))
+
+        loaded = service.seed_from_history(session, before=_bar(8))
+
+        assert loaded == 4
+        assert service.get('SOL', 'sma', 3) == sum(prices[5:8]) / 3
+
+
+class TestMACrossoverStrategy:
+    """Tests for MACrossoverStrategy on shared indicators"""
+
+    def test_signals_match_list_implementation(self):
+        """Signals are identical to re-summing a list of prices"""
+        prices = _prices(80)
+        strategy = MACrossoverStrategy(5, 20, 'BTC', indicators=IndicatorService())
+
+        for i, price in enumerate(prices):
+            signal = strategy.generate_signal(
+                {'BTC': {'price': price}, 'timestamp': _bar(i).isoformat()}
+            )
+            window = prices[max(0, i - 19) : i + 1]
+            if len(window) < 20:
+                assert signal['action'] == 'hold'
+            elif sum(window[-5:]) / 5 > sum(window) / 20:
+                assert signal['action'] == 'buy'
+            else:
+                assert signal['action'] == 'sell'
@@ -0,0 +1,207 @@
+"""
+Tests for the FIFO P&L lot ledger
+
+Tests cover:
+- FIFO matching across partial lots
+- Incremental sync of new fills
+- Rebuild when a fill is backfilled behind the watermark
+- Per-algorithm books
+- Ledger updates from TradeRecorder.record_success
+- Concurrent syncs from separate sessions
+"""
+import threading
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import patch
+from uuid import uuid4
+
+import pytest
+from sqlmodel import Session, select
+
+from app.core.db import engine
+from app.models import Order, PnLLedgerState, PnLLot, User
+from app.services.trading.ledger import PnLLedger
+from app.services.trading.recorder import TradeRecorder
+
+
+def _fill(
+    session: Session,
+    user: User,
+    side: str,
+    quantity: str,
+    price: str,
+    filled_at: datetime,
+    coin_type: str = "BTC",
+    algorithm_id=None,
+) -> Order:
+    order = Order(
+        user_id=user.id,
+        algorithm_id=algorithm_id,
+        coin_type=coin_type,
+        side=side,
+        quantity=Decimal(quantity),
+        price=Decimal(price),
+        filled_quantity=Decimal(quantity),
+        status="filled",
+        filled_at=filled_at,
+    )
+    session.add(order)
+    session.commit()
+    return order
+
+
+@pytest.fixture
+def ledger(session: Session) -> PnLLedger:
+    """Create a ledger instance for testing"""
+    return PnLLedger(session=session)
+
+
+class TestPnLLedger:
+    """Tests for PnLLedger"""
+
+    def test_fifo_matching_across_lots(
+        self, ledger: PnLLedger, test_user: User, session: Session
+    ):
+        """Sells consume the oldest lots first, splitting lots as needed"""
+        t0 = datetime.now(timezone.utc) - timedelta(days=1)
+        _fill(session, test_user, "buy", "1.0", "100", t0)
+        _fill(session, test_user, "buy", "1.0", "200", t0 + timedelta(hours=1))
+        _fill(session, test_user, "sell", "1.5", "300", t0 + timedelta(hours=2))
+
+        assert ledger.sync(test_user.id) == 3
+
+        # 1.0 * (300 - 100) + 0.5 * (300 - 200)
+        assert ledger.realized_pnl(test_user.id) == Decimal("250")
+
+        open_lots = session.exec(
+            select(PnLLot).where(
+                PnLLot.user_id == test_user.id,
+                PnLLot.book == "user",
+                PnLLot.remaining_quantity > 0,
+            )
+        ).all()
+        assert len(open_lots) == 1
+        assert open_lots[0].remaining_quantity == Decimal("0.5")
+
+    def test_incremental_sync(
+        self, ledger: PnLLedger, test_user: User, session: Session
+    ):
+        """Only fills newer than the watermark are applied"""
+        t0 = datetime.now(timezone.utc) - timedelta(days=1)
+        _fill(session, test_user, "buy", "2.0", "100", t0)
+        assert ledger.sync(test_user.id) == 1
+
+        _fill(session, test_user, "sell", "1.0", "150", t0 + timedelta(hours=1))
+        assert ledger.sync(test_user.id) == 1
+        assert ledger.sync(test_user.id) == 0
+
+        state = session.get(PnLLedgerState, test_user.id)
+        assert state.applied_orders == 2
+        assert ledger.realized_pnl(test_user.id) == Decimal("50")
+
+    def test_backfilled_fill_triggers_rebuild(
+        self, ledger: PnLLedger, test_user: User, session: Session
+    ):
+        """A fill older than the watermark rebuilds the ledger in FIFO order"""
+        t0 = datetime.now(timezone.utc) - timedelta(days=1)
+        _fill(session, test_user, "buy", "1.0", "200", t0 + timedelta(hours=1))
+        _fill(session, test_user, "sell", "1.0", "300", t0 + timedelta(hours=2))
+        ledger.sync(test_user.id)
+        assert ledger.realized_pnl(test_user.id) == Decimal("100")
+
+        # Older, cheaper buy arrives late and must be matched first
+        _fill(session, test_user, "buy", "1.0", "100", t0)
+        assert ledger.sync(test_user.id) == 3
+        assert ledger.realized_pnl(test_user.id) == Decimal("200")
+
+    def test_window_and_algorithm_books(
+        self, ledger: PnLLedger, test_user: User, session: Session
+    ):
+        """Algorithm books only match fills from the same algorithm"""
+        algo = uuid4()
+        t0 = datetime.now(timezone.utc) - timedelta(days=2)
+        _fill(session, test_user, "buy", "1.0", "100", t0)
+        _fill(session, test_user, "buy", "1.0", "150", t0 + timedelta(hours=1), algorithm_id=algo)
+        _fill(session, test_user, "sell", "1.0", "200", t0 + timedelta(days=1), algorithm_id=algo)
+        ledger.sync(test_user.id)
+
+        # User book matches the manual buy at 100, the algorithm book its own buy at 150
+        assert ledger.realized_pnl(test_user.id) == Decimal("100")
+        assert ledger.realized_pnl(test_user.id, algorithm_id=algo) == Decimal("50")
+
+        # Window excludes the sell
+        assert ledger.realized_pnl(
+            test_user.id, end_date=t0 + timedelta(hours=12)
+        ) == Decimal("0")
+
+    def test_record_success_updates_ledger(
+        self, test_user: User, session: Session
+    ):
+        """Recording a fill applies it to the ledger immediately"""
+        recorder = TradeRecorder(session=session)
+
+        buy = recorder.log_trade_attempt(
+            user_id=test_user.id, coin_type="ETH", side="buy", quantity=Decimal("2")
+        )
+        recorder.record_success(buy.id, "CS1", Decimal("2"), Decimal("3000"))
+
+        sell = recorder.log_trade_attempt(
+            user_id=test_user.id, coin_type="ETH", side="sell", quantity=Decimal("2")
+        )
+        recorder.record_success(sell.id, "CS2", Decimal("2"), Decimal("3100"))
+
+        state = session.get(PnLLedgerState, test_user.id)
+        assert state.applied_orders == 2
+        assert state.last_order_id == sell.id
+        assert recorder.ledger.realized_pnl(test_user.id) == Decimal("200")
+
+    def test_concurrent_syncs_apply_fills_once(
+        self, test_user: User, session: Session
+    ):
+        """Two sessions syncing at once apply each fill exactly once"""
+        apply = PnLLedger._apply
+
+        def race():
+            # Without the lock both syncs meet here and apply the same fills;
+            # with it the second waits for the first and the barrier times out
+            barrier = threading.Barrier(2, timeout=1)
+
+            def racing_apply(self, *args, **kwargs):
+                try:
+                    barrier.wait()
+                except threading.BrokenBarrierError:
+                    pass
+                apply(self, *args, **kwargs)
+
+            errors = []
+
+            def sync():
+                try:
+                    with Session(engine) as own_session:
+                        PnLLedger(own_session).sync(test_user.id)
+                except Exception as e:
+                    errors.append(e)
+
+            with patch.object(PnLLedger, "_apply", racing_apply):
+                threads = [threading.Thread(target=sync) for _ in range(2)]
+                for thread in threads:
+                    thread.start()
+                for thread in threads:
+                    thread.join()
+            assert errors == []
+            session.expire_all()
+
+        t0 = datetime.now(timezone.utc) - timedelta(days=1)
+        _fill(session, test_user, "buy", "2.0", "100", t0)
+        _fill(session, test_user, "sell", "1.0", "300", t0 + timedelta(hours=1))
+
+        # First sync of the user (creates the watermark)
+        race()
+        assert session.get(PnLLedgerState, test_user.id).applied_orders == 2
+        assert PnLLedger(session).realized_pnl(test_user.id) == Decimal("200")
+
+        # Incremental sync of a new fill
+        _fill(session, test_user, "sell", "1.0", "200", t0 + timedelta(hours=2))
+        race()
+        assert session.get(PnLLedgerState, test_user.id).applied_orders == 3
+        assert PnLLedger(session).realized_pnl(test_user.id) == Decimal("300")
@@ -1,6 +1,14 @@
 """Tests for backtest metrics calculator."""
 
-from app.services.trading.metrics import calculate_backtest_metrics
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.services.trading.metrics import (
+    calculate_backtest_metrics,
+    calculate_backtest_metrics_reference,
+    extract_position_trades,
+)
 
 
 class TestCalculateBacktestMetrics:
@@ -49,3 +57,55 @@ class TestCalculateBacktestMetrics:
         assert result["total_return"] == 0.0
         assert result["num_trades"] == 0
         assert result["sharpe_ratio"] == 0.0
+
+
+class TestMetricsParity:
+    @pytest.mark.parametrize("seed", [0, 1, 2, 3])
+    def test_random_walks_match_reference(self, seed: int) -> None:
+        """NumPy metrics match the pure-Python reference on random curves."""
+        rng = np.random.default_rng(seed)
+        equity = (10000 * np.cumprod(1 + rng.normal(0, 0.01, 5000))).tolist()
+        trades = [{"pnl": float(p)} for p in rng.normal(5, 50, 200)]
+
+        result = calculate_backtest_metrics(equity, trades)
+        expected = calculate_backtest_metrics_reference(equity, trades)
+
+        assert result.keys() == expected.keys()
+        for key, value in expected.items():
+            assert result[key] == pytest.approx(value, abs=2e-4), key
+
+    @pytest.mark.parametrize(
+        "equity",
+        [
+            [100.0, 100.0, 100.0],
+            [100.0, 110.0, 120.0],
+            [100.0, 90.0, 80.0, 70.0],
+            [100.0, 90.0, 100.0, 90.0, 100.0, 101.0],
+            [0.0, 10.0, 0.0, 5.0],
+            [10.0, 0.0, 0.0, 20.0, 5.0],
+        ],
+    )
+    def test_edge_curves_match_reference(self, equity: list[float]) -> None:
+        """Flat curves, ties with the peak and zero equity follow the reference."""
+        trades = [{"pnl": 0.0}, {"pnl": -1.0}]
+
+        assert calculate_backtest_metrics(
+            equity, trades
+        ) == calculate_backtest_metrics_reference(equity, trades)
+
+    def test_extract_position_trades(self) -> None:
+        """Trades open on changes to a non-zero position and close on the next change."""
+        index = pd.date_range("2025-01-01", periods=7, freq="5min")
+        close = np.array([100.0, 100.0, 110.0, 120.0, 120.0, 90.0, 99.0])
+        position = np.array([0, 1, 1, -1, 0, 0, 1])
+
+        trades = extract_position_trades(index, close, position, cost_per_side=0.0)
+
+        assert [(t["type"], t["entry_price"], t["exit_price"]) for t in trades] == [
+            ("long", 100.0, 120.0),
+            ("short", 120.0, 120.0),
+            ("long", 99.0, 99.0),
+        ]
+        assert trades[0]["entry_time"] == index[1]
+        assert trades[0]["exit_time"] == index[3]
+        assert trades[0]["pnl"] == pytest.approx(0.2)
@@ -0,0 +1,321 @@
+"""
+Tests for the paper exchange order book and matching
+
+Tests cover:
+- Price levels sorted best-first with FIFO queues per level
+- Market orders walking the book, including resting limit orders
+- Resting limit orders filled by set_price, fully and partially
+- Cancelling partially filled orders
+- Open order index and the bounded order history
+"""
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+from app.services.trading.paper_exchange import BookOrder, OrderBook, PaperExchange
+
+
+def _exchange(**balances) -> PaperExchange:
+    exchange = PaperExchange(initial_aud_balance=Decimal('100000'), seed=7)
+    for coin, amount in balances.items():
+        exchange.balances[coin] = Decimal(amount)
+    return exchange
+
+
+class TestOrderBook:
+    """Tests for OrderBook"""
+
+    def test_levels_sorted_best_first(self):
+        """Bids are served highest first, asks lowest first"""
+        book = OrderBook()
+        for price in ('99', '101', '100'):
+            book.add(BookOrder(f'b{price}', 'buy', Decimal(price), Decimal('1')))
+            book.add(BookOrder(f'a{price}', 'sell', Decimal(price) + 10, Decimal('1')))
+
+        depth = book.depth()
+
+        assert [p for p, _ in depth['bids']] == [Decimal('101'), Decimal('100'), Decimal('99')]
+        assert [p for p, _ in depth['asks']] == [Decimal('109'), Decimal('110'), Decimal('111')]
+
+    def test_fifo_within_level(self):
+        """Orders at the same price fill in arrival order"""
+        book = OrderBook()
+        first = BookOrder('first', 'sell', Decimal('100'), Decimal('1'))
+        second = BookOrder('second', 'sell', Decimal('100'), Decimal('1'))
+        book.add(first)
+        book.add(second)
+
+        fills = book.match('buy', quantity=Decimal('1.5'))
+
+        assert [(f.order.order_id, f.quantity) for f in fills] == [
+            ('first', Decimal('1')),
+            ('second', Decimal('0.5')),
+        ]
+        assert second.remaining == Decimal('0.5')
+        assert book.depth()['asks'] == [(Decimal('100'), Decimal('0.5'))]
+
+    def test_match_respects_limit(self):
+        """Limit orders stop at levels beyond their price"""
+        book = OrderBook()
+        book.add(BookOrder(None, 'sell', Decimal('100'), Decimal('1')))
+        book.add(BookOrder(None, 'sell', Decimal('102'), Decimal('1')))
+
+        fills = book.match('buy', quantity=Decimal('5'), limit=Decimal('101'))
+
+        assert sum(f.quantity for f in fills) == Decimal('1')
+        assert book.best_ask() == Decimal('102')
+
+    def test_quote_match_spends_exact_budget(self):
+        """AUD-denominated matching spends exactly the budget"""
+        book = OrderBook()
+        book.add(BookOrder(None, 'sell', Decimal('3'), Decimal('10')))
+
+        fills = book.match('buy', quote=Decimal('10'))
+
+        assert sum(f.notional for f in fills) == Decimal('10')
+
+    def test_cancel_drops_empty_level(self):
+        """Cancelling the last order at a price removes the level"""
+        book = OrderBook()
+        order = BookOrder('x', 'buy', Decimal('100'), Decimal('1'))
+        book.add(order)
+
+        book.cancel(order)
+
+        assert book.best_bid() is None
+        assert len(book.bids) == 0
+
+    def test_synthetic_liquidity_replaced(self):
+        """set_simple_liquidity replaces synthetic levels but keeps resting orders"""
+        book = OrderBook(seed=1)
+        resting = BookOrder('r', 'buy', Decimal('50'), Decimal('1'))
+        book.add(resting)
+
+        book.set_simple_liquidity(Decimal('100'))
+        book.set_simple_liquidity(Decimal('200'))
+
+        assert len(book.asks) == 10
+        assert len(book.bids) == 11
+        assert book.best_ask() > Decimal('200')
+        assert resting.remaining == Decimal('1')
+
+
+class TestPaperExchangeMatching:
+    """Tests for PaperExchange limit order matching"""
+
+    @pytest.mark.asyncio
+    async def test_limit_buy_rests_until_price_crosses(self):
+        """A resting limit buy fills at its limit when the market drops through it"""
+        exchange = _exchange()
+        exchange.set_price('BTC', Decimal('100'))
+
+        result = await exchange.limit_buy('BTC', Decimal('90'), Decimal('90'))
+        order = exchange.orders[result['id']]
+        assert order['status'] == 'open'
+        assert exchange.balances['AUD'] == Decimal('99910')
+
+        exchange.set_price('BTC', Decimal('80'))
+
+        assert order['status'] == 'completed'
+        assert Decimal(order['rate']) == Decimal('90')
+        assert exchange.balances['BTC'] == Decimal('1')
+        assert exchange.balances['AUD'] == Decimal('99910')
+        assert (await exchange.get_orders('BTC'))['buyorders'] == []
+
+    @pytest.mark.asyncio
+    async def test_resting_order_filled_across_levels_completes_once(self):
+        """A resting order crossed by several levels in one update is settled once"""
+        exchange = PaperExchange(initial_aud_balance=Decimal('100000'), seed=1)
+        exchange.set_price('BTC', Decimal('100'))
+        result = await exchange.limit_buy('BTC', Decimal('200'), Decimal('90'))
+
+        fills = []
+        apply_fill = exchange._apply_fill
+        with patch.object(
+            exchange, '_apply_fill',
+            side_effect=lambda *args: (fills.append(args), apply_fill(*args)),
+        ):
+            exchange.set_price('BTC', Decimal('80'))
+
+        assert len(fills) > 1
+        order = exchange.orders[result['id']]
+        assert order['status'] == 'completed'
+        assert exchange.balances['BTC'] == Decimal(order['amount'])
+        # Bought at its limit: AUD plus coins at 90 is conserved
+        value = exchange.balances['AUD'] + exchange.balances['BTC'] * Decimal('90')
+        assert value.quantize(Decimal('0.00000001')) == Decimal('100000')
+        history = await exchange.get_order_history('BTC')
+        assert [o['id'] for o in history['buyorders']] == [result['id']]
+
+    @pytest.mark.asyncio
+    async def test_partial_fill_across_price_updates(self):
+        """Large resting orders fill across several price updates"""
+        exchange = _exchange(BTC='1000')
+        exchange.set_price('BTC', Decimal('100'))
+
+        result = await exchange.limit_sell('BTC', Decimal('100'), Decimal('110'))
+        order = exchange.orders[result['id']]
+
+        exchange.set_price('BTC', Decimal('120'))
+        filled = Decimal(order['filled'])
+        assert order['status'] == 'open'
+        assert Decimal('0') < filled < Decimal('100')
+        assert exchange.balances['AUD'] == Decimal('100000') + filled * 110
+
+        for _ in range(200):
+            exchange.set_price('BTC', Decimal('120'))
+            if order['status'] == 'completed':
+                break
+
+        assert order['status'] == 'completed'
+        assert exchange.balances['AUD'] == Decimal('111000')
+        assert exchange.balances['BTC'] == Decimal('900')
+
+    @pytest.mark.asyncio
+    async def test_marketable_limit_fills_at_book_prices(self):
+        """A limit buy above the ask fills immediately at the ask and releases the rest"""
+        exchange = _exchange()
+        exchange.set_price('BTC', Decimal('100'))
+        best_ask = exchange.orderbooks['BTC'].best_ask()
+
+        result = await exchange.limit_buy('BTC', Decimal('1'), Decimal('200'))
+        order = exchange.orders[result['id']]
+
+        assert order['status'] == 'completed'
+        assert Decimal(order['rate']) == best_ask
+        assert exchange.balances['AUD'] == Decimal('100000') - Decimal(order['total'])
+
+    @pytest.mark.asyncio
+    async def test_market_order_fills_resting_limit(self):
+        """Market orders consume resting limit orders ahead of worse synthetic levels"""
+        exchange = _exchange(BTC='10')
+        exchange.set_price('BTC', Decimal('100'))
+        best_ask = exchange.orderbooks['BTC'].best_ask()
+        result = await exchange.limit_sell('BTC', Decimal('1'), best_ask)
+        resting = exchange.orders[result['id']]
+
+        order = await exchange.market_buy('BTC', Decimal('50000'))
+
+        assert resting['status'] == 'completed'
+        assert Decimal(order['total']) == Decimal('50000')
+        assert exchange.balances['AUD'] == Decimal('100000') - Decimal('50000') + best_ask
+
+    @pytest.mark.asyncio
+    async def test_cancel_partially_filled_buy(self):
+        """Cancelling refunds only the AUD held for the unfilled part"""
+        exchange = _exchange()
+        exchange.set_price('BTC', Decimal('100'))
+        result = await exchange.limit_buy('BTC', Decimal('50000'), Decimal('90'))
+        order = exchange.orders[result['id']]
+
+        exchange.set_price('BTC', Decimal('80'))
+        filled = Decimal(order['filled'])
+        assert order['status'] == 'open'
+
+        await exchange.cancel_buy_order(result['id'])
+
+        assert order['status'] == 'cancelled'
+        assert exchange.balances['BTC'] == filled
+        assert exchange.balances['AUD'] == Decimal('100000') - filled * 90
+        assert exchange.orderbooks['BTC'].best_bid() < Decimal('80')
+
+    @pytest.mark.asyncio
+    async def test_cancel_sell_refunds_remaining_coins(self):
+        """Cancelling a resting sell returns its unfilled coins"""
+        exchange = _exchange(ETH='5')
+        exchange.set_price('ETH', Decimal('100'))
+        result = await exchange.limit_sell('ETH', Decimal('5'), Decimal('150'))
+        assert exchange.balances['ETH'] == Decimal('0')
+
+        await exchange.cancel_sell_order(result['id'])
+
+        assert exchange.balances['ETH'] == Decimal('5')
+        assert exchange.orderbooks['ETH'].best_ask() < Decimal('150')
+        with pytest.raises(ValueError):
+            await exchange.cancel_sell_order(result['id'])
+
+    @pytest.mark.asyncio
+    async def test_zero_amount_limit_orders_complete_at_limit(self):
+        """Zero-quantity limit orders complete unfilled at their limit price"""
+        exchange = _exchange(ETH='5')
+        exchange.set_price('ETH', Decimal('100'))
+
+        buy = await exchange.limit_buy('ETH', Decimal('0'), Decimal('90'))
+        sell = await exchange.limit_sell('ETH', Decimal('0'), Decimal('110'))
+
+        for result, rate in ((buy, '90'), (sell, '110')):
+            order = exchange.orders[result['id']]
+            assert order['status'] == 'completed'
+            assert Decimal(order['amount']) == 0
+            assert Decimal(order['rate']) == Decimal(rate)
+        assert exchange.balances['AUD'] == Decimal('100000')
+        assert exchange.balances['ETH'] == Decimal('5')
+
+
+class TestPaperExchangeOrderIndex:
+    """Tests for open order and history lookups"""
+
+    @pytest.mark.asyncio
+    async def test_get_orders_per_coin(self):
+        """Open orders are listed per coin and leave the index when finished"""
+        exchange = _exchange(ETH='10')
+        exchange.set_price('BTC', Decimal('100'))
+        exchange.set_price('ETH', Decimal('10'))
+        btc = await exchange.limit_buy('BTC', Decimal('50'), Decimal('50'))
+        eth = await exchange.limit_sell('ETH', Decimal('1'), Decimal('20'))
+
+        assert [o['id'] for o in (await exchange.get_orders('BTC'))['buyorders']] == [btc['id']]
+        assert [o['id'] for o in (await exchange.get_orders())['sellorders']] == [eth['id']]
+        assert await exchange.get_orders('SOL') == {'buyorders': [], 'sellorders': []}
+
+        await exchange.cancel_buy_order(btc['id'])
+
+        assert (await exchange.get_orders('BTC'))['buyorders'] == []
+
+    @pytest.mark.asyncio
+    async def test_history_most_recent_first(self):
+        """History lists finished orders newest first, per coin and overall"""
+        exchange = _exchange(ETH='10')
+        first = await exchange.market_buy('BTC', Decimal('100'))
+        second = await exchange.market_sell('ETH', Decimal('1'))
+        third = await exchange.market_buy('BTC', Decimal('200'))
+        await exchange.limit_buy('BTC', Decimal('1'), Decimal('1'))  # Stays open
+
+        history = await exchange.get_order_history()
+        assert [o['id'] for o in history['buyorders']] == [third['id'], first['id']]
+        assert [o['id'] for o in history['sellorders']] == [second['id']]
+
+        history = await exchange.get_order_history('BTC', limit=1)
+        assert [o['id'] for o in history['buyorders']] == [third['id']]
+        assert history['sellorders'] == []
+
+    @pytest.mark.asyncio
+    async def test_history_limit_caps_buffer(self):
+        """Only the last history_limit finished orders are kept"""
+        exchange = PaperExchange(history_limit=3)
+        ids = [(await exchange.market_buy('BTC', Decimal('10')))['id'] for _ in range(5)]
+
+        history = await exchange.get_order_history('BTC')
+
+        assert [o['id'] for o in history['buyorders']] == ids[:1:-1]
+        assert len(exchange.orders) == 5
+
+    @pytest.mark.asyncio
+    async def test_memory_bounded_drops_old_orders(self):
+        """Memory-bounded mode forgets evicted orders but keeps open ones"""
+        exchange = PaperExchange(history_limit=2, memory_bounded=True)
+        exchange.set_price('BTC', Decimal('100'))
+        resting = await exchange.limit_buy('BTC', Decimal('50'), Decimal('50'))
+        for _ in range(10):
+            await exchange.market_buy('BTC', Decimal('10'))
+
+        assert len(exchange.orders) == 3
+        assert resting['id'] in exchange.orders
+        await exchange.cancel_buy_order(resting['id'])
+        assert len(exchange.orders) == 2
+
+    def test_invalid_history_limit(self):
+        """The history buffer must hold at least one order"""
+        with pytest.raises(ValueError):
+            PaperExchange(history_limit=0)
@@ -0,0 +1,181 @@
+"""
+Tests for the P&L engine
+
+Tests cover:
+- Calendar-aware bucket boundaries
+- Single-pass historical P&L bucketing
+- Batched per-coin and per-algorithm breakdowns
+"""
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlmodel import Session
+
+from app.models import Order, Position, PriceData5Min, User
+from app.services.trading.pnl import PnLEngine, get_bucket_boundaries
+
+
+class TestBucketBoundaries:
+    """Tests for get_bucket_boundaries"""
+
+    def test_day_buckets_cover_end_date(self):
+        """Bucket starts run up to end_date and include a closing boundary"""
+        start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        end = datetime(2026, 1, 3, tzinfo=timezone.utc)
+
+        boundaries = get_bucket_boundaries(start, end, "day")
+
+        assert boundaries == [start + timedelta(days=i) for i in range(4)]
+
+    def test_month_buckets_follow_calendar(self):
+        """Month buckets use calendar months and clamp short months"""
+        start = datetime(2026, 1, 31, tzinfo=timezone.utc)
+        end = datetime(2026, 4, 1, tzinfo=timezone.utc)
+
+        boundaries = get_bucket_boundaries(start, end, "month")
+
+        assert [b.date().isoformat() for b in boundaries] == [
+            "2026-01-31",
+            "2026-02-28",
+            "2026-03-31",
+            "2026-04-30",
+        ]
+
+    def test_invalid_interval(self):
+        """Unsupported intervals raise ValueError"""
+        now = datetime.now(timezone.utc)
+        with pytest.raises(ValueError):
+            get_bucket_boundaries(now, now, "fortnight")
+
+
+class TestHistoricalPnL:
+    """Tests for PnLEngine.get_historical_pnl"""
+
+    def test_buckets_sum_to_realized_total(self, test_user: User, session: Session):
+        """Per-bucket P&L lands in the bucket of the sell fill"""
+        start = datetime(2026, 3, 1, tzinfo=timezone.utc)
+        fills = [
+            ("buy", "2.0", "100", start + timedelta(hours=1)),
+            ("sell", "1.0", "150", start + timedelta(days=1, hours=2)),
+            ("sell", "1.0", "90", start + timedelta(days=3)),
+        ]
+        for side, quantity, price, filled_at in fills:
+            session.add(
+                Order(
+                    user_id=test_user.id,
+                    coin_type="BTC",
+                    side=side,
+                    quantity=Decimal(quantity),
+                    price=Decimal(price),
+                    filled_quantity=Decimal(quantity),
+                    status="filled",
+                    filled_at=filled_at,
+                )
+            )
+        session.commit()
+
+        engine = PnLEngine(session)
+        history = engine.get_historical_pnl(
+            test_user.id, start, start + timedelta(days=4), interval="day"
+        )
+
+        assert [entry["realized_pnl"] for entry in history] == [
+            0.0,
+            50.0,
+            0.0,
+            -10.0,
+            0.0,
+        ]
+        assert sum(entry["realized_pnl"] for entry in history) == float(
+            engine.calculate_realized_pnl(test_user.id)
+        )
+
+
+class TestPnLBreakdowns:
+    """Tests for batched per-coin and per-algorithm breakdowns"""
+
+    def test_pnl_by_coin_includes_unrealized(
+        self, test_user: User, session: Session
+    ):
+        """Every traded coin gets realized and unrealized P&L from bulk lookups"""
+        now = datetime.now(timezone.utc)
+        for coin_type, side, price, offset in [
+            ("BTC", "buy", "100", 3),
+            ("BTC", "sell", "120", 2),
+            ("ETH", "buy", "10", 1),
+        ]:
+            session.add(
+                Order(
+                    user_id=test_user.id,
+                    coin_type=coin_type,
+                    side=side,
+                    quantity=Decimal("1"),
+                    price=Decimal(price),
+                    filled_quantity=Decimal("1"),
+                    status="filled",
+                    filled_at=now - timedelta(hours=offset),
+                )
+            )
+        session.add(
+            Position(
+                user_id=test_user.id,
+                coin_type="ETH",
+                quantity=Decimal("1"),
+                average_price=Decimal("10"),
+                total_cost=Decimal("10"),
+            )
+        )
+        for minutes, last in [(10, "11"), (5, "12")]:
+            session.add(
+                PriceData5Min(
+                    timestamp=now - timedelta(minutes=minutes),
+                    coin_type="ETH",
+                    bid=Decimal(last),
+                    ask=Decimal(last),
+                    last=Decimal(last),
+                )
+            )
+        session.commit()
+
+        result = PnLEngine(session).get_pnl_by_coin(test_user.id)
+
+        assert set(result) == {"BTC", "ETH"}
+        assert result["BTC"].realized_pnl == Decimal("20")
+        assert result["BTC"].unrealized_pnl == Decimal("0")
+        assert result["ETH"].realized_pnl == Decimal("0")
+        # Valued at the most recent price (12)
+        assert result["ETH"].unrealized_pnl == Decimal("2")
+
+    def test_pnl_by_algorithm_uses_algorithm_books(
+        self, test_user: User, session: Session
+    ):
+        """Algorithms only realize P&L against their own buys"""
+        algo_a = uuid4()
+        algo_b = uuid4()
+        now = datetime.now(timezone.utc)
+        for algorithm_id, side, price, offset in [
+            (algo_a, "buy", "100", 4),
+            (algo_b, "buy", "200", 3),
+            (algo_b, "sell", "250", 2),
+        ]:
+            session.add(
+                Order(
+                    user_id=test_user.id,
+                    algorithm_id=algorithm_id,
+                    coin_type="BTC",
+                    side=side,
+                    quantity=Decimal("1"),
+                    price=Decimal(price),
+                    filled_quantity=Decimal("1"),
+                    status="filled",
+                    filled_at=now - timedelta(hours=offset),
+                )
+            )
+        session.commit()
+
+        result = PnLEngine(session).get_pnl_by_algorithm(test_user.id)
+
+        assert result[algo_a].realized_pnl == Decimal("0")
+        assert result[algo_b].realized_pnl == Decimal("50")
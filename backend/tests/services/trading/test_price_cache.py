@@ -0,0 +1,98 @@
+"""
+Tests for the latest price cache
+
+Tests cover:
+- Write-through updates and out-of-order protection
+- Bulk reads served from memory
+- Cold-start fallback to a single DISTINCT ON query
+- Max-age expiry
+"""
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+from sqlmodel import Session
+
+from app.models import PriceData5Min
+from app.services.trading.price_cache import LatestPriceCache, get_price_cache
+
+
+class TestLatestPriceCache:
+    """Tests for LatestPriceCache"""
+
+    def test_update_and_get_many_from_memory(self):
+        """Cached coins are served without touching the session"""
+        cache = LatestPriceCache()
+        now = datetime.now(timezone.utc)
+        cache.update("BTC", Decimal("50000"), now)
+        cache.update("ETH", Decimal("3000"), now)
+
+        session = MagicMock()
+        prices = cache.get_many(["BTC", "ETH"], session)
+
+        assert prices == {"BTC": Decimal("50000"), "ETH": Decimal("3000")}
+        session.exec.assert_not_called()
+        assert cache.stats()["hits"] == 2
+
+    def test_older_observation_does_not_replace_newer(self):
+        """Out-of-order writes keep the most recent price"""
+        cache = LatestPriceCache()
+        now = datetime.now(timezone.utc)
+        cache.update("BTC", Decimal("51000"), now)
+        cache.update("BTC", Decimal("49000"), now - timedelta(minutes=5))
+
+        assert cache.get("BTC") == Decimal("51000")
+
+    def test_update_many_from_collected_rows(self):
+        """Collector output can be published in one call"""
+        cache = LatestPriceCache()
+        now = datetime.now(timezone.utc)
+        rows = [
+            PriceData5Min(
+                coin_type="btc",
+                bid=Decimal("1"),
+                ask=Decimal("3"),
+                last=Decimal("2"),
+                timestamp=now,
+            )
+        ]
+
+        assert cache.update_many(rows) == 1
+        assert cache.get("btc") == Decimal("2")
+
+    def test_expired_entries_are_misses(self):
+        """Entries older than max_age_seconds are not served"""
+        cache = LatestPriceCache(max_age_seconds=0)
+        cache.update("BTC", Decimal("50000"), datetime.now(timezone.utc))
+
+        assert cache.get_many(["BTC"]) == {}
+        assert cache.stats()["misses"] == 1
+
+    def test_cold_start_loads_latest_rows(self, session: Session):
+        """Misses are loaded from PriceData5Min with the newest row per coin"""
+        now = datetime.now(timezone.utc)
+        for coin_type, minutes, last in [
+            ("BTC", 10, "50000"),
+            ("BTC", 5, "50500"),
+            ("ETH", 5, "3000"),
+        ]:
+            session.add(
+                PriceData5Min(
+                    coin_type=coin_type,
+                    bid=Decimal(last),
+                    ask=Decimal(last),
+                    last=Decimal(last),
+                    timestamp=now - timedelta(minutes=minutes),
+                )
+            )
+        session.commit()
+
+        cache = LatestPriceCache()
+        prices = cache.get_many(["BTC", "ETH", "DOGE"], session)
+
+        assert prices == {"BTC": Decimal("50500"), "ETH": Decimal("3000")}
+        assert cache.stats()["size"] == 2
+
+    def test_get_price_cache_singleton(self):
+        """The process-wide cache is shared"""
+        assert get_price_cache() is get_price_cache()
@@ -80,6 +80,38 @@ class TestTradeRecorder:
         assert order.coin_type == 'ETH'
         assert order.side == 'sell'
 
+    def test_log_trade_attempts_batch(
+        self,
+        trade_recorder: TradeRecorder,
+        test_user: User,
+        session: Session
+    ):
+        """Test logging several trade attempts at once"""
+        algorithm_id = uuid4()
+
+        order_ids = trade_recorder.log_trade_attempts([
+            {
+                'user_id': test_user.id,
+                'coin_type': 'BTC',
+                'side': 'buy',
+                'quantity': Decimal('0.01'),
+                'algorithm_id': algorithm_id
+            },
+            {
+                'user_id': test_user.id,
+                'coin_type': 'ETH',
+                'side': 'sell',
+                'quantity': Decimal('2')
+            }
+        ])
+
+        assert len(order_ids) == 2
+        orders = [session.get(Order, order_id) for order_id in order_ids]
+        assert [o.coin_type for o in orders] == ['BTC', 'ETH']
+        assert orders[0].algorithm_id == algorithm_id
+        assert orders[1].order_type == 'market'
+        assert all(o.status == 'pending' for o in orders)
+
     def test_record_success(
         self,
         trade_recorder: TradeRecorder,
@@ -0,0 +1,255 @@
+"""
+Tests for the historical replay feed
+
+Tests cover:
+- Chunked reads grouped into per-timestamp ticks
+- Market data in the scheduler format
+- Feeding PaperExchange and executing algorithms at their frequency
+- Refusing to run outside paper mode
+- Risk state on the simulated clock
+- Replay users standing in for real owners and their cleanup
+"""
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from sqlmodel import Session, select
+
+from app.models import AuditLog, Order, Position, PriceData5Min, User
+from app.services.trading.exceptions import ReplayError
+from app.services.trading.paper_exchange import PaperExchange
+from app.services.trading.replay import HistoricalReplayFeed, ReplayAccounts
+from app.services.trading.risk_state import RiskSnapshot
+
+START = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+def _ticks(count, coins=('BTC', 'ETH')):
+    """Synthetic (timestamp, rows) ticks, 5 minutes apart"""
+    ticks = []
+    for i in range(count):
+        ts = START + timedelta(minutes=5 * i)
+        rows = [
+            (i, ts, coin, Decimal(100 + i), Decimal(102 + i), Decimal(101 + i))
+            for coin in coins
+        ]
+        ticks.append((ts, rows))
+    return ticks
+
+
+def _feed(**kwargs):
+    kwargs.setdefault('order_queue', MagicMock(drain=AsyncMock()))
+    return HistoricalReplayFeed(
+        session=MagicMock(),
+        start=START,
+        end=START + timedelta(days=1),
+        **kwargs,
+    )
+
+
+class TestHistoricalReplayFeed:
+    """Tests for HistoricalReplayFeed"""
+
+    def test_iter_ticks_groups_across_chunks(self, session: Session):
+        """Rows are read in chunks and grouped by timestamp in time order"""
+        for i in range(5):
+            for coin in ('BTC', 'ETH', 'SOL'):
+                session.add(
+                    PriceData5Min(
+                        timestamp=START + timedelta(minutes=5 * i),
+                        coin_type=coin,
+                        bid=Decimal('99'),
+                        ask=Decimal('101'),
+                        last=Decimal(100 + i),
+                    )
+                )
+        session.commit()
+
+        feed = HistoricalReplayFeed(
+            session=session,
+            start=START + timedelta(minutes=5),
+            end=START + timedelta(minutes=25),
+            coin_types=['BTC', 'SOL'],
+            order_queue=MagicMock(),
+            chunk_size=3,
+        )
+        ticks = list(feed.iter_ticks())
+
+        assert [ts for ts, _ in ticks] == [
+            START + timedelta(minutes=5 * i) for i in range(1, 5)
+        ]
+        assert all(sorted(row[2] for row in rows) == ['BTC', 'SOL'] for _, rows in ticks)
+        assert [rows[0][5] for _, rows in ticks] == [Decimal(100 + i) for i in range(1, 5)]
+
+    def test_build_market_data(self):
+        """Market data carries per-coin prices and the legacy keys"""
+        ts, rows = _ticks(1)[0]
+
+        data = HistoricalReplayFeed.build_market_data(ts, rows)
+
+        assert data['timestamp'] == ts.isoformat()
+        assert data['prices']['ETH'] == {
+            'last': Decimal('101'),
+            'bid': Decimal('100'),
+            'ask': Decimal('102'),
+            'coin_type': 'ETH',
+        }
+        assert data['price'] == Decimal('101')
+        assert data['coin_type'] == 'BTC'
+        assert data['ETH'] == {'price': Decimal('101')}
+
+    @pytest.mark.asyncio
+    async def test_run_feeds_exchange_and_algorithms(self):
+        """Each tick updates prices, runs due algorithms and waits for orders"""
+        exchange = PaperExchange(seed=1)
+        executor = MagicMock()
+        executor.execute_algorithm = AsyncMock(return_value={'executed': True})
+        queue = MagicMock(drain=AsyncMock())
+        feed = _feed(exchange=exchange, executor=executor, order_queue=queue)
+        feed.add_algorithm(uuid4(), uuid4(), MagicMock(), frequency_seconds=600)
+
+        with patch('app.services.trading.replay.settings') as mock_settings, patch.object(
+            feed, 'iter_ticks', return_value=iter(_ticks(6))
+        ):
+            mock_settings.TRADING_MODE = 'paper'
+            report = await feed.run()
+
+        assert exchange.prices == {'BTC': Decimal('106'), 'ETH': Decimal('106')}
+        assert executor.execute_algorithm.await_count == 3
+        seen = [
+            call.kwargs['market_data']['price']
+            for call in executor.execute_algorithm.await_args_list
+        ]
+        assert seen == [Decimal('101'), Decimal('103'), Decimal('105')]
+        assert queue.drain.await_count == 3
+        assert (await feed.get_data())['price'] == Decimal('106')
+
+        assert report.ticks == 6
+        assert report.events == 12
+        assert report.executions == 3
+        assert report.orders == 3
+        assert report.last_timestamp == START + timedelta(minutes=25)
+        assert report.events_per_sec > 0
+        assert set(report.latency_ms) == {'p50', 'p95', 'max'}
+
+    @pytest.mark.asyncio
+    async def test_algorithm_errors_are_counted(self):
+        """A failing algorithm does not stop the replay"""
+        executor = MagicMock()
+        executor.execute_algorithm = AsyncMock(side_effect=RuntimeError('boom'))
+        feed = _feed(exchange=PaperExchange(), executor=executor)
+        feed.add_algorithm(uuid4(), uuid4(), MagicMock())
+
+        with patch('app.services.trading.replay.settings') as mock_settings, patch.object(
+            feed, 'iter_ticks', return_value=iter(_ticks(3))
+        ):
+            mock_settings.TRADING_MODE = 'paper'
+            report = await feed.run()
+
+        assert report.ticks == 3
+        assert report.errors == 3
+        assert report.orders == 0
+
+    @pytest.mark.asyncio
+    async def test_requires_paper_mode(self):
+        """Replays never run against the live exchange"""
+        feed = _feed(exchange=PaperExchange())
+
+        with patch('app.services.trading.replay.settings') as mock_settings:
+            mock_settings.TRADING_MODE = 'live'
+            with pytest.raises(ReplayError):
+                await feed.run()
+
+    @pytest.mark.asyncio
+    async def test_risk_state_follows_replayed_time(self):
+        """Daily P&L rolls over on replayed days, not on the wall clock"""
+        user_id = uuid4()
+        executor = MagicMock()
+        feed = _feed(exchange=PaperExchange(), executor=executor)
+        clocks = []
+
+        async def execute_algorithm(**kwargs):
+            clocks.append(feed.risk_state.clock())
+            return {}
+
+        executor.execute_algorithm = AsyncMock(side_effect=execute_algorithm)
+        feed.add_algorithm(user_id, uuid4(), MagicMock())
+        feed.risk_state._snapshots[user_id] = RiskSnapshot(
+            user_id=user_id,
+            positions={},
+            daily_pnl=Decimal('-400'),
+            day=START.date(),
+            loaded_at=0.0,
+        )
+        late = START + timedelta(hours=23, minutes=55)
+        rows = _ticks(1)[0][1]
+        ticks = [(late, rows), (late + timedelta(minutes=5), rows)]
+
+        with patch('app.services.trading.replay.settings') as mock_settings, patch.object(
+            feed, 'iter_ticks', return_value=iter(ticks)
+        ):
+            mock_settings.TRADING_MODE = 'paper'
+            await feed.run()
+
+        assert clocks == [late, late + timedelta(minutes=5)]
+        # Never reloaded, however long ago it was loaded
+        snapshot = feed.risk_state.get(MagicMock(), user_id)
+        assert snapshot.day == date(2025, 1, 2)
+        assert snapshot.daily_pnl == Decimal('0')
+
+    def test_invalid_arguments(self):
+        """Empty ranges and non-positive speeds are rejected"""
+        with pytest.raises(ReplayError):
+            HistoricalReplayFeed(MagicMock(), START, START, order_queue=MagicMock())
+        with pytest.raises(ReplayError):
+            _feed(speed=0)
+
+
+class TestReplayAccounts:
+    """Tests for ReplayAccounts"""
+
+    def test_replay_users_are_deleted_with_their_rows(
+        self, session: Session, test_user: User
+    ):
+        """Owners map to one replay user each; cleanup removes all they wrote"""
+        accounts = ReplayAccounts(session)
+        replay_user_id = accounts.user_for(test_user.id)
+
+        assert accounts.user_for(test_user.id) == replay_user_id
+        assert replay_user_id != test_user.id
+        assert not session.get(User, replay_user_id).is_active
+
+        session.add(
+            Order(
+                user_id=replay_user_id,
+                coin_type='BTC',
+                side='buy',
+                order_type='market',
+                quantity=Decimal('10'),
+                filled_quantity=Decimal('10'),
+                status='filled',
+            )
+        )
+        session.add(
+            Position(
+                user_id=replay_user_id,
+                coin_type='BTC',
+                quantity=Decimal('0.1'),
+                average_price=Decimal('100'),
+                total_cost=Decimal('10'),
+            )
+        )
+        session.add(AuditLog(event_type='TRADE_APPROVED', user_id=replay_user_id))
+        session.commit()
+
+        accounts.cleanup()
+
+        assert session.get(User, replay_user_id) is None
+        for model in (Order, Position, AuditLog):
+            assert not session.exec(
+                select(model).where(model.user_id == replay_user_id)
+            ).all()
+        assert session.get(User, test_user.id) is not None
+        assert accounts.users == {}
@@ -0,0 +1,193 @@
+"""
+Tests for the risk state cache
+
+Tests cover:
+- Snapshot loading from positions and filled orders
+- Serving snapshots from memory within the TTL
+- Incremental updates from fills and day rollover
+- Injected clocks deciding the day
+- Active rule caching and invalidation
+"""
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from unittest.mock import MagicMock
+from uuid import uuid4
+
+from sqlmodel import Session
+
+from app.models import Order, Position, RiskRule, User
+from app.services.trading.risk_state import (
+    RiskSnapshot,
+    RiskStateCache,
+    get_risk_state,
+)
+
+
+def _filled_order(user_id, side, quantity, price, algorithm_id=None, filled_at=None):
+    now = datetime.now(timezone.utc)
+    return Order(
+        user_id=user_id,
+        coin_type='BTC',
+        side=side,
+        order_type='market',
+        quantity=Decimal(quantity),
+        filled_quantity=Decimal(quantity),
+        price=Decimal(price),
+        status='filled',
+        algorithm_id=algorithm_id,
+        filled_at=filled_at or now,
+        created_at=now,
+        updated_at=now,
+    )
+
+
+def _cached_snapshot(cache: RiskStateCache, user_id) -> RiskSnapshot:
+    snapshot = RiskSnapshot(
+        user_id=user_id,
+        positions={'BTC': Decimal('5000'), 'ETH': Decimal('1000')},
+        daily_pnl=Decimal('0'),
+        day=datetime.now(timezone.utc).date(),
+        loaded_at=float('inf'),
+    )
+    cache._snapshots[user_id] = snapshot
+    return snapshot
+
+
+class TestRiskStateCache:
+    """Tests for RiskStateCache"""
+
+    def test_load_snapshot(self, session: Session, test_user: User):
+        """Positions, today's fills and algorithm exposure are aggregated"""
+        algorithm_id = uuid4()
+        session.add(
+            Position(
+                user_id=test_user.id,
+                coin_type='BTC',
+                quantity=Decimal('0.1'),
+                average_price=Decimal('60000'),
+                total_cost=Decimal('6000'),
+            )
+        )
+        session.add(_filled_order(test_user.id, 'buy', '0.01', '50000', algorithm_id))
+        session.add(_filled_order(test_user.id, 'sell', '0.01', '45000', algorithm_id))
+        session.add(
+            _filled_order(
+                test_user.id,
+                'buy',
+                '1',
+                '100',
+                filled_at=datetime.now(timezone.utc) - timedelta(days=2),
+            )
+        )
+        session.commit()
+
+        snapshot = RiskStateCache().get(session, test_user.id)
+
+        assert snapshot.portfolio_value == Decimal('6000')
+        assert snapshot.daily_pnl == Decimal('-50')
+        assert snapshot.algorithm_exposure == {algorithm_id: Decimal('50')}
+
+    def test_unknown_user(self, session: Session):
+        """Missing users have no snapshot"""
+        assert RiskStateCache().get(session, uuid4()) is None
+
+    def test_served_from_memory_within_ttl(self):
+        """Fresh snapshots do not touch the session"""
+        cache = RiskStateCache()
+        user_id = uuid4()
+        _cached_snapshot(cache, user_id)
+        session = MagicMock()
+
+        snapshot = cache.get(session, user_id)
+
+        assert snapshot.portfolio_value == Decimal('6000')
+        session.get.assert_not_called()
+        session.exec.assert_not_called()
+        assert cache.stats()['hits'] == 1
+
+    def test_record_fill_updates_snapshot(self):
+        """Fills adjust daily P&L, algorithm exposure and position cost"""
+        cache = RiskStateCache()
+        user_id = uuid4()
+        algorithm_id = uuid4()
+        snapshot = _cached_snapshot(cache, user_id)
+
+        cache.record_fill(
+            _filled_order(user_id, 'buy', '0.02', '50000', algorithm_id),
+            Decimal('6000'),
+        )
+        cache.record_fill(
+            _filled_order(user_id, 'sell', '0.02', '49000', algorithm_id),
+            Decimal('0'),
+        )
+
+        assert snapshot.daily_pnl == Decimal('-20')
+        assert snapshot.algorithm_exposure[algorithm_id] == Decimal('20')
+        assert snapshot.positions == {'ETH': Decimal('1000')}
+
+    def test_record_fill_without_position_cost_drops_snapshot(self):
+        """An unknown position outcome forces a reload"""
+        cache = RiskStateCache()
+        user_id = uuid4()
+        _cached_snapshot(cache, user_id)
+
+        cache.record_fill(_filled_order(user_id, 'buy', '1', '100'), None)
+
+        assert cache.stats()['size'] == 0
+
+    def test_day_rollover_resets_daily_pnl(self):
+        """Daily P&L restarts at zero on a new UTC day"""
+        cache = RiskStateCache()
+        user_id = uuid4()
+        snapshot = _cached_snapshot(cache, user_id)
+        snapshot.daily_pnl = Decimal('-400')
+        snapshot.day = date(2020, 1, 1)
+
+        assert cache.get(MagicMock(), user_id).daily_pnl == Decimal('0')
+
+    def test_clock_decides_day(self):
+        """Fills count towards the clock's day, not the wall clock's"""
+        now = datetime(2025, 1, 1, 23, 55, tzinfo=timezone.utc)
+        cache = RiskStateCache(clock=lambda: now)
+        user_id = uuid4()
+        snapshot = _cached_snapshot(cache, user_id)
+        snapshot.day = now.date()
+
+        cache.record_fill(_filled_order(user_id, 'sell', '1', '100'), Decimal('0'))
+        assert snapshot.daily_pnl == Decimal('100')
+
+        now = datetime(2025, 1, 2, 0, 5, tzinfo=timezone.utc)
+        cache.record_fill(_filled_order(user_id, 'buy', '1', '40'), Decimal('40'))
+        assert snapshot.day == date(2025, 1, 2)
+        assert snapshot.daily_pnl == Decimal('-40')
+
+    def test_rules_cached_until_invalidated(self, session: Session):
+        """Active rules are loaded once and reloaded after invalidation"""
+        rule = RiskRule(
+            name=f'cap-{uuid4().hex[:8]}',
+            rule_type='max_position_size',
+            value={'max_value': 5000},
+        )
+        session.add(rule)
+        session.commit()
+
+        cache = RiskStateCache()
+        names = {r.name for r in cache.get_rules(session, 'max_position_size')}
+        assert rule.name in names
+
+        rule.is_active = False
+        session.add(rule)
+        session.commit()
+        names = {r.name for r in cache.get_rules(session, 'max_position_size')}
+        assert rule.name in names
+
+        cache.invalidate_rules()
+        names = {r.name for r in cache.get_rules(session, 'max_position_size')}
+        assert rule.name not in names
+
+        session.delete(rule)
+        session.commit()
+
+    def test_get_risk_state_singleton(self):
+        """The process-wide cache is shared"""
+        assert get_risk_state() is get_risk_state()
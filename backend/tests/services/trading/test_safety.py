@@ -11,7 +11,7 @@ Tests cover:
 from collections.abc import AsyncGenerator
 from datetime import datetime, timedelta, timezone
 from decimal import Decimal
-from unittest.mock import AsyncMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 import pytest
@@ -19,6 +19,8 @@ import pytest_asyncio
 from sqlmodel import Session
 
 from app.models import Order, Position, User
+from app.services.trading.audit import AuditLogWriter
+from app.services.trading.risk_state import RiskSnapshot, RiskStateCache
 from app.services.trading.safety import (
     SafetyViolation,
     TradingSafetyManager,
@@ -371,6 +373,23 @@ class TestSafetyManager:
 
         assert manager1 is manager2
 
+    def test_bind_shares_limits_and_connection(
+        self, safety_manager: TradingSafetyManager
+    ):
+        """A bound manager keeps the limits and Redis client of the original"""
+        other_session = MagicMock()
+        bound = safety_manager.bind(other_session)
+
+        assert bound.session is other_session
+        assert bound.redis_client is safety_manager.redis_client
+        assert bound.risk_state is safety_manager.risk_state
+        assert bound.max_position_pct == safety_manager.max_position_pct
+        assert bound.max_daily_loss_pct == safety_manager.max_daily_loss_pct
+        assert (
+            bound.max_algorithm_exposure_pct
+            == safety_manager.max_algorithm_exposure_pct
+        )
+
 
 class TestSafetyManagerEdgeCases:
     """Edge case tests for safety manager"""
@@ -573,9 +592,71 @@ class TestSafetyManagerEdgeCases:
         safety_manager: TradingSafetyManager
     ):
         """Test that audit log failures do not crash the application"""
-        # Mock session.add to raise an exception
-        with patch.object(safety_manager.session, 'add', side_effect=Exception("DB Error")):
-             # This simple log call should not raise an exception
-             safety_manager._log_audit("TEST_ACTION", {})
+        failing_engine = MagicMock()
+        failing_engine.begin.side_effect = Exception("DB Error")
+        writer = AuditLogWriter(engine=failing_engine)
+
+        with patch('app.services.trading.safety.get_audit_writer', return_value=writer):
+            # A synchronous (CRITICAL) write hits the database and must not raise
+            safety_manager._log_audit("TEST_ACTION", {}, severity="CRITICAL")
+
+        assert writer.stats()['failed'] == 1
+
+
+class TestCachedValidation:
+    """validate_trade on a cached risk snapshot"""
+
+    @pytest.fixture
+    def cached_manager(self) -> TradingSafetyManager:
+        user_id = uuid4()
+        risk_state = RiskStateCache()
+        risk_state._snapshots[user_id] = RiskSnapshot(
+            user_id=user_id,
+            positions={'BTC': Decimal('6000'), 'ETH': Decimal('4000')},
+            daily_pnl=Decimal('-100'),
+            day=datetime.now(timezone.utc).date(),
+            loaded_at=float('inf'),
+        )
+        risk_state._rules = {}
+        risk_state._rules_loaded_at = float('inf')
+
+        manager = TradingSafetyManager(session=MagicMock(), risk_state=risk_state)
+        manager.redis_client = MagicMock()
+        manager.redis_client.mget = AsyncMock(return_value=[None, None])
+        manager.user_id = user_id
+        return manager
+
+    @pytest.mark.asyncio
+    async def test_single_redis_call_and_no_queries(
+        self, cached_manager: TradingSafetyManager
+    ):
+        """A cached validation makes one MGET and no database reads"""
+        result = await cached_manager.validate_trade(
+            user_id=cached_manager.user_id,
+            coin_type='SOL',
+            side='buy',
+            quantity=Decimal('10'),
+            estimated_price=Decimal('100'),
+            algorithm_id=uuid4(),
+        )
+
+        assert result['valid'] is True
+        cached_manager.redis_client.mget.assert_awaited_once()
+        cached_manager.session.get.assert_not_called()
+        cached_manager.session.exec.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_limits_use_snapshot(self, cached_manager: TradingSafetyManager):
+        """Limits are evaluated against the snapshot and market flags"""
+        cached_manager.redis_client.mget = AsyncMock(return_value=[None, 'volatile'])
 
+        with pytest.raises(SafetyViolation) as excinfo:
+            await cached_manager.validate_trade(
+                user_id=cached_manager.user_id,
+                coin_type='SOL',
+                side='buy',
+                quantity=Decimal('15'),
+                estimated_price=Decimal('100'),
+            )
 
+        assert "LIMITS HALVED" in str(excinfo.value)